@@ -2,11 +2,35 @@
 
 Provides caching decorators and utilities optimized for Railway deployment.
 """
+import atexit
+import hashlib
+import json
+import logging
+import math
+import os
+import pickle
+import random
+import threading
+import time
+import zlib
+from collections import OrderedDict
 from functools import wraps
-from typing import Any, Callable, Optional
+from importlib import import_module
+from typing import Any, Callable, Dict, Iterable, NamedTuple, Optional, Union
+from redis.exceptions import RedisError
+try:
+    import orjson
+except ImportError:  # Optional: faster JSON encoding
+    orjson = None
+try:
+    import zstandard
+except ImportError:  # Optional: better compression than zlib
+    zstandard = None
 from django.core.cache import cache
 from django.conf import settings
 
+logger = logging.getLogger(__name__)
+
 
 # Cache timeouts (in seconds)
 CACHE_TIMEOUTS = {
@@ -20,6 +44,506 @@ CACHE_TIMEOUTS = {
     'stats': 3600,               # 1 hour - site stats updated by celery task
 }
 
+# Stale-while-revalidate timeouts (soft, hard) in seconds, see stale_while_revalidate
+CACHE_SWR_TIMEOUTS = {
+    'browse_section': (900, 86400),     # 15 minutes / 1 day - also refreshed on writes
+    'works_catalog': (1800, 86400),     # 30 minutes / 1 day - catalog changes with ingestion
+}
+SWR_REFRESH_TIMEOUT = 300       # Seconds a queued refresh blocks further refreshes of the same key
+
+# Serialization per key prefix: (format, compression). format is 'pickle' or
+# 'json' (plain JSON types only, anything else falls back to pickle);
+# compression is 'zlib', 'zstd' (if zstandard is installed, else zlib) or None.
+# Values are only compressed from COMPRESS_MIN_BYTES. Unlisted prefixes are
+# pickled by the cache backend as-is. Compare codecs with `manage.py cache_benchmark`.
+CACHE_SERIALIZATION = {
+    'browse_section': ('pickle', 'zlib'),
+    'works_catalog': ('pickle', 'zlib'),
+    'comparison_vote_stats': ('json', None),
+    'comparison_page': ('pickle', 'zlib'),
+}
+COMPRESS_MIN_BYTES = 1024
+ZLIB_LEVEL = 6
+ZSTD_LEVEL = 3
+
+
+# Single-flight settings (stampede protection for expensive recomputations)
+LOCK_TIMEOUT = 30               # Seconds a recompute lock is held before it is presumed dead
+LOCK_WAIT_TIMEOUT = 2.0         # Seconds a worker without the lock waits for the winner
+LOCK_POLL_INTERVAL = 0.05       # Seconds between cache polls while waiting
+STALE_GRACE = 300               # Seconds an expired entry is kept around to serve while recomputing
+EARLY_EXPIRATION_BETA = 1.0     # >1 favours earlier recomputation, <1 later (0 disables)
+
+# Cache tags. Tagged keys embed the current generation of each tag, so bumping a
+# tag's generation (a single INCR) orphans every entry that depends on it.
+TAG_VERSION_PREFIX = 'tag_version'
+BROWSE_TAG = 'browse'            # Browse page sections
+TRENDING_TAG = 'trending'        # Trending comparisons
+NEEDS_HELP_TAG = 'needs_help'    # Needs-help sections
+SEARCH_TAG = 'search'            # Search results
+CATALOG_TAG = 'catalog'          # Works catalog pages
+TAG_MODIFIED_PREFIX = 'tag_modified'  # When each tag was last bumped (Last-Modified headers)
+
+# Redis pub/sub channel used to drop entries from every worker's local tier
+INVALIDATION_CHANNEL = 'cache_invalidation'
+
+
+class LocalCache:
+    """Size-bounded LRU cache with a short TTL, private to the worker process.
+
+    Sits in front of Redis so hot entries skip the network round trip and the
+    unpickling. Values are shared between requests and must be treated as
+    read-only. Entries remember their tags so tag invalidations broadcast over
+    pub/sub can drop them; the short TTL bounds staleness if a message is lost.
+    """
+
+    def __init__(self, max_entries: int, ttl: int, on_evict: Optional[Callable[[str], None]] = None):
+        """Create an empty local cache holding up to max_entries for ttl seconds.
+
+        on_evict is called with the key of every entry pushed out by the size bound.
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.on_evict = on_evict
+        self._entries: 'OrderedDict[str, tuple[Any, float, frozenset]]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Any:
+        """Get a value, or None if missing or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at, _ = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any, tags: Iterable[str] = (), timeout: Optional[int] = None) -> None:
+        """Store a value, evicting the least recently used entry when full."""
+        if self.max_entries <= 0 or self.ttl <= 0:
+            return
+        ttl = self.ttl if timeout is None else min(self.ttl, timeout)
+        evicted = []
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + ttl, frozenset(tags))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                evicted.append(self._entries.popitem(last=False)[0])
+
+        if self.on_evict is not None:
+            for evicted_key in evicted:
+                self.on_evict(evicted_key)
+
+    def delete(self, key: str) -> None:
+        """Drop a single entry."""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def delete_tag(self, tag: str) -> None:
+        """Drop every entry depending on tag."""
+        with self._lock:
+            for key in [key for key, (_, _, tags) in self._entries.items() if tag in tags]:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        with self._lock:
+            self._entries.clear()
+
+
+local_cache = LocalCache(
+    max_entries=getattr(settings, 'CACHE_LOCAL_MAX_ENTRIES', 256),
+    ttl=getattr(settings, 'CACHE_LOCAL_TTL', 10),
+    on_evict=lambda key: _record_metric(key, 'evictions'),
+)
+
+# Per-process hit counters for each cache tier
+_tier_counts = {'local': 0, 'redis': 0, 'miss': 0}
+_tier_counts_lock = threading.Lock()
+
+
+def _record_tier(tier: str, key: str) -> None:
+    """Count a lookup of key answered by tier ('local', 'redis' or 'miss')."""
+    with _tier_counts_lock:
+        _tier_counts[tier] += 1
+    _record_metric(key, TIER_METRICS[tier])
+
+
+def get_tier_stats() -> Dict[str, Any]:
+    """Get hit counts and hit rates per cache tier for this process.
+
+    Returns:
+        Dict with local_hits, redis_hits, misses and the matching rates
+        (local_hit_rate, redis_hit_rate, hit_rate) as fractions of all lookups
+    """
+    with _tier_counts_lock:
+        counts = dict(_tier_counts)
+
+    lookups = sum(counts.values())
+
+    def rate(count: int) -> float:
+        return round(count / lookups, 4) if lookups else 0.0
+
+    return {
+        'local_hits': counts['local'],
+        'redis_hits': counts['redis'],
+        'misses': counts['miss'],
+        'local_hit_rate': rate(counts['local']),
+        'redis_hit_rate': rate(counts['redis']),
+        'hit_rate': rate(counts['local'] + counts['redis']),
+    }
+
+
+def reset_tier_stats() -> None:
+    """Reset the per-tier hit counters."""
+    with _tier_counts_lock:
+        for tier in _tier_counts:
+            _tier_counts[tier] = 0
+
+
+# Per-prefix metrics. Counted in process and periodically added to Redis hashes
+# shared by every worker, so get_cache_metrics() reports site-wide totals.
+METRICS_KEY_PREFIX = 'cache_metrics'
+METRICS_FLUSH_INTERVAL = getattr(settings, 'CACHE_METRICS_FLUSH_INTERVAL', 10)  # Seconds
+METRIC_FIELDS = (
+    'local_hits', 'redis_hits', 'misses', 'recomputes', 'recompute_seconds', 'payload_bytes', 'evictions',
+)
+TIER_METRICS = {'local': 'local_hits', 'redis': 'redis_hits', 'miss': 'misses'}
+
+_metrics: Dict[str, Dict[str, float]] = {}
+_metrics_lock = threading.Lock()
+_metrics_flushed_at = time.monotonic()
+
+
+def _key_prefix(key: str) -> str:
+    """Metrics prefix of a cache key: the part before the first ':'."""
+    return key.split(':', 1)[0]
+
+
+def _metrics_key(prefix: str) -> str:
+    """Redis hash holding the metrics of prefix."""
+    return cache.make_key(f"{METRICS_KEY_PREFIX}:{prefix}")
+
+
+def _metrics_prefixes_key() -> str:
+    """Redis set of prefixes that have metrics."""
+    return cache.make_key(f"{METRICS_KEY_PREFIX}_prefixes")
+
+
+def _record_metric(key: str, field: str, amount: float = 1) -> None:
+    """Add amount to a metric of the key's prefix, flushing to Redis when due."""
+    prefix = _key_prefix(key)
+    with _metrics_lock:
+        counters = _metrics.setdefault(prefix, dict.fromkeys(METRIC_FIELDS, 0))
+        counters[field] += amount
+
+    if time.monotonic() - _metrics_flushed_at >= METRICS_FLUSH_INTERVAL:
+        flush_cache_metrics()
+
+
+def _record_recompute(key: str, seconds: float, stored: Any = None) -> None:
+    """Record a recomputation of key and, if it was stored, the size of what was stored."""
+    _record_metric(key, 'recomputes')
+    _record_metric(key, 'recompute_seconds', seconds)
+    if stored is not None:
+        _record_metric(key, 'payload_bytes', _payload_size(stored))
+
+
+def _payload_size(value: Any) -> int:
+    """Approximate size of value as stored by the cache backend (pickled)."""
+    try:
+        return len(pickle.dumps(value, pickle.HIGHEST_PROTOCOL))
+    except Exception:
+        return 0
+
+
+class PackedValue(NamedTuple):
+    """A value serialized by pack_value(); data starts with a format and a compression byte."""
+
+    data: bytes
+
+
+_FORMATS = {'pickle': b'p', 'json': b'j'}
+_COMPRESSIONS = {None: b'-', 'zlib': b'z', 'zstd': b's'}
+
+
+def _json_dumps(value: Any) -> bytes:
+    """Encode plain JSON types, raising TypeError for anything else."""
+    if orjson is not None:
+        # Datetimes would silently come back as strings; make them fail instead
+        return orjson.dumps(value, option=orjson.OPT_PASSTHROUGH_DATETIME)
+    return json.dumps(value, separators=(',', ':'), allow_nan=False).encode()
+
+
+def _json_loads(data: bytes) -> Any:
+    """Decode JSON written by _json_dumps."""
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+
+def pack_value(value: Any, fmt: str = 'pickle', compression: Optional[str] = None,
+               min_bytes: int = COMPRESS_MIN_BYTES) -> PackedValue:
+    """
+    Serialize and optionally compress a value.
+
+    Args:
+        value: Value to serialize
+        fmt: 'pickle' or 'json' (falls back to pickle for non-JSON types)
+        compression: 'zlib', 'zstd' or None
+        min_bytes: Only compress payloads at least this large
+
+    Returns:
+        PackedValue to store in the cache; read it back with unpack_value()
+    """
+    if fmt == 'json':
+        try:
+            body = _json_dumps(value)
+        except (TypeError, ValueError):
+            fmt, body = 'pickle', pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+    else:
+        body = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+
+    if compression == 'zstd' and zstandard is None:
+        compression = 'zlib'
+    if len(body) < min_bytes:
+        compression = None
+
+    if compression == 'zstd':
+        body = zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(body)
+    elif compression == 'zlib':
+        body = zlib.compress(body, ZLIB_LEVEL)
+
+    return PackedValue(_FORMATS[fmt] + _COMPRESSIONS[compression] + body)
+
+
+def unpack_value(value: Any) -> Any:
+    """Decode a PackedValue; any other value is returned unchanged."""
+    if not isinstance(value, PackedValue):
+        return value
+
+    fmt, compression, body = value.data[:1], value.data[1:2], value.data[2:]
+    if compression == b's':
+        body = zstandard.ZstdDecompressor().decompress(body)
+    elif compression == b'z':
+        body = zlib.decompress(body)
+
+    return _json_loads(body) if fmt == b'j' else pickle.loads(body)
+
+
+def _encode(key: str, value: Any) -> Any:
+    """Pack value as configured for its key prefix in CACHE_SERIALIZATION."""
+    codec = CACHE_SERIALIZATION.get(_key_prefix(key))
+    if codec is None:
+        return value
+    return pack_value(value, *codec)
+
+
+def flush_cache_metrics() -> None:
+    """Add this process's metrics to the shared Redis hashes and reset them.
+
+    Metrics stay in process for non-Redis backends.
+    """
+    global _metrics_flushed_at
+
+    client = _get_redis_client()
+    if client is None:
+        return
+
+    with _metrics_lock:
+        pending = dict(_metrics)
+        _metrics.clear()
+        _metrics_flushed_at = time.monotonic()
+
+    if not pending:
+        return
+
+    try:
+        pipe = client.pipeline(transaction=False)
+        for prefix, counters in pending.items():
+            metrics_key = _metrics_key(prefix)
+            for field, amount in counters.items():
+                if isinstance(amount, float):
+                    pipe.hincrbyfloat(metrics_key, field, amount)
+                elif amount:
+                    pipe.hincrby(metrics_key, field, amount)
+        pipe.sadd(_metrics_prefixes_key(), *pending)
+        pipe.execute()
+    except RedisError as e:
+        # Metrics are best effort; drop this batch
+        logger.warning(f"Failed to flush cache metrics: {e}")
+
+
+# Don't lose the last batch of short-lived processes (commands, shells)
+atexit.register(flush_cache_metrics)
+
+
+def _summarize_metrics(counters: Dict[str, float]) -> Dict[str, Any]:
+    """Derive hit rate and averages from raw metric counters."""
+    hits = int(counters['local_hits'] + counters['redis_hits'])
+    lookups = hits + int(counters['misses'])
+    recomputes = int(counters['recomputes'])
+
+    return {
+        'hits': hits,
+        'local_hits': int(counters['local_hits']),
+        'redis_hits': int(counters['redis_hits']),
+        'misses': int(counters['misses']),
+        'hit_rate': round(hits / lookups, 4) if lookups else 0.0,
+        'recomputes': recomputes,
+        'recompute_seconds': round(counters['recompute_seconds'], 3),
+        'avg_recompute_ms': round(counters['recompute_seconds'] * 1000 / recomputes, 1) if recomputes else 0.0,
+        'avg_payload_bytes': int(counters['payload_bytes'] / recomputes) if recomputes else 0,
+        'evictions': int(counters['evictions']),
+    }
+
+
+def get_cache_metrics() -> Dict[str, Dict[str, Any]]:
+    """
+    Get cache metrics per key prefix, across every worker.
+
+    Returns:
+        Dict mapping key prefix to hits (local_hits + redis_hits), misses,
+        hit_rate, recomputes, recompute_seconds (total), avg_recompute_ms,
+        avg_payload_bytes and local-tier evictions
+    """
+    flush_cache_metrics()
+
+    client = _get_redis_client()
+    if client is None:
+        with _metrics_lock:
+            totals = {prefix: dict(counters) for prefix, counters in _metrics.items()}
+    else:
+        prefixes = sorted(prefix.decode() for prefix in client.smembers(_metrics_prefixes_key()))
+        pipe = client.pipeline(transaction=False)
+        for prefix in prefixes:
+            pipe.hgetall(_metrics_key(prefix))
+
+        totals = {}
+        for prefix, raw in zip(prefixes, pipe.execute()):
+            counters = dict.fromkeys(METRIC_FIELDS, 0.0)
+            for field, amount in raw.items():
+                counters[field.decode()] = float(amount)
+            totals[prefix] = counters
+
+    return {prefix: _summarize_metrics(counters) for prefix, counters in sorted(totals.items())}
+
+
+def get_backend_stats() -> Dict[str, Any]:
+    """
+    Get server-wide Redis statistics relevant to cache tuning.
+
+    Returns:
+        Dict with evicted_keys, expired_keys, keyspace_hits, keyspace_misses,
+        used_memory and maxmemory_policy; empty for non-Redis backends
+    """
+    client = _get_redis_client()
+    if client is None:
+        return {}
+
+    info = {**client.info('stats'), **client.info('memory')}
+    fields = ['evicted_keys', 'expired_keys', 'keyspace_hits', 'keyspace_misses', 'used_memory', 'maxmemory_policy']
+    return {field: info.get(field) for field in fields}
+
+
+def reset_cache_metrics() -> None:
+    """Clear cache metrics in this process and in Redis."""
+    with _metrics_lock:
+        _metrics.clear()
+
+    client = _get_redis_client()
+    if client is None:
+        return
+
+    prefixes = [prefix.decode() for prefix in client.smembers(_metrics_prefixes_key())]
+    client.delete(_metrics_prefixes_key(), *[_metrics_key(prefix) for prefix in prefixes])
+
+
+def _get_redis_client() -> Any:
+    """Get the raw Redis client behind the default cache, or None for other backends."""
+    try:
+        return cache._cache.get_client(write=True)
+    except AttributeError:
+        return None
+
+
+def _invalidation_channel() -> str:
+    """Pub/sub channel name, namespaced like cache keys."""
+    return cache.make_key(INVALIDATION_CHANNEL)
+
+
+def _broadcast_invalidation(kind: str, name: str) -> None:
+    """Tell every worker to drop a key ('key') or tag ('tag') from its local tier."""
+    client = _get_redis_client()
+    if client is None:
+        return
+    try:
+        client.publish(_invalidation_channel(), f"{kind}:{name}")
+    except RedisError as e:
+        logger.warning(f"Failed to broadcast cache invalidation of {kind} {name}: {e}")
+
+
+def _apply_invalidation(message: Union[str, bytes]) -> None:
+    """Apply an invalidation message received over pub/sub to the local tier."""
+    if isinstance(message, bytes):
+        message = message.decode()
+    kind, _, name = message.partition(':')
+    if kind == 'tag':
+        local_cache.delete_tag(name)
+    elif kind == 'key':
+        local_cache.delete(name)
+
+
+_listener_pid: Optional[int] = None
+_listener_lock = threading.Lock()
+
+
+def _listen_for_invalidations(client: Any) -> None:
+    """Drop local entries as invalidations are published by any worker (runs forever)."""
+    while True:
+        try:
+            pubsub = client.pubsub(ignore_subscribe_messages=True)
+            pubsub.subscribe(_invalidation_channel())
+            for message in pubsub.listen():
+                _apply_invalidation(message['data'])
+        except RedisError as e:
+            # Messages may have been missed while disconnected
+            logger.warning(f"Cache invalidation listener disconnected: {e}")
+            local_cache.clear()
+            time.sleep(1)
+
+
+def _start_invalidation_listener() -> None:
+    """Start the pub/sub listener thread once per process (after any fork)."""
+    global _listener_pid
+    if _listener_pid == os.getpid():
+        return
+
+    with _listener_lock:
+        if _listener_pid == os.getpid():
+            return
+
+        client = _get_redis_client()
+        if client is None:
+            # Non-Redis backends are not shared between processes
+            return
+
+        _listener_pid = os.getpid()
+        thread = threading.Thread(
+            target=_listen_for_invalidations,
+            args=(client,),
+            name='cache-invalidation-listener',
+            daemon=True,
+        )
+        thread.start()
+
+
+def _set_local(key: str, value: Any, tags: Iterable[str], timeout: int) -> None:
+    """Store a value in the local tier, making sure invalidations will reach it."""
+    _start_invalidation_listener()
+    local_cache.set(key, value, tags=tags, timeout=timeout)
+
 
 def get_cache_key(prefix: str, *args, **kwargs) -> str:
     """Generate a cache key from prefix and arguments.
@@ -48,7 +572,9 @@ def get_cache_key(prefix: str, *args, **kwargs) -> str:
 def cache_view(
     key_prefix: str,
     timeout: Optional[int] = None,
-    key_func: Optional[Callable] = None
+    key_func: Optional[Callable] = None,
+    single_flight: bool = False,
+    tags: Union[Iterable[str], Callable, None] = None
 ) -> Callable:
     """Decorator to cache view results.
 
@@ -57,6 +583,9 @@ def cache_view(
         timeout: Cache timeout in seconds (uses CACHE_TIMEOUTS[key_prefix] if None)
         key_func: Optional function to generate cache key from request
                   Signature: key_func(request, *args, **kwargs) -> str
+        single_flight: Only let one worker recompute an expired entry (see cache_get_or_set)
+        tags: Cache tags the response depends on, or a function returning them
+              Signature: tags(request, *args, **kwargs) -> Iterable[str]
 
     Usage:
         @cache_view('book_detail', timeout=3600)
@@ -77,20 +606,51 @@ def cache_view(
             else:
                 cache_key = get_cache_key(key_prefix, *args, **kwargs)
 
-            # Try to get from cache
-            cached_response = cache.get(cache_key)
-            if cached_response is not None:
-                return cached_response
+            # Local tier holds pickled responses: response objects are mutated
+            # by middleware and must not be shared between requests
+            local_response = local_cache.get(cache_key)
+            if local_response is not None:
+                _record_tier('local', cache_key)
+                return pickle.loads(local_response)
 
-            # Execute view and cache result
-            response = view_func(request, *args, **kwargs)
+            view_tags = []
+            if tags:
+                view_tags = list(tags(request, *args, **kwargs) if callable(tags) else tags)
+            tagged_key = make_tagged_key(cache_key, view_tags)
 
             # Determine timeout
             cache_timeout = timeout if timeout is not None else CACHE_TIMEOUTS.get(key_prefix, 300)
 
-            # Only cache successful responses (status 200-299)
-            if hasattr(response, 'status_code') and 200 <= response.status_code < 300:
-                cache.set(cache_key, response, cache_timeout)
+            if single_flight:
+                response = _single_flight_get_or_set(
+                    tagged_key,
+                    lambda: view_func(request, *args, **kwargs),
+                    cache_timeout,
+                    should_cache=_is_successful_response,
+                )
+            else:
+                # Try to get from cache
+                response = unpack_value(cache.get(tagged_key))
+                if response is not None:
+                    _record_tier('redis', cache_key)
+                else:
+                    _record_tier('miss', cache_key)
+
+                    # Execute view and cache result
+                    started = time.monotonic()
+                    response = view_func(request, *args, **kwargs)
+                    elapsed = time.monotonic() - started
+
+                    # Only cache successful responses (status 200-299)
+                    if _is_successful_response(response):
+                        stored = _encode(cache_key, response)
+                        cache.set(tagged_key, stored, cache_timeout)
+                        _record_recompute(cache_key, elapsed, stored)
+                    else:
+                        _record_recompute(cache_key, elapsed)
+
+            if _is_successful_response(response):
+                _set_local(cache_key, pickle.dumps(response), view_tags, cache_timeout)
 
             return response
 
@@ -108,119 +668,610 @@ def invalidate_cache(key_prefix: str, *args, **kwargs) -> None:
     """
     cache_key = get_cache_key(key_prefix, *args, **kwargs)
     cache.delete(cache_key)
+    local_cache.delete(cache_key)
+    _broadcast_invalidation('key', cache_key)
+
+
+def comparison_tag(work_id: int, screen_work_id: int) -> str:
+    """Cache tag for everything derived from one book/screen comparison."""
+    return f"comparison:{work_id}:{screen_work_id}"
+
+
+def book_tag(slug: str) -> str:
+    """Cache tag for a book's detail data."""
+    return f"book:{slug}"
 
 
-def invalidate_pattern(pattern: str) -> None:
-    """Invalidate all cache keys matching a pattern.
+def screen_tag(slug: str) -> str:
+    """Cache tag for a screen work's detail data."""
+    return f"screen:{slug}"
 
-    Note: This requires Redis and uses SCAN command.
-    Only use when necessary as it can be expensive.
+
+def _tag_version_key(tag: str) -> str:
+    """Cache key holding the current generation of tag."""
+    return f"{TAG_VERSION_PREFIX}:{tag}"
+
+
+def _new_tag_version() -> int:
+    """Initial generation for a tag.
+
+    Generations start from the current time in microseconds rather than 1, so a
+    counter that was evicted (or flushed) never comes back at a value that older
+    entries were stored under.
+    """
+    return time.time_ns() // 1000
+
+
+def get_tag_versions(tags: Iterable[str]) -> Dict[str, int]:
+    """Get the current generation of each tag in a single cache round trip.
 
     Args:
-        pattern: Cache key pattern (e.g., 'book:*', 'search:*')
+        tags: Cache tags (e.g., 'browse', comparison_tag(1, 2))
+
+    Returns:
+        Dict mapping each tag to its generation
     """
-    try:
-        # Get Redis client from cache backend
-        redis_client = cache._cache.get_client()
-
-        # Scan for matching keys
-        cursor = 0
-        while True:
-            cursor, keys = redis_client.scan(
-                cursor=cursor,
-                match=f"adaptapedia:{pattern}",  # Include cache key prefix
-                count=100
-            )
+    version_keys = {_tag_version_key(tag): tag for tag in tags}
+    found = cache.get_many(list(version_keys))
 
-            if keys:
-                redis_client.delete(*keys)
+    versions = {}
+    for version_key, tag in version_keys.items():
+        version = found.get(version_key)
+        if version is None:
+            version = _new_tag_version()
+            # add() so concurrent readers settle on the same first generation
+            if not cache.add(version_key, version, None):
+                version = cache.get(version_key, version)
+        versions[tag] = version
 
-            if cursor == 0:
-                break
+    return versions
 
-    except AttributeError:
-        # Not using Redis backend, skip pattern invalidation
-        pass
+
+def make_tagged_key(key: str, tags: Iterable[str]) -> str:
+    """Embed the current generation of each tag in a cache key.
+
+    Args:
+        key: Base cache key
+        tags: Cache tags the cached value depends on
+
+    Returns:
+        Cache key that changes whenever one of the tags is invalidated
+    """
+    tags = sorted(set(tags))
+    if not tags:
+        return key
+
+    versions = get_tag_versions(tags)
+    generation = '.'.join(str(versions[tag]) for tag in tags)
+    return f"{key}:v{generation}"
+
+
+def invalidate_tags(*tags: str) -> None:
+    """Invalidate every cache entry depending on any of the given tags.
+
+    Costs one INCR per tag, regardless of how many entries depend on it.
+    Orphaned entries are never read again and simply expire.
+
+    Args:
+        *tags: Cache tags to invalidate (e.g., 'browse', comparison_tag(1, 2))
+    """
+    bump_versions(*tags)
+    for tag in tags:
+        local_cache.delete_tag(tag)
+        _broadcast_invalidation('tag', tag)
+
+
+def bump_versions(*tags: str) -> None:
+    """Advance the generation of each tag and record when it changed.
+
+    Unlike invalidate_tags this does not touch the local tier, so it can also
+    version data that is not cached under the tag (e.g. a refreshed section).
+
+    Args:
+        *tags: Tags to bump
+    """
+    for tag in tags:
+        version_key = _tag_version_key(tag)
+        try:
+            cache.incr(version_key)
+        except ValueError:
+            # Counter missing (never read, or evicted) - start a new generation
+            cache.set(version_key, _new_tag_version(), None)
+
+    now = time.time()
+    cache.set_many({_tag_modified_key(tag): now for tag in tags}, None)
+
+
+def _tag_modified_key(tag: str) -> str:
+    """Cache key holding the time tag was last bumped."""
+    return f"{TAG_MODIFIED_PREFIX}:{tag}"
+
+
+def get_tag_last_modified(tags: Iterable[str]) -> Optional[float]:
+    """Get the last time any of the given tags was bumped.
+
+    Args:
+        tags: Cache tags
+
+    Returns:
+        Unix timestamp, or None if none of the tags was bumped since the cache was cleared
+    """
+    found = cache.get_many([_tag_modified_key(tag) for tag in tags])
+    return max(found.values(), default=None)
 
 
-def cache_get_or_set(key: str, default_func: Callable, timeout: int = 300) -> Any:
+def conditional_on_versions(
+    version_tags: Callable[..., Optional[Iterable[str]]],
+    bucket: Optional[int] = None,
+) -> Callable:
+    """Decorator adding ETag/Last-Modified headers to a viewset action.
+
+    The ETag is derived from the current generation of the tags the response
+    depends on, so it changes whenever a write bumps one of them. Requests
+    carrying a matching If-None-Match (or a recent enough If-Modified-Since)
+    get a 304 without running the action at all; the check costs two cache
+    round trips.
+
+    Args:
+        version_tags: Function returning the tags the response depends on, or
+                      None to skip conditional handling for this request
+                      Signature: version_tags(request, *args, **kwargs) -> Iterable[str]
+        bucket: For responses that also drift with time (e.g. a trending window),
+                seconds after which the ETag changes even without writes
+
+    Usage:
+        @action(detail=False, methods=['get'])
+        @conditional_on_versions(lambda request: [BROWSE_TAG])
+        def browse(self, request):
+            ...
+    """
+    from django.utils.cache import get_conditional_response, patch_cache_control
+    from django.utils.http import http_date
+
+    def decorator(view_func: Callable) -> Callable:
+        view_name = f"{view_func.__module__}.{view_func.__qualname__}"
+
+        @wraps(view_func)
+        def wrapper(view, request, *args, **kwargs):
+            if request.method not in ('GET', 'HEAD'):
+                return view_func(view, request, *args, **kwargs)
+
+            tags = version_tags(request, *args, **kwargs)
+            if tags is None:
+                return view_func(view, request, *args, **kwargs)
+            tags = sorted(set(tags))
+
+            versions = get_tag_versions(tags)
+            last_modified = get_tag_last_modified(tags)
+            bucket_part = ''
+            if bucket:
+                bucket_start = int(time.time() // bucket) * bucket
+                bucket_part = str(bucket_start)
+                last_modified = max(last_modified or 0, bucket_start)
+
+            # Query string and user are part of the ETag: they change the response
+            fingerprint = '|'.join([
+                view_name,
+                request.get_full_path(),
+                str(request.user.pk or ''),
+                ','.join(f"{tag}={versions[tag]}" for tag in tags),
+                bucket_part,
+            ])
+            etag = '"%s"' % hashlib.sha1(fingerprint.encode()).hexdigest()
+            last_modified = math.ceil(last_modified) if last_modified else None
+
+            response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+            if response is None:
+                response = view_func(view, request, *args, **kwargs)
+                if not _is_successful_response(response):
+                    return response
+
+            response['ETag'] = etag
+            if last_modified:
+                response['Last-Modified'] = http_date(last_modified)
+            # Revalidate on every use instead of heuristic freshness from Last-Modified
+            patch_cache_control(response, private=True, no_cache=True)
+            return response
+
+        return wrapper
+    return decorator
+
+
+def cache_get_or_set(
+    key: str,
+    default_func: Callable,
+    timeout: int = 300,
+    single_flight: bool = False,
+    tags: Iterable[str] = (),
+    refresh: bool = False
+) -> Any:
     """Get value from cache or set it using default_func.
 
     Args:
         key: Cache key
         default_func: Function to call if cache miss (should return value to cache)
         timeout: Cache timeout in seconds
+        single_flight: Protect default_func from cache stampedes. Only the worker
+                       holding a short-lived lock recomputes; the others get the
+                       previous value or wait briefly for the new one. Entries are
+                       also recomputed probabilistically shortly before they expire,
+                       so recomputation is spread over time instead of piling up at
+                       the TTL boundary. Keys must always be used with the same mode.
+        tags: Cache tags the value depends on; invalidate_tags() on any of them
+              makes the next call recompute
+        refresh: Skip the cached value, recompute and overwrite it (e.g. to warm
+                 the cache ahead of readers)
+
+    Values are served from the per-process local tier first (see LocalCache),
+    then from Redis, so callers must not mutate what they get back.
 
     Returns:
         Cached value or result of default_func
     """
-    value = cache.get(key)
-    if value is None:
-        value = default_func()
-        cache.set(key, value, timeout)
+    tags = list(tags)
+
+    if refresh:
+        tagged_key = make_tagged_key(key, tags)
+        if single_flight:
+            value = _compute_entry(tagged_key, default_func, timeout, lambda value: True)
+        else:
+            value = _compute_plain(tagged_key, default_func, timeout)
+        local_cache.delete(key)
+        _broadcast_invalidation('key', key)
+        return value
+
+    value = local_cache.get(key)
+    if value is not None:
+        _record_tier('local', key)
+        return value
+
+    tagged_key = make_tagged_key(key, tags)
+
+    if single_flight:
+        value = _single_flight_get_or_set(tagged_key, default_func, timeout)
+    else:
+        value = unpack_value(cache.get(tagged_key))
+        if value is not None:
+            _record_tier('redis', key)
+        else:
+            _record_tier('miss', key)
+            value = _compute_plain(tagged_key, default_func, timeout)
+
+    if value is not None:
+        _set_local(key, value, tags, timeout)
+    return value
+
+
+def _compute_plain(key: str, default_func: Callable, timeout: int) -> Any:
+    """Run default_func and store its result as-is."""
+    started = time.monotonic()
+    value = default_func()
+    stored = _encode(key, value)
+    cache.set(key, stored, timeout)
+    _record_recompute(key, time.monotonic() - started, stored)
+    return value
+
+
+def stale_while_revalidate(
+    key_prefix: str,
+    tags: Union[Iterable[str], Callable[..., Iterable[str]], None] = None,
+    on_refresh: Optional[Callable[..., Any]] = None,
+) -> Callable:
+    """
+    Decorator caching a function's result and refreshing it in the background.
+
+    Until the soft TTL the cached value is served as-is. Past it the value is
+    still served, and a Celery task recomputes it (one at a time per key). The
+    hard TTL only evicts entries nothing has read or refreshed for a long time.
+    Callers only pay for the computation on a cold miss (single-flight).
+
+    TTLs come from CACHE_SWR_TIMEOUTS[key_prefix]. Arguments are part of the
+    cache key and are passed to the Celery task, so they must be JSON-serializable.
+
+    Usage:
+        @stale_while_revalidate('browse_section', tags=[BROWSE_TAG])
+        def get_section(name):
+            ...
+
+        get_section.refresh('featured')  # Recompute now, e.g. after a write
+
+    Args:
+        key_prefix: Prefix for cache key and CACHE_SWR_TIMEOUTS entry
+        tags: Cache tags the result depends on, or a function of the decorated
+              function's arguments returning them
+        on_refresh: Called with the decorated function's arguments after every
+                    recompute, in the background or through refresh()
+
+    Returns:
+        Decorated function with a refresh(*args, **kwargs) attribute
+    """
+    def decorator(func: Callable) -> Callable:
+        path = f"{func.__module__}:{func.__qualname__}"
+
+        def get_tags(*args, **kwargs) -> list:
+            if tags is None:
+                return []
+            return list(tags(*args, **kwargs) if callable(tags) else tags)
+
+        def refresh(*args, **kwargs) -> Any:
+            """Recompute the cached value for these arguments and store it."""
+            soft_timeout, hard_timeout = CACHE_SWR_TIMEOUTS[key_prefix]
+            cache_key = get_cache_key(key_prefix, *args, **kwargs)
+            value = _compute_entry(
+                make_tagged_key(cache_key, get_tags(*args, **kwargs)),
+                lambda: func(*args, **kwargs),
+                soft_timeout,
+                lambda value: True,
+                hard_timeout=hard_timeout,
+            )
+            local_cache.delete(cache_key)
+            _broadcast_invalidation('key', cache_key)
+            if on_refresh is not None:
+                on_refresh(*args, **kwargs)
+            return value
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            soft_timeout, hard_timeout = CACHE_SWR_TIMEOUTS[key_prefix]
+            cache_key = get_cache_key(key_prefix, *args, **kwargs)
+
+            value = local_cache.get(cache_key)
+            if value is not None:
+                _record_tier('local', cache_key)
+                return value
+
+            entry_tags = get_tags(*args, **kwargs)
+            tagged_key = make_tagged_key(cache_key, entry_tags)
+
+            entry = _get_entry(tagged_key)
+            if entry is not None:
+                _record_tier('redis', cache_key)
+                if time.time() >= entry.expires_at:
+                    _schedule_refresh(path, tagged_key, args, kwargs)
+                value = entry.value
+            else:
+                value = _single_flight_get_or_set(
+                    tagged_key,
+                    lambda: func(*args, **kwargs),
+                    soft_timeout,
+                    hard_timeout=hard_timeout,
+                )
+
+            if value is not None:
+                _set_local(cache_key, value, entry_tags, soft_timeout)
+            return value
+
+        wrapper.refresh = refresh
+        _swr_functions[path] = wrapper
+        return wrapper
+
+    return decorator
+
+
+# Functions decorated with stale_while_revalidate, by "module:qualname"
+_swr_functions: Dict[str, Callable] = {}
+
+
+def _refreshing_key(key: str) -> str:
+    """Key marking that a background refresh of key is queued or running."""
+    return f"{key}:refreshing"
+
+
+def _schedule_refresh(path: str, key: str, args: tuple, kwargs: dict) -> None:
+    """Queue a background refresh of key unless one is already pending."""
+    from adaptapedia.celery import refresh_stale_cache_entry
+
+    refreshing_key = _refreshing_key(key)
+    if not cache.add(refreshing_key, 1, SWR_REFRESH_TIMEOUT):
+        return
+
+    try:
+        refresh_stale_cache_entry.delay(path, key, list(args), kwargs)
+    except Exception as e:
+        # Keep serving the stale value; the next read tries again
+        cache.delete(refreshing_key)
+        logger.warning(f"Failed to queue refresh of {key}: {e}")
+
+
+def refresh_stale_entry(path: str, key: str, args: list, kwargs: dict) -> None:
+    """
+    Refresh an entry cached by a stale_while_revalidate function.
+
+    Called by the refresh_stale_cache_entry Celery task.
+
+    Args:
+        path: Decorated function as "module:qualname"
+        key: Tagged cache key that went stale
+        args: Positional arguments of the original call
+        kwargs: Keyword arguments of the original call
+    """
+    module, _ = path.split(':', 1)
+    # Importing the module registers its decorated functions
+    import_module(module)
+
+    try:
+        _swr_functions[path].refresh(*args, **kwargs)
+    finally:
+        cache.delete(_refreshing_key(key))
+
+
+class CacheEntry(NamedTuple):
+    """Value stored by single-flight caching, with the metadata needed to expire it early."""
+
+    value: Any
+    expires_at: float  # Logical expiry (epoch seconds); the cache key outlives it by STALE_GRACE
+    delta: float       # Seconds it took to compute value
+
+
+def _get_entry(key: str) -> Optional[CacheEntry]:
+    """Get a single-flight entry, ignoring values written in another format."""
+    entry = cache.get(key)
+    if not isinstance(entry, CacheEntry):
+        return None
+    return entry._replace(value=unpack_value(entry.value))
+
+
+def _is_successful_response(response: Any) -> bool:
+    """Only cache successful responses (status 200-299)."""
+    return hasattr(response, 'status_code') and 200 <= response.status_code < 300
+
+
+def _lock_key(key: str) -> str:
+    """Cache key of the recompute lock guarding key."""
+    return f"{key}:lock"
+
+
+def _is_fresh(entry: CacheEntry, beta: float = EARLY_EXPIRATION_BETA) -> bool:
+    """Check whether a single-flight entry can be served without recomputing.
+
+    Uses probabilistic early expiration (XFetch): the closer an entry is to its
+    expiry, and the longer it took to compute, the more likely a reader is to
+    volunteer for recomputation before the entry actually expires.
+    """
+    early_by = -entry.delta * beta * math.log(1.0 - random.random())
+    return time.time() + early_by < entry.expires_at
+
+
+def _compute_entry(
+    key: str,
+    default_func: Callable,
+    timeout: int,
+    should_cache: Callable[[Any], bool],
+    hard_timeout: Optional[int] = None
+) -> Any:
+    """Run default_func and store its result as a single-flight entry.
+
+    The entry logically expires after timeout but stays in the cache until
+    hard_timeout (default: timeout + STALE_GRACE) so it can be served while
+    it is recomputed.
+    """
+    started = time.monotonic()
+    value = default_func()
+    delta = time.monotonic() - started
+
+    if value is not None and should_cache(value):
+        entry = CacheEntry(value=_encode(key, value), expires_at=time.time() + timeout, delta=delta)
+        cache.set(key, entry, hard_timeout if hard_timeout is not None else timeout + STALE_GRACE)
+        _record_recompute(key, delta, entry.value)
+    else:
+        _record_recompute(key, delta)
+
     return value
 
 
+def _single_flight_get_or_set(
+    key: str,
+    default_func: Callable,
+    timeout: int,
+    should_cache: Callable[[Any], bool] = lambda value: True,
+    hard_timeout: Optional[int] = None
+) -> Any:
+    """Get or recompute key, letting only one worker at a time run default_func."""
+    entry = _get_entry(key)
+    if entry is not None and _is_fresh(entry):
+        _record_tier('redis', key)
+        return entry.value
+
+    lock_key = _lock_key(key)
+    if cache.add(lock_key, 1, LOCK_TIMEOUT):
+        _record_tier('miss', key)
+        try:
+            return _compute_entry(key, default_func, timeout, should_cache, hard_timeout)
+        finally:
+            cache.delete(lock_key)
+
+    # Someone else is recomputing: serve the previous value if we have one
+    if entry is not None:
+        _record_tier('redis', key)
+        return entry.value
+
+    # Cold miss: wait briefly for the lock holder to publish the value
+    deadline = time.monotonic() + LOCK_WAIT_TIMEOUT
+    while time.monotonic() < deadline:
+        time.sleep(LOCK_POLL_INTERVAL)
+        entry = _get_entry(key)
+        if entry is not None:
+            _record_tier('redis', key)
+            return entry.value
+        if cache.get(lock_key) is None:
+            break
+
+    # Lock holder is slow or failed - compute it ourselves
+    _record_tier('miss', key)
+    return _compute_entry(key, default_func, timeout, should_cache, hard_timeout)
+
+
 # Specific cache helpers for common use cases
 
 def cache_book_detail(slug: str, data: dict) -> None:
     """Cache book detail data."""
-    cache_key = get_cache_key('book_detail', slug)
+    cache_key = make_tagged_key(get_cache_key('book_detail', slug), [book_tag(slug)])
     cache.set(cache_key, data, CACHE_TIMEOUTS['book_detail'])
 
 
 def get_cached_book_detail(slug: str) -> Optional[dict]:
     """Get cached book detail data."""
-    cache_key = get_cache_key('book_detail', slug)
+    cache_key = make_tagged_key(get_cache_key('book_detail', slug), [book_tag(slug)])
     return cache.get(cache_key)
 
 
 def invalidate_book_detail(slug: str) -> None:
     """Invalidate book detail cache."""
-    invalidate_cache('book_detail', slug)
+    invalidate_tags(book_tag(slug))
 
 
 def cache_screen_detail(slug: str, data: dict) -> None:
     """Cache screen detail data."""
-    cache_key = get_cache_key('screen_detail', slug)
+    cache_key = make_tagged_key(get_cache_key('screen_detail', slug), [screen_tag(slug)])
     cache.set(cache_key, data, CACHE_TIMEOUTS['screen_detail'])
 
 
 def get_cached_screen_detail(slug: str) -> Optional[dict]:
     """Get cached screen detail data."""
-    cache_key = get_cache_key('screen_detail', slug)
+    cache_key = make_tagged_key(get_cache_key('screen_detail', slug), [screen_tag(slug)])
     return cache.get(cache_key)
 
 
 def invalidate_screen_detail(slug: str) -> None:
     """Invalidate screen detail cache."""
-    invalidate_cache('screen_detail', slug)
+    invalidate_tags(screen_tag(slug))
 
 
-def cache_comparison(book_slug: str, screen_slug: str, data: dict) -> None:
-    """Cache comparison data."""
-    cache_key = get_cache_key('comparison', book_slug, screen_slug)
+def cache_comparison(work_id: int, screen_work_id: int, data: dict) -> None:
+    """Cache comparison data.
+
+    Keyed by IDs rather than slugs so diff and vote writes, which only know
+    the IDs, can invalidate it through comparison_tag().
+    """
+    tags = [comparison_tag(work_id, screen_work_id)]
+    cache_key = make_tagged_key(get_cache_key('comparison', work_id, screen_work_id), tags)
     cache.set(cache_key, data, CACHE_TIMEOUTS['comparison'])
 
 
-def get_cached_comparison(book_slug: str, screen_slug: str) -> Optional[dict]:
+def get_cached_comparison(work_id: int, screen_work_id: int) -> Optional[dict]:
     """Get cached comparison data."""
-    cache_key = get_cache_key('comparison', book_slug, screen_slug)
+    tags = [comparison_tag(work_id, screen_work_id)]
+    cache_key = make_tagged_key(get_cache_key('comparison', work_id, screen_work_id), tags)
     return cache.get(cache_key)
 
 
-def invalidate_comparison(book_slug: str, screen_slug: str) -> None:
+def invalidate_comparison(work_id: int, screen_work_id: int) -> None:
     """Invalidate comparison cache."""
-    invalidate_cache('comparison', book_slug, screen_slug)
+    invalidate_tags(comparison_tag(work_id, screen_work_id))
 
 
 def cache_search_results(query: str, filters: dict, data: dict) -> None:
     """Cache search results."""
-    cache_key = get_cache_key('search_results', query, **filters)
+    cache_key = make_tagged_key(get_cache_key('search_results', query, **filters), [SEARCH_TAG])
     cache.set(cache_key, data, CACHE_TIMEOUTS['search_results'])
 
 
 def get_cached_search_results(query: str, filters: dict) -> Optional[dict]:
     """Get cached search results."""
-    cache_key = get_cache_key('search_results', query, **filters)
+    cache_key = make_tagged_key(get_cache_key('search_results', query, **filters), [SEARCH_TAG])
     return cache.get(cache_key)
+
+
+def invalidate_search_results() -> None:
+    """Invalidate all cached search results."""
+    invalidate_tags(SEARCH_TAG)
@@ -13,3 +13,11 @@ app.autodiscover_tasks()
 def debug_task(self) -> str:
     """Debug task for testing Celery."""
     return f'Request: {self.request!r}'
+
+
+@app.task(ignore_result=True)
+def refresh_stale_cache_entry(path: str, key: str, args: list, kwargs: dict) -> None:
+    """Recompute a cache entry served stale by a stale_while_revalidate function."""
+    from adaptapedia.cache import refresh_stale_entry
+
+    refresh_stale_entry(path, key, args, kwargs)
@@ -0,0 +1,107 @@
+"""Batch loaders for per-row serializer lookups.
+
+A serializer field that needs one extra query per row (the current user's
+vote, a user's top badge, ...) asks a BatchLoader instead. When a page is
+serialized with BatchListSerializer, the child serializer primes its loaders
+with every row's key first, so each lookup costs one IN query per page
+rather than one query per row. Loaders are memoized on the request, so other
+serializers in the same request reuse the resolved values.
+"""
+from typing import Any, Callable, Dict, Hashable, Iterable, Optional
+from django.db import models
+from rest_framework import serializers
+
+
+class BatchLoader:
+    """Resolve a lookup for many keys with one call, memoizing the results.
+
+    Usage:
+        loader = BatchLoader(lambda ids: dict(
+            DiffVote.objects.filter(user=user, diff_item_id__in=ids).values_list('diff_item_id', 'vote')
+        ))
+        loader.prime(diff.id for diff in page)
+        loader.load(diff.id)  # No query for primed keys
+    """
+
+    def __init__(self, batch_fn: Callable[[list], Dict[Hashable, Any]], default: Any = None):
+        """
+        Args:
+            batch_fn: Function resolving a list of keys; keys it leaves out
+                      of the returned dict resolve to default
+            default: Value for keys batch_fn did not return
+        """
+        self.batch_fn = batch_fn
+        self.default = default
+        self._values: Dict[Hashable, Any] = {}
+        self._pending: set = set()
+
+    def prime(self, keys: Iterable[Hashable]) -> None:
+        """Queue keys to be resolved with the next load()."""
+        self._pending.update(key for key in keys if key not in self._values)
+
+    def load(self, key: Hashable) -> Any:
+        """Get the value for key, resolving it and every queued key if needed."""
+        if key not in self._values:
+            self._pending.add(key)
+            self._dispatch()
+        return self._values[key]
+
+    def _dispatch(self) -> None:
+        """Resolve every queued key in one batch_fn call."""
+        keys = list(self._pending)
+        self._pending.clear()
+        found = self.batch_fn(keys)
+        for key in keys:
+            self._values[key] = found.get(key, self.default)
+
+
+def get_loader(
+    context: Dict[str, Any],
+    name: str,
+    batch_fn: Callable[[list], Dict[Hashable, Any]],
+    default: Any = None,
+) -> BatchLoader:
+    """
+    Get the named loader for a serializer context, creating it on first use.
+
+    Loaders live on the request when there is one (shared by every serializer
+    in the request), otherwise on the context itself.
+
+    Args:
+        context: Serializer context
+        name: Loader name, unique per lookup (include anything batch_fn
+              closes over that varies, e.g. the user ID)
+        batch_fn: See BatchLoader
+        default: See BatchLoader
+
+    Returns:
+        BatchLoader
+    """
+    request = context.get('request')
+    owner = getattr(request, '_request', request)  # DRF requests wrap Django's
+    if owner is not None:
+        if not hasattr(owner, '_batch_loaders'):
+            owner._batch_loaders = {}
+        loaders = owner._batch_loaders
+    else:
+        loaders = context.setdefault('_batch_loaders', {})
+
+    if name not in loaders:
+        loaders[name] = BatchLoader(batch_fn, default)
+    return loaders[name]
+
+
+class BatchListSerializer(serializers.ListSerializer):
+    """List serializer priming the child's batch loaders with the whole page.
+
+    Child serializers opt in by setting Meta.list_serializer_class to this
+    class and implementing prime_loaders(instances).
+    """
+
+    def to_representation(self, data):
+        """Prime the child's loaders, then serialize each item."""
+        instances = list(data.all() if isinstance(data, models.Manager) else data)
+        prime_loaders: Optional[Callable] = getattr(self.child, 'prime_loaders', None)
+        if prime_loaders and instances:
+            prime_loaders(instances)
+        return super().to_representation(instances)
@@ -166,6 +166,20 @@ CACHES = {
     }
 }
 
+# Per-process LRU tier in front of Redis (see adaptapedia.cache.LocalCache)
+CACHE_LOCAL_MAX_ENTRIES = int(os.environ.get('CACHE_LOCAL_MAX_ENTRIES', 256))
+CACHE_LOCAL_TTL = int(os.environ.get('CACHE_LOCAL_TTL', 10))  # Seconds; 0 disables the local tier
+
+# Seconds between flushes of per-process cache metrics to Redis (see adaptapedia.cache.get_cache_metrics)
+CACHE_METRICS_FLUSH_INTERVAL = int(os.environ.get('CACHE_METRICS_FLUSH_INTERVAL', 10))
+
+# Cache warmer (diffs.cache_warmer): parallel jobs and number of comparison pages kept warm
+CACHE_WARM_CONCURRENCY = int(os.environ.get('CACHE_WARM_CONCURRENCY', 4))
+CACHE_WARM_TOP_COMPARISONS = int(os.environ.get('CACHE_WARM_TOP_COMPARISONS', 50))
+
+# Accept diff votes into Redis and write them to Postgres in batches (see diffs.vote_buffer)
+DIFF_VOTE_BUFFERING = os.environ.get('DIFF_VOTE_BUFFERING', 'false').lower() == 'true'
+
 # Celery Beat Schedule
 from celery.schedules import crontab
 
@@ -205,6 +219,34 @@ CELERY_BEAT_SCHEDULE = {
             'expires': 3600,
         }
     },
+    'outbox-processor': {
+        'task': 'users.tasks.process_outbox',
+        'schedule': crontab(),  # Every minute; writes also schedule runs directly
+        'options': {
+            'expires': 60,
+        }
+    },
+    'daily-outbox-prune': {
+        'task': 'users.tasks.prune_outbox',
+        'schedule': crontab(hour=4, minute=30),  # 4:30 AM UTC daily
+        'options': {
+            'expires': 3600,
+        }
+    },
+    'vote-buffer-flush': {
+        'task': 'diffs.tasks.flush_vote_buffer',
+        'schedule': 5.0,  # Every 5 seconds; a no-op unless votes are buffered
+        'options': {
+            'expires': 5,
+        }
+    },
+    'cache-warmer': {
+        'task': 'diffs.tasks.warm_cache',
+        'schedule': crontab(minute='*/30'),  # Every 30 minutes
+        'options': {
+            'expires': 600,  # Skip if the previous run is still backed up
+        }
+    },
     'hourly-health-check': {
         'task': 'ingestion.tasks.health_check',
         'schedule': crontab(minute=0),  # Every hour on the hour
@@ -0,0 +1,523 @@
+"""Tests for cache utilities."""
+import time
+from unittest import mock
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+from adaptapedia import cache as cache_utils
+from adaptapedia.cache import (
+    BROWSE_TAG,
+    SEARCH_TAG,
+    CacheEntry,
+    LocalCache,
+    PackedValue,
+    cache_book_detail,
+    cache_comparison,
+    cache_get_or_set,
+    cache_search_results,
+    comparison_tag,
+    conditional_on_versions,
+    get_cached_book_detail,
+    get_cached_comparison,
+    get_cached_search_results,
+    get_cache_metrics,
+    get_tier_stats,
+    invalidate_book_detail,
+    invalidate_comparison,
+    invalidate_search_results,
+    invalidate_tags,
+    pack_value,
+    reset_cache_metrics,
+    reset_tier_stats,
+    stale_while_revalidate,
+    unpack_value,
+)
+
+LOCMEM_CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'adaptapedia-tests',
+    }
+}
+
+compute_calls = []
+
+
+@stale_while_revalidate('test_swr', tags=[BROWSE_TAG])
+def expensive_section(name):
+    """Decorated function used by StaleWhileRevalidateTestCase."""
+    compute_calls.append(name)
+    return f"{name}-{len(compute_calls)}"
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class SingleFlightCacheTestCase(SimpleTestCase):
+    """Test cases for single-flight cache_get_or_set."""
+
+    def setUp(self):
+        """Start every test with an empty cache and the local tier disabled."""
+        cache.clear()
+        patcher = mock.patch.object(cache_utils, 'local_cache', LocalCache(max_entries=0, ttl=0))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_miss_computes_and_caches(self):
+        """Test that a miss computes the value once and later reads hit the cache."""
+        compute = mock.Mock(return_value={'sections': [1, 2, 3]})
+
+        first = cache_get_or_set('browse', compute, timeout=60, single_flight=True)
+        second = cache_get_or_set('browse', compute, timeout=60, single_flight=True)
+
+        self.assertEqual(first, {'sections': [1, 2, 3]})
+        self.assertEqual(second, first)
+        self.assertEqual(compute.call_count, 1)
+        # The recompute lock is released after computing
+        self.assertIsNone(cache.get('browse:lock'))
+
+    def test_expired_entry_served_while_locked(self):
+        """Test that other workers get the previous value while one worker recomputes."""
+        cache_get_or_set('browse', lambda: 'old', timeout=60, single_flight=True)
+        entry = cache.get('browse')._replace(expires_at=0)  # Logically expired, still cached
+        cache.set('browse', entry, 60)
+
+        # Another worker holds the lock
+        cache.add('browse:lock', 1, 30)
+        compute = mock.Mock(return_value='new')
+
+        value = cache_get_or_set('browse', compute, timeout=60, single_flight=True)
+
+        self.assertEqual(value, 'old')
+        compute.assert_not_called()
+
+    def test_expired_entry_recomputed_by_lock_holder(self):
+        """Test that the worker acquiring the lock recomputes an expired entry."""
+        cache_get_or_set('browse', lambda: 'old', timeout=60, single_flight=True)
+        entry = cache.get('browse')._replace(expires_at=0)
+        cache.set('browse', entry, 60)
+
+        value = cache_get_or_set('browse', lambda: 'new', timeout=60, single_flight=True)
+
+        self.assertEqual(value, 'new')
+        self.assertEqual(cache.get('browse').value, 'new')
+
+    @mock.patch.object(cache_utils, 'LOCK_WAIT_TIMEOUT', 0.2)
+    def test_cold_miss_waits_then_computes(self):
+        """Test that a cold miss waits for the lock holder before computing itself."""
+        cache.add('browse:lock', 1, 30)
+
+        value = cache_get_or_set('browse', lambda: 'computed', timeout=60, single_flight=True)
+
+        self.assertEqual(value, 'computed')
+
+    def test_value_in_legacy_format_is_a_miss(self):
+        """Test that values cached without single-flight are recomputed, not returned raw."""
+        cache.set('browse', ['legacy'], 60)
+
+        value = cache_get_or_set('browse', lambda: {'fresh': True}, timeout=60, single_flight=True)
+
+        self.assertEqual(value, {'fresh': True})
+
+    def test_early_expiration_near_expiry(self):
+        """Test that entries close to expiry with a slow recompute are refreshed early."""
+        entry = CacheEntry(value='v', expires_at=0, delta=0.0)
+        self.assertFalse(cache_utils._is_fresh(entry))
+
+        entry = CacheEntry(value='v', expires_at=time.time() + 3600, delta=0.01)
+        self.assertTrue(cache_utils._is_fresh(entry))
+
+        # Expires in 1s but took 10s to compute: almost always recomputed early
+        entry = CacheEntry(value='v', expires_at=time.time() + 1, delta=10.0)
+        with mock.patch.object(cache_utils.random, 'random', return_value=0.5):
+            self.assertFalse(cache_utils._is_fresh(entry))
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class CacheTagTestCase(SimpleTestCase):
+    """Test cases for tag/version-based invalidation."""
+
+    def setUp(self):
+        """Start every test with an empty cache and the local tier disabled."""
+        cache.clear()
+        patcher = mock.patch.object(cache_utils, 'local_cache', LocalCache(max_entries=0, ttl=0))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_invalidating_tag_recomputes_dependent_entries(self):
+        """Test that bumping a tag makes every entry depending on it miss."""
+        tag = comparison_tag(1, 2)
+        cache_get_or_set('diffs:a', lambda: 'a1', tags=[tag])
+        cache_get_or_set('diffs:b', lambda: 'b1', tags=[tag, BROWSE_TAG])
+
+        invalidate_tags(tag)
+
+        self.assertEqual(cache_get_or_set('diffs:a', lambda: 'a2', tags=[tag]), 'a2')
+        self.assertEqual(cache_get_or_set('diffs:b', lambda: 'b2', tags=[tag, BROWSE_TAG]), 'b2')
+
+    def test_unrelated_tags_are_not_invalidated(self):
+        """Test that bumping one tag leaves entries with other tags cached."""
+        cache_get_or_set('browse', lambda: 'browse1', tags=[BROWSE_TAG])
+        cache_get_or_set('comparison', lambda: 'comparison1', tags=[comparison_tag(1, 2)])
+
+        invalidate_tags(comparison_tag(3, 4))
+
+        self.assertEqual(cache_get_or_set('browse', lambda: 'browse2', tags=[BROWSE_TAG]), 'browse1')
+        self.assertEqual(
+            cache_get_or_set('comparison', lambda: 'comparison2', tags=[comparison_tag(1, 2)]),
+            'comparison1'
+        )
+
+    def test_lost_tag_counter_does_not_resurrect_old_entries(self):
+        """Test that a tag counter evicted from the cache starts a new generation."""
+        cache_get_or_set('search:dune', lambda: 'old', tags=[SEARCH_TAG])
+        cache.delete('tag_version:search')
+
+        self.assertEqual(cache_get_or_set('search:dune', lambda: 'new', tags=[SEARCH_TAG]), 'new')
+
+    def test_helpers_declare_tags(self):
+        """Test that the detail and search helpers are invalidated through their tags."""
+        cache_book_detail('dune', {'title': 'Dune'})
+        cache_comparison(1, 2, {'diffs': []})
+        cache_search_results('dune', {'type': 'book'}, {'results': []})
+
+        invalidate_book_detail('dune')
+        invalidate_comparison(1, 2)
+        invalidate_search_results()
+
+        self.assertIsNone(get_cached_book_detail('dune'))
+        self.assertIsNone(get_cached_comparison(1, 2))
+        self.assertIsNone(get_cached_search_results('dune', {'type': 'book'}))
+
+
+class LocalCacheTestCase(SimpleTestCase):
+    """Test cases for the per-process LRU tier."""
+
+    def test_evicts_least_recently_used(self):
+        """Test that the oldest untouched entry is evicted when full."""
+        local = LocalCache(max_entries=2, ttl=60)
+        local.set('a', 1)
+        local.set('b', 2)
+        local.get('a')
+        local.set('c', 3)
+
+        self.assertEqual(local.get('a'), 1)
+        self.assertIsNone(local.get('b'))
+        self.assertEqual(local.get('c'), 3)
+
+    def test_entries_expire(self):
+        """Test that entries expire after the local TTL or a shorter timeout."""
+        local = LocalCache(max_entries=10, ttl=60)
+        local.set('short', 1, timeout=1)
+        local.set('long', 2)
+
+        with mock.patch.object(cache_utils.time, 'monotonic', return_value=time.monotonic() + 30):
+            self.assertIsNone(local.get('short'))
+            self.assertEqual(local.get('long'), 2)
+
+    def test_delete_tag(self):
+        """Test that dropping a tag only removes entries depending on it."""
+        local = LocalCache(max_entries=10, ttl=60)
+        local.set('browse', 1, tags=[BROWSE_TAG])
+        local.set('search', 2, tags=[SEARCH_TAG])
+
+        local.delete_tag(BROWSE_TAG)
+
+        self.assertIsNone(local.get('browse'))
+        self.assertEqual(local.get('search'), 2)
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class TwoTierCacheTestCase(SimpleTestCase):
+    """Test cases for cache_get_or_set with the local tier in front of the shared cache."""
+
+    def setUp(self):
+        """Start every test with empty tiers and counters."""
+        cache.clear()
+        patcher = mock.patch.object(cache_utils, 'local_cache', LocalCache(max_entries=10, ttl=60))
+        self.local = patcher.start()
+        self.addCleanup(patcher.stop)
+        reset_tier_stats()
+
+    def test_local_hit_skips_shared_cache(self):
+        """Test that repeat reads are answered locally and counted per tier."""
+        cache_get_or_set('browse', lambda: 'v', tags=[BROWSE_TAG])
+        with mock.patch.object(cache, 'get') as shared_get, \
+                mock.patch.object(cache, 'get_many') as shared_get_many:
+            self.assertEqual(cache_get_or_set('browse', lambda: 'other', tags=[BROWSE_TAG]), 'v')
+            shared_get.assert_not_called()
+            shared_get_many.assert_not_called()
+
+        self.local.clear()
+        cache_get_or_set('browse', lambda: 'other', tags=[BROWSE_TAG])
+
+        stats = get_tier_stats()
+        self.assertEqual((stats['misses'], stats['local_hits'], stats['redis_hits']), (1, 1, 1))
+        self.assertAlmostEqual(stats['hit_rate'], 2 / 3, places=3)
+
+    def test_invalidation_drops_local_entries(self):
+        """Test that tag invalidation and pub/sub messages clear the local tier."""
+        cache_get_or_set('browse', lambda: 'v1', tags=[BROWSE_TAG])
+        invalidate_tags(BROWSE_TAG)
+        self.assertEqual(cache_get_or_set('browse', lambda: 'v2', tags=[BROWSE_TAG]), 'v2')
+
+        # Invalidation published by another worker
+        cache_utils._apply_invalidation(b'tag:browse')
+        self.assertIsNone(self.local.get('browse'))
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+@mock.patch.dict(cache_utils.CACHE_SWR_TIMEOUTS, {'test_swr': (60, 3600)})
+class StaleWhileRevalidateTestCase(SimpleTestCase):
+    """Test cases for the stale_while_revalidate decorator."""
+
+    def setUp(self):
+        """Start every test with an empty cache and the local tier disabled."""
+        cache.clear()
+        compute_calls.clear()
+        patcher = mock.patch.object(cache_utils, 'local_cache', LocalCache(max_entries=0, ttl=0))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _expire(self, name):
+        """Push the cached entry for name past its soft TTL."""
+        key = cache_utils.make_tagged_key(cache_utils.get_cache_key('test_swr', name), [BROWSE_TAG])
+        cache.set(key, cache.get(key)._replace(expires_at=0), 3600)
+        return key
+
+    def test_fresh_value_served_from_cache(self):
+        """Test that a cold miss computes once and later calls are cached."""
+        self.assertEqual(expensive_section('featured'), 'featured-1')
+        self.assertEqual(expensive_section('featured'), 'featured-1')
+        self.assertEqual(compute_calls, ['featured'])
+
+    @mock.patch('adaptapedia.celery.refresh_stale_cache_entry.delay')
+    def test_stale_value_served_while_refresh_queued(self, delay):
+        """Test that stale values are returned immediately and refreshed once in the background."""
+        expensive_section('featured')
+        key = self._expire('featured')
+
+        self.assertEqual(expensive_section('featured'), 'featured-1')
+        self.assertEqual(expensive_section('featured'), 'featured-1')
+
+        self.assertEqual(compute_calls, ['featured'])
+        delay.assert_called_once_with(
+            f'{__name__}:expensive_section', key, ['featured'], {}
+        )
+
+    @mock.patch('adaptapedia.celery.refresh_stale_cache_entry.delay')
+    def test_background_refresh_replaces_value(self, delay):
+        """Test that the refresh task recomputes the entry and allows later refreshes."""
+        expensive_section('featured')
+        self._expire('featured')
+        expensive_section('featured')
+
+        cache_utils.refresh_stale_entry(*delay.call_args.args)
+
+        self.assertEqual(expensive_section('featured'), 'featured-2')
+        self.assertIsNone(cache.get(cache_utils._refreshing_key(delay.call_args.args[1])))
+
+    def test_refresh_recomputes_immediately(self):
+        """Test that refresh() overwrites the cached value."""
+        expensive_section('featured')
+        expensive_section.refresh('featured')
+
+        self.assertEqual(expensive_section('featured'), 'featured-2')
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class CacheMetricsTestCase(SimpleTestCase):
+    """Test cases for per-prefix cache metrics."""
+
+    def setUp(self):
+        """Start every test with empty caches and metrics."""
+        cache.clear()
+        reset_cache_metrics()
+        patcher = mock.patch.object(
+            cache_utils, 'local_cache',
+            LocalCache(max_entries=1, ttl=60, on_evict=lambda key: cache_utils._record_metric(key, 'evictions')),
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_lookups_recorded_per_prefix(self):
+        """Test that hits, misses, recomputes and payload size are grouped by key prefix."""
+        cache_get_or_set('browse:featured', lambda: ['a'] * 100)
+        cache_get_or_set('browse:featured', lambda: ['b'])  # Local hit
+        cache_get_or_set('search:dune', lambda: 'results', single_flight=True)  # Evicts browse:featured
+        cache_get_or_set('browse:featured', lambda: ['b'])  # Redis hit
+
+        metrics = get_cache_metrics()
+
+        self.assertEqual(metrics['browse']['misses'], 1)
+        self.assertEqual(metrics['browse']['local_hits'], 1)
+        self.assertEqual(metrics['browse']['redis_hits'], 1)
+        self.assertEqual(metrics['browse']['recomputes'], 1)
+        self.assertEqual(metrics['browse']['evictions'], 1)
+        self.assertGreater(metrics['browse']['avg_payload_bytes'], 100)
+        self.assertAlmostEqual(metrics['browse']['hit_rate'], 2 / 3, places=3)
+        self.assertEqual(metrics['search']['misses'], 1)
+        self.assertEqual(metrics['search']['recomputes'], 1)
+
+
+class SharedCacheMetricsTestCase(SimpleTestCase):
+    """Test cases for metrics aggregated in Redis (uses the configured cache)."""
+
+    def setUp(self):
+        """Start with empty metrics."""
+        if cache_utils._get_redis_client() is None:
+            self.skipTest('Requires the Redis cache backend')
+        reset_cache_metrics()
+        self.addCleanup(reset_cache_metrics)
+
+    def test_flushed_metrics_are_summed(self):
+        """Test that flushes from several workers add up."""
+        cache_utils._record_metric('test_prefix:a', 'misses')
+        cache_utils._record_recompute('test_prefix:a', 0.5)
+        cache_utils.flush_cache_metrics()
+        cache_utils._record_metric('test_prefix:b', 'misses')
+        cache_utils._record_recompute('test_prefix:b', 0.25)
+
+        metrics = get_cache_metrics()['test_prefix']
+
+        self.assertEqual(metrics['misses'], 2)
+        self.assertEqual(metrics['recomputes'], 2)
+        self.assertEqual(metrics['recompute_seconds'], 0.75)
+        self.assertEqual(metrics['avg_recompute_ms'], 375.0)
+
+
+class CacheStatsViewTestCase(SimpleTestCase):
+    """Test cases for the cache stats endpoint."""
+
+    def _get(self, user):
+        from rest_framework.test import APIRequestFactory, force_authenticate
+        from adaptapedia.views import cache_stats
+
+        request = APIRequestFactory().get('/api/cache-stats/')
+        force_authenticate(request, user=user)
+        return cache_stats(request)
+
+    @mock.patch('adaptapedia.views.get_backend_stats', return_value={})
+    @mock.patch('adaptapedia.views.get_cache_metrics', return_value={'browse': {'hits': 1}})
+    def test_staff_only(self, *mocks):
+        """Test that only staff can read cache stats."""
+        from users.models import User
+
+        self.assertEqual(self._get(User(username='reader')).status_code, 403)
+
+        response = self._get(User(username='admin', is_staff=True))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['prefixes'], {'browse': {'hits': 1}})
+
+
+class SerializationTestCase(SimpleTestCase):
+    """Test cases for packed (compact/compressed) cache values."""
+
+    payload = {'all_comparisons': [{'work_title': 'Dune', 'poster_url': 'https://img/p.jpg'}] * 50}
+
+    def test_round_trip_for_every_codec(self):
+        """Test that every format/compression pair decodes to the original value."""
+        for fmt in ('pickle', 'json'):
+            for compression in (None, 'zlib', 'zstd'):
+                packed = pack_value(self.payload, fmt, compression)
+                self.assertIsInstance(packed, PackedValue)
+                self.assertEqual(unpack_value(packed), self.payload)
+
+    def test_small_values_not_compressed(self):
+        """Test that compression only applies from the size threshold."""
+        self.assertEqual(pack_value({'a': 1}, 'json', 'zlib').data[:2], b'j-')
+        self.assertEqual(pack_value(self.payload, 'json', 'zlib').data[:2], b'jz')
+
+    def test_json_falls_back_to_pickle(self):
+        """Test that values JSON cannot represent exactly are pickled instead."""
+        from datetime import datetime, timezone
+
+        value = {'last_updated': datetime(2024, 1, 1, tzinfo=timezone.utc)}
+        packed = pack_value(value, 'json')
+
+        self.assertEqual(packed.data[:1], b'p')
+        self.assertEqual(unpack_value(packed), value)
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+@mock.patch.dict(cache_utils.CACHE_SERIALIZATION, {'packed': ('json', 'zlib')})
+class PackedCacheTestCase(SimpleTestCase):
+    """Test cases for per-prefix serialization in cache_get_or_set."""
+
+    def setUp(self):
+        """Start every test with an empty cache and the local tier disabled."""
+        cache.clear()
+        patcher = mock.patch.object(cache_utils, 'local_cache', LocalCache(max_entries=0, ttl=0))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_configured_prefix_is_packed(self):
+        """Test that values under a configured prefix are stored packed and read back decoded."""
+        value = {'results': list(range(500))}
+
+        cache_get_or_set('packed:a', lambda: value)
+        cache_get_or_set('packed:b', lambda: value, single_flight=True)
+
+        self.assertIsInstance(cache.get('packed:a'), PackedValue)
+        self.assertIsInstance(cache.get('packed:b').value, PackedValue)
+        self.assertEqual(cache_get_or_set('packed:a', lambda: None), value)
+        self.assertEqual(cache_get_or_set('packed:b', lambda: None, single_flight=True), value)
+
+    def test_other_prefixes_unchanged(self):
+        """Test that unlisted prefixes are stored as-is."""
+        cache_get_or_set('plain:a', lambda: [1, 2, 3])
+
+        self.assertEqual(cache.get('plain:a'), [1, 2, 3])
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class ConditionalOnVersionsTestCase(SimpleTestCase):
+    """Test cases for ETag/Last-Modified handling driven by tag versions."""
+
+    def setUp(self):
+        """Start every test with an empty cache."""
+        from rest_framework import viewsets
+        from rest_framework.response import Response
+
+        cache.clear()
+        self.calls = []
+        calls = self.calls
+
+        class VersionedViewSet(viewsets.ViewSet):
+            permission_classes = []
+
+            @conditional_on_versions(lambda request: [BROWSE_TAG])
+            def list(self, request):
+                calls.append(request)
+                return Response({'ok': True})
+
+        self.view = VersionedViewSet.as_view({'get': 'list'})
+
+    def _get(self, **headers):
+        from rest_framework.test import APIRequestFactory
+
+        return self.view(APIRequestFactory().get('/versioned/', **headers))
+
+    def test_matching_etag_skips_view(self):
+        """Test that a matching If-None-Match gets a 304 without running the view."""
+        response = self._get()
+        etag = response['ETag']
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('no-cache', response['Cache-Control'])
+
+        response = self._get(HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+        self.assertEqual(len(self.calls), 1)
+
+    def test_bump_changes_etag(self):
+        """Test that bumping a tag changes the ETag and sets Last-Modified."""
+        etag = self._get()['ETag']
+
+        invalidate_tags(BROWSE_TAG)
+        response = self._get(HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertIn('Last-Modified', response)
+
+        response = self._get(HTTP_IF_MODIFIED_SINCE=response['Last-Modified'])
+        self.assertEqual(response.status_code, 304)
@@ -0,0 +1,38 @@
+"""Tests for batch loaders."""
+from django.test import SimpleTestCase
+from adaptapedia.loaders import BatchLoader, get_loader
+
+
+class BatchLoaderTestCase(SimpleTestCase):
+    """Test cases for BatchLoader."""
+
+    def setUp(self):
+        """Create a loader recording each batch it resolves."""
+        self.batches = []
+
+        def batch_fn(keys):
+            self.batches.append(sorted(keys))
+            return {key: key * 10 for key in keys if key != 3}
+
+        self.loader = BatchLoader(batch_fn, default=-1)
+
+    def test_primed_keys_resolved_in_one_batch(self):
+        """Test that primed keys are resolved together and memoized."""
+        self.loader.prime([1, 2, 3])
+
+        self.assertEqual([self.loader.load(key) for key in (1, 2, 3, 1)], [10, 20, -1, 10])
+        self.assertEqual(self.batches, [[1, 2, 3]])
+
+    def test_unprimed_key_resolved_on_load(self):
+        """Test that loading an unknown key resolves it on demand."""
+        self.assertEqual(self.loader.load(4), 40)
+        self.assertEqual(self.loader.load(4), 40)
+        self.assertEqual(self.batches, [[4]])
+
+    def test_get_loader_memoized_per_context(self):
+        """Test that the same named loader is returned for a context without a request."""
+        context = {}
+        loader = get_loader(context, 'numbers', lambda keys: {})
+
+        self.assertIs(get_loader(context, 'numbers', lambda keys: {}), loader)
+        self.assertIsNot(get_loader({}, 'numbers', lambda keys: {}), loader)
@@ -9,6 +9,7 @@ from rest_framework_simplejwt.views import (
     TokenRefreshView,
 )
 from users.social_auth_views import SocialAuthCallbackView
+from .views import cache_stats
 
 
 def health_check(request):
@@ -32,6 +33,7 @@ urlpatterns = [
     path('api/diffs/', include('diffs.urls')),
     path('api/users/', include('users.urls')),
     path('api/mod/', include('moderation.urls')),
+    path('api/cache-stats/', cache_stats, name='cache_stats'),
 ]
 
 # Serve media files in development
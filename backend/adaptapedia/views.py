@@ -0,0 +1,24 @@
+"""Project-level API views."""
+from rest_framework import permissions
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.response import Response
+from adaptapedia.cache import get_backend_stats, get_cache_metrics, get_tier_stats
+
+
+@api_view(['GET'])
+@permission_classes([permissions.IsAdminUser])
+def cache_stats(request):
+    """
+    Get cache metrics for tuning TTLs (staff only).
+
+    Returns:
+    - prefixes: Hits, misses, hit rate, recompute time, payload size and
+      evictions per cache key prefix, summed over every worker
+    - tiers: Local/Redis hit counts for the worker serving this request
+    - backend: Server-wide Redis statistics (evictions, memory)
+    """
+    return Response({
+        'prefixes': get_cache_metrics(),
+        'tiers': get_tier_stats(),
+        'backend': get_backend_stats(),
+    })
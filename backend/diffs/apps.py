@@ -7,3 +7,7 @@ class DiffsConfig(AppConfig):
 
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'diffs'
+
+    def ready(self):
+        """Import signal handlers when app is ready."""
+        import diffs.signals  # noqa: F401
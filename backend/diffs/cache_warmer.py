@@ -0,0 +1,148 @@
+"""Pre-compute the caches behind the homepage, browse, catalog and comparison pages.
+
+Run at deploy time and periodically (see the cache-warmer beat entry), so the
+first visitors after a deploy or a Redis flush do not all pay for the section
+queries at once.
+"""
+import logging
+import string
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Tuple
+from django.conf import settings
+from django.db import connection
+from .constants import TRENDING_COMMON_DAYS, TRENDING_LOOKBACK_DAYS
+from . import comparison_page, sampling, sections
+
+logger = logging.getLogger(__name__)
+
+CATALOG_LETTERS = list(string.ascii_uppercase) + ['#']
+
+
+def get_warm_jobs() -> List[Tuple[str, Callable[[], Any]]]:
+    """
+    List the browse, trending, catalog and random sampling cache entries to warm.
+
+    Returns:
+        List of (name, function recomputing and storing the entry) tuples
+    """
+    from works.services import WorkService
+
+    jobs = [(f'section:{name}', lambda name=name: sections.refresh_section(name)) for name in sections.SECTIONS]
+
+    jobs += [
+        (f'trending:days={days}', lambda days=days: sections.get_trending(days, refresh=True))
+        for days in TRENDING_COMMON_DAYS if days != TRENDING_LOOKBACK_DAYS
+    ]
+
+    # Catalog pages as requested by the frontend (first page, default sort)
+    jobs += [
+        (
+            f'catalog:letter={letter or "all"}',
+            lambda letter=letter: WorkService.get_catalog.refresh(
+                sort_by='title', order='asc', genre=None, letter=letter, page=1
+            ),
+        )
+        for letter in [None] + CATALOG_LETTERS
+    ]
+
+    # Also picks up genre changes, which do not mark comparisons dirty
+    jobs.append(('random_comparisons', sampling.rebuild))
+
+    return jobs
+
+
+def get_comparison_jobs(top_comparisons: int) -> List[Tuple[str, Callable[[], Any]]]:
+    """
+    List the comparison page cache entries to warm.
+
+    Args:
+        top_comparisons: Number of comparisons to warm, most popular first
+
+    Returns:
+        List of (name, function recomputing and storing the entry) tuples
+    """
+    popular = sections.get_section('all_comparisons:popularity')[:top_comparisons]
+    jobs = [
+        (
+            f"comparison:{c['work_slug']}/{c['screen_work_slug']}",
+            lambda c=c: sections.get_comparison_vote_stats(c['work_id'], c['screen_work_id'], refresh=True),
+        )
+        for c in popular
+    ]
+
+    # Diff lists as first shown on the comparison page (every spoiler level, default ordering)
+    jobs += [
+        (
+            f"comparison_diffs:{c['work_slug']}/{c['screen_work_slug']}",
+            lambda c=c: sections.get_comparison_diff_ids(c['work_id'], c['screen_work_id'], refresh=True),
+        )
+        for c in popular
+    ]
+
+    # Aggregate page payloads as requested by the frontend (every spoiler level)
+    jobs += [
+        (
+            f"comparison_page:{c['work_slug']}/{c['screen_work_slug']}",
+            lambda c=c: comparison_page.get_page(c['work_id'], c['screen_work_id'], refresh=True),
+        )
+        for c in popular
+    ]
+    return jobs
+
+
+def _run_job(name: str, job: Callable[[], Any]) -> Dict[str, Any]:
+    """Run one warm job, timing it and capturing errors."""
+    started = time.monotonic()
+    try:
+        job()
+        error = None
+    except Exception as e:
+        logger.warning(f"Cache warm job {name} failed: {e}", exc_info=True)
+        error = str(e)
+
+    return {'name': name, 'seconds': round(time.monotonic() - started, 3), 'error': error}
+
+
+def _run_job_in_thread(item: Tuple[str, Callable[[], Any]]) -> Dict[str, Any]:
+    """Run a warm job in a pool thread, closing the thread's DB connection afterwards."""
+    try:
+        return _run_job(*item)
+    finally:
+        connection.close()
+
+
+def warm_cache(concurrency: int = None, top_comparisons: int = None) -> Dict[str, Any]:
+    """
+    Recompute and store every warmable cache entry.
+
+    Args:
+        concurrency: Maximum jobs running at once (default CACHE_WARM_CONCURRENCY);
+                     1 runs them in the calling thread
+        top_comparisons: Number of comparison pages to warm (default CACHE_WARM_TOP_COMPARISONS)
+
+    Returns:
+        Dict with per-job timings (name, seconds, error), total_seconds and failed count
+    """
+    if concurrency is None:
+        concurrency = getattr(settings, 'CACHE_WARM_CONCURRENCY', 4)
+    if top_comparisons is None:
+        top_comparisons = getattr(settings, 'CACHE_WARM_TOP_COMPARISONS', 50)
+
+    started = time.monotonic()
+
+    def run(jobs):
+        if concurrency <= 1:
+            return [_run_job(name, job) for name, job in jobs]
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            return list(executor.map(_run_job_in_thread, jobs))
+
+    # Comparisons are picked from the popularity section, so warm sections first
+    results = run(get_warm_jobs())
+    results += run(get_comparison_jobs(top_comparisons))
+
+    return {
+        'jobs': results,
+        'total_seconds': round(time.monotonic() - started, 3),
+        'failed': sum(1 for result in results if result['error']),
+    }
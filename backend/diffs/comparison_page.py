@@ -0,0 +1,248 @@
+"""Everything a book-vs-screen comparison page shows, assembled in one payload.
+
+The part every visitor sees (work, screen work, diffs, comparison vote stats
+and each diff's first comment threads) is cached per spoiler level under the
+comparison's tag, so the diff, vote, comment and comparison vote signals
+invalidate it. The current user's part (own diff votes, comparison vote and
+bookmark) is read with one query and overlaid on a copy, so a warm page costs
+one query to resolve the slugs plus one per signed-in user.
+"""
+from typing import Any, Dict, List, Optional, Tuple
+from django.contrib.postgres.expressions import ArraySubquery
+from django.db.models import OuterRef, Subquery
+from django.db.models.functions import JSONObject
+from django.utils.dateparse import parse_datetime
+from rest_framework import serializers
+from adaptapedia.cache import CACHE_TIMEOUTS, cache_get_or_set, comparison_tag, get_cache_key
+from .constants import (
+    COMPARISON_PAGE_THREADS,
+    COMPARISON_PAGE_THREAD_DEPTH,
+    DEFAULT_DIFF_ORDERING,
+    DIFF_ORDERINGS,
+    MAX_SPOILER_LEVEL,
+)
+from .models import DiffItem, DiffVote, ComparisonVote
+from .serializers import DiffItemSerializer, serialize_threads
+from .services import DiffService
+from .sections import get_comparison_vote_stats
+from . import vote_buffer
+
+# ComparisonVote fields read by the user overlay
+COMPARISON_VOTE_FIELDS = [
+    'id', 'user', 'has_read_book', 'has_watched_adaptation', 'preference', 'faithfulness_rating',
+    'created_at', 'updated_at',
+]
+
+
+def resolve_comparison(work_slug: str, screen_slug: str) -> Optional[Tuple[int, int]]:
+    """
+    Look up a comparison's IDs from its slugs with one query.
+
+    Args:
+        work_slug: Work slug
+        screen_slug: ScreenWork slug
+
+    Returns:
+        (work_id, screen_work_id), or None if either slug is unknown
+    """
+    from works.models import Work
+    from screen.models import ScreenWork
+
+    row = Work.objects.filter(slug=work_slug).annotate(
+        screen_work_id=Subquery(ScreenWork.objects.filter(slug=screen_slug).values('id')[:1])
+    ).values_list('id', 'screen_work_id').first()
+    if row is None or row[1] is None:
+        return None
+    return row
+
+
+def build_page(work_id: int, screen_work_id: int, max_level: int = MAX_SPOILER_LEVEL) -> Dict[str, Any]:
+    """
+    Assemble the part of a comparison page every visitor sees.
+
+    Args:
+        work_id: Work ID
+        screen_work_id: ScreenWork ID
+        max_level: Maximum spoiler level of diffs and comments (see SPOILER_SCOPE_ORDER)
+
+    Returns:
+        Dict with work, screen_work, vote_stats (see DiffService.get_comparison_vote_stats)
+        and diffs, in default order, each with 'comments': its thread_count
+        (visible top-level comments) and first COMPARISON_PAGE_THREADS threads
+    """
+    from works.models import Work
+    from works.serializers import WorkSerializer
+    from screen.models import ScreenWork
+    from screen.serializers import ScreenWorkSerializer
+
+    spoiler_filter = max_level if max_level < MAX_SPOILER_LEVEL else None
+
+    diffs = DiffItem.objects.filter(
+        work_id=work_id, screen_work_id=screen_work_id, status='LIVE'
+    ).select_related('created_by', 'work', 'screen_work').order_by(*DIFF_ORDERINGS[DEFAULT_DIFF_ORDERING])
+    if spoiler_filter is not None:
+        diffs = diffs.filter(spoiler_level__lte=spoiler_filter)
+    diffs = list(diffs)
+
+    roots = DiffService.get_first_threads([diff.pk for diff in diffs], COMPARISON_PAGE_THREADS, spoiler_filter)
+    comments = DiffService.get_comment_threads(roots, COMPARISON_PAGE_THREAD_DEPTH, spoiler_filter)
+    thread_counts = {root.diff_item_id: root.thread_count for root in roots}
+    threads: Dict[int, List[Dict[str, Any]]] = {}
+    for thread in serialize_threads(comments, roots, COMPARISON_PAGE_THREAD_DEPTH, {}):
+        threads.setdefault(thread['diff_item'], []).append(thread)
+
+    return {
+        'work': WorkSerializer(Work.objects.get(pk=work_id)).data,
+        'screen_work': ScreenWorkSerializer(ScreenWork.objects.get(pk=screen_work_id)).data,
+        'vote_stats': get_comparison_vote_stats(work_id, screen_work_id),
+        'diffs': [
+            {
+                **item,
+                'comments': {
+                    'thread_count': thread_counts.get(item['id'], 0),
+                    'threads': threads.get(item['id'], []),
+                },
+            }
+            for item in DiffItemSerializer(diffs, many=True).data
+        ],
+    }
+
+
+def get_page(
+    work_id: int,
+    screen_work_id: int,
+    max_level: int = MAX_SPOILER_LEVEL,
+    refresh: bool = False,
+) -> Dict[str, Any]:
+    """
+    Get the part of a comparison page every visitor sees, cached until the comparison changes.
+
+    Args:
+        work_id: Work ID
+        screen_work_id: ScreenWork ID
+        max_level: Maximum spoiler level (see SPOILER_SCOPE_ORDER)
+        refresh: Recompute and overwrite the cached value
+
+    Returns:
+        See build_page
+    """
+    return cache_get_or_set(
+        get_cache_key('comparison_page', work_id, screen_work_id, max_level),
+        lambda: build_page(work_id, screen_work_id, max_level),
+        timeout=CACHE_TIMEOUTS['comparison'],
+        single_flight=True,
+        tags=[comparison_tag(work_id, screen_work_id)],
+        refresh=refresh,
+    )
+
+
+def get_user_overlay(user, work_id: int, screen_work_id: int) -> Dict[str, Any]:
+    """
+    Read a user's votes and bookmark on a comparison with one query.
+
+    Args:
+        user: Authenticated user
+        work_id: Work ID
+        screen_work_id: ScreenWork ID
+
+    Returns:
+        Dict with bookmark_id (None if not bookmarked), comparison_vote (a dict
+        of COMPARISON_VOTE_FIELDS, None without a confirmed vote) and
+        diff_votes (dict mapping diff ID to vote, buffered votes included)
+    """
+    from users.models import User, Bookmark
+
+    comparison = {'work_id': work_id, 'screen_work_id': screen_work_id}
+    row = User.objects.filter(pk=user.pk).annotate(
+        bookmark_id=Subquery(Bookmark.objects.filter(user=OuterRef('pk'), **comparison).values('id')[:1]),
+        comparison_vote=Subquery(
+            ComparisonVote.objects.filter(
+                user=OuterRef('pk'), has_read_book=True, has_watched_adaptation=True, **comparison
+            ).values(data=JSONObject(**{field: field for field in COMPARISON_VOTE_FIELDS}))[:1]
+        ),
+        # Named apart from the User.diff_votes relation
+        voted_diffs=ArraySubquery(
+            DiffVote.objects.filter(
+                user=OuterRef('pk'), diff_item__work_id=work_id, diff_item__screen_work_id=screen_work_id
+            ).values(data=JSONObject(diff='diff_item_id', vote='vote'))
+        ),
+    ).values('bookmark_id', 'comparison_vote', 'voted_diffs').first()
+
+    return {
+        'bookmark_id': row['bookmark_id'],
+        'comparison_vote': row['comparison_vote'],
+        'diff_votes': {vote['diff']: vote['vote'] for vote in row['voted_diffs']},
+    }
+
+
+def _comparison_vote_data(vote: Dict[str, Any], page: Dict[str, Any]) -> Dict[str, Any]:
+    """A user's comparison vote as ComparisonVoteSerializer renders it, from the overlay and page data."""
+    datetime_field = serializers.DateTimeField()
+    work, screen_work = page['work'], page['screen_work']
+    return {
+        'id': vote['id'],
+        'work': work['id'],
+        'screen_work': screen_work['id'],
+        'work_title': work['title'],
+        'work_slug': work['slug'],
+        'work_author': work['author'],
+        'cover_url': work['cover_url'],
+        'screen_work_title': screen_work['title'],
+        'screen_work_slug': screen_work['slug'],
+        'screen_work_type': screen_work['type'],
+        'poster_url': screen_work['poster_url'],
+        'user': vote['user'],
+        'has_read_book': vote['has_read_book'],
+        'has_watched_adaptation': vote['has_watched_adaptation'],
+        'preference': vote['preference'],
+        'faithfulness_rating': vote['faithfulness_rating'],
+        'created_at': datetime_field.to_representation(parse_datetime(vote['created_at'])),
+        'updated_at': datetime_field.to_representation(parse_datetime(vote['updated_at'])),
+    }
+
+
+def get_page_for_request(request, work_id: int, screen_work_id: int, max_level: int) -> Dict[str, Any]:
+    """
+    Get a comparison page with the current user's votes and bookmark overlaid.
+
+    Builds new dicts rather than modifying the cached page, which is shared.
+
+    Args:
+        request: Current request
+        work_id: Work ID
+        screen_work_id: ScreenWork ID
+        max_level: Maximum spoiler level (see SPOILER_SCOPE_ORDER)
+
+    Returns:
+        See build_page, with each diff's user_vote, vote_stats' user_vote,
+        bookmark ({is_bookmarked, bookmark_id}) and absolute diff image URLs
+    """
+    page = get_page(work_id, screen_work_id, max_level)
+
+    overlay = {'bookmark_id': None, 'comparison_vote': None, 'diff_votes': {}}
+    if request.user.is_authenticated:
+        overlay = get_user_overlay(request.user, work_id, screen_work_id)
+        diff_ids = [diff['id'] for diff in page['diffs']]
+        # The user's buffered votes win until they are flushed
+        overlay['diff_votes'].update(vote_buffer.get_pending_votes(request.user.pk, diff_ids))
+
+    comparison_vote = overlay['comparison_vote']
+    return {
+        **page,
+        'vote_stats': {
+            **page['vote_stats'],
+            'user_vote': _comparison_vote_data(comparison_vote, page) if comparison_vote else None,
+        },
+        'bookmark': {
+            'is_bookmarked': overlay['bookmark_id'] is not None,
+            'bookmark_id': overlay['bookmark_id'],
+        },
+        'diffs': [
+            {
+                **diff,
+                'image': request.build_absolute_uri(diff['image']) if diff['image'] else None,
+                'user_vote': overlay['diff_votes'].get(diff['id']),
+            }
+            for diff in page['diffs']
+        ],
+    }
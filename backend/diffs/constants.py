@@ -7,6 +7,18 @@ DEFAULT_BROWSE_LIMIT = 12
 DEFAULT_NEEDS_HELP_LIMIT = 20
 DEFAULT_CATALOG_LIMIT = 20
 MAX_BROWSE_LIMIT = 50
+MAX_TRENDING_LIMIT = 20
+MAX_NEEDS_HELP_LIMIT = 50
+
+# Denormalized DiffItem counter for each vote type
+VOTE_COUNT_FIELDS = {
+    'ACCURATE': 'accurate_count',
+    'NEEDS_NUANCE': 'nuance_count',
+    'DISAGREE': 'disagree_count',
+}
+
+# Sort orders for the browse page's all_comparisons section
+BROWSE_SORTS = ['popularity', 'trending', 'most_documented', 'recently_updated', 'newest']
 
 # Featured works - manually curated for homepage/browse sections
 # These work IDs represent high-quality, popular comparisons
@@ -30,23 +42,61 @@ SPOILER_SCOPE_ORDER = {
     SpoilerScope.SCREEN_ONLY: 1,
     SpoilerScope.FULL: 2,
 }
+MAX_SPOILER_LEVEL = max(SPOILER_SCOPE_ORDER.values())
+
+# Diff list orderings (?ordering=), each backed by a per-comparison index
+DIFF_ORDERINGS = {
+    'best': ('-wilson_score', '-created_at'),
+    'new': ('-created_at',),
+    'controversial': ('-controversy_score', '-total_votes', '-created_at'),
+}
+DEFAULT_DIFF_ORDERING = 'best'
 
 # Trending algorithm parameters
 TRENDING_LOOKBACK_DAYS = 7  # How many days to consider "recent" activity
 TRENDING_MAX_PER_WORK = 2  # Maximum comparisons from the same book in trending
+TRENDING_COMMON_DAYS = [1, 7, 30]  # Lookback windows kept warm by the cache warmer
+MAX_TRENDING_DAYS = 90  # Longest lookback window a request can ask for
 
 # Activity score weights for trending
 TRENDING_DIFF_WEIGHT = 3.0  # Weight for new diffs (encourage content creation)
 TRENDING_VOTE_WEIGHT = 1.0  # Weight for votes
+TRENDING_COMMENT_WEIGHT = 1.0  # Weight for comments
+TRENDING_HALF_LIFE_HOURS = 48  # Activity counts half as much after this long
 
 # Engagement score weights for featured
 FEATURED_DIFF_WEIGHT = 2.0  # Weight for total diffs
 FEATURED_VOTE_WEIGHT = 1.0  # Weight for total votes
 
+# Diff ranking scores (DiffItem.wilson_score, DiffItem.controversy_score)
+WILSON_Z = 1.96  # 95% confidence for the lower bound of the accurate share
+
 # Disputed diff thresholds
 MIN_VOTES_FOR_DISPUTE = 5  # Minimum votes before considering dispute
 DISPUTE_ACCURACY_MIN = 0.3  # Disputed if accurate % is between these bounds
 DISPUTE_ACCURACY_MAX = 0.7
 
+# Comment threads (DiffComment.path holds one zero-padded ID per level, root first)
+COMMENT_PATH_WIDTH = 10  # Digits per path segment
+DEFAULT_THREAD_DEPTH = 5  # Reply levels loaded below each thread's root
+MAX_THREAD_DEPTH = 20
+
+# Comparison page payload (see diffs.comparison_page); the threads endpoint serves the rest
+COMPARISON_PAGE_THREADS = 3  # Top-level comments included per diff
+COMPARISON_PAGE_THREAD_DEPTH = 2  # Reply levels included below each of them
+
+# Comparison votes
+MAX_STATS_BATCH_PAIRS = 100  # Comparisons per batch comparison vote stats request
+
+# Random comparison sampling (see diffs.sampling)
+RANDOM_WEIGHTINGS = ['uniform', 'activity']  # Uniform, or proportional to diffs + votes
+RANDOM_MAX_TIER = 12  # Activity tiers 0..12 (2**12 or more diffs + votes share the top tier)
+RANDOM_RECENT_EXCLUDE = 10  # Comparisons recently served to a session that are not served again
+RANDOM_SYNC_BATCH = 200  # Dirty comparisons re-filed per sample
+
+# Write-behind vote buffering (see diffs.vote_buffer)
+VOTE_BUFFER_FLUSH_BATCH = 100  # Diffs flushed per round
+VOTE_BUFFER_MAX_ROUNDS = 50  # Rounds per flush task run; the rest waits for the next run
+
 # Recently updated cutoff
 RECENTLY_UPDATED_HOURS = 48  # Activity within this window counts as "recent"
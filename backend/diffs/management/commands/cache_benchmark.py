@@ -0,0 +1,92 @@
+"""Management command to compare cache serialization formats on real payloads."""
+import pickle
+import time
+import uuid
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from adaptapedia.cache import pack_value, unpack_value, zstandard, _get_redis_client
+
+CODECS = [
+    ('pickle', None),
+    ('pickle', 'zlib'),
+    ('pickle', 'zstd'),
+    ('json', None),
+    ('json', 'zlib'),
+    ('json', 'zstd'),
+]
+
+
+class Command(BaseCommand):
+    help = 'Benchmark cache serializers (bytes stored, CPU per get/set, Redis memory) on current data'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--iterations',
+            type=int,
+            default=50,
+            help='Encode/decode rounds per payload and codec (default: 50)',
+        )
+
+    def handle(self, *args, **options):
+        iterations = options['iterations']
+        client = _get_redis_client()
+
+        for name, payload in self._payloads():
+            self.stdout.write(self.style.MIGRATE_HEADING(f'\n{name}'))
+            self.stdout.write(
+                f"  {'codec':<14} {'stored B':>10} {'ratio':>6} {'set ms':>8} {'get ms':>8} {'redis B':>9}"
+            )
+            baseline = None
+
+            for fmt, compression in CODECS:
+                if compression == 'zstd' and zstandard is None:
+                    continue
+
+                # What the cache backend stores: the pickled (packed) value
+                raw = payload if (fmt, compression) == ('pickle', None) else None
+
+                started = time.perf_counter()
+                for _ in range(iterations):
+                    stored = raw if raw is not None else pack_value(payload, fmt, compression, min_bytes=0)
+                    data = pickle.dumps(stored, pickle.HIGHEST_PROTOCOL)
+                set_ms = (time.perf_counter() - started) * 1000 / iterations
+
+                started = time.perf_counter()
+                for _ in range(iterations):
+                    unpack_value(pickle.loads(data))
+                get_ms = (time.perf_counter() - started) * 1000 / iterations
+
+                baseline = baseline or len(data)
+                self.stdout.write(
+                    f"  {fmt + '+' + (compression or 'none'):<14} {len(data):>10} "
+                    f"{len(data) / baseline:>6.2f} {set_ms:>8.3f} {get_ms:>8.3f} "
+                    f"{self._redis_memory(client, stored):>9}"
+                )
+
+        if zstandard is None:
+            self.stdout.write(self.style.WARNING('\nzstandard not installed: zstd codecs skipped'))
+
+    def _payloads(self):
+        """Yield (name, payload) for the largest cached payloads, computed from current data."""
+        from diffs.sections import SECTIONS
+        from works.services import WorkService
+
+        browse = {name: compute() for name, (compute, _) in SECTIONS.items() if name != 'needs_help'}
+        yield 'browse (all sections)', browse
+        yield 'all_comparisons:popularity', browse['all_comparisons:popularity']
+        yield 'needs_help', SECTIONS['needs_help'][0]()
+        yield 'catalog (first page)', WorkService.get_catalog.__wrapped__(
+            sort_by='title', order='asc', genre=None, letter=None, page=1
+        )
+
+    def _redis_memory(self, client, stored):
+        """Bytes Redis reports for the stored value (MEMORY USAGE), or '-' without Redis."""
+        if client is None:
+            return '-'
+
+        key = f'cache_benchmark:{uuid.uuid4().hex}'
+        cache.set(key, stored, 60)
+        try:
+            return client.memory_usage(cache.make_key(key))
+        finally:
+            cache.delete(key)
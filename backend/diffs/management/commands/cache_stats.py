@@ -0,0 +1,66 @@
+"""Management command to show per-prefix cache metrics."""
+import json
+from django.core.management.base import BaseCommand
+from adaptapedia.cache import get_backend_stats, get_cache_metrics, reset_cache_metrics
+
+SORT_FIELDS = ['recompute_seconds', 'misses', 'hits', 'hit_rate', 'avg_payload_bytes', 'evictions']
+
+
+class Command(BaseCommand):
+    help = 'Show cache hit/miss, recompute time and payload size per key prefix'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--sort',
+            choices=SORT_FIELDS,
+            default='recompute_seconds',
+            help='Sort prefixes by this metric, descending (default: recompute_seconds)',
+        )
+        parser.add_argument(
+            '--json',
+            action='store_true',
+            help='Print raw metrics as JSON',
+        )
+        parser.add_argument(
+            '--reset',
+            action='store_true',
+            help='Clear all collected metrics after printing them',
+        )
+
+    def handle(self, *args, **options):
+        metrics = get_cache_metrics()
+        backend = get_backend_stats()
+
+        if options['json']:
+            self.stdout.write(json.dumps({'prefixes': metrics, 'backend': backend}, indent=2))
+        elif not metrics:
+            self.stdout.write(self.style.WARNING('No cache metrics recorded yet'))
+        else:
+            self._print_table(metrics, options['sort'])
+            if backend:
+                self.stdout.write(
+                    f"\nRedis: {backend['evicted_keys']} evicted keys, "
+                    f"{backend['expired_keys']} expired keys, "
+                    f"{backend['used_memory']} bytes used (maxmemory-policy {backend['maxmemory_policy']})"
+                )
+
+        if options['reset']:
+            reset_cache_metrics()
+            self.stdout.write(self.style.SUCCESS('Cache metrics reset'))
+
+    def _print_table(self, metrics, sort):
+        """Print one row per prefix, sorted by the chosen metric."""
+        header = (
+            f"{'prefix':<36} {'hits':>9} {'misses':>8} {'hit %':>6} "
+            f"{'recomp':>7} {'total s':>9} {'avg ms':>8} {'avg KB':>8} {'evict':>6}"
+        )
+        self.stdout.write(header)
+        self.stdout.write('-' * len(header))
+
+        rows = sorted(metrics.items(), key=lambda item: item[1][sort], reverse=True)
+        for prefix, m in rows:
+            self.stdout.write(
+                f"{prefix[:36]:<36} {m['hits']:>9} {m['misses']:>8} {m['hit_rate'] * 100:>6.1f} "
+                f"{m['recomputes']:>7} {m['recompute_seconds']:>9.2f} {m['avg_recompute_ms']:>8.1f} "
+                f"{m['avg_payload_bytes'] / 1024:>8.1f} {m['evictions']:>6}"
+            )
@@ -1,6 +1,6 @@
 """Management command to clear browse page cache."""
 from django.core.management.base import BaseCommand
-from django.core.cache import cache
+from adaptapedia.cache import invalidate_tags, BROWSE_TAG, TRENDING_TAG, NEEDS_HELP_TAG
 
 
 class Command(BaseCommand):
@@ -8,12 +8,9 @@ class Command(BaseCommand):
 
     def handle(self, *args, **options):
         try:
-            # Clear browse page cache
-            cache.delete('browse_page_sections')
-
-            # Clear needs_help cache variants
-            for limit in [10, 20, 30, 40, 50]:
-                cache.delete(f'needs_help_limit_{limit}')
+            # Bump the browse, trending and needs-help tags; every sort/limit
+            # variant cached under them is orphaned at once
+            invalidate_tags(BROWSE_TAG, TRENDING_TAG, NEEDS_HELP_TAG)
 
             self.stdout.write(
                 self.style.SUCCESS('Successfully cleared browse page cache')
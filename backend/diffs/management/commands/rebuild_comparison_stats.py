@@ -0,0 +1,11 @@
+"""Management command to recompute the materialized per-comparison stats."""
+from django.core.management.base import BaseCommand
+from diffs.services import ComparisonStatsService
+
+
+class Command(BaseCommand):
+    help = 'Recompute ComparisonStats for every comparison from diffs, comments and votes'
+
+    def handle(self, *args, **options):
+        count = ComparisonStatsService.rebuild()
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt stats for {count} comparisons'))
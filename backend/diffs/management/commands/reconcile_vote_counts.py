@@ -0,0 +1,24 @@
+"""Management command to repair denormalized vote counters on diffs."""
+from django.core.management.base import BaseCommand
+from diffs.services import DiffService
+
+
+class Command(BaseCommand):
+    help = 'Recount votes and fix diffs whose denormalized vote counters drifted'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Only report how many diffs drifted',
+        )
+
+    def handle(self, *args, **options):
+        drifted = DiffService.reconcile_vote_counts(dry_run=options['dry_run'])
+
+        if not drifted:
+            self.stdout.write(self.style.SUCCESS('All vote counters are correct'))
+        elif options['dry_run']:
+            self.stdout.write(self.style.WARNING(f'{drifted} diffs have drifted vote counters'))
+        else:
+            self.stdout.write(self.style.SUCCESS(f'Fixed vote counters on {drifted} diffs'))
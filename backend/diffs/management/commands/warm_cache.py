@@ -0,0 +1,38 @@
+"""Management command to pre-compute browse, trending, catalog and comparison caches."""
+from django.core.management.base import BaseCommand
+from diffs.cache_warmer import warm_cache
+
+
+class Command(BaseCommand):
+    help = 'Pre-compute cached browse sections, trending, catalog pages and top comparisons'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--concurrency',
+            type=int,
+            help='Maximum jobs running at once (default: CACHE_WARM_CONCURRENCY)',
+        )
+        parser.add_argument(
+            '--top',
+            type=int,
+            help='Number of comparison pages to warm (default: CACHE_WARM_TOP_COMPARISONS)',
+        )
+
+    def handle(self, *args, **options):
+        report = warm_cache(concurrency=options['concurrency'], top_comparisons=options['top'])
+
+        for job in sorted(report['jobs'], key=lambda job: job['seconds'], reverse=True):
+            line = f"  {job['seconds']:>8.3f}s  {job['name']}"
+            if job['error']:
+                self.stdout.write(self.style.ERROR(f"{line}  FAILED: {job['error']}"))
+            else:
+                self.stdout.write(line)
+
+        summary = (
+            f"Warmed {len(report['jobs']) - report['failed']}/{len(report['jobs'])} "
+            f"cache entries in {report['total_seconds']}s"
+        )
+        if report['failed']:
+            self.stdout.write(self.style.WARNING(summary))
+        else:
+            self.stdout.write(self.style.SUCCESS(summary))
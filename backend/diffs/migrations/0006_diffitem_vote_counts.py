@@ -0,0 +1,124 @@
+# Generated by Django 4.2.10 on 2026-10-16 23:47
+
+from django.db import migrations, models
+import django.db.models.expressions
+
+
+def backfill_vote_counts(apps, schema_editor):
+    """Populate the new counters from existing votes."""
+    from django.db.models import Count, OuterRef, Subquery
+    from django.db.models.functions import Coalesce
+
+    DiffItem = apps.get_model("diffs", "DiffItem")
+    DiffVote = apps.get_model("diffs", "DiffVote")
+
+    def vote_count(vote_type=None):
+        votes = DiffVote.objects.filter(diff_item=OuterRef("pk"))
+        if vote_type:
+            votes = votes.filter(vote=vote_type)
+        return Coalesce(
+            Subquery(votes.order_by().values("diff_item").annotate(n=Count("id")).values("n")),
+            0,
+        )
+
+    DiffItem.objects.update(
+        accurate_count=vote_count("ACCURATE"),
+        nuance_count=vote_count("NEEDS_NUANCE"),
+        disagree_count=vote_count("DISAGREE"),
+        total_votes=vote_count(),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("diffs", "0005_diffitem_image"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="diffitem",
+            name="accurate_count",
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="diffitem",
+            name="disagree_count",
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="diffitem",
+            name="nuance_count",
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="diffitem",
+            name="total_votes",
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name="comparisonvote",
+            index=models.Index(
+                fields=["user", "-created_at"], name="diffs_compa_user_id_7ce840_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="diffcomment",
+            index=models.Index(
+                fields=["diff_item", "status"], name="diffs_diffc_diff_it_3b525e_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="diffcomment",
+            index=models.Index(
+                fields=["user", "-created_at"], name="diffs_diffc_user_id_fa6184_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="diffitem",
+            index=models.Index(
+                fields=["updated_at"], name="diffs_diffi_updated_1e95fe_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="diffitem",
+            index=models.Index(
+                fields=["created_at"], name="diffs_diffi_created_caea56_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="diffitem",
+            index=models.Index(
+                fields=["status", "updated_at"], name="diffs_diffi_status_3d8088_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="diffitem",
+            index=models.Index(
+                fields=["status", "work", "screen_work"],
+                name="diffs_diffi_status_e56d44_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="diffitem",
+            index=models.Index(
+                models.F("status"),
+                models.OrderBy(
+                    django.db.models.expressions.CombinedExpression(
+                        models.F("accurate_count"), "-", models.F("disagree_count")
+                    ),
+                    descending=True,
+                ),
+                models.OrderBy(models.F("accurate_count"), descending=True),
+                models.OrderBy(models.F("created_at"), descending=True),
+                name="diffs_diffitem_best_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="diffvote",
+            index=models.Index(
+                fields=["created_at"], name="diffs_diffv_created_9499f0_idx"
+            ),
+        ),
+        migrations.RunPython(backfill_vote_counts, migrations.RunPython.noop),
+    ]
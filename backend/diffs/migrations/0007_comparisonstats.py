@@ -0,0 +1,149 @@
+# Generated by Django 4.2.10 on 2026-10-16 23:56
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def backfill_comparison_stats(apps, schema_editor):
+    """Populate stats for every comparison with an edge, a diff or a comparison vote."""
+    from django.db.models import Count, Max, Q, Sum
+
+    AdaptationEdge = apps.get_model("screen", "AdaptationEdge")
+    ComparisonStats = apps.get_model("diffs", "ComparisonStats")
+    ComparisonVote = apps.get_model("diffs", "ComparisonVote")
+    DiffComment = apps.get_model("diffs", "DiffComment")
+    DiffItem = apps.get_model("diffs", "DiffItem")
+
+    rows = {}
+
+    def row(work_id, screen_work_id):
+        return rows.setdefault((work_id, screen_work_id), {})
+
+    diffs = DiffItem.objects.filter(status="LIVE").values("work_id", "screen_work_id").annotate(
+        n=Count("id"), votes=Sum("total_votes"), last=Max("updated_at")
+    ).order_by()
+    for item in diffs:
+        row(item["work_id"], item["screen_work_id"]).update(
+            diff_count=item["n"], vote_count=item["votes"] or 0, last_activity=item["last"]
+        )
+
+    comments = DiffComment.objects.filter(status="LIVE", diff_item__status="LIVE").values(
+        "diff_item__work_id", "diff_item__screen_work_id"
+    ).annotate(n=Count("id")).order_by()
+    for item in comments:
+        row(item["diff_item__work_id"], item["diff_item__screen_work_id"])["comment_count"] = item["n"]
+
+    confirmed = Q(has_read_book=True, has_watched_adaptation=True)
+    rated = confirmed & ~Q(preference="DIDNT_FINISH")
+    votes = ComparisonVote.objects.values("work_id", "screen_work_id").annotate(
+        n=Count("id"),
+        book=Count("id", filter=confirmed & Q(preference="BOOK")),
+        screen=Count("id", filter=confirmed & Q(preference="SCREEN")),
+        tie=Count("id", filter=confirmed & Q(preference="TIE")),
+        didnt_finish=Count("id", filter=confirmed & Q(preference="DIDNT_FINISH")),
+        rating_sum=Sum("faithfulness_rating", filter=rated),
+        rating_count=Count("faithfulness_rating", filter=rated),
+    ).order_by()
+    for item in votes:
+        row(item["work_id"], item["screen_work_id"]).update(
+            comparison_vote_count=item["n"],
+            preference_book=item["book"],
+            preference_screen=item["screen"],
+            preference_tie=item["tie"],
+            preference_didnt_finish=item["didnt_finish"],
+            faithfulness_sum=item["rating_sum"] or 0,
+            faithfulness_count=item["rating_count"],
+        )
+
+    for edge_id, work_id, screen_work_id in AdaptationEdge.objects.values_list("id", "work_id", "screen_work_id"):
+        row(work_id, screen_work_id)["edge_id"] = edge_id
+
+    ComparisonStats.objects.bulk_create(
+        [
+            ComparisonStats(work_id=work_id, screen_work_id=screen_work_id, **values)
+            for (work_id, screen_work_id), values in rows.items()
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("screen", "0008_screenwork_average_rating_screenwork_ratings_count"),
+        ("works", "0004_work_average_rating_work_ratings_count"),
+        ("diffs", "0006_diffitem_vote_counts"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ComparisonStats",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("diff_count", models.IntegerField(default=0)),
+                ("vote_count", models.IntegerField(default=0)),
+                ("comment_count", models.IntegerField(default=0)),
+                (
+                    "last_activity",
+                    models.DateTimeField(
+                        blank=True, help_text="Latest update of a LIVE diff", null=True
+                    ),
+                ),
+                ("comparison_vote_count", models.IntegerField(default=0)),
+                ("preference_book", models.IntegerField(default=0)),
+                ("preference_screen", models.IntegerField(default=0)),
+                ("preference_tie", models.IntegerField(default=0)),
+                ("preference_didnt_finish", models.IntegerField(default=0)),
+                ("faithfulness_sum", models.IntegerField(default=0)),
+                ("faithfulness_count", models.IntegerField(default=0)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "edge",
+                    models.OneToOneField(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="stats",
+                        to="screen.adaptationedge",
+                    ),
+                ),
+                (
+                    "screen_work",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="comparison_stats",
+                        to="screen.screenwork",
+                    ),
+                ),
+                (
+                    "work",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="comparison_stats",
+                        to="works.work",
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["-diff_count", "-vote_count"],
+                        name="diffs_compa_diff_co_a14c83_idx",
+                    ),
+                    models.Index(
+                        fields=["-last_activity"], name="diffs_compa_last_ac_63a716_idx"
+                    ),
+                ],
+                "unique_together": {("work", "screen_work")},
+            },
+        ),
+        migrations.RunPython(backfill_comparison_stats, migrations.RunPython.noop),
+    ]
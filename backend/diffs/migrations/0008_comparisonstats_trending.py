@@ -0,0 +1,91 @@
+# Generated by Django 4.2.10 on 2026-10-17 00:03
+
+import math
+
+from django.db import migrations, models
+
+# Frozen copies of the trending constants at the time of this migration
+HALF_LIFE_HOURS = 48
+WEIGHTS = {"diffs": 3.0, "votes": 1.0, "comments": 1.0}
+
+
+def backfill_trending(apps, schema_editor):
+    """Compute decayed trending activity for existing comparisons, as of their latest event."""
+    from django.db.models import DateTimeField, DurationField, ExpressionWrapper, F, FloatField, Max, Sum, Value
+    from django.db.models.functions import Exp, Extract, Greatest
+    from django.utils import timezone
+
+    ComparisonStats = apps.get_model("diffs", "ComparisonStats")
+    DiffComment = apps.get_model("diffs", "DiffComment")
+    DiffItem = apps.get_model("diffs", "DiffItem")
+    DiffVote = apps.get_model("diffs", "DiffVote")
+
+    now = timezone.now()
+    time_constant = HALF_LIFE_HOURS * 3600 / math.log(2)
+    offset = ExpressionWrapper(
+        F("created_at") - Value(now, output_field=DateTimeField()), output_field=DurationField()
+    )
+    exponent = ExpressionWrapper(Extract(offset, "epoch") / time_constant, output_field=FloatField())
+    decay = Exp(Greatest(exponent, Value(-600.0)), output_field=FloatField())
+
+    sources = (
+        ("diffs", DiffItem.objects.filter(status="LIVE"), ""),
+        ("votes", DiffVote.objects.filter(diff_item__status="LIVE"), "diff_item__"),
+        ("comments", DiffComment.objects.filter(status="LIVE", diff_item__status="LIVE"), "diff_item__"),
+    )
+    activity = {}
+    for kind, queryset, prefix in sources:
+        rows = queryset.values_list(f"{prefix}work_id", f"{prefix}screen_work_id").annotate(
+            latest=Max("created_at"), decayed=Sum(decay)
+        ).order_by()
+        for work_id, screen_work_id, latest, decayed in rows:
+            entry = activity.setdefault((work_id, screen_work_id), {"latest": latest})
+            entry["latest"] = max(entry["latest"], latest)
+            entry[kind] = decayed
+
+    for (work_id, screen_work_id), entry in activity.items():
+        growth = math.exp(min((now - entry["latest"]).total_seconds() / time_constant, 600.0))
+        values = {kind: entry.get(kind, 0) * growth for kind in WEIGHTS}
+        ComparisonStats.objects.filter(work_id=work_id, screen_work_id=screen_work_id).update(
+            trending_score=sum(values[kind] * weight for kind, weight in WEIGHTS.items()),
+            trending_diffs=values["diffs"],
+            trending_votes=values["votes"],
+            trending_at=entry["latest"],
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("diffs", "0007_comparisonstats"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="comparisonstats",
+            name="trending_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="comparisonstats",
+            name="trending_diffs",
+            field=models.FloatField(default=0),
+        ),
+        migrations.AddField(
+            model_name="comparisonstats",
+            name="trending_score",
+            field=models.FloatField(default=0),
+        ),
+        migrations.AddField(
+            model_name="comparisonstats",
+            name="trending_votes",
+            field=models.FloatField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name="comparisonstats",
+            index=models.Index(
+                fields=["-trending_at"], name="diffs_compa_trendin_d76ab8_idx"
+            ),
+        ),
+        migrations.RunPython(backfill_trending, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 4.2.10 on 2026-10-17 00:08
+
+from django.db import migrations, models
+import django.db.models.expressions
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("diffs", "0008_comparisonstats_trending"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="comparisonstats",
+            name="diffs_compa_diff_co_a14c83_idx",
+        ),
+        migrations.AddIndex(
+            model_name="comparisonstats",
+            index=models.Index(
+                fields=["-diff_count", "-vote_count", "-id"],
+                name="diffs_compa_diff_co_9586fa_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="comparisonstats",
+            index=models.Index(
+                models.OrderBy(
+                    models.F("last_activity"), descending=True, nulls_last=True
+                ),
+                models.OrderBy(models.F("id"), descending=True),
+                name="diffs_stats_recent_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="comparisonstats",
+            index=models.Index(
+                models.OrderBy(
+                    models.F("last_activity"), descending=True, nulls_last=True
+                ),
+                models.OrderBy(
+                    django.db.models.expressions.CombinedExpression(
+                        models.F("diff_count"), "+", models.F("vote_count")
+                    ),
+                    descending=True,
+                ),
+                models.OrderBy(models.F("id"), descending=True),
+                name="diffs_stats_trending_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,67 @@
+# Generated by Django 4.2.10 on 2026-10-17 00:27
+
+from django.db import migrations, models
+
+
+def backfill_histogram(apps, schema_editor):
+    """Count faithfulness ratings per comparison from confirmed, finished comparison votes."""
+    from django.db.models import Count, Q
+
+    ComparisonStats = apps.get_model("diffs", "ComparisonStats")
+    ComparisonVote = apps.get_model("diffs", "ComparisonVote")
+
+    rated = Q(has_read_book=True, has_watched_adaptation=True) & ~Q(preference="DIDNT_FINISH")
+    rows = ComparisonVote.objects.values("work_id", "screen_work_id").annotate(
+        **{
+            f"faithfulness_{rating}": Count("id", filter=rated & Q(faithfulness_rating=rating))
+            for rating in range(1, 6)
+        }
+    ).order_by()
+    for row in rows:
+        ComparisonStats.objects.filter(work_id=row.pop("work_id"), screen_work_id=row.pop("screen_work_id")).update(
+            **row
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("diffs", "0009_comparisonstats_browse_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="comparisonstats",
+            name="faithfulness_1",
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="comparisonstats",
+            name="faithfulness_2",
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="comparisonstats",
+            name="faithfulness_3",
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="comparisonstats",
+            name="faithfulness_4",
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="comparisonstats",
+            name="faithfulness_5",
+            field=models.IntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_histogram, migrations.RunPython.noop),
+        migrations.RemoveField(
+            model_name="comparisonstats",
+            name="faithfulness_count",
+        ),
+        migrations.RemoveField(
+            model_name="comparisonstats",
+            name="faithfulness_sum",
+        ),
+    ]
@@ -0,0 +1,78 @@
+# Generated by Django 4.2.10 on 2026-10-17 00:32
+
+from django.db import migrations, models
+
+# Frozen copies of the dispute constants at the time of this migration
+MIN_VOTES_FOR_DISPUTE = 5
+DISPUTE_ACCURACY_MIN = 0.3
+DISPUTE_ACCURACY_MAX = 0.7
+
+
+def backfill_flags(apps, schema_editor):
+    """Compute the needs-help flags of existing diffs."""
+    from django.db.models import (
+        BooleanField, Case, Exists, ExpressionWrapper, F, FloatField, OuterRef, Value, When,
+    )
+    from django.db.models.functions import Cast, NullIf
+    from django.db.models.lookups import GreaterThanOrEqual, LessThanOrEqual
+
+    DiffComment = apps.get_model("diffs", "DiffComment")
+    DiffItem = apps.get_model("diffs", "DiffItem")
+
+    accurate_ratio = ExpressionWrapper(
+        Cast(F("accurate_count"), FloatField()) / NullIf(F("total_votes"), 0), output_field=FloatField()
+    )
+    DiffItem.objects.update(
+        is_disputed=Case(
+            When(
+                GreaterThanOrEqual(F("total_votes"), MIN_VOTES_FOR_DISPUTE)
+                & GreaterThanOrEqual(accurate_ratio, DISPUTE_ACCURACY_MIN)
+                & LessThanOrEqual(accurate_ratio, DISPUTE_ACCURACY_MAX),
+                then=Value(True),
+            ),
+            default=Value(False),
+            output_field=BooleanField(),
+        ),
+        has_live_comments=Exists(DiffComment.objects.filter(diff_item=OuterRef("pk"), status="LIVE")),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("diffs", "0010_comparisonstats_faithfulness_histogram"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="diffitem",
+            name="has_live_comments",
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name="diffitem",
+            name="is_disputed",
+            field=models.BooleanField(default=False),
+        ),
+        migrations.RunPython(backfill_flags, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="diffitem",
+            index=models.Index(
+                condition=models.Q(("is_disputed", True), ("status", "LIVE")),
+                fields=["work", "screen_work"],
+                name="diffs_item_disputed_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="diffitem",
+            index=models.Index(
+                condition=models.Q(
+                    ("has_live_comments", False),
+                    ("status", "LIVE"),
+                    ("total_votes__gte", 1),
+                ),
+                fields=["work", "screen_work"],
+                name="diffs_item_uncommented_idx",
+            ),
+        ),
+    ]
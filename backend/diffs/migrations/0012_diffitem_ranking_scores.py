@@ -0,0 +1,96 @@
+# Generated by Django 4.2.10 on 2026-10-17 00:36
+
+from django.db import migrations, models
+
+# Frozen copy of the Wilson z at the time of this migration
+WILSON_Z = 1.96
+
+
+def backfill_scores(apps, schema_editor):
+    """Compute the ranking scores of existing diffs from their vote counters."""
+    from django.db.models import Case, F, FloatField, Value, When
+    from django.db.models.functions import Cast, Greatest, Least, NullIf, Power, Sqrt
+    from django.db.models.lookups import GreaterThanOrEqual
+
+    DiffItem = apps.get_model("diffs", "DiffItem")
+
+    z2 = WILSON_Z * WILSON_Z
+    n = Cast(NullIf(F("total_votes"), 0), FloatField())
+    p = Cast(F("accurate_count"), FloatField()) / n
+    accurate = Cast(F("accurate_count"), FloatField())
+    disagree = Cast(F("disagree_count"), FloatField())
+    DiffItem.objects.update(
+        wilson_score=Case(
+            When(
+                GreaterThanOrEqual(F("total_votes"), 1),
+                then=(p + z2 / (2 * n) - WILSON_Z * Sqrt((p * (1 - p) + z2 / (4 * n)) / n)) / (1 + z2 / n),
+            ),
+            default=Value(0.0),
+            output_field=FloatField(),
+        ),
+        controversy_score=Case(
+            When(
+                GreaterThanOrEqual(accurate, 1) & GreaterThanOrEqual(disagree, 1),
+                then=Power(accurate + disagree, Least(accurate, disagree) / Greatest(accurate, disagree)),
+            ),
+            default=Value(0.0),
+            output_field=FloatField(),
+        ),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("diffs", "0011_diffitem_needs_help_flags"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="diffitem",
+            name="diffs_diffitem_best_idx",
+        ),
+        migrations.AddField(
+            model_name="diffitem",
+            name="controversy_score",
+            field=models.FloatField(default=0),
+        ),
+        migrations.AddField(
+            model_name="diffitem",
+            name="wilson_score",
+            field=models.FloatField(default=0),
+        ),
+        migrations.RunPython(backfill_scores, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="diffitem",
+            index=models.Index(
+                models.F("status"),
+                models.OrderBy(models.F("wilson_score"), descending=True),
+                models.OrderBy(models.F("created_at"), descending=True),
+                name="diffs_diffitem_best_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="diffitem",
+            index=models.Index(
+                models.F("work"),
+                models.F("screen_work"),
+                models.F("status"),
+                models.OrderBy(models.F("wilson_score"), descending=True),
+                models.OrderBy(models.F("created_at"), descending=True),
+                name="diffs_item_cmp_best_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="diffitem",
+            index=models.Index(
+                models.F("work"),
+                models.F("screen_work"),
+                models.F("status"),
+                models.OrderBy(models.F("controversy_score"), descending=True),
+                models.OrderBy(models.F("total_votes"), descending=True),
+                models.OrderBy(models.F("created_at"), descending=True),
+                name="diffs_item_cmp_controv_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,87 @@
+# Generated by Django 4.2.10 on 2026-10-17 00:42
+
+from django.db import migrations, models
+
+# Frozen copy of SPOILER_SCOPE_ORDER at the time of this migration
+SPOILER_SCOPE_ORDER = {
+    "NONE": 0,
+    "BOOK_ONLY": 1,
+    "SCREEN_ONLY": 1,
+    "FULL": 2,
+}
+
+
+def backfill_spoiler_levels(apps, schema_editor):
+    """Set the spoiler level of existing diffs and comments from their scope."""
+    from django.db.models import Case, Value, When
+
+    level = Case(
+        *[When(spoiler_scope=scope, then=Value(value)) for scope, value in SPOILER_SCOPE_ORDER.items()],
+        default=Value(0),
+    )
+    for model_name in ("DiffItem", "DiffComment"):
+        apps.get_model("diffs", model_name).objects.exclude(spoiler_scope="NONE").update(spoiler_level=level)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("diffs", "0012_diffitem_ranking_scores"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="diffcomment",
+            name="spoiler_level",
+            field=models.PositiveSmallIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="diffitem",
+            name="spoiler_level",
+            field=models.PositiveSmallIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_spoiler_levels, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="diffcomment",
+            index=models.Index(
+                fields=["diff_item", "status", "spoiler_level", "created_at"],
+                name="diffs_comment_spl_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="diffitem",
+            index=models.Index(
+                models.F("work"),
+                models.F("screen_work"),
+                models.F("status"),
+                models.F("spoiler_level"),
+                models.OrderBy(models.F("wilson_score"), descending=True),
+                models.OrderBy(models.F("created_at"), descending=True),
+                name="diffs_item_spl_best_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="diffitem",
+            index=models.Index(
+                models.F("work"),
+                models.F("screen_work"),
+                models.F("status"),
+                models.F("spoiler_level"),
+                models.OrderBy(models.F("created_at"), descending=True),
+                name="diffs_item_spl_new_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="diffitem",
+            index=models.Index(
+                models.F("work"),
+                models.F("screen_work"),
+                models.F("status"),
+                models.F("spoiler_level"),
+                models.OrderBy(models.F("controversy_score"), descending=True),
+                models.OrderBy(models.F("total_votes"), descending=True),
+                models.OrderBy(models.F("created_at"), descending=True),
+                name="diffs_item_spl_controv_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,97 @@
+# Generated by Django 4.2.10 on 2026-10-17 00:48
+
+from django.db import migrations, models
+
+# Frozen copy of COMMENT_PATH_WIDTH at the time of this migration
+COMMENT_PATH_WIDTH = 10
+BATCH_SIZE = 1000
+
+
+def backfill_paths(apps, schema_editor):
+    """Set the path, depth and visible reply counts of existing comments."""
+    DiffComment = apps.get_model("diffs", "DiffComment")
+
+    rows = {
+        pk: (parent_id, status)
+        for pk, parent_id, status in DiffComment.objects.values_list("id", "parent_id", "status")
+    }
+    paths = {}
+    for pk in sorted(rows):
+        # Walk up to the nearest ancestor with a known path
+        chain = [pk]
+        while rows[chain[-1]][0] is not None and rows[chain[-1]][0] not in paths:
+            chain.append(rows[chain[-1]][0])
+        for node in reversed(chain):
+            parent_id = rows[node][0]
+            paths[node] = (paths[parent_id] if parent_id else "") + f"{node:0{COMMENT_PATH_WIDTH}d}"
+
+    visible = {}
+    for pk in sorted(rows, key=paths.get):
+        parent_id, status = rows[pk]
+        visible[pk] = status == "LIVE" and (parent_id is None or visible[parent_id])
+
+    reply_counts = dict.fromkeys(rows, 0)
+    descendant_counts = dict.fromkeys(rows, 0)
+    for pk in sorted(rows, key=paths.get, reverse=True):
+        parent_id = rows[pk][0]
+        if parent_id is not None and visible[pk]:
+            reply_counts[parent_id] += 1
+            descendant_counts[parent_id] += 1 + descendant_counts[pk]
+
+    DiffComment.objects.bulk_update(
+        [
+            DiffComment(
+                id=pk,
+                path=paths[pk],
+                depth=len(paths[pk]) // COMMENT_PATH_WIDTH - 1,
+                reply_count=reply_counts[pk],
+                descendant_count=descendant_counts[pk],
+            )
+            for pk in rows
+        ],
+        ["path", "depth", "reply_count", "descendant_count"],
+        batch_size=BATCH_SIZE,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("diffs", "0013_spoiler_level"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="diffcomment",
+            name="depth",
+            field=models.PositiveSmallIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="diffcomment",
+            name="descendant_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="diffcomment",
+            name="path",
+            field=models.TextField(db_collation="C", default="", editable=False),
+        ),
+        migrations.AddField(
+            model_name="diffcomment",
+            name="reply_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_paths, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="diffcomment",
+            index=models.Index(
+                fields=["diff_item", "path"], name="diffs_comment_thread_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="diffcomment",
+            index=models.Index(
+                fields=["diff_item", "depth", "path"], name="diffs_comment_roots_idx"
+            ),
+        ),
+    ]
@@ -1,5 +1,7 @@
 """Models for diffs between books and screen adaptations."""
-from django.db import models
+from typing import Dict
+from django.db import connection, models
+from django.db.models import F
 from django.contrib.auth import get_user_model
 
 User = get_user_model()
@@ -39,6 +41,16 @@ class DiffStatus(models.TextChoices):
     FLAGGED = 'FLAGGED', 'Flagged'
 
 
+def _sync_spoiler_level(instance: models.Model, save_kwargs: Dict) -> None:
+    """Set spoiler_level from spoiler_scope before a save, saving it along with the scope."""
+    from .constants import SPOILER_SCOPE_ORDER
+
+    instance.spoiler_level = SPOILER_SCOPE_ORDER.get(instance.spoiler_scope, 0)
+    update_fields = save_kwargs.get('update_fields')
+    if update_fields is not None and 'spoiler_scope' in update_fields:
+        save_kwargs['update_fields'] = {*update_fields, 'spoiler_level'}
+
+
 class DiffItem(models.Model):
     """A specific difference between a book and its screen adaptation."""
 
@@ -48,6 +60,8 @@ class DiffItem(models.Model):
     claim = models.CharField(max_length=200, help_text="Short description of the difference")
     detail = models.TextField(blank=True, help_text="Detailed explanation (optional)")
     spoiler_scope = models.CharField(max_length=15, choices=SpoilerScope.choices, default=SpoilerScope.NONE)
+    # SPOILER_SCOPE_ORDER of spoiler_scope, set on save, so spoiler filters are index ranges
+    spoiler_level = models.PositiveSmallIntegerField(default=0, editable=False)
     status = models.CharField(max_length=10, choices=DiffStatus.choices, default=DiffStatus.LIVE)
     image = models.ImageField(
         upload_to='diff_images/',
@@ -59,6 +73,24 @@ class DiffItem(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    # Denormalized vote counters, kept in sync by diffs.signals
+    # (repair with `manage.py reconcile_vote_counts`)
+    accurate_count = models.IntegerField(default=0)
+    nuance_count = models.IntegerField(default=0)
+    disagree_count = models.IntegerField(default=0)
+    total_votes = models.IntegerField(default=0)
+
+    # Needs-help flags, kept in sync by diffs.signals: votes split between
+    # DISPUTE_ACCURACY_MIN and DISPUTE_ACCURACY_MAX accurate, and any LIVE comment
+    is_disputed = models.BooleanField(default=False)
+    has_live_comments = models.BooleanField(default=False)
+
+    # Ranking scores, recomputed with the vote counters: lower bound of the
+    # Wilson score interval for the accurate share of votes ('best'), and
+    # (accurate + disagree) ** (minority / majority) ('controversial')
+    wilson_score = models.FloatField(default=0)
+    controversy_score = models.FloatField(default=0)
+
     class Meta:
         """Meta options for DiffItem model."""
 
@@ -72,22 +104,65 @@ class DiffItem(models.Model):
             models.Index(fields=['created_at']),  # For ordering
             models.Index(fields=['status', 'updated_at']),  # Composite for filtered sorts
             models.Index(fields=['status', 'work', 'screen_work']),  # For comparison queries
+            # 'best' and 'controversial' orderings, across all diffs and per comparison
+            models.Index(
+                F('status'), F('wilson_score').desc(), F('created_at').desc(),
+                name='diffs_diffitem_best_idx',
+            ),
+            models.Index(
+                F('work'), F('screen_work'), F('status'), F('wilson_score').desc(), F('created_at').desc(),
+                name='diffs_item_cmp_best_idx',
+            ),
+            models.Index(
+                F('work'), F('screen_work'), F('status'),
+                F('controversy_score').desc(), F('total_votes').desc(), F('created_at').desc(),
+                name='diffs_item_cmp_controv_idx',
+            ),
+            # The same per comparison orderings within a maximum spoiler level
+            models.Index(
+                F('work'), F('screen_work'), F('status'), F('spoiler_level'),
+                F('wilson_score').desc(), F('created_at').desc(),
+                name='diffs_item_spl_best_idx',
+            ),
+            models.Index(
+                F('work'), F('screen_work'), F('status'), F('spoiler_level'), F('created_at').desc(),
+                name='diffs_item_spl_new_idx',
+            ),
+            models.Index(
+                F('work'), F('screen_work'), F('status'), F('spoiler_level'),
+                F('controversy_score').desc(), F('total_votes').desc(), F('created_at').desc(),
+                name='diffs_item_spl_controv_idx',
+            ),
+            # Needs-help sections (DiffService.get_needs_help)
+            models.Index(
+                fields=['work', 'screen_work'],
+                condition=models.Q(status='LIVE', is_disputed=True),
+                name='diffs_item_disputed_idx',
+            ),
+            models.Index(
+                fields=['work', 'screen_work'],
+                condition=models.Q(status='LIVE', has_live_comments=False, total_votes__gte=1),
+                name='diffs_item_uncommented_idx',
+            ),
         ]
 
     def __str__(self) -> str:
         """String representation of DiffItem."""
         return f"{self.get_category_display()}: {self.claim[:50]}"
 
+    def save(self, *args, **kwargs):
+        """Save the diff, keeping spoiler_level in step with spoiler_scope."""
+        _sync_spoiler_level(self, kwargs)
+        super().save(*args, **kwargs)
+
     @property
     def vote_counts(self) -> dict[str, int]:
         """Get vote counts for this diff."""
-        from django.db.models import Count, Q
-        votes = self.votes.aggregate(
-            accurate=Count('id', filter=Q(vote='ACCURATE')),
-            needs_nuance=Count('id', filter=Q(vote='NEEDS_NUANCE')),
-            disagree=Count('id', filter=Q(vote='DISAGREE'))
-        )
-        return votes
+        return {
+            'accurate': self.accurate_count,
+            'needs_nuance': self.nuance_count,
+            'disagree': self.disagree_count,
+        }
 
 
 class VoteType(models.TextChoices):
@@ -115,6 +190,13 @@ class DiffVote(models.Model):
             models.Index(fields=['created_at']),  # For trending queries with date filters
         ]
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Remember the stored vote, so signals can move the diff's counters."""
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_vote = instance.__dict__.get('vote')
+        return instance
+
     def __str__(self) -> str:
         """String representation of DiffVote."""
         return f"{self.user.username} → {self.get_vote_display()}"
@@ -137,15 +219,33 @@ class DiffComment(models.Model):
     parent = models.ForeignKey('self', on_delete=models.CASCADE, null=True, blank=True, related_name='replies')
     body = models.TextField()
     spoiler_scope = models.CharField(max_length=15, choices=SpoilerScope.choices, default=SpoilerScope.NONE)
+    spoiler_level = models.PositiveSmallIntegerField(default=0, editable=False)  # See DiffItem.spoiler_level
     status = models.CharField(max_length=10, choices=CommentStatus.choices, default=CommentStatus.LIVE)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    # Materialized path: the zero-padded IDs of the thread's root, ..., the
+    # parent and this comment, set on insert. Sorting by path gives display
+    # order (each thread oldest first, replies after their parent), and a
+    # thread or subtree is a path prefix. C collation keeps the order bytewise.
+    path = models.TextField(db_collation='C', default='', editable=False)
+    depth = models.PositiveSmallIntegerField(default=0, editable=False)
+
+    # Visible (LIVE, under LIVE ancestors) direct replies and replies at any
+    # depth, kept in sync by diffs.signals
+    reply_count = models.PositiveIntegerField(default=0, editable=False)
+    descendant_count = models.PositiveIntegerField(default=0, editable=False)
+
     class Meta:
         """Meta options for DiffComment model."""
 
         ordering = ['created_at']
         indexes = [
             models.Index(fields=['diff_item', 'status']),  # For filtering live comments
+            models.Index(fields=['diff_item', 'path'], name='diffs_comment_thread_idx'),  # Threads in display order
+            models.Index(fields=['diff_item', 'depth', 'path'], name='diffs_comment_roots_idx'),  # Top-level comments
+            models.Index(  # Live comments within a maximum spoiler level
+                fields=['diff_item', 'status', 'spoiler_level', 'created_at'], name='diffs_comment_spl_idx'
+            ),
             models.Index(fields=['user', '-created_at']),  # For user comment history
         ]
 
@@ -153,6 +253,26 @@ class DiffComment(models.Model):
         """String representation of DiffComment."""
         return f"Comment by {self.user.username} on {self.diff_item}"
 
+    def save(self, *args, **kwargs):
+        """Save the comment, keeping spoiler_level in step with spoiler_scope and setting the path on insert."""
+        _sync_spoiler_level(self, kwargs)
+        if self._state.adding and not self.path:
+            self._set_path()
+            kwargs['force_insert'] = True
+        super().save(*args, **kwargs)
+
+    def _set_path(self) -> None:
+        """Reserve the comment's ID and derive its path and depth, so the insert writes them."""
+        from .constants import COMMENT_PATH_WIDTH
+
+        if self.pk is None:
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT nextval(pg_get_serial_sequence(%s, 'id'))", [self._meta.db_table])
+                self.pk = cursor.fetchone()[0]
+        parent_path = self.parent.path if self.parent_id else ''
+        self.path = f"{parent_path}{self.pk:0{COMMENT_PATH_WIDTH}d}"
+        self.depth = len(self.path) // COMMENT_PATH_WIDTH - 1
+
 
 class PreferenceChoice(models.TextChoices):
     """Preference choices for comparison votes."""
@@ -163,6 +283,9 @@ class PreferenceChoice(models.TextChoices):
     DIDNT_FINISH = 'DIDNT_FINISH', "Didn't finish both"
 
 
+FAITHFULNESS_RATINGS = (1, 2, 3, 4, 5)  # 1 = completely different, 5 = very faithful
+
+
 class ComparisonVote(models.Model):
     """Vote comparing a book and its screen adaptation."""
 
@@ -198,3 +321,90 @@ class ComparisonVote(models.Model):
     def __str__(self) -> str:
         """String representation of ComparisonVote."""
         return f"{self.user.username}: {self.get_preference_display()}"
+
+
+class ComparisonStats(models.Model):
+    """Materialized per-comparison counters read by the browse sections.
+
+    Keyed by (work, screen_work) because diffs can exist for pairs without an
+    AdaptationEdge; linked to the edge when there is one. Kept up to date by
+    diffs.signals (repair with `manage.py rebuild_comparison_stats`).
+    """
+
+    work = models.ForeignKey('works.Work', on_delete=models.CASCADE, related_name='comparison_stats')
+    screen_work = models.ForeignKey('screen.ScreenWork', on_delete=models.CASCADE, related_name='comparison_stats')
+    edge = models.OneToOneField(
+        'screen.AdaptationEdge', on_delete=models.SET_NULL, null=True, blank=True, related_name='stats'
+    )
+
+    # LIVE diffs, votes on them and LIVE comments on them
+    diff_count = models.IntegerField(default=0)
+    vote_count = models.IntegerField(default=0)
+    comment_count = models.IntegerField(default=0)
+    last_activity = models.DateTimeField(null=True, blank=True, help_text="Latest update of a LIVE diff")
+
+    # All comparison votes, and the breakdown of votes from users who confirmed both
+    comparison_vote_count = models.IntegerField(default=0)
+    preference_book = models.IntegerField(default=0)
+    preference_screen = models.IntegerField(default=0)
+    preference_tie = models.IntegerField(default=0)
+    preference_didnt_finish = models.IntegerField(default=0)
+    # Histogram of faithfulness ratings (1-5) from votes by users who finished both
+    faithfulness_1 = models.IntegerField(default=0)
+    faithfulness_2 = models.IntegerField(default=0)
+    faithfulness_3 = models.IntegerField(default=0)
+    faithfulness_4 = models.IntegerField(default=0)
+    faithfulness_5 = models.IntegerField(default=0)
+
+    # Exponentially decayed activity (see TRENDING_HALF_LIFE_HOURS), as of trending_at,
+    # the time of the latest diff, vote or comment; readers decay it to the present
+    trending_score = models.FloatField(default=0)
+    trending_diffs = models.FloatField(default=0)
+    trending_votes = models.FloatField(default=0)
+    trending_at = models.DateTimeField(null=True, blank=True)
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        """Meta options for ComparisonStats model."""
+
+        unique_together = [['work', 'screen_work']]
+        indexes = [
+            models.Index(fields=['-diff_count', '-vote_count', '-id']),  # For most_documented
+            models.Index(fields=['-last_activity']),  # For recently_updated
+            models.Index(fields=['-trending_at']),  # For the trending window
+            # Browse sorts (DiffService.BROWSE_SORT_KEYS)
+            models.Index(
+                models.F('last_activity').desc(nulls_last=True), models.F('id').desc(),
+                name='diffs_stats_recent_idx',
+            ),
+            models.Index(
+                models.F('last_activity').desc(nulls_last=True),
+                (models.F('diff_count') + models.F('vote_count')).desc(),
+                models.F('id').desc(),
+                name='diffs_stats_trending_idx',
+            ),
+        ]
+
+    def __str__(self) -> str:
+        """String representation of ComparisonStats."""
+        return f"Stats for {self.work_id}/{self.screen_work_id}: {self.diff_count} diffs"
+
+    @property
+    def faithfulness_histogram(self) -> Dict[int, int]:
+        """Number of votes per faithfulness rating."""
+        return {rating: getattr(self, f'faithfulness_{rating}') for rating in FAITHFULNESS_RATINGS}
+
+    @property
+    def faithfulness_count(self) -> int:
+        """Number of faithfulness ratings."""
+        return sum(self.faithfulness_histogram.values())
+
+    @property
+    def faithfulness_average(self) -> float | None:
+        """Average faithfulness rating, None without ratings."""
+        histogram = self.faithfulness_histogram
+        count = sum(histogram.values())
+        if not count:
+            return None
+        return round(sum(rating * votes for rating, votes in histogram.items()) / count, 2)
@@ -0,0 +1,367 @@
+"""Random comparison sampling backed by Redis sets.
+
+Every comparison with a LIVE diff is a member ("work_id:screen_work_id") of
+one set per (pool, activity tier): the 'all' pool, plus one pool per genre
+of its work. Tier k holds comparisons with 2**k to 2**(k+1) - 1 diffs plus
+votes. Sampling picks a tier from the pool's SCARD counts (weighted by tier
+size, or by size times 2**k to favour active comparisons) and draws from it
+with SRANDMEMBER, so it costs a few O(1) Redis commands however many
+comparisons there are. Each generation of keys lists itself in a registry
+set, so an old generation is dropped without scanning the keyspace.
+
+Writes only mark comparisons dirty (see diffs.signals); each sample re-files
+up to RANDOM_SYNC_BATCH dirty comparisons before drawing. rebuild() refills
+every set from ComparisonStats into a new generation of keys, and runs with
+the cache warmer; one rebuild runs at a time. Without Redis, or until the
+first generation is built in the background, sampling falls back to a
+random row query.
+"""
+import json
+import logging
+import random
+from typing import Any, Iterable, List, Optional, Tuple
+from django.core.cache import cache
+from django.db import transaction
+from redis.exceptions import RedisError
+from adaptapedia.cache import _get_redis_client
+from .constants import RANDOM_MAX_TIER, RANDOM_RECENT_EXCLUDE, RANDOM_SYNC_BATCH
+from .models import ComparisonStats
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = 'random_comparisons'
+ALL_POOL = 'all'
+REBUILD_CHUNK = 1000  # Comparisons written per pipeline during a rebuild
+REBUILD_LOCK_TIMEOUT = 300  # Seconds a rebuild lock is held before it is presumed dead
+REBUILD_SCHEDULED_KEY = 'random_comparisons_rebuild_scheduled'
+
+
+class SetsNotBuilt(Exception):
+    """No generation of sampling sets exists yet."""
+
+
+def _key(*parts: Any) -> str:
+    """Redis key for sampling data, namespaced like cache keys."""
+    return cache.make_key(':'.join([KEY_PREFIX, *map(str, parts)]))
+
+
+def member_key(work_id: int, screen_work_id: int) -> str:
+    """Set member identifying a comparison."""
+    return f"{work_id}:{screen_work_id}"
+
+
+def _parse_member(member: Any) -> Tuple[int, int]:
+    """(work_id, screen_work_id) of a set member."""
+    if isinstance(member, bytes):
+        member = member.decode()
+    work_id, screen_work_id = member.split(':')
+    return int(work_id), int(screen_work_id)
+
+
+def _tier(activity: int) -> int:
+    """Activity tier of a comparison with the given diffs plus votes."""
+    return min(max(activity, 1).bit_length() - 1, RANDOM_MAX_TIER)
+
+
+def _pools(genres: Optional[List[str]]) -> List[str]:
+    """Pools a comparison belongs to, from its work's genres."""
+    return [ALL_POOL] + [f"genre:{genre}" for genre in genres or []]
+
+
+def _placement(diff_count: int, vote_count: int, genres: Optional[List[str]]) -> Optional[List[Any]]:
+    """[tier, pools] of a comparison, or None if it has no LIVE diffs."""
+    if diff_count <= 0:
+        return None
+    return [_tier(diff_count + vote_count), _pools(genres)]
+
+
+def _file(
+    pipe: Any, generation: int, member: str, old: Optional[List[Any]], new: Optional[List[Any]]
+) -> List[str]:
+    """Queue the commands moving a member from its old placement to its new one; returns the keys written."""
+    if old == new:
+        return []
+    written = []
+    if old:
+        tier, pools = old
+        for pool in pools:
+            pipe.srem(_key(generation, pool, tier), member)
+            written.append(_key(generation, pool, tier))
+    if new:
+        tier, pools = new
+        set_keys = [_key(generation, pool, tier) for pool in pools]
+        for set_key in set_keys:
+            pipe.sadd(set_key, member)
+        pipe.hset(_key(generation, 'placements'), member, json.dumps(new))
+        # Registry of the generation's keys, so rebuild() can drop them without a SCAN
+        pipe.sadd(_key(generation, 'keys'), _key(generation, 'placements'), *set_keys)
+        written += [*set_keys, _key(generation, 'keys')]
+    else:
+        pipe.hdel(_key(generation, 'placements'), member)
+    return written + [_key(generation, 'placements')]
+
+
+def mark_dirty(work_id: int, screen_work_id: int) -> None:
+    """Queue a comparison to be re-filed once the current transaction commits."""
+    def mark():
+        client = _get_redis_client()
+        if client is None:
+            return
+        try:
+            client.sadd(_key('dirty'), member_key(work_id, screen_work_id))
+        except RedisError as e:
+            # Never fail the write; the next rebuild re-files the comparison
+            logger.warning(f"Failed to mark comparison {work_id}/{screen_work_id} for re-sampling: {e}")
+
+    transaction.on_commit(mark)
+
+
+def _sync(client: Any, generation: int, members: Iterable[Any]) -> List[str]:
+    """Re-file comparisons from their current stats; returns the keys written."""
+    pairs = [_parse_member(member) for member in members]
+    if not pairs:
+        return []
+
+    rows = ComparisonStats.objects.filter(
+        work_id__in={work_id for work_id, _ in pairs},
+        screen_work_id__in={screen_work_id for _, screen_work_id in pairs},
+    ).values_list('work_id', 'screen_work_id', 'diff_count', 'vote_count', 'work__genres')
+    current = {(row[0], row[1]): _placement(*row[2:]) for row in rows}
+
+    keys = [member_key(*pair) for pair in pairs]
+    old = client.hmget(_key(generation, 'placements'), keys)
+    pipe = client.pipeline(transaction=False)
+    written = set()
+    for pair, member, old_placement in zip(pairs, keys, old):
+        written.update(
+            _file(pipe, generation, member, json.loads(old_placement) if old_placement else None, current.get(pair))
+        )
+    pipe.execute()
+    return sorted(written)
+
+
+def _sync_current(client: Any, generation: int, members: List[Any]) -> None:
+    """
+    Re-file comparisons into the generation being sampled, outside a rebuild.
+
+    A rebuild may read a comparison's stats before the write that marked it
+    dirty, or switch generations while these members are filed into the old
+    one. Either way the members are marked dirty again, for the rebuild's
+    final pass or the next sample, and keys written to a retired generation
+    expire instead of outliving its cleanup.
+    """
+    written = _sync(client, generation, members)
+
+    pipe = client.pipeline(transaction=False)
+    pipe.exists(_key('rebuild_lock'))
+    pipe.get(_key('generation'))
+    rebuilding, current = pipe.execute()
+    if current is not None and int(current) != generation and written:
+        pipe = client.pipeline(transaction=False)
+        for key in written:
+            pipe.expire(key, REBUILD_LOCK_TIMEOUT)
+        pipe.execute()
+    elif not rebuilding:
+        return
+    client.sadd(_key('dirty'), *members)
+
+
+def rebuild() -> int:
+    """
+    Refill every sampling set from ComparisonStats.
+
+    Writes a new generation of keys and switches to it once complete, so
+    sampling keeps working during the rebuild, then re-files comparisons
+    marked dirty meanwhile. Skipped if another rebuild holds the lock.
+
+    Returns:
+        Number of comparisons in the 'all' pool (0 without Redis or when skipped)
+    """
+    client = _get_redis_client()
+    if client is None:
+        return 0
+
+    lock_key = _key('rebuild_lock')
+    if not client.set(lock_key, 1, nx=True, ex=REBUILD_LOCK_TIMEOUT):
+        logger.info("Random comparison sampling rebuild already running, skipped")
+        return 0
+    try:
+        return _rebuild(client)
+    finally:
+        client.delete(lock_key)
+
+
+def _rebuild(client: Any) -> int:
+    """Fill a new generation of sets and switch to it (see rebuild)."""
+    previous = client.get(_key('generation'))
+    generation = client.incr(_key('generation_counter'))
+
+    count = 0
+    pipe = client.pipeline(transaction=False)
+    rows = ComparisonStats.objects.filter(diff_count__gt=0).values_list(
+        'work_id', 'screen_work_id', 'diff_count', 'vote_count', 'work__genres'
+    )
+    for work_id, screen_work_id, *stats in rows.iterator(chunk_size=REBUILD_CHUNK):
+        _file(pipe, generation, member_key(work_id, screen_work_id), None, _placement(*stats))
+        count += 1
+        if count % REBUILD_CHUNK == 0:
+            pipe.execute()
+    pipe.execute()
+
+    client.set(_key('generation'), generation)
+
+    # Stats may have changed after their rows were read; samplers leave such
+    # marks in the dirty set while the lock is held (see _sync_current)
+    while True:
+        dirty = client.spop(_key('dirty'), REBUILD_CHUNK)
+        if not dirty:
+            break
+        _sync(client, generation, dirty)
+
+    if previous is not None:
+        # Drop the old generation's sets
+        registry = _key(int(previous), 'keys')
+        old_keys = list(client.smembers(registry))
+        for start in range(0, len(old_keys), REBUILD_CHUNK):
+            client.delete(*old_keys[start:start + REBUILD_CHUNK])
+        client.delete(registry)
+
+    logger.info(f"Rebuilt random comparison sampling for {count} comparisons")
+    return count
+
+
+def _schedule_rebuild() -> None:
+    """Queue a rebuild unless one is already queued."""
+    from .tasks import rebuild_random_comparisons
+
+    if not cache.add(REBUILD_SCHEDULED_KEY, 1, REBUILD_LOCK_TIMEOUT):
+        return
+    try:
+        rebuild_random_comparisons.delay()
+    except Exception as e:
+        # Keep sampling from the database; the next request tries again
+        cache.delete(REBUILD_SCHEDULED_KEY)
+        logger.warning(f"Failed to schedule random comparison sampling rebuild: {e}")
+
+
+def _current_generation(client: Any) -> int:
+    """
+    Generation of keys to sample from.
+
+    Raises:
+        SetsNotBuilt: If no generation exists yet (e.g. after a Redis flush);
+                      a rebuild is scheduled in the background
+    """
+    generation = client.get(_key('generation'))
+    if generation is None:
+        _schedule_rebuild()
+        raise SetsNotBuilt()
+    return int(generation)
+
+
+def _choose_tier(counts: List[int], weighting: str) -> Optional[int]:
+    """Pick a tier with probability proportional to its share of the pool's weight."""
+    weights = [count * (2 ** tier if weighting == 'activity' else 1) for tier, count in enumerate(counts)]
+    if not any(weights):
+        return None
+    return random.choices(range(len(weights)), weights=weights)[0]
+
+
+def _sample_from_redis(client: Any, genre: Optional[str], weighting: str, exclude: Iterable[str]) -> Optional[str]:
+    """Draw a member from the Redis sets (see module docstring)."""
+    generation = _current_generation(client)
+
+    dirty = client.spop(_key('dirty'), RANDOM_SYNC_BATCH)
+    if dirty:
+        _sync_current(client, generation, dirty)
+
+    pool = f"genre:{genre}" if genre else ALL_POOL
+    pipe = client.pipeline(transaction=False)
+    for tier in range(RANDOM_MAX_TIER + 1):
+        pipe.scard(_key(generation, pool, tier))
+    counts = pipe.execute()
+
+    excluded = set(exclude)
+    fallback = None
+    while (tier := _choose_tier(counts, weighting)) is not None:
+        # Enough distinct candidates that one was not served recently, unless
+        # the whole tier was; then draw from the other tiers
+        candidates = [
+            member.decode() if isinstance(member, bytes) else member
+            for member in client.srandmember(_key(generation, pool, tier), RANDOM_RECENT_EXCLUDE + 1)
+        ]
+        member = next((member for member in candidates if member not in excluded), None)
+        if member is not None:
+            return member
+        fallback = fallback or next(iter(candidates), None)
+        counts[tier] = 0
+
+    # Every comparison in the pool was excluded, so serve one anyway
+    return fallback
+
+
+def _sample_from_db(genre: Optional[str], exclude: Iterable[str]) -> Optional[str]:
+    """Draw a member with a random row query (no Redis, so no weighting)."""
+    stats = ComparisonStats.objects.filter(diff_count__gt=0)
+    if genre:
+        stats = stats.filter(work__genres__contains=[genre])
+    unseen = stats
+    for work_id, screen_work_id in map(_parse_member, exclude):
+        unseen = unseen.exclude(work_id=work_id, screen_work_id=screen_work_id)
+
+    # Excluded comparisons are served anyway once nothing else is left
+    pair = (
+        unseen.order_by('?').values_list('work_id', 'screen_work_id').first()
+        or stats.order_by('?').values_list('work_id', 'screen_work_id').first()
+    )
+    return member_key(*pair) if pair else None
+
+
+def get_random_comparison(
+    genre: Optional[str] = None,
+    weighting: str = 'uniform',
+    exclude: Iterable[str] = (),
+) -> Optional[ComparisonStats]:
+    """
+    Get a random comparison with at least one LIVE diff.
+
+    Args:
+        genre: Only comparisons whose work has this genre
+        weighting: 'uniform', or 'activity' for probability proportional to
+                   diffs plus votes (to within a factor of two)
+        exclude: member_key()s to avoid, e.g. comparisons the session saw
+                 recently (served anyway if nothing else is left)
+
+    Returns:
+        ComparisonStats with work and screen_work selected, or None if there
+        are no eligible comparisons
+    """
+    exclude = list(exclude)
+    client = _get_redis_client()
+
+    # A member can be stale until its dirty mark is processed; re-file and retry
+    for _ in range(3):
+        member = None
+        if client is not None:
+            try:
+                member = _sample_from_redis(client, genre, weighting, exclude)
+            except SetsNotBuilt:
+                client = None
+            except RedisError as e:
+                logger.warning(f"Random comparison sampling failed, falling back to the database: {e}")
+                client = None
+        if client is None:
+            member = _sample_from_db(genre, exclude)
+        if member is None:
+            return None
+
+        work_id, screen_work_id = _parse_member(member)
+        stats = ComparisonStats.objects.select_related('work', 'screen_work').filter(
+            work_id=work_id, screen_work_id=screen_work_id, diff_count__gt=0
+        ).first()
+        if stats is not None:
+            return stats
+        if client is not None:
+            _sync_current(client, _current_generation(client), [member])
+
+    return None
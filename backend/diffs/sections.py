@@ -0,0 +1,303 @@
+"""Cached browse, trending, needs-help and comparison sections.
+
+Each section is cached once, at the largest size any endpoint serves, with
+stale-while-revalidate. Writes to diffs, votes and comments mark the sections
+they affect as dirty; a debounced Celery task (diffs.tasks.refresh_dirty_sections)
+recomputes only those sections and overwrites the cached values. The soft TTL
+only bounds time-based drift (e.g. the trending window moving on), and is also
+refreshed in the background, so readers only pay for a cold miss.
+
+Every explicit refresh also bumps the section's version tag, from which the
+browse, trending and needs-help endpoints derive their ETags.
+"""
+import logging
+from typing import Any, Callable, Dict, Iterable, List
+from django.core.cache import cache
+from django.db import transaction
+from adaptapedia.cache import (
+    _get_redis_client,
+    CACHE_TIMEOUTS,
+    BROWSE_TAG,
+    TRENDING_TAG,
+    NEEDS_HELP_TAG,
+    bump_versions,
+    cache_get_or_set,
+    comparison_tag,
+    get_cache_key,
+    stale_while_revalidate,
+)
+from .constants import (
+    BROWSE_SORTS,
+    DEFAULT_BROWSE_LIMIT,
+    DEFAULT_DIFF_ORDERING,
+    MAX_SPOILER_LEVEL,
+    MAX_NEEDS_HELP_LIMIT,
+    MAX_TRENDING_LIMIT,
+    TRENDING_COMMON_DAYS,
+    TRENDING_LOOKBACK_DAYS,
+)
+from .services import DiffService
+
+logger = logging.getLogger(__name__)
+
+DIRTY_KEY_PREFIX = 'browse_section_dirty'
+REFRESH_SCHEDULED_KEY = 'browse_section_refresh_scheduled'
+REFRESH_DEBOUNCE = 30  # Seconds to collect writes before recomputing
+
+# Section name -> (compute function, tag used by clear_browse_cache)
+SECTIONS: Dict[str, tuple[Callable[[], Any], str]] = {
+    'featured': (lambda: DiffService.get_featured_comparisons(limit=DEFAULT_BROWSE_LIMIT), BROWSE_TAG),
+    'recently_updated': (lambda: DiffService.get_recently_updated(limit=DEFAULT_BROWSE_LIMIT), BROWSE_TAG),
+    'most_documented': (lambda: DiffService.get_most_documented(limit=DEFAULT_BROWSE_LIMIT), BROWSE_TAG),
+    'trending': (
+        lambda: DiffService.get_trending_comparisons(limit=MAX_TRENDING_LIMIT, days=TRENDING_LOOKBACK_DAYS),
+        TRENDING_TAG,
+    ),
+    'needs_help': (lambda: DiffService.get_needs_help(limit=MAX_NEEDS_HELP_LIMIT), NEEDS_HELP_TAG),
+}
+for _sort in BROWSE_SORTS:
+    SECTIONS[f'all_comparisons:{_sort}'] = (
+        lambda sort=_sort: DiffService.get_all_comparisons(limit=50, sort=sort),
+        BROWSE_TAG,
+    )
+
+ALL_COMPARISONS_SECTIONS = [name for name in SECTIONS if name.startswith('all_comparisons:')]
+
+# Sections affected by writes to each model
+DIFF_SECTIONS = list(SECTIONS)
+DIFF_VOTE_SECTIONS = list(SECTIONS)
+DIFF_COMMENT_SECTIONS = ['trending', 'needs_help']
+COMPARISON_VOTE_SECTIONS = [
+    'featured', 'recently_updated', 'most_documented', 'trending', *ALL_COMPARISONS_SECTIONS,
+]
+
+
+def _dirty_key(name: str) -> str:
+    """Cache key marking a section as dirty (cache backends other than Redis)."""
+    return f"{DIRTY_KEY_PREFIX}:{name}"
+
+
+def _dirty_set_key() -> str:
+    """Redis set of dirty section names, namespaced like cache keys."""
+    return cache.make_key(DIRTY_KEY_PREFIX)
+
+
+def _section_tags(name: str) -> List[str]:
+    """Cache tags of a section."""
+    return [SECTIONS[name][1]]
+
+
+def section_version_tag(name: str) -> str:
+    """Tag bumped whenever a section is recomputed."""
+    return f"section:{name}"
+
+
+def section_version_tags(*names: str) -> List[str]:
+    """
+    Tags whose generations identify the current data of the given sections.
+
+    Args:
+        *names: Section names
+
+    Returns:
+        Version tags and cache tags of the sections (cache tags cover clear_browse_cache)
+    """
+    tags = [section_version_tag(name) for name in names]
+    return tags + [SECTIONS[name][1] for name in names]
+
+
+def _bump_section_version(name: str) -> None:
+    """Mark a section's data as changed, whoever recomputed it."""
+    bump_versions(section_version_tag(name))
+
+
+@stale_while_revalidate('browse_section', tags=_section_tags, on_refresh=_bump_section_version)
+def get_section(name: str) -> Any:
+    """
+    Get a section, served from the cache.
+
+    Args:
+        name: Section name (a key of SECTIONS)
+
+    Returns:
+        Section data
+    """
+    compute, _ = SECTIONS[name]
+    return compute()
+
+
+def refresh_section(name: str) -> Any:
+    """
+    Recompute a section and overwrite its cached value.
+
+    Bumps the section's version tag (see _bump_section_version), as the
+    background refresh of a stale section does.
+
+    Args:
+        name: Section name (a key of SECTIONS)
+
+    Returns:
+        Recomputed section data
+    """
+    return get_section.refresh(name)
+
+
+def get_trending(days: int = TRENDING_LOOKBACK_DAYS, refresh: bool = False) -> List[Dict[str, Any]]:
+    """
+    Get trending comparisons for a lookback window, cached at MAX_TRENDING_LIMIT.
+
+    The default window is the trending section. The other TRENDING_COMMON_DAYS
+    windows are cached for 30 minutes under the trending tag, which the section
+    refresh bumps. Any other window is computed uncached, so requests cannot
+    fill the cache with one entry per window.
+
+    Args:
+        days: Number of days to look back for activity
+        refresh: Recompute and overwrite the cached value
+
+    Returns:
+        Trending comparisons, best first
+    """
+    if days == TRENDING_LOOKBACK_DAYS:
+        return refresh_section('trending') if refresh else get_section('trending')
+    if days not in TRENDING_COMMON_DAYS:
+        return DiffService.get_trending_comparisons(limit=MAX_TRENDING_LIMIT, days=days)
+
+    # Single-flight so only one worker recomputes when the entry expires
+    return cache_get_or_set(
+        f'trending_comparisons_days_{days}',
+        lambda: DiffService.get_trending_comparisons(limit=MAX_TRENDING_LIMIT, days=days),
+        timeout=1800,
+        single_flight=True,
+        tags=[TRENDING_TAG],
+        refresh=refresh,
+    )
+
+
+def get_comparison_vote_stats(work_id: int, screen_work_id: int, refresh: bool = False) -> Dict[str, Any]:
+    """
+    Get aggregated comparison vote statistics, cached until the comparison changes.
+
+    Args:
+        work_id: Work ID
+        screen_work_id: ScreenWork ID
+        refresh: Recompute and overwrite the cached value
+
+    Returns:
+        See DiffService.get_comparison_vote_stats
+    """
+    return cache_get_or_set(
+        get_cache_key('comparison_vote_stats', work_id, screen_work_id),
+        lambda: DiffService.get_comparison_vote_stats(work_id, screen_work_id),
+        timeout=CACHE_TIMEOUTS['comparison'],
+        tags=[comparison_tag(work_id, screen_work_id)],
+        refresh=refresh,
+    )
+
+
+def get_comparison_diff_ids(
+    work_id: int,
+    screen_work_id: int,
+    max_level: int = MAX_SPOILER_LEVEL,
+    ordering: str = DEFAULT_DIFF_ORDERING,
+    refresh: bool = False,
+) -> List[int]:
+    """
+    Get a comparison's diff IDs for a spoiler level and ordering, cached until it changes.
+
+    Args:
+        work_id: Work ID
+        screen_work_id: ScreenWork ID
+        max_level: Maximum spoiler level (see SPOILER_SCOPE_ORDER)
+        ordering: Key of DIFF_ORDERINGS
+        refresh: Recompute and overwrite the cached value
+
+    Returns:
+        See DiffService.get_comparison_diff_ids
+    """
+    return cache_get_or_set(
+        get_cache_key('comparison_diff_ids', work_id, screen_work_id, max_level, ordering),
+        lambda: DiffService.get_comparison_diff_ids(work_id, screen_work_id, max_level, ordering),
+        timeout=CACHE_TIMEOUTS['comparison'],
+        tags=[comparison_tag(work_id, screen_work_id)],
+        refresh=refresh,
+    )
+
+
+def invalidate_comparison_on_commit(work_id: int, screen_work_id: int) -> None:
+    """Invalidate everything cached for a comparison once the current transaction commits."""
+    from adaptapedia.cache import invalidate_comparison
+
+    def invalidate():
+        try:
+            invalidate_comparison(work_id, screen_work_id)
+        except Exception as e:
+            # Never fail the write; the entries' TTL bounds staleness
+            logger.warning(f"Failed to invalidate comparison {work_id}/{screen_work_id}: {e}")
+
+    transaction.on_commit(invalidate)
+
+
+def mark_sections_dirty(names: Iterable[str]) -> None:
+    """
+    Mark sections as dirty once the current transaction commits.
+
+    The first write in a debounce window schedules the refresh task, which
+    runs REFRESH_DEBOUNCE seconds later and picks up every section marked
+    in the meantime.
+
+    Args:
+        names: Section names affected by the write
+    """
+    names = list(names)
+    transaction.on_commit(lambda: flush_dirty_sections(names))
+
+
+def _record_dirty(names: List[str]) -> None:
+    """Add sections to the dirty set."""
+    client = _get_redis_client()
+    if client is not None:
+        client.sadd(_dirty_set_key(), *names)
+    else:
+        cache.set_many({_dirty_key(name): 1 for name in names}, None)
+
+
+def flush_dirty_sections(names: List[str]) -> None:
+    """Record dirty sections now and schedule a refresh if none is pending."""
+    from .tasks import refresh_dirty_sections
+
+    if not names:
+        return
+    try:
+        _record_dirty(names)
+        if cache.add(REFRESH_SCHEDULED_KEY, 1, REFRESH_DEBOUNCE * 10):
+            try:
+                refresh_dirty_sections.apply_async(countdown=REFRESH_DEBOUNCE)
+            except Exception:
+                # Let the next write try again
+                cache.delete(REFRESH_SCHEDULED_KEY)
+                raise
+    except Exception as e:
+        # Never fail the write; the section TTL bounds staleness
+        logger.warning(f"Failed to schedule browse section refresh: {e}")
+
+
+def pop_dirty_sections() -> List[str]:
+    """
+    Get and clear the set of dirty sections.
+
+    With Redis the set is emptied with one SPOP, so a section marked during
+    the pop is either returned or left for the next refresh, never lost.
+
+    Returns:
+        Names of sections marked dirty since the last refresh
+    """
+    client = _get_redis_client()
+    if client is not None:
+        popped = client.spop(_dirty_set_key(), len(SECTIONS)) or []
+        dirty = {name.decode() if isinstance(name, bytes) else name for name in popped}
+        return [name for name in SECTIONS if name in dirty]
+
+    dirty_keys = cache.get_many([_dirty_key(name) for name in SECTIONS])
+    cache.delete_many(list(dirty_keys))
+    return [name for name in SECTIONS if _dirty_key(name) in dirty_keys]
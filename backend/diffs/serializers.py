@@ -1,6 +1,8 @@
 """Serializers for diffs app."""
 from rest_framework import serializers
+from adaptapedia.loaders import BatchListSerializer, get_loader
 from .models import DiffItem, DiffVote, DiffComment, ComparisonVote
+from . import vote_buffer
 
 
 class DiffItemSerializer(serializers.ModelSerializer):
@@ -8,6 +10,8 @@ class DiffItemSerializer(serializers.ModelSerializer):
 
     vote_counts = serializers.ReadOnlyField()
     created_by_username = serializers.CharField(source='created_by.username', read_only=True)
+    created_by_top_badge = serializers.ReadOnlyField(source='created_by.top_badge_data')
+    created_by_reputation_tier = serializers.ReadOnlyField(source='created_by.reputation_tier')
     work_title = serializers.CharField(source='work.title', read_only=True)
     work_slug = serializers.CharField(source='work.slug', read_only=True)
     screen_work_title = serializers.CharField(source='screen_work.title', read_only=True)
@@ -20,6 +24,7 @@ class DiffItemSerializer(serializers.ModelSerializer):
         """Meta options for DiffItemSerializer."""
 
         model = DiffItem
+        list_serializer_class = BatchListSerializer
         fields = [
             'id',
             'work',
@@ -38,6 +43,8 @@ class DiffItemSerializer(serializers.ModelSerializer):
             'image',
             'created_by',
             'created_by_username',
+            'created_by_top_badge',
+            'created_by_reputation_tier',
             'vote_counts',
             'user_vote',
             'created_at',
@@ -45,14 +52,35 @@ class DiffItemSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ['id', 'created_by', 'created_at', 'updated_at', 'status']
 
+    def _user_vote_loader(self):
+        """Batch loader of the current user's votes by diff ID, None when anonymous."""
+        request = self.context.get('request')
+        if not (request and request.user.is_authenticated):
+            return None
+
+        user = request.user
+        return get_loader(
+            self.context,
+            f'diff_user_vote:{user.pk}',
+            lambda diff_ids: {
+                **dict(
+                    DiffVote.objects.filter(user=user, diff_item_id__in=diff_ids).values_list('diff_item_id', 'vote')
+                ),
+                # The user's buffered votes win until they are flushed
+                **vote_buffer.get_pending_votes(user.pk, diff_ids),
+            },
+        )
+
     def get_user_vote(self, obj):
         """Get the current user's vote on this diff, if any."""
-        request = self.context.get('request')
-        if request and request.user.is_authenticated:
-            vote = DiffVote.objects.filter(diff_item=obj, user=request.user).first()
-            if vote:
-                return vote.vote
-        return None
+        loader = self._user_vote_loader()
+        return loader.load(obj.pk) if loader else None
+
+    def prime_loaders(self, instances):
+        """Batch user vote lookups for a page of diffs."""
+        loader = self._user_vote_loader()
+        if loader:
+            loader.prime(diff.pk for diff in instances)
 
     def validate_claim(self, value: str) -> str:
         """Validate claim field."""
@@ -124,47 +152,9 @@ class DiffCommentSerializer(serializers.ModelSerializer):
     work_slug = serializers.CharField(source='diff_item.work.slug', read_only=True)
     screen_work_title = serializers.CharField(source='diff_item.screen_work.title', read_only=True)
     screen_work_slug = serializers.CharField(source='diff_item.screen_work.slug', read_only=True)
-    top_badge = serializers.SerializerMethodField()
-
-    def get_top_badge(self, obj):
-        """Get the user's most prestigious badge to display next to their name."""
-        from users.models import UserBadge, BadgeType
-
-        # Badge priority order (higher = more prestigious)
-        badge_priority = {
-            # Quality badges (highest priority)
-            BadgeType.HIGH_ACCURACY: 100,
-            BadgeType.WELL_SOURCED: 99,
-            BadgeType.CONSENSUS_BUILDER: 98,
-            # High milestone badges
-            BadgeType.VOTER_100: 49,
-            # Medium milestone badges
-            BadgeType.VOTER_50: 29,
-            BadgeType.COMMENTER_50: 28,
-            BadgeType.DIFF_CREATOR_25: 27,
-            # Low milestone badges
-            BadgeType.VOTER_10: 14,
-            BadgeType.COMMENTER_10: 13,
-            BadgeType.DIFF_CREATOR_5: 12,
-            # Special badges
-            BadgeType.EARLY_ADOPTER: 80,
-            BadgeType.WEEKLY_CONTRIBUTOR: 35,
-            # First badges (lowest priority)
-            BadgeType.FIRST_DIFF: 5,
-            BadgeType.FIRST_VOTE: 4,
-            BadgeType.FIRST_COMMENT: 3,
-        }
-
-        badges = UserBadge.objects.filter(user=obj.user).select_related('user')
-        if not badges.exists():
-            return None
-
-        # Find the most prestigious badge
-        top_badge = max(badges, key=lambda b: badge_priority.get(b.badge_type, 0))
-        return {
-            'badge_type': top_badge.badge_type,
-            'badge_display': top_badge.get_badge_type_display(),
-        }
+    # Author flair, stored on the user row (no query beyond the selected user)
+    top_badge = serializers.ReadOnlyField(source='user.top_badge_data')
+    reputation_tier = serializers.ReadOnlyField(source='user.reputation_tier')
 
     class Meta:
         """Meta options for DiffCommentSerializer."""
@@ -176,6 +166,7 @@ class DiffCommentSerializer(serializers.ModelSerializer):
             'user',
             'username',
             'top_badge',
+            'reputation_tier',
             'parent',
             'body',
             'spoiler_scope',
@@ -189,6 +180,64 @@ class DiffCommentSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ['id', 'user', 'created_at', 'status']
 
+    def validate(self, attrs):
+        """Keep replies on their parent's diff; a comment's place in its thread is fixed."""
+        parent = attrs.get('parent')
+        if self.instance is not None:
+            if 'parent' in attrs and parent != self.instance.parent:
+                raise serializers.ValidationError({'parent': 'A comment cannot be moved to another thread.'})
+            return attrs
+
+        if parent is not None and parent.diff_item_id != attrs['diff_item'].pk:
+            raise serializers.ValidationError({'parent': 'A reply must be on the same diff as its parent.'})
+        return attrs
+
+
+class DiffCommentThreadSerializer(DiffCommentSerializer):
+    """Comment in a thread listing, with its place in the thread and reply counts."""
+
+    collapsed_reply_count = serializers.SerializerMethodField()
+
+    class Meta(DiffCommentSerializer.Meta):
+        """Meta options for DiffCommentThreadSerializer."""
+
+        fields = DiffCommentSerializer.Meta.fields + [
+            'depth',
+            'reply_count',
+            'descendant_count',
+            'collapsed_reply_count',
+        ]
+
+    def get_collapsed_reply_count(self, obj):
+        """Visible replies below the listing's depth limit, left for the client to expand."""
+        return obj.descendant_count if obj.depth >= self.context['depth_limit'] else 0
+
+
+def serialize_threads(comments, roots, max_depth, context):
+    """
+    Serialize loaded comment threads (see DiffService.get_comment_threads).
+
+    Args:
+        comments: Roots and their replies, in display order
+        roots: Comments starting the threads
+        max_depth: Reply levels loaded below the roots
+        context: Serializer context
+
+    Returns:
+        One {...root, 'replies': [...]} dict per thread, replies in display order
+    """
+    depth_limit = roots[0].depth + max_depth if roots else 0
+    data = DiffCommentThreadSerializer(comments, many=True, context={**context, 'depth_limit': depth_limit}).data
+
+    root_ids = {root.pk for root in roots}
+    threads = []
+    for comment, item in zip(comments, data):
+        if comment.pk in root_ids:
+            threads.append({**item, 'replies': []})
+        else:
+            threads[-1]['replies'].append(item)
+    return threads
+
 
 class ComparisonVoteSerializer(serializers.ModelSerializer):
     """Serializer for ComparisonVote model."""
@@ -1,23 +1,45 @@
 """Business logic services for diffs app."""
-from typing import Optional, Dict, Any, List
+import base64
+import json
+import math
+from collections import Counter
+from typing import Optional, Dict, Any, Iterable, List, Tuple
 from datetime import timedelta
 from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
 from django.utils import timezone
-from django.db.models import Count, Q, F, FloatField, ExpressionWrapper, Max, Case, When, IntegerField
-from .models import DiffItem, DiffVote, DiffComment
+from django.db import transaction
+from django.db.models import (
+    Count, Q, F, FloatField, ExpressionWrapper, Max, Case, When, OuterRef, Subquery, Sum,
+    Value, DateTimeField, DurationField, BooleanField, Exists, Window,
+)
+from django.db.models.functions import (
+    Cast, Coalesce, Exp, Extract, Greatest, Least, NullIf, Power, RowNumber, Sqrt,
+)
+from django.db.models.lookups import GreaterThanOrEqual, LessThanOrEqual
+from .models import DiffItem, DiffVote, DiffComment, ComparisonVote, ComparisonStats, FAITHFULNESS_RATINGS
 from .constants import (
+    COMMENT_PATH_WIDTH,
     CURATED_WORK_IDS,
+    DEFAULT_DIFF_ORDERING,
+    DIFF_ORDERINGS,
+    MAX_SPOILER_LEVEL,
     SPOILER_SCOPE_ORDER,
     TRENDING_LOOKBACK_DAYS,
     TRENDING_MAX_PER_WORK,
     TRENDING_DIFF_WEIGHT,
     TRENDING_VOTE_WEIGHT,
+    TRENDING_COMMENT_WEIGHT,
+    TRENDING_HALF_LIFE_HOURS,
     FEATURED_DIFF_WEIGHT,
     FEATURED_VOTE_WEIGHT,
     MIN_VOTES_FOR_DISPUTE,
     DISPUTE_ACCURACY_MIN,
     DISPUTE_ACCURACY_MAX,
     RECENTLY_UPDATED_HOURS,
+    VOTE_COUNT_FIELDS,
+    WILSON_Z,
 )
 
 User = get_user_model()
@@ -31,26 +53,42 @@ class DiffService:
         """
         Get comparison vote counts for multiple work/screen work pairs.
 
-        Single query with GROUP BY - replaced N*M query loop.
+        Read from the materialized ComparisonStats table.
         Returns dict with (work_id, screen_work_id) tuples as keys and vote counts as values.
         """
-        from diffs.models import ComparisonVote
-
-        # Single query with GROUP BY - much more efficient than nested loops
-        votes = ComparisonVote.objects.filter(
+        stats = ComparisonStats.objects.filter(
             work_id__in=work_ids,
             screen_work_id__in=screen_work_ids
-        ).values('work_id', 'screen_work_id').annotate(
-            count=Count('id')
-        )
+        ).values_list('work_id', 'screen_work_id', 'comparison_vote_count')
 
-        # Build dict from results
-        comparison_votes = {
-            (vote['work_id'], vote['screen_work_id']): vote['count']
-            for vote in votes
+        return {
+            (work_id, screen_work_id): count
+            for work_id, screen_work_id, count in stats
         }
 
-        return comparison_votes
+    @staticmethod
+    def _build_stats_comparison_dicts(stats, **extra_fields) -> List[Dict[str, Any]]:
+        """
+        Build comparison dicts from ComparisonStats rows (with work and screen_work selected).
+
+        Args:
+            stats: ComparisonStats rows
+            **extra_fields: Functions of a row returning additional fields
+
+        Returns:
+            List of comparison dicts in the rows' order
+        """
+        return [
+            DiffService._build_comparison_dict(
+                work=row.work,
+                screen_work=row.screen_work,
+                diff_count=row.diff_count,
+                vote_count=row.vote_count,
+                comparison_vote_count=row.comparison_vote_count,
+                **{field: get_value(row) for field, get_value in extra_fields.items()},
+            )
+            for row in stats
+        ]
 
     @staticmethod
     def _bulk_fetch_works_and_screens(
@@ -146,6 +184,341 @@ class DiffService:
         )
         return vote
 
+    @staticmethod
+    def apply_vote_change(diff_id: int, old_vote: Optional[str], new_vote: Optional[str]) -> Dict[str, int]:
+        """
+        Move a diff's denormalized vote counters from one vote to another.
+
+        A single UPDATE with F() expressions, so concurrent votes cannot lose counts.
+
+        Args:
+            diff_id: DiffItem ID
+            old_vote: Vote type before the change (None for a new vote)
+            new_vote: Vote type after the change (None for a removed vote)
+
+        Returns:
+            Dict mapping each changed counter field to its delta
+        """
+        return DiffService.apply_vote_changes(diff_id, [(old_vote, new_vote)])
+
+    @staticmethod
+    def apply_vote_changes(diff_id: int, changes: Iterable[Tuple[Optional[str], Optional[str]]]) -> Dict[str, int]:
+        """
+        Move a diff's denormalized vote counters for several vote changes in one UPDATE.
+
+        Args:
+            diff_id: DiffItem ID
+            changes: (old_vote, new_vote) pairs, as for apply_vote_change
+
+        Returns:
+            Dict mapping each changed counter field to its delta
+        """
+        deltas: Dict[str, int] = {}
+        for old_vote, new_vote in changes:
+            if old_vote == new_vote:
+                continue
+            if old_vote in VOTE_COUNT_FIELDS:
+                deltas[VOTE_COUNT_FIELDS[old_vote]] = deltas.get(VOTE_COUNT_FIELDS[old_vote], 0) - 1
+                deltas['total_votes'] = deltas.get('total_votes', 0) - 1
+            if new_vote in VOTE_COUNT_FIELDS:
+                deltas[VOTE_COUNT_FIELDS[new_vote]] = deltas.get(VOTE_COUNT_FIELDS[new_vote], 0) + 1
+                deltas['total_votes'] = deltas.get('total_votes', 0) + 1
+        deltas = {field: delta for field, delta in deltas.items() if delta}
+
+        if deltas:
+            # Right-hand sides see the old counters, so derived columns apply the deltas too
+            new = {
+                field: F(field) + deltas.get(field, 0)
+                for field in ('accurate_count', 'disagree_count', 'total_votes')
+            }
+            DiffItem.objects.filter(pk=diff_id).update(
+                **{field: F(field) + delta for field, delta in deltas.items()},
+                **DiffService.derived_vote_fields(new['accurate_count'], new['disagree_count'], new['total_votes']),
+            )
+        return deltas
+
+    @staticmethod
+    def derived_vote_fields(accurate: Any = None, disagree: Any = None, total: Any = None) -> Dict[str, Any]:
+        """
+        SQL expressions for the DiffItem columns derived from the vote counters.
+
+        Args:
+            accurate: Expression for the ACCURATE vote count (default: the stored counter)
+            disagree: Expression for the DISAGREE vote count (default: the stored counter)
+            total: Expression for the total vote count (default: the stored counter)
+
+        Returns:
+            Dict of field name to expression, for QuerySet.update()
+        """
+        accurate = accurate if accurate is not None else F('accurate_count')
+        disagree = disagree if disagree is not None else F('disagree_count')
+        total = total if total is not None else F('total_votes')
+        return {
+            'is_disputed': DiffService.disputed_expression(accurate, total),
+            'wilson_score': DiffService.wilson_expression(accurate, total),
+            'controversy_score': DiffService.controversy_expression(accurate, disagree),
+        }
+
+    @staticmethod
+    def wilson_expression(accurate: Any, total: Any) -> Case:
+        """
+        SQL expression for the lower bound of the Wilson score interval of the accurate share.
+
+        Ranks a diff with few votes below one with the same share from many
+        votes, unlike the raw share or accurate minus disagree.
+
+        Args:
+            accurate: Expression for the ACCURATE vote count
+            total: Expression for the total vote count
+
+        Returns:
+            Float expression in [0, 1], 0 without votes
+        """
+        z2 = WILSON_Z * WILSON_Z
+        n = Cast(NullIf(total, 0), FloatField())
+        p = Cast(accurate, FloatField()) / n
+        return Case(
+            When(
+                GreaterThanOrEqual(total, 1),
+                then=(p + z2 / (2 * n) - WILSON_Z * Sqrt((p * (1 - p) + z2 / (4 * n)) / n)) / (1 + z2 / n),
+            ),
+            default=Value(0.0),
+            output_field=FloatField(),
+        )
+
+    @staticmethod
+    def controversy_expression(accurate: Any, disagree: Any) -> Case:
+        """
+        SQL expression for how controversial a diff's votes are.
+
+        (accurate + disagree) ** (minority / majority): grows with the number
+        of opposing votes and is largest for an even split; 0 when either side
+        has no votes. NEEDS_NUANCE votes take no side.
+
+        Args:
+            accurate: Expression for the ACCURATE vote count
+            disagree: Expression for the DISAGREE vote count
+
+        Returns:
+            Float expression, 0 for uncontested diffs
+        """
+        accurate = Cast(accurate, FloatField())
+        disagree = Cast(disagree, FloatField())
+        return Case(
+            When(
+                GreaterThanOrEqual(accurate, 1) & GreaterThanOrEqual(disagree, 1),
+                then=Power(accurate + disagree, Least(accurate, disagree) / Greatest(accurate, disagree)),
+            ),
+            default=Value(0.0),
+            output_field=FloatField(),
+        )
+
+    @staticmethod
+    def disputed_expression(accurate: Any, total: Any) -> Case:
+        """
+        SQL expression for whether a diff's votes are split enough to be disputed.
+
+        Args:
+            accurate: Expression for the diff's ACCURATE vote count
+            total: Expression for the diff's total vote count
+
+        Returns:
+            Boolean expression: at least MIN_VOTES_FOR_DISPUTE votes, between
+            DISPUTE_ACCURACY_MIN and DISPUTE_ACCURACY_MAX of them accurate
+        """
+        accurate_ratio = ExpressionWrapper(
+            Cast(accurate, FloatField()) / NullIf(total, 0), output_field=FloatField()
+        )
+        return Case(
+            When(
+                GreaterThanOrEqual(total, MIN_VOTES_FOR_DISPUTE)
+                & GreaterThanOrEqual(accurate_ratio, DISPUTE_ACCURACY_MIN)
+                & LessThanOrEqual(accurate_ratio, DISPUTE_ACCURACY_MAX),
+                then=Value(True),
+            ),
+            default=Value(False),
+            output_field=BooleanField(),
+        )
+
+    @staticmethod
+    def refresh_comment_flag(diff_id: int) -> None:
+        """Recompute whether a diff has LIVE comments, in one UPDATE."""
+        DiffItem.objects.filter(pk=diff_id).update(
+            has_live_comments=Exists(DiffComment.objects.filter(diff_item=OuterRef('pk'), status='LIVE'))
+        )
+
+    @staticmethod
+    def refresh_thread_counts(path: str) -> None:
+        """
+        Recount the visible replies of every comment in a thread.
+
+        Reads the thread with one path range query and writes only the
+        counters that changed, so status changes anywhere in the thread
+        (hiding a comment hides its replies too) are reflected.
+
+        Args:
+            path: Path of any comment in the thread
+        """
+        if not path:
+            return  # Not inserted through DiffComment.save
+
+        comments = list(
+            DiffComment.objects.filter(path__startswith=path[:COMMENT_PATH_WIDTH]).order_by('path').only(
+                'id', 'parent_id', 'status', 'reply_count', 'descendant_count'
+            )
+        )
+        by_id = {comment.pk: comment for comment in comments}
+
+        # Parents sort before their replies
+        visible = set()
+        for comment in comments:
+            if comment.status == 'LIVE' and (comment.parent_id is None or comment.parent_id in visible):
+                visible.add(comment.pk)
+
+        reply_counts = dict.fromkeys(by_id, 0)
+        descendant_counts = dict.fromkeys(by_id, 0)
+        for comment in reversed(comments):
+            if comment.parent_id is not None and comment.pk in visible:
+                reply_counts[comment.parent_id] += 1
+                descendant_counts[comment.parent_id] += 1 + descendant_counts[comment.pk]
+
+        changed = []
+        for comment in comments:
+            counts = (reply_counts[comment.pk], descendant_counts[comment.pk])
+            if counts != (comment.reply_count, comment.descendant_count):
+                comment.reply_count, comment.descendant_count = counts
+                changed.append(comment)
+        DiffComment.objects.bulk_update(changed, ['reply_count', 'descendant_count'])
+
+    @staticmethod
+    def get_comment_threads(
+        roots: List[DiffComment],
+        max_depth: int,
+        max_spoiler_level: Optional[int] = None,
+    ) -> List[DiffComment]:
+        """
+        Load the visible replies of consecutive threads with one path range query.
+
+        Args:
+            roots: Comments starting the threads, at the same depth, in path
+                   order within each diff (a page of top-level comments, the
+                   first threads of several diffs, or one comment to continue
+                   its thread)
+            max_depth: Reply levels to load below the roots
+            max_spoiler_level: Leave out replies above this spoiler level
+
+        Returns:
+            The roots and their replies, in display order (grouped by diff in
+            the roots' order). Replies under a comment that is left out (not
+            LIVE, or too spoilery) are left out too.
+        """
+        if not roots:
+            return []
+
+        # One path range per diff, from its first thread to its last
+        diff_roots: Dict[int, List[DiffComment]] = {}
+        for root in roots:
+            diff_roots.setdefault(root.diff_item_id, []).append(root)
+        ranges = Q()
+        for diff_id, threads in diff_roots.items():
+            ranges |= Q(
+                diff_item_id=diff_id,
+                path__gt=threads[0].path,
+                path__lt=f"{threads[-1].path}:",  # ':' sorts right after the digits
+            )
+
+        depth = roots[0].depth
+        replies = DiffComment.objects.filter(
+            ranges,
+            depth__gt=depth,
+            depth__lte=depth + max_depth,
+            status='LIVE',
+        ).select_related('user', 'diff_item__work', 'diff_item__screen_work').order_by('path')
+        if max_spoiler_level is not None:
+            replies = replies.filter(spoiler_level__lte=max_spoiler_level)
+
+        # Parents sort before their replies
+        included = {root.pk for root in roots}
+        comments = list(roots)
+        for reply in replies:
+            if reply.parent_id in included:
+                included.add(reply.pk)
+                comments.append(reply)
+        diff_order = {diff_id: index for index, diff_id in enumerate(diff_roots)}
+        return sorted(comments, key=lambda comment: (diff_order[comment.diff_item_id], comment.path))
+
+    @staticmethod
+    def get_first_threads(
+        diff_ids: List[int],
+        per_diff: int,
+        max_spoiler_level: Optional[int] = None,
+    ) -> List[DiffComment]:
+        """
+        Get the first top-level comments of several diffs with one query.
+
+        Args:
+            diff_ids: DiffItem IDs
+            per_diff: Top-level comments to get per diff
+            max_spoiler_level: Leave out comments above this spoiler level
+
+        Returns:
+            Top-level LIVE comments in path order within each diff, each
+            annotated with thread_count (the diff's visible top-level comments)
+        """
+        if not diff_ids:
+            return []
+
+        per_diff_window = {'partition_by': [F('diff_item_id')]}
+        roots = DiffComment.objects.filter(diff_item_id__in=diff_ids, depth=0, status='LIVE')
+        if max_spoiler_level is not None:
+            roots = roots.filter(spoiler_level__lte=max_spoiler_level)
+        return list(
+            roots.annotate(
+                position=Window(RowNumber(), order_by=F('path').asc(), **per_diff_window),
+                thread_count=Window(Count('id'), **per_diff_window),
+            ).filter(position__lte=per_diff).select_related(
+                'user', 'diff_item__work', 'diff_item__screen_work'
+            ).order_by('diff_item_id', 'path')
+        )
+
+    @staticmethod
+    def reconcile_vote_counts(dry_run: bool = False) -> int:
+        """
+        Recount every diff's votes and fix counters that drifted.
+
+        Counters drift only through writes that bypass model signals
+        (bulk_create, queryset update/delete, raw SQL).
+
+        Args:
+            dry_run: Only count drifted diffs, without fixing them
+
+        Returns:
+            Number of diffs whose counters were wrong
+        """
+        def vote_count(vote_type=None):
+            votes = DiffVote.objects.filter(diff_item=OuterRef('pk'))
+            if vote_type:
+                votes = votes.filter(vote=vote_type)
+            return Coalesce(
+                Subquery(votes.order_by().values('diff_item').annotate(n=Count('id')).values('n')),
+                0,
+            )
+
+        actual = {field: vote_count(vote_type) for vote_type, field in VOTE_COUNT_FIELDS.items()}
+        actual['total_votes'] = vote_count()
+
+        drifted = DiffItem.objects.annotate(
+            **{f'actual_{field}': expression for field, expression in actual.items()}
+        ).filter(
+            ~Q(**{field: F(f'actual_{field}') for field in actual})
+        ).values_list('pk', flat=True)
+        drifted_ids = list(drifted)
+
+        if drifted_ids and not dry_run:
+            DiffItem.objects.filter(pk__in=drifted_ids).update(**actual)
+            DiffItem.objects.filter(pk__in=drifted_ids).update(**DiffService.derived_vote_fields())
+        return len(drifted_ids)
+
     @staticmethod
     def add_comment(diff_id: int, user: User, body: str, spoiler_scope: str) -> DiffComment:
         """Add a comment to a diff."""
@@ -171,387 +544,287 @@ class DiffService:
         ).select_related('work', 'screen_work', 'created_by').prefetch_related('votes')
 
         if max_spoiler_scope:
-            # Apply spoiler filtering using constant
-            max_level = SPOILER_SCOPE_ORDER.get(max_spoiler_scope, 0)
-            allowed_scopes = [k for k, v in SPOILER_SCOPE_ORDER.items() if v <= max_level]
-            queryset = queryset.filter(spoiler_scope__in=allowed_scopes)
+            queryset = queryset.filter(spoiler_level__lte=SPOILER_SCOPE_ORDER.get(max_spoiler_scope, 0))
 
         return list(queryset)
 
     @staticmethod
-    def _get_trending_query(cutoff_date):
-        """Build the trending comparisons query with activity metrics."""
-        return DiffItem.objects.filter(
-            status='LIVE'
-        ).values(
-            'work_id', 'screen_work_id'
-        ).annotate(
-            # Total number of diffs for this comparison
-            total_diffs=Count('id', distinct=True),
-            # Recent diffs (created in last N days)
-            recent_diffs=Count(
-                'id',
-                filter=Q(created_at__gte=cutoff_date),
-                distinct=True
-            ),
-            # Recent votes (cast in last N days on any diff in this comparison)
-            recent_votes=Count(
-                'votes',
-                filter=Q(votes__created_at__gte=cutoff_date),
-                distinct=True
-            ),
-        ).annotate(
-            # Activity score: (recent_diffs * weight) + (recent_votes * weight)
-            # Weight new diffs more heavily than votes to encourage new content
-            activity_score=ExpressionWrapper(
-                (F('recent_diffs') * TRENDING_DIFF_WEIGHT) + (F('recent_votes') * TRENDING_VOTE_WEIGHT),
-                output_field=FloatField()
-            )
-        ).filter(
-            # Only include comparisons with recent activity
-            activity_score__gt=0
-        ).order_by(
-            '-activity_score', '-recent_diffs', '-total_diffs'
+    def get_comparison_diff_ids(
+        work_id: int,
+        screen_work_id: int,
+        max_level: int = MAX_SPOILER_LEVEL,
+        ordering: str = DEFAULT_DIFF_ORDERING,
+    ) -> List[int]:
+        """
+        Get the IDs of a comparison's LIVE diffs in list order.
+
+        Args:
+            work_id: Work ID
+            screen_work_id: ScreenWork ID
+            max_level: Maximum spoiler level (see SPOILER_SCOPE_ORDER)
+            ordering: Key of DIFF_ORDERINGS
+
+        Returns:
+            Diff IDs, read from the comparison's spoiler level indexes
+        """
+        queryset = DiffItem.objects.filter(work_id=work_id, screen_work_id=screen_work_id, status='LIVE')
+        if max_level < MAX_SPOILER_LEVEL:
+            queryset = queryset.filter(spoiler_level__lte=max_level)
+        return list(queryset.order_by(*DIFF_ORDERINGS[ordering]).values_list('id', flat=True))
+
+    @staticmethod
+    def _comparison_vote_stats_data(stats: ComparisonStats) -> Dict[str, Any]:
+        """Comparison vote statistics of a ComparisonStats row (see get_comparison_vote_stats)."""
+        preference_breakdown = {
+            preference: getattr(stats, field)
+            for preference, field in ComparisonStatsService.PREFERENCE_FIELDS.items()
+        }
+
+        return {
+            'total_votes': sum(preference_breakdown.values()),
+            'preference_breakdown': preference_breakdown,
+            'faithfulness': {
+                'average': stats.faithfulness_average,
+                'count': stats.faithfulness_count,
+                'histogram': {str(rating): votes for rating, votes in stats.faithfulness_histogram.items()},
+            },
+        }
+
+    @staticmethod
+    def get_comparison_vote_stats(work_id: int, screen_work_id: int) -> Dict[str, Any]:
+        """
+        Get aggregated comparison vote statistics for a comparison.
+
+        Only votes from users who confirmed reading the book and watching the
+        adaptation are counted. Read from the materialized ComparisonStats row.
+
+        Args:
+            work_id: Work ID
+            screen_work_id: ScreenWork ID
+
+        Returns:
+            Dict with total_votes, preference_breakdown and faithfulness
+            (average, count, and histogram of votes per rating)
+        """
+        stats = ComparisonStats.objects.filter(work_id=work_id, screen_work_id=screen_work_id).first()
+        if stats is None:
+            stats = ComparisonStats(work_id=work_id, screen_work_id=screen_work_id)
+        return DiffService._comparison_vote_stats_data(stats)
+
+    @staticmethod
+    def get_comparison_vote_stats_batch(pairs: List[Tuple[int, int]]) -> Dict[Tuple[int, int], Dict[str, Any]]:
+        """
+        Get aggregated comparison vote statistics for many comparisons with one query.
+
+        Args:
+            pairs: (work_id, screen_work_id) pairs
+
+        Returns:
+            Dict mapping each pair to its statistics (see get_comparison_vote_stats)
+        """
+        pairs = list(dict.fromkeys(pairs))
+        if not pairs:
+            return {}
+
+        rows = ComparisonStats.objects.filter(
+            work_id__in={work_id for work_id, _ in pairs},
+            screen_work_id__in={screen_work_id for _, screen_work_id in pairs},
         )
+        found = {(stats.work_id, stats.screen_work_id): stats for stats in rows}
+
+        return {
+            pair: DiffService._comparison_vote_stats_data(
+                found.get(pair) or ComparisonStats(work_id=pair[0], screen_work_id=pair[1])
+            )
+            for pair in pairs
+        }
 
     @staticmethod
-    def _apply_diversity_filter(comparisons, limit: int, max_per_work: int = TRENDING_MAX_PER_WORK) -> tuple:
+    def _apply_diversity_filter(comparisons, limit: int, max_per_work: int = TRENDING_MAX_PER_WORK) -> list:
         """
-        Apply diversity filtering to limit comparisons from the same work.
+        Take comparisons in order, skipping those beyond max_per_work from the same work.
 
-        Returns tuple of (comparisons_list, work_ids, screen_work_ids) for bulk fetching.
+        Single pass over the rows, stopping as soon as limit comparisons are taken.
+
+        Returns:
+            Up to limit comparisons
         """
-        work_ids_to_fetch = set()
-        screen_work_ids_to_fetch = set()
-        comparisons_list = []
+        per_work = Counter()
+        selected = []
 
         for comparison in comparisons:
-            work_id = comparison['work_id']
-
-            # Diversity check: limit comparisons from same book
-            work_count = sum(1 for c in comparisons_list if c['work_id'] == work_id)
-            if work_count >= max_per_work:
+            if per_work[comparison.work_id] >= max_per_work:
                 continue
 
-            comparisons_list.append(comparison)
-            work_ids_to_fetch.add(work_id)
-            screen_work_ids_to_fetch.add(comparison['screen_work_id'])
-
-            # Stop when we have enough results
-            if len(comparisons_list) >= limit:
+            per_work[comparison.work_id] += 1
+            selected.append(comparison)
+            if len(selected) >= limit:
                 break
 
-        return comparisons_list, list(work_ids_to_fetch), list(screen_work_ids_to_fetch)
+        return selected
 
     @staticmethod
-    def get_trending_comparisons(limit: int = 8, days: int = 7) -> List[Dict[str, Any]]:
+    def get_trending_comparisons(limit: int = 8, days: int = TRENDING_LOOKBACK_DAYS) -> List[Dict[str, Any]]:
         """
         Get trending comparisons based on recent activity.
 
         Trending algorithm:
-        1. Recent activity (diffs added or votes cast in last N days)
-        2. Volume of activity (number of recent diffs + votes)
+        1. Activity score: new diffs, votes and comments, weighted and decayed
+           exponentially with age (half-life TRENDING_HALF_LIFE_HOURS)
+        2. Recency: only comparisons with activity in the last N days
         3. Diversity (prefer different books, not all from same book)
 
+        Scores are maintained incrementally on ComparisonStats and decayed to
+        the present here, so this reads one row per active comparison.
+
         Args:
             limit: Number of trending comparisons to return (default 8)
-            days: Number of days to look back for activity (default 7)
+            days: Number of days to look back for activity (default TRENDING_LOOKBACK_DAYS)
 
         Returns:
             List of dicts with comparison metadata (work details, activity metrics, etc.)
         """
-        # Calculate cutoff date and get trending comparisons
-        cutoff_date = timezone.now() - timedelta(days=TRENDING_LOOKBACK_DAYS)
-        comparisons = DiffService._get_trending_query(cutoff_date)
-
-        # Apply diversity filtering
-        comparisons_list, work_ids_to_fetch, screen_work_ids_to_fetch = DiffService._apply_diversity_filter(
-            comparisons, limit
-        )
-
-        # Bulk fetch all needed works and screen works
-        works, screen_works = DiffService._bulk_fetch_works_and_screens(
-            work_ids_to_fetch, screen_work_ids_to_fetch
+        now = timezone.now()
+        decay = ComparisonStatsService.decay_expression('trending_at', now)
+        stats = ComparisonStats.objects.filter(
+            diff_count__gt=0,
+            trending_at__gte=now - timedelta(days=days),
+        ).annotate(
+            decay=decay,
+            activity_score=ExpressionWrapper(F('trending_score') * decay, output_field=FloatField()),
+        ).select_related('work', 'screen_work').order_by('-activity_score', '-diff_count')
+
+        return DiffService._build_stats_comparison_dicts(
+            DiffService._apply_diversity_filter(stats, limit),
+            # Extra fields specific to trending (diffs and votes decayed with age, so fractional)
+            total_diffs=lambda row: row.diff_count,
+            decayed_diffs=lambda row: round(row.trending_diffs * row.decay, 2),
+            decayed_votes=lambda row: round(row.trending_votes * row.decay, 2),
+            activity_score=lambda row: round(row.activity_score, 3),
         )
 
-        # Get comparison vote counts
-        comparison_votes = DiffService._get_comparison_votes(list(work_ids_to_fetch), list(screen_work_ids_to_fetch))
-
-        # Build the final results
-        results = []
-        for comparison in comparisons_list:
-            work = works[comparison['work_id']]
-            screen_work = screen_works[comparison['screen_work_id']]
-
-            results.append(DiffService._build_comparison_dict(
-                work=work,
-                screen_work=screen_work,
-                diff_count=comparison['total_diffs'],
-                vote_count=0,  # Not tracked for trending
-                comparison_vote_count=comparison_votes.get((work.id, screen_work.id), 0),
-                # Extra fields specific to trending
-                total_diffs=comparison['total_diffs'],
-                recent_diffs=comparison['recent_diffs'],
-                recent_votes=comparison['recent_votes'],
-                activity_score=float(comparison['activity_score']),
-            ))
-
-        return results
-
     @staticmethod
     def get_featured_comparisons(limit: int = 12) -> List[Dict[str, Any]]:
         """
         Get featured comparisons with highest overall engagement.
 
         Featured algorithm:
-        - Curated work IDs get priority
+        - Only curated works (CURATED_WORK_IDS)
         - Total diffs (weighted 2x)
         - Total votes
-        - Recent activity boost
+        - Recent activity as tie-breaker
 
         Returns list of comparison dicts with metadata.
         """
-        from works.models import Work
-        from screen.models import ScreenWork
-
-        # Curated work IDs - only these will appear in featured
-        # Lord of the Rings, Jurassic Park, Harry Potter, It, Dune, Hunger Games, The Shining, Fight Club
-        CURATED_WORK_IDS = [1, 12, 9, 23, 10, 11, 22, 38]
-
-        comparisons = DiffItem.objects.filter(
-            status='LIVE',
-            work_id__in=CURATED_WORK_IDS  # Only show curated works
-        ).values(
-            'work_id', 'screen_work_id'
-        ).annotate(
-            total_diffs=Count('id', distinct=True),
-            total_votes=Count('votes', distinct=True),
-            last_updated=Max('updated_at'),
-        ).annotate(
+        stats = ComparisonStats.objects.filter(
+            work_id__in=CURATED_WORK_IDS,  # Only show curated works
+            diff_count__gt=0
+        ).select_related('work', 'screen_work').annotate(
             # Engagement score
             engagement_score=ExpressionWrapper(
-                (F('total_diffs') * 2.0) + (F('total_votes') * 1.0),
+                (F('diff_count') * FEATURED_DIFF_WEIGHT) + (F('vote_count') * FEATURED_VOTE_WEIGHT),
                 output_field=FloatField()
             )
-        ).filter(
-            total_diffs__gt=0
         ).order_by(
-            '-engagement_score', '-last_updated'
+            '-engagement_score', F('last_activity').desc(nulls_last=True)
         )[:limit]
 
-        # Bulk fetch works and screen works
-        work_ids = [c['work_id'] for c in comparisons]
-        screen_work_ids = [c['screen_work_id'] for c in comparisons]
-        works, screen_works = DiffService._bulk_fetch_works_and_screens(work_ids, screen_work_ids)
-
-        # Get comparison vote counts for each comparison
-        comparison_votes = DiffService._get_comparison_votes(work_ids, screen_work_ids)
-
-        results = []
-        for comparison in comparisons:
-            work = works[comparison['work_id']]
-            screen_work = screen_works[comparison['screen_work_id']]
-
-            results.append(DiffService._build_comparison_dict(
-                work=work,
-                screen_work=screen_work,
-                diff_count=comparison['total_diffs'],
-                vote_count=comparison['total_votes'],
-                comparison_vote_count=comparison_votes.get((work.id, screen_work.id), 0),
-            ))
-
-        return results
+        return DiffService._build_stats_comparison_dicts(stats)
 
     @staticmethod
     def get_recently_updated(limit: int = 12) -> List[Dict[str, Any]]:
         """
-        Get comparisons with recent activity (last 48 hours).
+        Get comparisons with recent activity (last RECENTLY_UPDATED_HOURS hours).
         """
-        from works.models import Work
-        from screen.models import ScreenWork
+        cutoff = timezone.now() - timedelta(hours=RECENTLY_UPDATED_HOURS)
 
-        cutoff = timezone.now() - timedelta(hours=48)
-
-        comparisons = DiffItem.objects.filter(
-            status='LIVE',
-            updated_at__gte=cutoff
-        ).values(
-            'work_id', 'screen_work_id'
-        ).annotate(
-            total_diffs=Count('id', distinct=True),
-            total_votes=Count('votes', distinct=True),
-            last_updated=Max('updated_at'),
-        ).order_by('-last_updated')[:limit]
-
-        # Bulk fetch
-        work_ids = [c['work_id'] for c in comparisons]
-        screen_work_ids = [c['screen_work_id'] for c in comparisons]
-        works, screen_works = DiffService._bulk_fetch_works_and_screens(work_ids, screen_work_ids)
-
-        # Get comparison vote counts
-        comparison_votes = DiffService._get_comparison_votes(work_ids, screen_work_ids)
-
-        results = []
-        for comparison in comparisons:
-            work = works[comparison['work_id']]
-            screen_work = screen_works[comparison['screen_work_id']]
-
-            results.append(DiffService._build_comparison_dict(
-                work=work,
-                screen_work=screen_work,
-                diff_count=comparison['total_diffs'],
-                vote_count=comparison['total_votes'],
-                comparison_vote_count=comparison_votes.get((work.id, screen_work.id), 0),
-                last_updated=comparison['last_updated'],
-            ))
+        stats = ComparisonStats.objects.filter(
+            diff_count__gt=0,
+            last_activity__gte=cutoff
+        ).select_related('work', 'screen_work').order_by('-last_activity')[:limit]
 
-        return results
+        return DiffService._build_stats_comparison_dicts(stats, last_updated=lambda row: row.last_activity)
 
     @staticmethod
     def get_most_documented(limit: int = 12) -> List[Dict[str, Any]]:
         """
         Get comparisons with the most diffs documented.
         """
-        from works.models import Work
-        from screen.models import ScreenWork
-
-        comparisons = DiffItem.objects.filter(
-            status='LIVE'
-        ).values(
-            'work_id', 'screen_work_id'
-        ).annotate(
-            total_diffs=Count('id', distinct=True),
-            total_votes=Count('votes', distinct=True),
-        ).filter(
-            total_diffs__gt=0
-        ).order_by('-total_diffs', '-total_votes')[:limit]
-
-        # Bulk fetch
-        work_ids = [c['work_id'] for c in comparisons]
-        screen_work_ids = [c['screen_work_id'] for c in comparisons]
-        works, screen_works = DiffService._bulk_fetch_works_and_screens(work_ids, screen_work_ids)
-
-        # Get comparison vote counts
-        comparison_votes = DiffService._get_comparison_votes(work_ids, screen_work_ids)
-
-        results = []
-        for comparison in comparisons:
-            work = works[comparison['work_id']]
-            screen_work = screen_works[comparison['screen_work_id']]
-
-            results.append(DiffService._build_comparison_dict(
-                work=work,
-                screen_work=screen_work,
-                diff_count=comparison['total_diffs'],
-                vote_count=comparison['total_votes'],
-                comparison_vote_count=comparison_votes.get((work.id, screen_work.id), 0),
-            ))
+        stats = ComparisonStats.objects.filter(
+            diff_count__gt=0
+        ).select_related('work', 'screen_work').order_by('-diff_count', '-vote_count', '-id')[:limit]
 
-        return results
+        return DiffService._build_stats_comparison_dicts(stats)
 
     @staticmethod
     def _get_comparisons_needing_diffs(limit: int) -> List[Dict[str, Any]]:
-        """Get comparisons with fewer than 3 diffs."""
-        return list(DiffItem.objects.filter(
-            status='LIVE'
-        ).values(
-            'work_id', 'screen_work_id'
-        ).annotate(
-            total_diffs=Count('id')
-        ).filter(
-            total_diffs__lt=3
-        ).order_by('total_diffs', 'work_id', 'screen_work_id')[:limit])
+        """Get comparisons with fewer than 3 LIVE diffs, fewest diffs and votes first."""
+        stats = ComparisonStats.objects.filter(
+            diff_count__gt=0, diff_count__lt=3
+        ).select_related('work', 'screen_work').order_by('diff_count', 'vote_count', 'id')[:limit]
+
+        return [
+            DiffService._build_comparison_dict(
+                work=row.work,
+                screen_work=row.screen_work,
+                diff_count=row.diff_count,
+            )
+            for row in stats
+        ]
 
     @staticmethod
-    def _get_disputed_comparisons(limit: int) -> List[tuple]:
+    def _top_comparisons_by_flag(flagged: Q, count_field: str, limit: int) -> List[Dict[str, Any]]:
         """
-        Get comparisons with controversial diffs that need discussion.
+        Get the comparisons with the most LIVE diffs matching a needs-help flag.
 
-        Returns list of ((work_id, screen_id), data) tuples sorted by controversy.
-        """
-        disputed_by_comparison = {}
-        disputed_diffs = DiffItem.objects.filter(
-            status='LIVE'
-        ).select_related('work', 'screen_work').annotate(
-            accurate_count=Count('votes', filter=Q(votes__vote='ACCURATE'), distinct=True),
-            disagree_count=Count('votes', filter=Q(votes__vote='DISAGREE'), distinct=True),
-            nuance_count=Count('votes', filter=Q(votes__vote='NEEDS_NUANCE'), distinct=True),
-        ).annotate(
-            total_votes=F('accurate_count') + F('disagree_count') + F('nuance_count')
-        ).filter(
-            total_votes__gte=MIN_VOTES_FOR_DISPUTE
-        )
+        Grouped, sorted and limited in SQL over the flag's partial index, so
+        only limit rows reach Python.
 
-        for diff in disputed_diffs:
-            key = (diff.work_id, diff.screen_work_id)
-            if key not in disputed_by_comparison:
-                disputed_by_comparison[key] = {
-                    'work': diff.work,
-                    'screen_work': diff.screen_work,
-                    'disputed_count': 0,
-                    'total_votes': 0,
-                }
-            # Calculate controversy: more controversial when votes are split
-            accurate = diff.accurate_count
-            disagree = diff.disagree_count
-            nuance = diff.nuance_count
-            total = accurate + disagree + nuance
-            if total > 0:
-                accurate_pct = accurate / total
-                is_controversial = DISPUTE_ACCURACY_MIN <= accurate_pct <= DISPUTE_ACCURACY_MAX
-                if is_controversial:
-                    disputed_by_comparison[key]['disputed_count'] += 1
-                    disputed_by_comparison[key]['total_votes'] += total
-
-        # Sort by number of disputed diffs
-        return sorted(
-            disputed_by_comparison.items(),
-            key=lambda x: (x[1]['disputed_count'], x[1]['total_votes']),
-            reverse=True
-        )[:limit]
+        Args:
+            flagged: Filter selecting the flagged diffs
+            count_field: Output key for the number of flagged diffs
+            limit: Number of comparisons to return
 
-    @staticmethod
-    def _get_uncommented_comparisons(limit: int) -> List[tuple]:
+        Returns:
+            Comparison dicts with count_field and total_votes of the flagged diffs
         """
-        Get comparisons with diffs that have votes but no comments.
+        rows = list(DiffItem.objects.filter(flagged, status='LIVE').values('work_id', 'screen_work_id').annotate(
+            flagged_count=Count('id'),
+            flagged_votes=Sum('total_votes'),
+        ).order_by('-flagged_count', '-flagged_votes', 'work_id', 'screen_work_id')[:limit])
 
-        Returns list of ((work_id, screen_id), data) tuples sorted by need.
-        """
-        no_comments_by_comparison = {}
-        no_comments_diffs = DiffItem.objects.filter(
-            status='LIVE'
-        ).select_related('work', 'screen_work').annotate(
-            comment_count=Count('comments', filter=Q(comments__status='LIVE'), distinct=True),
-            vote_count=Count('votes', distinct=True)
-        ).filter(
-            comment_count=0,
-            vote_count__gte=1  # Has at least one vote but no discussion
+        works_dict, screens_dict = DiffService._bulk_fetch_works_and_screens(
+            [row['work_id'] for row in rows], [row['screen_work_id'] for row in rows]
         )
+        return [
+            DiffService._build_comparison_dict(
+                work=works_dict[row['work_id']],
+                screen_work=screens_dict[row['screen_work_id']],
+                total_votes=row['flagged_votes'],
+                **{count_field: row['flagged_count']},
+            )
+            for row in rows
+        ]
 
-        for diff in no_comments_diffs:
-            key = (diff.work_id, diff.screen_work_id)
-            if key not in no_comments_by_comparison:
-                no_comments_by_comparison[key] = {
-                    'work': diff.work,
-                    'screen_work': diff.screen_work,
-                    'no_comment_count': 0,
-                    'total_votes': 0,
-                }
-            no_comments_by_comparison[key]['no_comment_count'] += 1
-            no_comments_by_comparison[key]['total_votes'] += diff.vote_count
-
-        # Sort by number of no-comment diffs
-        return sorted(
-            no_comments_by_comparison.items(),
-            key=lambda x: (x[1]['no_comment_count'], x[1]['total_votes']),
-            reverse=True
-        )[:limit]
+    @staticmethod
+    def _get_disputed_comparisons(limit: int) -> List[Dict[str, Any]]:
+        """Get comparisons with the most controversial diffs (see DiffItem.is_disputed)."""
+        return DiffService._top_comparisons_by_flag(Q(is_disputed=True), 'disputed_diff_count', limit)
+
+    @staticmethod
+    def _get_uncommented_comparisons(limit: int) -> List[Dict[str, Any]]:
+        """Get comparisons with the most diffs that have votes but no LIVE comments."""
+        return DiffService._top_comparisons_by_flag(
+            Q(has_live_comments=False, total_votes__gte=1), 'no_comment_diff_count', limit
+        )
 
     @staticmethod
     def get_needs_help(limit: int = 20) -> Dict[str, Any]:
         """
         Get comparisons that need community help (grouped by comparison, not individual diffs).
 
+        Each section is one top-K SQL query over a maintained count or flag.
+
         Returns:
             dict with sections:
             - needs_differences: Comparisons with <3 diffs
@@ -560,153 +833,474 @@ class DiffService:
 
         Each item includes counts of how many diffs need help.
         """
-        from works.models import Work
-        from screen.models import ScreenWork
+        return {
+            'needs_differences': DiffService._get_comparisons_needing_diffs(limit),
+            'most_disputed': DiffService._get_disputed_comparisons(limit),
+            'no_comments': DiffService._get_uncommented_comparisons(limit),
+        }
 
-        # Get data from helper methods
-        needs_diffs_comparisons = DiffService._get_comparisons_needing_diffs(limit * 2)  # Get extra for filtering
-        most_disputed_comparisons = DiffService._get_disputed_comparisons(limit)
-        no_comments_comparisons = DiffService._get_uncommented_comparisons(limit)
-
-        # Build needs_differences - need to bulk fetch works/screens since helper returns IDs only
-        work_ids = [c['work_id'] for c in needs_diffs_comparisons[:limit]]
-        screen_ids = [c['screen_work_id'] for c in needs_diffs_comparisons[:limit]]
-        works_dict, screens_dict = DiffService._bulk_fetch_works_and_screens(work_ids, screen_ids)
-
-        needs_differences = []
-        for comparison in needs_diffs_comparisons[:limit]:
-            work = works_dict.get(comparison['work_id'])
-            screen = screens_dict.get(comparison['screen_work_id'])
-            if work and screen:
-                needs_differences.append(DiffService._build_comparison_dict(
-                    work=work,
-                    screen_work=screen,
-                    diff_count=comparison['total_diffs'],
-                ))
-
-        # Build most_disputed - helper already has work/screen objects via select_related
-        most_disputed = []
-        for (work_id, screen_id), data in most_disputed_comparisons:
-            most_disputed.append(DiffService._build_comparison_dict(
-                work=data['work'],
-                screen_work=data['screen_work'],
-                disputed_diff_count=data['disputed_count'],
-                total_votes=data['total_votes'],
-            ))
+    # Keys each browse sort orders comparisons by, descending with NULLs last,
+    # then by stats ID; indexed on ComparisonStats (or the joined table)
+    BROWSE_SORT_KEYS = {
+        'popularity': [F('screen_work__tmdb_popularity'), F('work__title')],  # TMDb popularity score
+        'trending': [F('last_activity'), F('diff_count') + F('vote_count')],  # Recent activity, then engagement
+        'most_documented': [F('diff_count'), F('vote_count')],
+        'recently_updated': [F('last_activity')],
+        'newest': [F('edge__created_at')],  # When the comparison was added
+    }
 
-        # Build no_comments - helper already has work/screen objects via select_related
-        no_comments = []
-        for (work_id, screen_id), data in no_comments_comparisons:
-            no_comments.append(DiffService._build_comparison_dict(
-                work=data['work'],
-                screen_work=data['screen_work'],
-                no_comment_diff_count=data['no_comment_count'],
-                total_votes=data['total_votes'],
-            ))
+    @staticmethod
+    def _encode_comparison_cursor(sort: str, values: list, last_id: int) -> str:
+        """Encode the position after a row as an opaque cursor."""
+        payload = json.dumps({'sort': sort, 'keys': values, 'id': last_id}, cls=DjangoJSONEncoder)
+        return base64.urlsafe_b64encode(payload.encode()).decode()
 
-        return {
-            'needs_differences': needs_differences,
-            'most_disputed': most_disputed,
-            'no_comments': no_comments,
-        }
+    @staticmethod
+    def _decode_comparison_cursor(cursor: str, sort: str, fields: list) -> tuple[list, int]:
+        """
+        Decode a cursor made by _encode_comparison_cursor.
+
+        Args:
+            cursor: Cursor from a previous page
+            sort: Sort the cursor must have been made for
+            fields: Output field of each sort key, converting its value back from JSON
+
+        Returns:
+            Tuple of (sort key values, stats ID) of the last row already served
+
+        Raises:
+            ValueError: If the cursor is malformed or was made for another sort
+        """
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        if (
+            not isinstance(payload, dict)
+            or payload.get('sort') != sort
+            or not isinstance(payload.get('keys'), list)
+            or len(payload['keys']) != len(DiffService.BROWSE_SORT_KEYS[sort])
+            or not isinstance(payload.get('id'), int)
+        ):
+            raise ValueError('Invalid cursor')
+        try:
+            values = [
+                None if value is None else field.to_python(value)
+                for field, value in zip(fields, payload['keys'])
+            ]
+        except ValidationError:
+            raise ValueError('Invalid cursor')
+        return values, payload['id']
 
     @staticmethod
-    def get_all_comparisons(limit: int = 50, sort: str = 'popularity') -> List[Dict[str, Any]]:
+    def _keyset_after(names: List[str], values: list, last_id: int) -> Q:
+        """Match rows after a position in (names..., id) order, descending with NULLs last."""
+        after = Q(id__lt=last_id)
+        for name, value in reversed(list(zip(names, values))):
+            if value is None:
+                after = Q(**{f'{name}__isnull': True}) & after
+            else:
+                after = (
+                    Q(**{f'{name}__lt': value})
+                    | Q(**{f'{name}__isnull': True})
+                    | (Q(**{name: value}) & after)
+                )
+        return after
+
+    @staticmethod
+    def get_comparisons_page(sort: str = 'popularity', limit: int = 50, cursor: Optional[str] = None) -> Dict[str, Any]:
         """
-        Get all available book-to-screen comparisons from AdaptationEdge.
+        Get one page of all book-to-screen comparisons (those with an AdaptationEdge).
+
+        Sorted and paginated in SQL with keyset pagination, so every page costs
+        one indexed query however deep the client pages.
 
         Args:
-            limit: Number of comparisons to return (default 50)
-            sort: Sort order
+            sort: Sort order (a key of BROWSE_SORT_KEYS)
                 - 'popularity': TMDb popularity score (default)
                 - 'trending': Recent diff activity + engagement
                 - 'most_documented': Highest diff count
                 - 'recently_updated': Most recently updated diffs
                 - 'newest': Most recently added comparisons
+            limit: Number of comparisons to return (default 50)
+            cursor: next_cursor of the previous page, None for the first page
+
+        Returns:
+            Dict with results (comparison dicts with diff/vote counts) and
+            next_cursor (None on the last page)
+
+        Raises:
+            ValueError: If the cursor is invalid for this sort
+        """
+        names = [f'sort_key_{i}' for i in range(len(DiffService.BROWSE_SORT_KEYS[sort]))]
+        stats = ComparisonStats.objects.filter(edge__isnull=False).annotate(
+            **dict(zip(names, DiffService.BROWSE_SORT_KEYS[sort]))
+        ).select_related('work', 'screen_work', 'edge').order_by(
+            *[F(name).desc(nulls_last=True) for name in names], '-id'
+        )
+        if cursor:
+            values, last_id = DiffService._decode_comparison_cursor(
+                cursor, sort, [stats.query.annotations[name].output_field for name in names]
+            )
+            stats = stats.filter(DiffService._keyset_after(names, values, last_id))
+
+        # Fetch one extra row to know whether there is a next page
+        rows = list(stats[:limit + 1])
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            last = rows[-1]
+            next_cursor = DiffService._encode_comparison_cursor(
+                sort, [getattr(last, name) for name in names], last.id
+            )
+
+        results = DiffService._build_stats_comparison_dicts(
+            rows,
+            last_updated=lambda row: row.last_activity.isoformat() if row.last_activity else None,
+            comparison_created_at=lambda row: row.edge.created_at.isoformat() if row.edge.created_at else None,
+        )
+        return {'results': results, 'next_cursor': next_cursor}
+
+    @staticmethod
+    def get_all_comparisons(limit: int = 50, sort: str = 'popularity') -> List[Dict[str, Any]]:
+        """
+        Get the first page of all book-to-screen comparisons.
+
+        Args:
+            limit: Number of comparisons to return (default 50)
+            sort: Sort order (see get_comparisons_page)
 
         Returns comparisons sorted by the specified criteria, with diff/vote counts for each.
         """
-        from works.models import Work
-        from screen.models import ScreenWork, AdaptationEdge
+        return DiffService.get_comparisons_page(sort=sort, limit=limit)['results']
 
-        # Get ALL adaptation edges with related data (no limit yet)
-        # We'll filter and sort after we have all the data
-        edges = AdaptationEdge.objects.select_related('work', 'screen_work').all()
 
-        # Get diff counts and vote counts for all comparisons
-        diff_and_vote_data = DiffItem.objects.filter(
-            status='LIVE'
-        ).values('work_id', 'screen_work_id').annotate(
-            total_diffs=Count('id', distinct=True),
-            total_votes=Count('votes', distinct=True),
-            last_updated=Max('updated_at'),
+class ComparisonStatsService:
+    """Service maintaining the materialized ComparisonStats table."""
+
+    # ComparisonStats field for each confirmed comparison vote preference
+    PREFERENCE_FIELDS = {
+        'BOOK': 'preference_book',
+        'SCREEN': 'preference_screen',
+        'TIE': 'preference_tie',
+        'DIDNT_FINISH': 'preference_didnt_finish',
+    }
+
+    # Fields recomputed by each part of refresh()
+    DIFF_FIELDS = ('diff_count', 'vote_count', 'last_activity')
+    COMMENT_FIELDS = ('comment_count',)
+    # ComparisonStats histogram field for each faithfulness rating
+    FAITHFULNESS_FIELDS = {rating: f'faithfulness_{rating}' for rating in FAITHFULNESS_RATINGS}
+
+    COMPARISON_VOTE_FIELDS = (
+        'comparison_vote_count', *PREFERENCE_FIELDS.values(), *FAITHFULNESS_FIELDS.values(),
+    )
+    TRENDING_FIELDS = ('trending_score', 'trending_diffs', 'trending_votes', 'trending_at')
+
+    # Seconds over which trending activity decays by a factor of e
+    TRENDING_TIME_CONSTANT = TRENDING_HALF_LIFE_HOURS * 3600 / math.log(2)
+    # Floor for decay exponents, so activity idle for years stays representable
+    MIN_DECAY_EXPONENT = -600.0
+
+    @staticmethod
+    def decay_expression(field: str, now) -> Exp:
+        """
+        SQL factor decaying activity recorded as of a timestamp field to now.
+
+        Args:
+            field: DateTimeField name
+            now: Time to decay to
+
+        Returns:
+            Expression for exp(-(now - field) / TRENDING_TIME_CONSTANT), NULL where field is NULL
+        """
+        offset = ExpressionWrapper(F(field) - Value(now, output_field=DateTimeField()), output_field=DurationField())
+        exponent = ExpressionWrapper(
+            Extract(offset, 'epoch') / ComparisonStatsService.TRENDING_TIME_CONSTANT, output_field=FloatField()
         )
+        return Exp(Greatest(exponent, Value(ComparisonStatsService.MIN_DECAY_EXPONENT)), output_field=FloatField())
 
-        # Build lookup dicts
-        comparison_data = {}
-        for item in diff_and_vote_data:
-            key = (item['work_id'], item['screen_work_id'])
-            comparison_data[key] = {
-                'diff_count': item['total_diffs'],
-                'vote_count': item['total_votes'],
-                'last_updated': item['last_updated'],
+    @staticmethod
+    def _diff_stats(**filters) -> Dict[tuple[int, int], Dict[str, Any]]:
+        """Diff count, vote count and last activity of LIVE diffs, by comparison."""
+        rows = DiffItem.objects.filter(status='LIVE', **filters).values('work_id', 'screen_work_id').annotate(
+            diff_count=Count('id'),
+            vote_count=Sum('total_votes'),
+            last_activity=Max('updated_at'),
+        ).order_by()
+        return {
+            (row['work_id'], row['screen_work_id']): {
+                'diff_count': row['diff_count'],
+                'vote_count': row['vote_count'] or 0,
+                'last_activity': row['last_activity'],
+            }
+            for row in rows
+        }
+
+    @staticmethod
+    def _comment_stats(**filters) -> Dict[tuple[int, int], Dict[str, Any]]:
+        """LIVE comment count on LIVE diffs, by comparison."""
+        rows = DiffComment.objects.filter(
+            status='LIVE', diff_item__status='LIVE', **filters
+        ).values('diff_item__work_id', 'diff_item__screen_work_id').annotate(
+            comment_count=Count('id'),
+        ).order_by()
+        return {
+            (row['diff_item__work_id'], row['diff_item__screen_work_id']): {'comment_count': row['comment_count']}
+            for row in rows
+        }
+
+    @staticmethod
+    def _comparison_vote_stats(**filters) -> Dict[tuple[int, int], Dict[str, Any]]:
+        """Comparison vote count, preference breakdown and faithfulness histogram, by comparison."""
+        confirmed = Q(has_read_book=True, has_watched_adaptation=True)
+        rated = confirmed & ~Q(preference='DIDNT_FINISH')
+        rows = ComparisonVote.objects.filter(**filters).values('work_id', 'screen_work_id').annotate(
+            comparison_vote_count=Count('id'),
+            **{
+                field: Count('id', filter=confirmed & Q(preference=preference))
+                for preference, field in ComparisonStatsService.PREFERENCE_FIELDS.items()
+            },
+            **{
+                field: Count('id', filter=rated & Q(faithfulness_rating=rating))
+                for rating, field in ComparisonStatsService.FAITHFULNESS_FIELDS.items()
+            },
+        ).order_by()
+        return {(row.pop('work_id'), row.pop('screen_work_id')): row for row in rows}
+
+    @staticmethod
+    def _trending_stats(work_id: int = None, screen_work_id: int = None) -> Dict[tuple[int, int], Dict[str, Any]]:
+        """
+        Decayed diff, vote and comment activity as of the latest event, by comparison.
+
+        Counts LIVE diffs and the votes and LIVE comments on them, by creation time.
+
+        Args:
+            work_id: Only this comparison's work (with screen_work_id)
+            screen_work_id: Only this comparison's screen work
+        """
+        now = timezone.now()
+        sources = (
+            ('diffs', DiffItem.objects.filter(status='LIVE'), ''),
+            ('votes', DiffVote.objects.filter(diff_item__status='LIVE'), 'diff_item__'),
+            ('comments', DiffComment.objects.filter(status='LIVE', diff_item__status='LIVE'), 'diff_item__'),
+        )
+
+        activity: Dict[tuple[int, int], Dict[str, Any]] = {}
+        for kind, queryset, prefix in sources:
+            if work_id is not None:
+                queryset = queryset.filter(**{f'{prefix}work_id': work_id, f'{prefix}screen_work_id': screen_work_id})
+            rows = queryset.values_list(f'{prefix}work_id', f'{prefix}screen_work_id').annotate(
+                latest=Max('created_at'),
+                decayed=Sum(ComparisonStatsService.decay_expression('created_at', now)),
+            ).order_by()
+            for row_work_id, row_screen_work_id, latest, decayed in rows:
+                entry = activity.setdefault((row_work_id, row_screen_work_id), {'latest': latest})
+                entry['latest'] = max(entry['latest'], latest)
+                entry[kind] = decayed
+
+        stats = {}
+        for key, entry in activity.items():
+            # Sums are decayed to now; store them as of the latest event instead
+            growth = math.exp(min(
+                (now - entry['latest']).total_seconds() / ComparisonStatsService.TRENDING_TIME_CONSTANT,
+                -ComparisonStatsService.MIN_DECAY_EXPONENT,
+            ))
+            diffs, votes, comments = (entry.get(kind, 0) * growth for kind in ('diffs', 'votes', 'comments'))
+            stats[key] = {
+                'trending_score': (
+                    diffs * TRENDING_DIFF_WEIGHT + votes * TRENDING_VOTE_WEIGHT + comments * TRENDING_COMMENT_WEIGHT
+                ),
+                'trending_diffs': diffs,
+                'trending_votes': votes,
+                'trending_at': entry['latest'],
             }
+        return stats
+
+    @staticmethod
+    def _empty_stats() -> Dict[str, Any]:
+        """Field values of a comparison with no diffs, comments or votes."""
+        stats = {
+            field: 0
+            for fields in (
+                ComparisonStatsService.DIFF_FIELDS,
+                ComparisonStatsService.COMMENT_FIELDS,
+                ComparisonStatsService.COMPARISON_VOTE_FIELDS,
+                ComparisonStatsService.TRENDING_FIELDS,
+            )
+            for field in fields
+        }
+        stats['last_activity'] = None
+        stats['trending_at'] = None
+        return stats
+
+    @staticmethod
+    def refresh(
+        work_id: int,
+        screen_work_id: int,
+        diffs: bool = True,
+        comments: bool = True,
+        comparison_votes: bool = True,
+        trending: bool = True,
+        create: bool = True,
+    ) -> None:
+        """
+        Recompute the stats of one comparison.
 
-        # Get comparison vote counts
-        work_ids = [edge.work.id for edge in edges]
-        screen_work_ids = [edge.screen_work.id for edge in edges]
-        comparison_votes = DiffService._get_comparison_votes(work_ids, screen_work_ids)
-
-        # Build ALL results
-        results = []
-        for edge in edges:
-            key = (edge.work.id, edge.screen_work.id)
-            data = comparison_data.get(key, {})
-            diff_count = data.get('diff_count', 0)
-            vote_count = data.get('vote_count', 0)
-            last_updated = data.get('last_updated')
-
-            results.append({
-                'work_id': edge.work.id,
-                'work_title': edge.work.title,
-                'work_slug': edge.work.slug,
-                'work_author': edge.work.author,
-                'work_year': edge.work.year,
-                'cover_url': edge.work.cover_url,
-                'screen_work_id': edge.screen_work.id,
-                'screen_work_title': edge.screen_work.title,
-                'screen_work_slug': edge.screen_work.slug,
-                'screen_work_type': edge.screen_work.get_type_display(),
-                'screen_work_year': edge.screen_work.year,
-                'poster_url': edge.screen_work.poster_url,
-                'diff_count': diff_count,
-                'vote_count': vote_count,
-                'comparison_vote_count': comparison_votes.get(key, 0),
-                'last_updated': last_updated.isoformat() if last_updated else None,
-                'comparison_created_at': edge.created_at.isoformat() if edge.created_at else None,
-                'tmdb_popularity': edge.screen_work.tmdb_popularity or 0,  # For popularity sort
-            })
-
-        # Apply sorting based on sort parameter
-        if sort == 'trending':
-            # Use the existing trending logic for 7-day activity
-            # For now, approximate by recent updates + high engagement
-            results.sort(key=lambda x: (
-                x['last_updated'] or '',  # Recent activity first
-                x['diff_count'] + x['vote_count'],  # Then by total engagement
-            ), reverse=True)
-        elif sort == 'most_documented':
-            results.sort(key=lambda x: (x['diff_count'], x['vote_count']), reverse=True)
-        elif sort == 'recently_updated':
-            results.sort(key=lambda x: x['last_updated'] or '', reverse=True)
-        elif sort == 'newest':
-            # Sort by when the comparison was added to the database
-            results.sort(key=lambda x: x['comparison_created_at'] or '', reverse=True)
-        else:  # popularity
-            results.sort(key=lambda x: (x['tmdb_popularity'], x['work_title']), reverse=True)
-
-        # Remove tmdb_popularity from results as it's only used for sorting
-        for r in results:
-            r.pop('tmdb_popularity', None)
-
-        return results[:limit]
+        Each part is one aggregate over the comparison's own rows (indexed by
+        work and screen work), so this stays cheap however large the site gets.
+
+        Args:
+            work_id: Work ID
+            screen_work_id: ScreenWork ID
+            diffs: Recompute diff count, vote count and last activity
+            comments: Recompute the comment count
+            comparison_votes: Recompute comparison vote counts and breakdowns
+            trending: Recompute the trending score from every diff, vote and comment
+            create: Create the row if missing. Pass False from deletions, which
+                    may be part of deleting the work or screen work itself.
+        """
+        from screen.models import AdaptationEdge
+
+        values = ComparisonStatsService._compute(
+            work_id, screen_work_id, diffs, comments, comparison_votes, trending
+        )
+        updated = ComparisonStats.objects.filter(work_id=work_id, screen_work_id=screen_work_id).update(
+            **values, updated_at=timezone.now()
+        )
+        if updated or not create:
+            return
+
+        # First stats for this comparison: compute every part
+        values = ComparisonStatsService._compute(work_id, screen_work_id)
+        values['edge_id'] = AdaptationEdge.objects.filter(
+            work_id=work_id, screen_work_id=screen_work_id
+        ).values_list('id', flat=True).first()
+        # INSERT ... ON CONFLICT, so a concurrent first refresh cannot fail the caller's write
+        ComparisonStats.objects.bulk_create(
+            [ComparisonStats(work_id=work_id, screen_work_id=screen_work_id, **values)],
+            update_conflicts=True,
+            unique_fields=['work', 'screen_work'],
+            update_fields=[*values, 'updated_at'],
+        )
+
+    @staticmethod
+    def _compute(
+        work_id: int,
+        screen_work_id: int,
+        diffs: bool = True,
+        comments: bool = True,
+        comparison_votes: bool = True,
+        trending: bool = True,
+    ) -> Dict[str, Any]:
+        """Compute the requested parts of one comparison's stats (see refresh)."""
+        key = (work_id, screen_work_id)
+        empty = ComparisonStatsService._empty_stats()
+        parts = (
+            (diffs, ComparisonStatsService.DIFF_FIELDS, lambda: ComparisonStatsService._diff_stats(
+                work_id=work_id, screen_work_id=screen_work_id
+            )),
+            (comments, ComparisonStatsService.COMMENT_FIELDS, lambda: ComparisonStatsService._comment_stats(
+                diff_item__work_id=work_id, diff_item__screen_work_id=screen_work_id
+            )),
+            (comparison_votes, ComparisonStatsService.COMPARISON_VOTE_FIELDS, lambda: (
+                ComparisonStatsService._comparison_vote_stats(work_id=work_id, screen_work_id=screen_work_id)
+            )),
+            (trending, ComparisonStatsService.TRENDING_FIELDS, lambda: ComparisonStatsService._trending_stats(
+                work_id=work_id, screen_work_id=screen_work_id
+            )),
+        )
+
+        values = {}
+        for enabled, fields, compute in parts:
+            if enabled:
+                found = compute().get(key, {})
+                values.update({field: found.get(field, empty[field]) for field in fields})
+        return values
+
+    @staticmethod
+    def add_diff_votes(work_id: int, screen_work_id: int, delta: int) -> None:
+        """
+        Adjust a comparison's vote count for votes cast on or removed from a LIVE diff.
+
+        Args:
+            work_id: Work ID
+            screen_work_id: ScreenWork ID
+            delta: Change in the number of votes
+        """
+        updated = ComparisonStats.objects.filter(work_id=work_id, screen_work_id=screen_work_id).update(
+            vote_count=F('vote_count') + delta
+        )
+        if not updated and delta > 0:
+            ComparisonStatsService.refresh(work_id, screen_work_id)
+
+    @staticmethod
+    def bump_trending(work_id: int, screen_work_id: int, diffs: int = 0, votes: int = 0, comments: int = 0) -> None:
+        """
+        Add new activity to a comparison's trending score.
+
+        Decays the stored score from trending_at to now and adds the weighted
+        events in one UPDATE. Removed activity is only subtracted by the next
+        full refresh (any save of one of the comparison's diffs, or a rebuild).
+        Comparisons without stats are skipped; creating them computes the score.
+
+        Args:
+            work_id: Work ID
+            screen_work_id: ScreenWork ID
+            diffs: New diffs
+            votes: New votes
+            comments: New comments
+        """
+        now = timezone.now()
+        decay = Coalesce(ComparisonStatsService.decay_expression('trending_at', now), Value(0.0))
+        score = diffs * TRENDING_DIFF_WEIGHT + votes * TRENDING_VOTE_WEIGHT + comments * TRENDING_COMMENT_WEIGHT
+        ComparisonStats.objects.filter(work_id=work_id, screen_work_id=screen_work_id).update(
+            trending_score=F('trending_score') * decay + score,
+            trending_diffs=F('trending_diffs') * decay + float(diffs),
+            trending_votes=F('trending_votes') * decay + float(votes),
+            trending_at=now,
+        )
+
+    @staticmethod
+    def link_edge(edge) -> None:
+        """Attach an AdaptationEdge to its comparison's stats, creating them if needed."""
+        updated = ComparisonStats.objects.filter(
+            work_id=edge.work_id, screen_work_id=edge.screen_work_id
+        ).update(edge=edge)
+        if not updated:
+            ComparisonStatsService.refresh(edge.work_id, edge.screen_work_id)
+
+    @staticmethod
+    @transaction.atomic
+    def rebuild() -> int:
+        """
+        Recompute the stats of every comparison from scratch.
+
+        Covers every pair with an adaptation edge, a diff or a comparison vote,
+        in seven grouped queries and one bulk insert.
+
+        Returns:
+            Number of comparisons
+        """
+        from screen.models import AdaptationEdge
+
+        rows: Dict[tuple[int, int], Dict[str, Any]] = {}
+        for part in (
+            ComparisonStatsService._diff_stats(),
+            ComparisonStatsService._comment_stats(),
+            ComparisonStatsService._comparison_vote_stats(),
+            ComparisonStatsService._trending_stats(),
+        ):
+            for key, values in part.items():
+                rows.setdefault(key, ComparisonStatsService._empty_stats()).update(values)
+
+        edges = AdaptationEdge.objects.values_list('id', 'work_id', 'screen_work_id')
+        for edge_id, work_id, screen_work_id in edges:
+            rows.setdefault((work_id, screen_work_id), ComparisonStatsService._empty_stats())['edge_id'] = edge_id
+
+        ComparisonStats.objects.all().delete()
+        ComparisonStats.objects.bulk_create(
+            [
+                ComparisonStats(work_id=work_id, screen_work_id=screen_work_id, **values)
+                for (work_id, screen_work_id), values in rows.items()
+            ],
+            batch_size=1000,
+        )
+        return len(rows)
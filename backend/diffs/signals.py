@@ -0,0 +1,117 @@
+"""Signal handlers keeping vote counters and cached diff sections in sync with writes."""
+import logging
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from screen.models import AdaptationEdge
+from .models import DiffItem, DiffVote, DiffComment, ComparisonVote
+from .services import DiffService, ComparisonStatsService
+from . import sampling
+from .sections import (
+    invalidate_comparison_on_commit,
+    mark_sections_dirty,
+    DIFF_SECTIONS,
+    DIFF_VOTE_SECTIONS,
+    DIFF_COMMENT_SECTIONS,
+    COMPARISON_VOTE_SECTIONS,
+)
+
+logger = logging.getLogger(__name__)
+
+
+@receiver(post_save, sender=DiffItem)
+@receiver(post_delete, sender=DiffItem)
+def diff_item_changed(sender, instance, **kwargs):
+    """Refresh the comparison's stats and sections built from diff counts and activity."""
+    ComparisonStatsService.refresh(
+        instance.work_id, instance.screen_work_id, comparison_votes=False, create=kwargs['signal'] is post_save
+    )
+    sampling.mark_dirty(instance.work_id, instance.screen_work_id)
+    mark_sections_dirty(DIFF_SECTIONS)
+    invalidate_comparison_on_commit(instance.work_id, instance.screen_work_id)
+
+
+def _update_vote_counts(vote: DiffVote, deleted: bool, created: bool) -> None:
+    """Move the diff's denormalized counters for a saved or deleted vote."""
+    loaded_vote = getattr(vote, '_loaded_vote', None)
+    if deleted:
+        old_vote, new_vote = loaded_vote or vote.vote, None
+    elif created:
+        old_vote, new_vote = None, vote.vote
+    elif hasattr(vote, '_loaded_vote'):
+        old_vote, new_vote = loaded_vote, vote.vote
+    else:
+        # Saved over an existing row without loading it: previous vote unknown,
+        # reconcile_vote_counts repairs the counters
+        logger.warning(f"Vote {vote.pk} updated without its previous value; counters may drift")
+        return
+
+    deltas = DiffService.apply_vote_change(vote.diff_item_id, old_vote, new_vote)
+    vote._loaded_vote = new_vote
+
+    # Keep an already-loaded diff (e.g. the one the vote was created with) in step
+    if deltas and DiffVote.diff_item.is_cached(vote):
+        diff_item = vote.diff_item
+        for field, delta in deltas.items():
+            setattr(diff_item, field, getattr(diff_item, field) + delta)
+
+
+@receiver(post_save, sender=DiffVote)
+@receiver(post_delete, sender=DiffVote)
+def diff_vote_changed(sender, instance, **kwargs):
+    """Update the diff's vote counters and refresh what is built from them."""
+    deleted = kwargs['signal'] is post_delete
+    created = kwargs.get('created', False)
+    _update_vote_counts(instance, deleted=deleted, created=created)
+    mark_sections_dirty(DIFF_VOTE_SECTIONS)
+
+    diff = DiffItem.objects.filter(pk=instance.diff_item_id).values_list(
+        'work_id', 'screen_work_id', 'status'
+    ).first()
+    if diff:  # Gone when the vote is deleted along with its diff
+        work_id, screen_work_id, diff_status = diff
+        if diff_status == 'LIVE' and (created or deleted):
+            ComparisonStatsService.add_diff_votes(work_id, screen_work_id, 1 if created else -1)
+            sampling.mark_dirty(work_id, screen_work_id)
+            if created:
+                ComparisonStatsService.bump_trending(work_id, screen_work_id, votes=1)
+        invalidate_comparison_on_commit(work_id, screen_work_id)
+
+
+@receiver(post_save, sender=DiffComment)
+@receiver(post_delete, sender=DiffComment)
+def diff_comment_changed(sender, instance, **kwargs):
+    """Refresh the diff's comment flag, thread reply counts, comparison comment count, caches and sections."""
+    diff = DiffItem.objects.filter(pk=instance.diff_item_id).values_list(
+        'work_id', 'screen_work_id', 'status'
+    ).first()
+    if diff:  # Gone when the comment is deleted along with its diff
+        work_id, screen_work_id, diff_status = diff
+        DiffService.refresh_comment_flag(instance.diff_item_id)
+        DiffService.refresh_thread_counts(instance.path)
+        ComparisonStatsService.refresh(
+            work_id, screen_work_id, diffs=False, comparison_votes=False, trending=False,
+            create=kwargs['signal'] is post_save
+        )
+        if kwargs.get('created') and instance.status == 'LIVE' and diff_status == 'LIVE':
+            ComparisonStatsService.bump_trending(work_id, screen_work_id, comments=1)
+        invalidate_comparison_on_commit(work_id, screen_work_id)
+    mark_sections_dirty(DIFF_COMMENT_SECTIONS)
+
+
+@receiver(post_save, sender=ComparisonVote)
+@receiver(post_delete, sender=ComparisonVote)
+def comparison_vote_changed(sender, instance, **kwargs):
+    """Refresh the comparison's vote stats and sections showing comparison vote counts."""
+    ComparisonStatsService.refresh(
+        instance.work_id, instance.screen_work_id, diffs=False, comments=False, trending=False,
+        create=kwargs['signal'] is post_save
+    )
+    mark_sections_dirty(COMPARISON_VOTE_SECTIONS)
+    invalidate_comparison_on_commit(instance.work_id, instance.screen_work_id)
+
+
+@receiver(post_save, sender=AdaptationEdge)
+def adaptation_edge_saved(sender, instance, created, **kwargs):
+    """Link a new adaptation edge to its comparison's stats."""
+    if created:
+        ComparisonStatsService.link_edge(instance)
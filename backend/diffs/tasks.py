@@ -0,0 +1,123 @@
+"""Celery tasks for the diffs app."""
+import logging
+import time
+from typing import Dict, Any
+from celery import shared_task
+from django.core.cache import cache
+from adaptapedia.cache import invalidate_tags, TRENDING_TAG
+from . import sections
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(ignore_result=True)
+def refresh_dirty_sections() -> Dict[str, Any]:
+    """
+    Recompute browse, trending and needs-help sections marked dirty by writes.
+
+    A section that fails to refresh is marked dirty again and retried by the
+    next run, instead of being dropped with the other popped marks.
+
+    Returns:
+        dict: Refreshed and failed section names and time taken
+    """
+    # Clear the debounce flag first so writes from now on schedule another run
+    cache.delete(sections.REFRESH_SCHEDULED_KEY)
+
+    start = time.monotonic()
+    dirty = sections.pop_dirty_sections()
+
+    if 'trending' in dirty:
+        # Non-default trending windows are cached separately under the tag.
+        # Bumped before refreshing so the new trending section survives it.
+        invalidate_tags(TRENDING_TAG)
+
+    refreshed, failed = [], []
+    for name in dirty:
+        try:
+            sections.refresh_section(name)
+            refreshed.append(name)
+        except Exception as e:
+            logger.warning(f"Failed to refresh browse section {name}, will retry: {e}", exc_info=True)
+            failed.append(name)
+
+    # Their dirty marks were popped; mark them again so the next run retries them
+    sections.flush_dirty_sections(failed)
+
+    elapsed = round(time.monotonic() - start, 3)
+    if refreshed:
+        logger.info(f"Refreshed {len(refreshed)} browse sections in {elapsed}s: {', '.join(refreshed)}")
+
+    return {'refreshed': refreshed, 'failed': failed, 'seconds': elapsed}
+
+
+@shared_task(ignore_result=True)
+def warm_cache() -> Dict[str, Any]:
+    """
+    Pre-compute browse sections, trending windows, catalog pages and top comparisons.
+
+    Returns:
+        dict: Job count, failures and total time
+    """
+    from .cache_warmer import warm_cache as run_warmer
+
+    report = run_warmer()
+
+    slowest = sorted(report['jobs'], key=lambda job: job['seconds'], reverse=True)[:5]
+    logger.info(
+        f"Warmed {len(report['jobs'])} cache entries in {report['total_seconds']}s "
+        f"({report['failed']} failed); slowest: "
+        + ', '.join(f"{job['name']} {job['seconds']}s" for job in slowest)
+    )
+
+    return {
+        'jobs': len(report['jobs']),
+        'failed': report['failed'],
+        'seconds': report['total_seconds'],
+    }
+
+
+@shared_task(ignore_result=True)
+def flush_vote_buffer() -> Dict[str, Any]:
+    """
+    Write buffered diff votes to Postgres (see diffs.vote_buffer).
+
+    Returns:
+        dict: Diffs flushed, votes written and diffs left for the next run
+    """
+    from .constants import VOTE_BUFFER_MAX_ROUNDS
+    from . import vote_buffer
+
+    totals = {'diffs': 0, 'votes': 0, 'remaining': 0}
+    for _ in range(VOTE_BUFFER_MAX_ROUNDS):
+        result = vote_buffer.flush()
+        totals['diffs'] += result['diffs']
+        totals['votes'] += result['votes']
+        totals['remaining'] = result['remaining']
+        if not result['remaining']:
+            break
+
+    if totals['votes']:
+        logger.info(f"Flushed {totals['votes']} buffered votes on {totals['diffs']} diffs")
+
+    return totals
+
+
+@shared_task(ignore_result=True)
+def rebuild_random_comparisons() -> Dict[str, Any]:
+    """
+    Build the random comparison sampling sets (see diffs.sampling).
+
+    Scheduled by sampling when it finds no sets, e.g. after a Redis flush.
+
+    Returns:
+        dict: Comparisons filed and time taken
+    """
+    from . import sampling
+
+    # Clear the debounce flag first so a failed rebuild can be scheduled again
+    cache.delete(sampling.REBUILD_SCHEDULED_KEY)
+
+    start = time.monotonic()
+    count = sampling.rebuild()
+    return {'comparisons': count, 'seconds': round(time.monotonic() - start, 3)}
@@ -1,5 +1,5 @@
 """Tests for diffs app."""
-from django.test import TestCase
+from django.test import TestCase, override_settings
 from rest_framework.test import APITestCase
 from rest_framework import status
 from django.contrib.auth import get_user_model
@@ -233,6 +233,36 @@ class DiffVoteModelTestCase(TestCase):
         # Test user.diff_votes
         self.assertEqual(self.user.diff_votes.count(), 1)
 
+    def test_vote_counters_follow_votes(self):
+        """Test that the denormalized counters track created, changed and deleted votes."""
+        user2 = User.objects.create_user(username='user2', password='pass')
+        DiffVote.objects.create(diff_item=self.diff, user=self.user, vote=VoteType.ACCURATE)
+        DiffVote.objects.create(diff_item=self.diff, user=user2, vote=VoteType.ACCURATE)
+
+        DiffVote.objects.update_or_create(
+            diff_item=self.diff, user=user2, defaults={'vote': VoteType.DISAGREE}
+        )
+        DiffVote.objects.get(diff_item=self.diff, user=self.user).delete()
+
+        self.diff.refresh_from_db()
+        self.assertEqual(self.diff.accurate_count, 0)
+        self.assertEqual(self.diff.disagree_count, 1)
+        self.assertEqual(self.diff.total_votes, 1)
+
+    def test_reconcile_vote_counts(self):
+        """Test that reconciliation repairs counters changed behind the signals' back."""
+        from .services import DiffService
+
+        DiffVote.objects.create(diff_item=self.diff, user=self.user, vote=VoteType.NEEDS_NUANCE)
+        DiffItem.objects.filter(pk=self.diff.pk).update(nuance_count=5, total_votes=5)
+
+        self.assertEqual(DiffService.reconcile_vote_counts(), 1)
+        self.assertEqual(DiffService.reconcile_vote_counts(), 0)
+
+        self.diff.refresh_from_db()
+        self.assertEqual(self.diff.vote_counts, {'accurate': 0, 'needs_nuance': 1, 'disagree': 0})
+        self.assertEqual(self.diff.total_votes, 1)
+
 
 class DiffCommentModelTestCase(TestCase):
     """Test cases for DiffComment model."""
@@ -535,6 +565,32 @@ class DiffItemAPITestCase(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response.data['count'], 1)
 
+    def test_list_query_count_independent_of_page_size(self):
+        """Test that user votes are resolved in one query per page, not per diff."""
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        self.client.force_authenticate(user=self.user)
+
+        def list_queries(diff_count):
+            DiffItem.objects.all().delete()
+            for i in range(diff_count):
+                diff = DiffItem.objects.create(
+                    work=self.work,
+                    screen_work=self.screen,
+                    category=DiffCategory.PLOT,
+                    claim=f"Test diff {i}",
+                    created_by=self.user
+                )
+                DiffVote.objects.create(diff_item=diff, user=self.user, vote=VoteType.ACCURATE)
+
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get('/api/diffs/items/')
+            self.assertTrue(all(d['user_vote'] == VoteType.ACCURATE for d in response.data['results']))
+            return len(queries)
+
+        self.assertEqual(list_queries(2), list_queries(6))
+
 
 class DiffVoteAPITestCase(APITestCase):
     """Test cases for voting on diffs."""
@@ -718,12 +774,40 @@ class DiffCommentAPITestCase(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response.data['count'], 1)
 
+    def test_list_query_count_independent_of_page_size(self):
+        """Test that top badges are resolved in one query per page, not per comment."""
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        from users.models import UserBadge, BadgeType
+
+        def list_queries(comment_count):
+            DiffComment.objects.all().delete()
+            for i in range(comment_count):
+                user = User.objects.create_user(username=f'badged{comment_count}_{i}', password='pass')
+                UserBadge.objects.create(user=user, badge_type=BadgeType.FIRST_COMMENT)
+                UserBadge.objects.create(user=user, badge_type=BadgeType.VOTER_10)
+                DiffComment.objects.create(diff_item=self.diff, user=user, body=f"Comment {i}")
+
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get('/api/diffs/comments/')
+            self.assertTrue(all(c['top_badge']['badge_type'] == BadgeType.VOTER_10 for c in response.data['results']))
+            return len(queries)
+
+        self.assertEqual(list_queries(2), list_queries(6))
+
 
 class TrendingComparisonsAPITestCase(APITestCase):
     """Test cases for trending comparisons endpoint."""
 
     def setUp(self):
         """Set up test data."""
+        from django.core.cache import cache
+        from adaptapedia.cache import local_cache
+
+        # Trending is cached across requests; start from a cold cache
+        cache.clear()
+        local_cache.clear()
+
         self.user = User.objects.create_user(username='testuser', password='pass')
 
         # Create multiple books and adaptations
@@ -805,7 +889,7 @@ class TrendingComparisonsAPITestCase(APITestCase):
         comparison = response.data[0]
         self.assertEqual(comparison['work_id'], self.work1.id)
         self.assertEqual(comparison['screen_work_id'], self.screen1.id)
-        self.assertEqual(comparison['recent_diffs'], 2)
+        self.assertEqual(comparison['decayed_diffs'], 2)
         self.assertGreater(comparison['activity_score'], 0)
 
     def test_trending_comparisons_with_recent_votes(self):
@@ -837,7 +921,7 @@ class TrendingComparisonsAPITestCase(APITestCase):
             None
         )
         self.assertIsNotNone(comparison)
-        self.assertEqual(comparison['recent_votes'], 2)
+        self.assertEqual(comparison['decayed_votes'], 2)
 
     def test_trending_comparisons_ordering(self):
         """Test that trending comparisons are ordered by activity score."""
@@ -933,6 +1017,44 @@ class TrendingComparisonsAPITestCase(APITestCase):
         self.assertIn(self.work1.id, work_ids)
         self.assertNotIn(self.work2.id, work_ids)
 
+    def test_trending_comparisons_honors_wider_window(self):
+        """Test that a longer days window includes older activity."""
+        from django.utils import timezone
+        from datetime import timedelta
+
+        diff = DiffItem.objects.create(
+            work=self.work3,
+            screen_work=self.screen3,
+            category=DiffCategory.PLOT,
+            claim="15 days ago",
+            status=DiffStatus.LIVE,
+            created_by=self.user
+        )
+        diff.created_at = timezone.now() - timedelta(days=15)
+        diff.save()
+
+        response = self.client.get('/api/diffs/items/trending/?days=30')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([c['work_id'] for c in response.data], [self.work3.id])
+        # Two weeks of decay at a 48 hour half-life leaves under 1% of the diff's weight
+        self.assertLess(response.data[0]['activity_score'], 0.03)
+
+    def test_trending_days_validated_and_uncommon_windows_uncached(self):
+        """Test that days must be an integer, is clamped, and only common windows are cached."""
+        from unittest import mock
+        from . import sections
+
+        response = self.client.get('/api/diffs/items/trending/?days=abc')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        with mock.patch('diffs.sections.cache_get_or_set') as cache_get_or_set:
+            with mock.patch('diffs.services.DiffService.get_trending_comparisons', return_value=[]) as compute:
+                response = self.client.get('/api/diffs/items/trending/?days=100000')
+                sections.get_trending(3)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([call.kwargs['days'] for call in compute.call_args_list], [90, 3])
+        cache_get_or_set.assert_not_called()
+
     def test_trending_comparisons_diversity(self):
         """Test that trending promotes diversity (max 2 comparisons per book)."""
         # Create 3 different adaptations of the same book
@@ -995,7 +1117,7 @@ class TrendingComparisonsAPITestCase(APITestCase):
                 'work_id', 'work_title', 'work_slug',
                 'screen_work_id', 'screen_work_title', 'screen_work_slug',
                 'screen_work_type', 'screen_work_year',
-                'total_diffs', 'recent_diffs', 'recent_votes', 'activity_score'
+                'total_diffs', 'decayed_diffs', 'decayed_votes', 'activity_score'
             ]
 
             for field in required_fields:
@@ -1040,4 +1162,1223 @@ class TrendingComparisonsAPITestCase(APITestCase):
             comparison = response.data[0]
             # Should only count the LIVE diff
             self.assertEqual(comparison['total_diffs'], 1)
-            self.assertEqual(comparison['recent_diffs'], 1)
+            self.assertEqual(comparison['decayed_diffs'], 1)
+
+
+class BrowseComparisonsAPITestCase(APITestCase):
+    """Test cases for the paginated browse comparisons endpoint."""
+
+    def setUp(self):
+        """Set up comparisons with ties in every sort key."""
+        from screen.models import AdaptationEdge
+
+        self.user = User.objects.create_user(username='browser', password='pass')
+        for i in range(7):
+            work = Work.objects.create(title=f"Browse Book {i % 3}", slug=f"browse-book-{i}")
+            screen = ScreenWork.objects.create(
+                type=ScreenWorkType.MOVIE,
+                title=f"Browse Movie {i}",
+                slug=f"browse-movie-{i}",
+                tmdb_popularity=float(i % 2)
+            )
+            AdaptationEdge.objects.create(work=work, screen_work=screen)
+            for j in range(i % 3):
+                DiffItem.objects.create(
+                    work=work,
+                    screen_work=screen,
+                    category=DiffCategory.PLOT,
+                    claim=f"Browse diff {i}-{j}",
+                    created_by=self.user
+                )
+
+    def test_pages_cover_every_comparison_in_order(self):
+        """Test that following next_cursor visits every comparison once, in the sort order."""
+        from .constants import BROWSE_SORTS
+        from .services import DiffService
+
+        for sort in BROWSE_SORTS:
+            expected = [c['screen_work_slug'] for c in DiffService.get_all_comparisons(limit=50, sort=sort)]
+            self.assertEqual(len(expected), 7)
+
+            seen, cursor = [], ''
+            while True:
+                response = self.client.get(
+                    '/api/diffs/items/browse/comparisons/', {'sort': sort, 'limit': 3, 'cursor': cursor}
+                )
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+                seen += [c['screen_work_slug'] for c in response.data['results']]
+                cursor = response.data['next_cursor']
+                if not cursor:
+                    break
+
+            self.assertEqual(seen, expected, sort)
+
+    def test_sort_orders(self):
+        """Test that the SQL sorts match the documented orders."""
+        from .services import DiffService
+
+        most_documented = DiffService.get_all_comparisons(sort='most_documented')
+        counts = [c['diff_count'] for c in most_documented]
+        self.assertEqual(counts, sorted(counts, reverse=True))
+
+        # Comparisons without diffs have no activity and come last
+        recently_updated = DiffService.get_all_comparisons(sort='recently_updated')
+        self.assertEqual([c['last_updated'] is None for c in recently_updated], [False] * 4 + [True] * 3)
+
+        popularity = DiffService.get_all_comparisons(sort='popularity', limit=3)
+        self.assertEqual(len(popularity), 3)
+        self.assertTrue(all(c['screen_work_slug'].endswith(('1', '3', '5')) for c in popularity))
+
+    def test_invalid_cursor(self):
+        """Test that malformed cursors and cursors from another sort are rejected."""
+        response = self.client.get('/api/diffs/items/browse/comparisons/', {'cursor': 'not-a-cursor'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = self.client.get('/api/diffs/items/browse/comparisons/', {'sort': 'newest', 'limit': 2})
+        response = self.client.get(
+            '/api/diffs/items/browse/comparisons/', {'sort': 'popularity', 'cursor': response.data['next_cursor']}
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_tampered_cursor_keys(self):
+        """Test that cursors whose key values do not fit the sort's fields are rejected."""
+        from .services import DiffService
+
+        for sort, keys in [('recently_updated', ['not-a-date']), ('most_documented', [{'a': 1}, 1])]:
+            cursor = DiffService._encode_comparison_cursor(sort, keys, 1)
+            response = self.client.get('/api/diffs/items/browse/comparisons/', {'sort': sort, 'cursor': cursor})
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class RandomComparisonAPITestCase(APITestCase):
+    """Test cases for random comparison sampling."""
+
+    def setUp(self):
+        """Set up two comparisons with LIVE diffs and one without, with empty sampling sets."""
+        from unittest import mock
+        from django.core.cache import cache
+
+        cache.clear()
+        patcher = mock.patch('diffs.tasks.rebuild_random_comparisons.delay')
+        self.schedule_rebuild = patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.user = User.objects.create_user(username='sampler', password='pass')
+        self.horror = Work.objects.create(title="Scary Book", slug="scary-book", genres=['Horror'])
+        self.drama = Work.objects.create(title="Sad Book", slug="sad-book", genres=['Drama'])
+        self.screens = [
+            ScreenWork.objects.create(type=ScreenWorkType.MOVIE, title=f"Random Movie {i}", slug=f"random-movie-{i}")
+            for i in range(3)
+        ]
+        self.create_diff(self.horror, self.screens[0])
+        self.create_diff(self.drama, self.screens[1])
+        self.create_diff(self.drama, self.screens[2], status=DiffStatus.PENDING)
+
+    def create_diff(self, work, screen, status=DiffStatus.LIVE):
+        """Create a diff, running the on-commit sampling updates."""
+        with self.captureOnCommitCallbacks(execute=True):
+            return DiffItem.objects.create(
+                work=work, screen_work=screen, category=DiffCategory.PLOT, claim="Random diff",
+                status=status, created_by=self.user
+            )
+
+    def get_random(self, **params):
+        """Request a random comparison."""
+        return self.client.get('/api/diffs/items/random-comparison/', params)
+
+    def test_excluded_comparisons_not_repeated(self):
+        """Test that a client gets every eligible comparison before any repeats, without a session."""
+        first = self.get_random()
+        second = self.get_random(exclude=first.data['comparison'])
+        third = self.get_random(exclude=f"{second.data['comparison']},{first.data['comparison']}")
+
+        self.assertEqual(first.status_code, status.HTTP_200_OK)
+        served = {first.data['screen_work_slug'], second.data['screen_work_slug']}
+        self.assertEqual(served, {'random-movie-0', 'random-movie-1'})
+        # Everything was served recently, so repeats are allowed again
+        self.assertIn(third.data['screen_work_slug'], served)
+        self.assertNotIn('sessionid', self.client.cookies)
+
+    def test_exclusion_falls_through_to_other_tiers(self):
+        """Test that a tier whose every member is excluded is skipped while other tiers have some."""
+        from unittest import mock
+        from adaptapedia.cache import _get_redis_client
+        from . import sampling
+
+        sampling.rebuild()
+        client = _get_redis_client()
+        generation = int(client.get(sampling._key('generation')))
+        # Move the drama comparison up a tier
+        drama = sampling.member_key(self.drama.pk, self.screens[1].pk)
+        client.smove(sampling._key(generation, 'all', 0), sampling._key(generation, 'all', 1), drama)
+        horror = sampling.member_key(self.horror.pk, self.screens[0].pk)
+
+        with mock.patch('diffs.sampling.random.choices', side_effect=[[0], [1]]):
+            self.assertEqual(sampling._sample_from_redis(client, None, 'uniform', [horror]), drama)
+        with mock.patch('diffs.sampling.random.choices', side_effect=[[0], [1]]):
+            self.assertIn(sampling._sample_from_redis(client, None, 'uniform', [horror, drama]), {horror, drama})
+
+    def test_invalid_exclude_rejected(self):
+        """Test that exclude must list work_id:screen_work_id pairs."""
+        self.assertEqual(self.get_random(exclude='1:2,oops').status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_cold_sets_fall_back_and_rebuild_in_background(self):
+        """Test that requests finding no sets sample from the database and schedule one rebuild."""
+        from adaptapedia.cache import _get_redis_client
+        from . import sampling
+
+        self.assertEqual(self.get_random().status_code, status.HTTP_200_OK)
+        self.assertEqual(self.get_random().status_code, status.HTTP_200_OK)
+
+        self.schedule_rebuild.assert_called_once_with()
+        self.assertIsNone(_get_redis_client().get(sampling._key('generation')))
+
+    def test_marks_synced_into_retired_generation_are_kept(self):
+        """Test that dirty marks filed into a generation a rebuild retired are marked dirty again."""
+        from adaptapedia.cache import _get_redis_client
+        from . import sampling
+
+        client = _get_redis_client()
+        sampling.rebuild()
+        old = int(client.get(sampling._key('generation')))
+        sampling.rebuild()
+
+        western = Work.objects.create(title="Dusty Book", slug="dusty-book", genres=['Western'])
+        self.create_diff(western, self.screens[2])
+        member = client.spop(sampling._key('dirty'))
+        sampling._sync_current(client, old, [member])
+
+        self.assertEqual(client.smembers(sampling._key('dirty')), {member})
+        self.assertGreater(client.ttl(sampling._key(old, 'genre:Western', 0)), 0)
+        self.assertGreater(client.ttl(sampling._key(old, 'keys')), 0)
+        self.assertEqual(self.get_random(genre='Western').data['work_slug'], 'dusty-book')
+
+    def test_rebuild_refiles_marks_left_during_its_run(self):
+        """Test that a rebuild re-files comparisons marked dirty while it held the lock."""
+        from unittest import mock
+        from adaptapedia.cache import _get_redis_client
+        from . import sampling
+
+        client = _get_redis_client()
+        western = Work.objects.create(title="Dusty Book", slug="dusty-book", genres=['Western'])
+        real_sync = sampling._sync
+
+        def sync_after_late_write(client, generation, members):
+            # The diff is written after the rebuild read its rows
+            if not western.diffs.exists():
+                self.create_diff(western, self.screens[2])
+            return real_sync(client, generation, members)
+
+        with mock.patch('diffs.sampling._sync', side_effect=sync_after_late_write):
+            sampling.rebuild()
+
+        self.assertEqual(client.scard(sampling._key('dirty')), 0)
+        self.assertEqual(self.get_random(genre='Western').data['work_slug'], 'dusty-book')
+
+    def test_rebuild_drops_previous_generation(self):
+        """Test that a rebuild deletes the keys its previous generation registered."""
+        from adaptapedia.cache import _get_redis_client
+        from . import sampling
+
+        client = _get_redis_client()
+        self.assertEqual(sampling.rebuild(), 2)
+        old = int(client.get(sampling._key('generation')))
+        old_keys = client.smembers(sampling._key(old, 'keys'))
+        self.assertIn(sampling._key(old, 'all', 0).encode(), old_keys)
+
+        self.assertEqual(sampling.rebuild(), 2)
+        self.assertEqual(client.exists(*old_keys, sampling._key(old, 'keys')), 0)
+
+    def test_genre_filter(self):
+        """Test that the genre parameter only samples comparisons of books in that genre."""
+        for _ in range(3):
+            response = self.get_random(genre='Horror')
+            self.assertEqual(response.data['work_slug'], 'scary-book')
+
+        self.assertEqual(self.get_random(genre='Western').status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_writes_refile_comparisons(self):
+        """Test that comparisons gaining or losing their LIVE diffs join or leave the sets."""
+        from . import sampling
+
+        sampling.rebuild()
+
+        western = Work.objects.create(title="Dusty Book", slug="dusty-book", genres=['Western'])
+        diff = self.create_diff(western, self.screens[2])
+        response = self.get_random(genre='Western')
+        self.assertEqual(response.data['work_slug'], 'dusty-book')
+        self.assertEqual(response.data['diff_count'], 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            diff.status = DiffStatus.HIDDEN
+            diff.save()
+        self.assertEqual(self.get_random(genre='Western').status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_activity_weighting(self):
+        """Test that activity weighting scales each tier by its activity."""
+        from unittest import mock
+        from . import sampling
+
+        with mock.patch('diffs.sampling.random.choices', return_value=[2]) as choices:
+            self.assertEqual(sampling._choose_tier([3, 0, 1], 'activity'), 2)
+        self.assertEqual(choices.call_args.kwargs['weights'], [3, 0, 4])
+        self.assertIsNone(sampling._choose_tier([0, 0, 0], 'uniform'))
+
+
+class BrowseSectionInvalidationTestCase(TestCase):
+    """Test cases for write-driven refresh of cached browse sections."""
+
+    def setUp(self):
+        """Set up test data and clear section state."""
+        from django.core.cache import cache
+        from . import sections
+
+        self.user = User.objects.create_user(username='testuser', password='pass')
+        self.work = Work.objects.create(title="Section Book", slug="section-book")
+        self.screen = ScreenWork.objects.create(
+            type=ScreenWorkType.MOVIE,
+            title="Section Movie",
+            slug="section-movie",
+            year=2023
+        )
+        self.diff = DiffItem.objects.create(
+            work=self.work,
+            screen_work=self.screen,
+            category=DiffCategory.PLOT,
+            claim="Section diff",
+            created_by=self.user
+        )
+        sections.pop_dirty_sections()
+        cache.delete(sections.REFRESH_SCHEDULED_KEY)
+
+    def test_comment_marks_only_comment_sections_dirty(self):
+        """Test that a comment schedules one refresh covering only the trending and needs-help sections."""
+        from unittest import mock
+        from . import sections
+
+        with mock.patch('diffs.tasks.refresh_dirty_sections.apply_async') as apply_async:
+            with self.captureOnCommitCallbacks(execute=True):
+                DiffComment.objects.create(diff_item=self.diff, user=self.user, body="One")
+                DiffComment.objects.create(diff_item=self.diff, user=self.user, body="Two")
+
+        apply_async.assert_called_once_with(countdown=sections.REFRESH_DEBOUNCE)
+        self.assertEqual(sections.pop_dirty_sections(), ['trending', 'needs_help'])
+
+    def test_refresh_recomputes_dirty_sections(self):
+        """Test that the refresh task overwrites cached sections with fresh data."""
+        from unittest import mock
+        from . import sections
+        from .tasks import refresh_dirty_sections
+
+        sections.refresh_section('most_documented')
+        DiffItem.objects.create(
+            work=self.work,
+            screen_work=self.screen,
+            category=DiffCategory.ENDING,
+            claim="Another diff",
+            created_by=self.user
+        )
+
+        with mock.patch('diffs.tasks.refresh_dirty_sections.apply_async'):
+            with self.captureOnCommitCallbacks(execute=True):
+                DiffVote.objects.create(diff_item=self.diff, user=self.user, vote=VoteType.ACCURATE)
+
+        result = refresh_dirty_sections()
+
+        self.assertIn('most_documented', result['refreshed'])
+        self.assertNotIn('needs_help', sections.pop_dirty_sections())
+        most_documented = sections.get_section('most_documented')
+        entry = next(c for c in most_documented if c['work_slug'] == 'section-book')
+        self.assertEqual(entry['diff_count'], 2)
+        self.assertEqual(entry['vote_count'], 1)
+
+    def test_failed_refresh_marked_dirty_again(self):
+        """Test that a section failing to refresh is retried instead of dropped."""
+        from unittest import mock
+        from . import sections
+        from .tasks import refresh_dirty_sections
+
+        with mock.patch('diffs.tasks.refresh_dirty_sections.apply_async'):
+            sections.flush_dirty_sections(['trending', 'needs_help'])
+            real_refresh = sections.refresh_section
+
+            def flaky_refresh(name):
+                if name == 'trending':
+                    raise RuntimeError('boom')
+                return real_refresh(name)
+
+            with mock.patch('diffs.sections.refresh_section', side_effect=flaky_refresh):
+                result = refresh_dirty_sections()
+
+        self.assertEqual((result['refreshed'], result['failed']), (['needs_help'], ['trending']))
+        self.assertEqual(sections.pop_dirty_sections(), ['trending'])
+
+
+class ComparisonStatsTestCase(TestCase):
+    """Test cases for the materialized per-comparison stats."""
+
+    def setUp(self):
+        """Set up test data."""
+        from screen.models import AdaptationEdge
+
+        self.user = User.objects.create_user(username='statsuser', password='pass')
+        self.other = User.objects.create_user(username='otherstats', password='pass')
+        self.work = Work.objects.create(title="Stats Book", slug="stats-book")
+        self.screen = ScreenWork.objects.create(
+            type=ScreenWorkType.MOVIE,
+            title="Stats Movie",
+            slug="stats-movie"
+        )
+        self.edge = AdaptationEdge.objects.create(work=self.work, screen_work=self.screen)
+        self.diff = DiffItem.objects.create(
+            work=self.work,
+            screen_work=self.screen,
+            category=DiffCategory.PLOT,
+            claim="Stats diff",
+            created_by=self.user
+        )
+
+    def get_stats(self):
+        """Get the comparison's stats row."""
+        from .models import ComparisonStats
+
+        return ComparisonStats.objects.get(work=self.work, screen_work=self.screen)
+
+    def test_concurrent_first_refresh_upserts(self):
+        """Test that creating a row another writer just inserted updates it instead of failing."""
+        from unittest import mock
+        from .services import ComparisonStatsService
+
+        self.assertEqual(self.get_stats().diff_count, 1)
+        DiffItem.objects.filter(pk=self.diff.pk).update(status=DiffStatus.HIDDEN)
+
+        # The UPDATE finds no row, as when both writers check before either inserts
+        with mock.patch('django.db.models.query.QuerySet.update', return_value=0):
+            ComparisonStatsService.refresh(self.work.id, self.screen.id)
+
+        self.assertEqual(self.get_stats().diff_count, 0)
+
+    def test_stats_follow_writes(self):
+        """Test that diff, vote, comment and comparison vote writes keep the stats current."""
+        from .models import ComparisonVote
+
+        DiffVote.objects.create(diff_item=self.diff, user=self.user, vote=VoteType.ACCURATE)
+        vote = DiffVote.objects.create(diff_item=self.diff, user=self.other, vote=VoteType.DISAGREE)
+        DiffComment.objects.create(diff_item=self.diff, user=self.user, body="Comment")
+        ComparisonVote.objects.create(
+            work=self.work,
+            screen_work=self.screen,
+            user=self.user,
+            has_read_book=True,
+            has_watched_adaptation=True,
+            preference='BOOK',
+            faithfulness_rating=4
+        )
+
+        stats = self.get_stats()
+        self.assertEqual(stats.edge, self.edge)
+        self.assertEqual(stats.diff_count, 1)
+        self.assertEqual(stats.vote_count, 2)
+        self.assertEqual(stats.comment_count, 1)
+        self.assertEqual(stats.comparison_vote_count, 1)
+        self.assertEqual(stats.preference_book, 1)
+        self.assertEqual(stats.faithfulness_average, 4.0)
+
+        vote.delete()
+        self.diff.status = DiffStatus.HIDDEN
+        self.diff.save()
+
+        stats = self.get_stats()
+        self.assertEqual(stats.diff_count, 0)
+        self.assertEqual(stats.vote_count, 0)
+        self.assertEqual(stats.comment_count, 0)
+        self.assertEqual(stats.comparison_vote_count, 1)
+
+    def test_trending_score_decays_and_accumulates(self):
+        """Test that trending activity decays with age and new activity adds to it."""
+        from datetime import timedelta
+        from .constants import (
+            TRENDING_COMMENT_WEIGHT, TRENDING_DIFF_WEIGHT, TRENDING_HALF_LIFE_HOURS, TRENDING_VOTE_WEIGHT,
+        )
+        from .models import ComparisonStats
+        from .services import DiffService
+
+        stats = self.get_stats()
+        self.assertAlmostEqual(stats.trending_score, TRENDING_DIFF_WEIGHT, places=3)
+        self.assertAlmostEqual(stats.trending_diffs, 1, places=3)
+
+        # Age the activity by one half-life
+        ComparisonStats.objects.update(trending_at=stats.trending_at - timedelta(hours=TRENDING_HALF_LIFE_HOURS))
+        [trending] = DiffService.get_trending_comparisons(days=7)
+        self.assertAlmostEqual(trending['activity_score'], TRENDING_DIFF_WEIGHT / 2, places=2)
+
+        DiffVote.objects.create(diff_item=self.diff, user=self.user, vote=VoteType.ACCURATE)
+        DiffComment.objects.create(diff_item=self.diff, user=self.user, body="Comment")
+
+        [trending] = DiffService.get_trending_comparisons(days=7)
+        self.assertAlmostEqual(
+            trending['activity_score'],
+            TRENDING_DIFF_WEIGHT / 2 + TRENDING_VOTE_WEIGHT + TRENDING_COMMENT_WEIGHT,
+            places=2
+        )
+        self.assertEqual(trending['decayed_diffs'], 0.5)
+        self.assertEqual(trending['decayed_votes'], 1)
+
+    def test_rebuild_repairs_drift(self):
+        """Test that rebuild recomputes every comparison's stats."""
+        from .models import ComparisonStats
+        from .services import ComparisonStatsService
+
+        DiffVote.objects.create(diff_item=self.diff, user=self.user, vote=VoteType.ACCURATE)
+        ComparisonStats.objects.update(diff_count=10, vote_count=0, edge=None)
+
+        self.assertEqual(ComparisonStatsService.rebuild(), 1)
+
+        stats = self.get_stats()
+        self.assertEqual(stats.edge, self.edge)
+        self.assertEqual(stats.diff_count, 1)
+        self.assertEqual(stats.vote_count, 1)
+
+
+class CacheWarmerTestCase(TestCase):
+    """Test cases for the cache warmer."""
+
+    def setUp(self):
+        """Set up a comparison with a diff and a cold cache."""
+        from django.core.cache import cache
+        from adaptapedia.cache import local_cache
+        from screen.models import AdaptationEdge
+
+        cache.clear()
+        local_cache.clear()
+
+        self.user = User.objects.create_user(username='testuser', password='pass')
+        self.work = Work.objects.create(title="Warm Book", slug="warm-book")
+        self.screen = ScreenWork.objects.create(
+            type=ScreenWorkType.MOVIE,
+            title="Warm Movie",
+            slug="warm-movie",
+            year=2023
+        )
+        AdaptationEdge.objects.create(work=self.work, screen_work=self.screen)
+        DiffItem.objects.create(
+            work=self.work,
+            screen_work=self.screen,
+            category=DiffCategory.PLOT,
+            claim="Warm diff",
+            created_by=self.user
+        )
+
+    def test_warm_cache_fills_sections_and_comparisons(self):
+        """Test that warming stores sections and comparison stats so later reads don't query."""
+        from unittest import mock
+        from .cache_warmer import warm_cache
+        from .services import DiffService
+        from . import sections
+
+        report = warm_cache(concurrency=1, top_comparisons=5)
+
+        self.assertEqual(report['failed'], 0)
+        names = [job['name'] for job in report['jobs']]
+        self.assertIn('section:featured', names)
+        self.assertIn('catalog:letter=W', names)
+        self.assertIn('comparison:warm-book/warm-movie', names)
+
+        with mock.patch.object(DiffService, 'get_comparison_vote_stats') as compute, \
+                mock.patch.object(DiffService, 'get_all_comparisons') as compute_all:
+            stats = sections.get_comparison_vote_stats(self.work.id, self.screen.id)
+            popular = sections.get_section('all_comparisons:popularity')
+            compute.assert_not_called()
+            compute_all.assert_not_called()
+
+        self.assertEqual(stats['total_votes'], 0)
+        self.assertEqual(popular[0]['work_slug'], 'warm-book')
+
+
+class ConditionalGetAPITestCase(APITestCase):
+    """Test cases for ETag-based conditional GET on cached list endpoints."""
+
+    def setUp(self):
+        """Set up a comparison with a diff."""
+        self.user = User.objects.create_user(username='testuser', password='pass')
+        self.work = Work.objects.create(title="ETag Book", slug="etag-book")
+        self.screen = ScreenWork.objects.create(
+            type=ScreenWorkType.MOVIE,
+            title="ETag Movie",
+            slug="etag-movie",
+            year=2023
+        )
+        self.diff = DiffItem.objects.create(
+            work=self.work,
+            screen_work=self.screen,
+            category=DiffCategory.PLOT,
+            claim="ETag diff",
+            created_by=self.user
+        )
+        self.list_url = f'/api/diffs/items/?work={self.work.id}&screen_work={self.screen.id}'
+
+    def test_comparison_diff_list_revalidates_until_vote(self):
+        """Test that a diff list is 304 until a vote on one of its diffs commits."""
+        from unittest import mock
+
+        etag = self.client.get(self.list_url)['ETag']
+        response = self.client.get(self.list_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        with mock.patch('diffs.tasks.refresh_dirty_sections.apply_async'):
+            with self.captureOnCommitCallbacks(execute=True):
+                DiffVote.objects.create(diff_item=self.diff, user=self.user, vote=VoteType.ACCURATE)
+
+        response = self.client.get(self.list_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['results'][0]['vote_counts']['accurate'], 1)
+
+    def test_unscoped_diff_list_has_no_etag(self):
+        """Test that lists not scoped to a comparison are served unconditionally."""
+        response = self.client.get('/api/diffs/items/')
+        self.assertNotIn('ETag', response)
+
+    def test_browse_etag_changes_when_section_refreshed(self):
+        """Test that refreshing a browse section changes the browse ETag."""
+        from . import sections
+
+        etag = self.client.get('/api/diffs/items/browse/')['ETag']
+        response = self.client.get('/api/diffs/items/browse/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        sections.refresh_section('featured')
+
+        response = self.client.get('/api/diffs/items/browse/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_browse_etag_changes_on_background_refresh(self):
+        """Test that a stale section recomputed in the background changes the browse ETag."""
+        from adaptapedia.cache import refresh_stale_entry
+        from . import sections
+
+        etag = self.client.get('/api/diffs/items/browse/')['ETag']
+
+        refresh_stale_entry(f'{sections.__name__}:get_section', 'stale-key', ['featured'], {})
+
+        response = self.client.get('/api/diffs/items/browse/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+
+@override_settings(DIFF_VOTE_BUFFERING=True)
+class VoteBufferTestCase(APITestCase):
+    """Test cases for write-behind vote buffering."""
+
+    def setUp(self):
+        """Set up a diff with an empty vote buffer."""
+        from django.core.cache import cache
+
+        cache.clear()
+
+        self.user = User.objects.create_user(username='buffered', password='pass')
+        self.other = User.objects.create_user(username='other', password='pass')
+        work = Work.objects.create(title="Viral Book", slug="viral-book")
+        screen = ScreenWork.objects.create(type=ScreenWorkType.MOVIE, title="Viral Movie", slug="viral-movie")
+        self.diff = DiffItem.objects.create(
+            work=work, screen_work=screen, category=DiffCategory.PLOT, claim="Viral diff",
+            status=DiffStatus.LIVE, created_by=self.other
+        )
+        self.client.force_authenticate(user=self.user)
+
+    def vote(self, vote):
+        """Vote on the diff as the test user."""
+        return self.client.post(f'/api/diffs/items/{self.diff.id}/vote/', {'vote': vote})
+
+    def flush(self):
+        """Flush the buffer, running its on-commit callbacks."""
+        from .vote_buffer import flush
+
+        with self.captureOnCommitCallbacks(execute=False):
+            return flush()
+
+    def test_vote_is_buffered(self):
+        """Test that a buffered vote is not written, but the voter sees it."""
+        response = self.vote(VoteType.ACCURATE)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.data['pending'])
+        self.assertEqual(response.data['consensus'], {'total_votes': 1, 'accurate_percentage': 100})
+        self.assertFalse(DiffVote.objects.exists())
+
+        response = self.client.get(f'/api/diffs/items/{self.diff.id}/')
+        self.assertEqual(response.data['user_vote'], VoteType.ACCURATE)
+
+    def test_vote_changes_voter_list_etag(self):
+        """Test that a buffered vote changes the voter's comparison list ETag before the flush."""
+        params = {'work': self.diff.work_id, 'screen_work': self.diff.screen_work_id}
+        etag = self.client.get('/api/diffs/items/', params)['ETag']
+
+        self.vote(VoteType.ACCURATE)
+
+        response = self.client.get('/api/diffs/items/', params, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['results'][0]['user_vote'], VoteType.ACCURATE)
+
+    def test_flush_writes_votes_and_counters(self):
+        """Test that flushing upserts votes and moves the counters."""
+        from users.models import OutboxEvent
+
+        self.vote(VoteType.ACCURATE)
+        self.client.force_authenticate(user=self.other)
+        self.vote(VoteType.DISAGREE)
+
+        self.assertEqual(self.flush(), {'diffs': 1, 'votes': 2, 'remaining': 0})
+
+        self.assertEqual(
+            dict(DiffVote.objects.values_list('user__username', 'vote')),
+            {'buffered': VoteType.ACCURATE, 'other': VoteType.DISAGREE}
+        )
+        self.diff.refresh_from_db()
+        self.assertEqual((self.diff.accurate_count, self.diff.disagree_count, self.diff.total_votes), (1, 1, 2))
+        self.assertEqual(OutboxEvent.objects.filter(diff_item=self.diff).count(), 2)
+        self.assertEqual(self.flush(), {'diffs': 0, 'votes': 0, 'remaining': 0})
+
+    def test_last_write_wins(self):
+        """Test that only the latest of several buffered votes is written."""
+        self.vote(VoteType.ACCURATE)
+        self.vote(VoteType.DISAGREE)
+        self.flush()
+
+        self.assertEqual(DiffVote.objects.get(user=self.user).vote, VoteType.DISAGREE)
+        self.diff.refresh_from_db()
+        self.assertEqual((self.diff.accurate_count, self.diff.disagree_count, self.diff.total_votes), (0, 1, 1))
+
+    def test_toggle_removes_flushed_vote(self):
+        """Test that repeating a flushed vote removes it at the next flush."""
+        self.vote(VoteType.ACCURATE)
+        self.flush()
+
+        response = self.vote(VoteType.ACCURATE)
+        self.assertTrue(response.data['removed'])
+        response = self.client.get(f'/api/diffs/items/{self.diff.id}/')
+        self.assertIsNone(response.data['user_vote'])
+
+        self.flush()
+        self.assertFalse(DiffVote.objects.exists())
+        self.diff.refresh_from_db()
+        self.assertEqual((self.diff.accurate_count, self.diff.total_votes), (0, 0))
+
+    def test_vote_during_flush_is_kept(self):
+        """Test that a vote replacing a pending one mid-flush is flushed next time."""
+        from unittest.mock import patch
+        from . import vote_buffer
+
+        apply = vote_buffer._apply
+
+        def apply_then_vote(diff_id, pending):
+            written = apply(diff_id, pending)
+            vote_buffer.submit(self.diff.id, self.user.id, VoteType.DISAGREE)
+            return written
+
+        self.vote(VoteType.ACCURATE)
+        with patch.object(vote_buffer, '_apply', side_effect=apply_then_vote):
+            self.assertEqual(self.flush()['remaining'], 1)
+        self.assertEqual(DiffVote.objects.get(user=self.user).vote, VoteType.ACCURATE)
+
+        self.flush()
+        self.assertEqual(DiffVote.objects.get(user=self.user).vote, VoteType.DISAGREE)
+
+
+class ComparisonVoteStatsBatchAPITestCase(APITestCase):
+    """Test cases for batch comparison vote statistics."""
+
+    def setUp(self):
+        """Set up two comparisons, one with votes."""
+        from .models import ComparisonVote
+
+        self.user = User.objects.create_user(username='grid', password='pass')
+        self.other = User.objects.create_user(username='gridother', password='pass')
+        self.work = Work.objects.create(title="Grid Book", slug="grid-book")
+        self.screens = [
+            ScreenWork.objects.create(type=ScreenWorkType.MOVIE, title=f"Grid Movie {i}", slug=f"grid-movie-{i}")
+            for i in range(2)
+        ]
+        for user, preference, rating in ((self.user, 'BOOK', 4), (self.other, 'SCREEN', 2)):
+            ComparisonVote.objects.create(
+                work=self.work, screen_work=self.screens[0], user=user, has_read_book=True,
+                has_watched_adaptation=True, preference=preference, faithfulness_rating=rating
+            )
+
+    def get_batch(self, pairs):
+        """Request stats for the given pairs parameter."""
+        return self.client.get('/api/diffs/comparison-votes/stats/batch/', {'pairs': pairs})
+
+    def test_batch_stats(self):
+        """Test stats for several comparisons, from the maintained histograms."""
+        self.client.force_authenticate(user=self.user)
+        with self.assertNumQueries(2):  # Stats, then user votes
+            response = self.get_batch(f'{self.work.id}:{self.screens[0].id},{self.work.id}:{self.screens[1].id}')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        voted, empty = response.data['results']
+        self.assertEqual(voted['screen_work'], self.screens[0].id)
+        self.assertEqual(voted['total_votes'], 2)
+        self.assertEqual(voted['preference_breakdown']['BOOK'], 1)
+        self.assertEqual(voted['faithfulness']['average'], 3.0)
+        self.assertEqual(voted['faithfulness']['histogram'], {'1': 0, '2': 1, '3': 0, '4': 1, '5': 0})
+        self.assertEqual(voted['user_vote']['preference'], 'BOOK')
+
+        self.assertEqual(empty['total_votes'], 0)
+        self.assertIsNone(empty['faithfulness']['average'])
+        self.assertIsNone(empty['user_vote'])
+
+    def test_batch_stats_anonymous(self):
+        """Test that anonymous requests get stats without a user vote."""
+        response = self.get_batch(f'{self.work.id}:{self.screens[0].id}')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIsNone(response.data['results'][0]['user_vote'])
+
+    def test_batch_stats_validation(self):
+        """Test that malformed or too many pairs are rejected."""
+        from .constants import MAX_STATS_BATCH_PAIRS
+
+        self.assertEqual(self.get_batch('').status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.get_batch('1-2').status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.get_batch('a:b').status_code, status.HTTP_400_BAD_REQUEST)
+        too_many = ','.join(f'1:{i}' for i in range(MAX_STATS_BATCH_PAIRS + 1))
+        self.assertEqual(self.get_batch(too_many).status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class NeedsHelpTestCase(TestCase):
+    """Test cases for the needs-help flags and sections."""
+
+    def setUp(self):
+        """Set up a comparison with one diff."""
+        self.creator = User.objects.create_user(username='helper', password='pass')
+        self.voters = [User.objects.create_user(username=f'helpvoter{i}', password='pass') for i in range(6)]
+        self.work = Work.objects.create(title="Help Book", slug="help-book")
+        self.screen = ScreenWork.objects.create(type=ScreenWorkType.MOVIE, title="Help Movie", slug="help-movie")
+        self.diff = self.create_diff()
+
+    def create_diff(self, screen=None):
+        """Create a LIVE diff on the comparison (or another screen work)."""
+        return DiffItem.objects.create(
+            work=self.work, screen_work=screen or self.screen, category=DiffCategory.PLOT,
+            claim="Help diff", status=DiffStatus.LIVE, created_by=self.creator
+        )
+
+    def vote(self, diff, votes):
+        """Cast votes on a diff, one per voter (None skips a voter)."""
+        return [
+            DiffVote.objects.create(diff_item=diff, user=voter, vote=vote)
+            for voter, vote in zip(self.voters, votes) if vote
+        ]
+
+    def test_disputed_flag_follows_votes(self):
+        """Test that a diff is disputed once enough votes are split."""
+        votes = self.vote(self.diff, [VoteType.ACCURATE, VoteType.ACCURATE, VoteType.DISAGREE, VoteType.DISAGREE])
+        self.diff.refresh_from_db()
+        self.assertFalse(self.diff.is_disputed)  # Too few votes
+
+        self.vote(self.diff, [None] * 4 + [VoteType.NEEDS_NUANCE])
+        self.diff.refresh_from_db()
+        self.assertTrue(self.diff.is_disputed)  # 2 of 5 accurate
+
+        for vote in votes[2:]:
+            vote.vote = VoteType.ACCURATE
+            vote.save()
+        self.diff.refresh_from_db()
+        self.assertFalse(self.diff.is_disputed)  # 4 of 5 accurate
+
+    def test_comment_flag_follows_comments(self):
+        """Test that has_live_comments tracks LIVE comments."""
+        comment = DiffComment.objects.create(diff_item=self.diff, user=self.creator, body="Comment")
+        self.diff.refresh_from_db()
+        self.assertTrue(self.diff.has_live_comments)
+
+        comment.status = CommentStatus.HIDDEN
+        comment.save()
+        self.diff.refresh_from_db()
+        self.assertFalse(self.diff.has_live_comments)
+
+    def test_needs_help_sections(self):
+        """Test each section from the maintained counts and flags."""
+        from .services import DiffService
+
+        self.vote(self.diff, [VoteType.ACCURATE, VoteType.ACCURATE, VoteType.DISAGREE, VoteType.DISAGREE,
+                              VoteType.DISAGREE])
+        other_screen = ScreenWork.objects.create(type=ScreenWorkType.MOVIE, title="Quiet Movie", slug="quiet-movie")
+        commented = self.create_diff(other_screen)
+        self.vote(commented, [VoteType.ACCURATE])
+        DiffComment.objects.create(diff_item=commented, user=self.creator, body="Comment")
+
+        with self.assertNumQueries(7):
+            needs_help = DiffService.get_needs_help(limit=10)
+
+        self.assertEqual(len(needs_help['needs_differences']), 2)
+        disputed, = needs_help['most_disputed']
+        self.assertEqual((disputed['screen_work_id'], disputed['disputed_diff_count']), (self.screen.id, 1))
+        self.assertEqual(disputed['total_votes'], 5)
+        uncommented, = needs_help['no_comments']
+        self.assertEqual((uncommented['screen_work_id'], uncommented['no_comment_diff_count']), (self.screen.id, 1))
+
+
+class DiffRankingTestCase(APITestCase):
+    """Test cases for the stored 'best' and 'controversial' ranking scores."""
+
+    def setUp(self):
+        """Set up a comparison with three diffs."""
+        from django.core.cache import cache
+        from adaptapedia.cache import local_cache
+
+        # Diff lists are cached across requests; start from a cold cache
+        cache.clear()
+        local_cache.clear()
+
+        self.creator = User.objects.create_user(username='ranker', password='pass')
+        self.voters = [User.objects.create_user(username=f'rankvoter{i}', password='pass') for i in range(4)]
+        self.work = Work.objects.create(title="Ranked Book", slug="ranked-book")
+        self.screen = ScreenWork.objects.create(type=ScreenWorkType.MOVIE, title="Ranked Movie", slug="ranked-movie")
+        self.diffs = [
+            DiffItem.objects.create(
+                work=self.work, screen_work=self.screen, category=DiffCategory.PLOT,
+                claim=f"Ranked diff {i}", status=DiffStatus.LIVE, created_by=self.creator
+            )
+            for i in range(3)
+        ]
+
+    def vote(self, diff, votes):
+        """Cast votes on a diff, one per voter."""
+        for voter, vote in zip(self.voters, votes):
+            DiffVote.objects.create(diff_item=diff, user=voter, vote=vote)
+        diff.refresh_from_db()
+
+    def get_order(self, ordering):
+        """IDs of the comparison's diffs in the given ordering."""
+        response = self.client.get(
+            '/api/diffs/items/', {'work': self.work.id, 'screen_work': self.screen.id, 'ordering': ordering}
+        )
+        return [diff['id'] for diff in response.data['results']]
+
+    def test_scores_follow_votes(self):
+        """Test that scores are recomputed when a diff's votes change."""
+        import math
+        from .constants import WILSON_Z
+
+        diff = self.diffs[0]
+        self.assertEqual((diff.wilson_score, diff.controversy_score), (0, 0))
+
+        self.vote(diff, [VoteType.ACCURATE, VoteType.ACCURATE, VoteType.ACCURATE, VoteType.DISAGREE])
+
+        n, p, z = 4, 0.75, WILSON_Z
+        wilson = (p + z * z / (2 * n) - z * math.sqrt((p * (1 - p) + z * z / (4 * n)) / n)) / (1 + z * z / n)
+        self.assertAlmostEqual(diff.wilson_score, wilson)
+        self.assertAlmostEqual(diff.controversy_score, 4 ** (1 / 3))
+
+        DiffVote.objects.get(diff_item=diff, user=self.voters[3]).delete()
+        diff.refresh_from_db()
+        self.assertEqual(diff.controversy_score, 0)
+
+    def test_orderings_use_scores(self):
+        """Test 'best' and 'controversial' orderings from the stored scores."""
+        unanimous, split, unvoted = self.diffs
+        self.vote(unanimous, [VoteType.ACCURATE] * 3)
+        self.vote(split, [VoteType.ACCURATE, VoteType.ACCURATE, VoteType.DISAGREE, VoteType.DISAGREE])
+
+        self.assertEqual(self.get_order('best'), [unanimous.id, split.id, unvoted.id])
+        self.assertEqual(self.get_order('controversial')[0], split.id)
+
+
+class ComparisonDiffListTestCase(APITestCase):
+    """Test cases for spoiler levels and the cached comparison diff lists."""
+
+    def setUp(self):
+        """Set up a comparison with a diff at each spoiler scope."""
+        from django.core.cache import cache
+        from adaptapedia.cache import local_cache
+
+        # Diff lists are cached across requests; start from a cold cache
+        cache.clear()
+        local_cache.clear()
+
+        self.user = User.objects.create_user(username='spoilerlister', password='pass')
+        self.work = Work.objects.create(title="Listed Book", slug="listed-book")
+        self.screen = ScreenWork.objects.create(type=ScreenWorkType.MOVIE, title="Listed Movie", slug="listed-movie")
+        self.diffs = {
+            scope: DiffItem.objects.create(
+                work=self.work, screen_work=self.screen, category=DiffCategory.PLOT,
+                claim=f"Listed diff {scope}", spoiler_scope=scope, created_by=self.user
+            )
+            for scope in SpoilerScope.values
+        }
+
+    def get_list(self, **params):
+        """Response for the comparison's diff list."""
+        return self.client.get('/api/diffs/items/', {'work': self.work.id, 'screen_work': self.screen.id, **params})
+
+    def test_spoiler_level_follows_scope(self):
+        """Test that spoiler_level is set from spoiler_scope on save."""
+        from .constants import SPOILER_SCOPE_ORDER
+
+        for scope, diff in self.diffs.items():
+            diff.refresh_from_db()
+            self.assertEqual(diff.spoiler_level, SPOILER_SCOPE_ORDER[scope])
+
+        diff = self.diffs[SpoilerScope.NONE]
+        diff.spoiler_scope = SpoilerScope.FULL
+        diff.save(update_fields=['spoiler_scope'])
+        diff.refresh_from_db()
+        self.assertEqual(diff.spoiler_level, SPOILER_SCOPE_ORDER[SpoilerScope.FULL])
+
+        comment = DiffComment.objects.create(
+            diff_item=diff, user=self.user, body="Spoilery comment", spoiler_scope=SpoilerScope.BOOK_ONLY
+        )
+        comment.refresh_from_db()
+        self.assertEqual(comment.spoiler_level, SPOILER_SCOPE_ORDER[SpoilerScope.BOOK_ONLY])
+
+    def test_list_filters_by_spoiler_level(self):
+        """Test that a comparison's list only holds diffs up to the requested scope."""
+        response = self.get_list(max_spoiler_scope=SpoilerScope.BOOK_ONLY)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 3)
+        self.assertNotIn(SpoilerScope.FULL, [diff['spoiler_scope'] for diff in response.data['results']])
+        self.assertEqual(self.get_list().data['count'], 4)
+
+    def test_list_served_from_cached_ids(self):
+        """Test that a repeated comparison list only queries its page's rows."""
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        first = self.get_list(ordering='new')
+        with CaptureQueriesContext(connection) as queries:
+            second = self.get_list(ordering='new')
+
+        self.assertEqual(second.data, first.data)
+        self.assertEqual(
+            [diff['id'] for diff in second.data['results']],
+            [diff.id for diff in reversed(list(self.diffs.values()))],
+        )
+        self.assertEqual(len(queries), 1)
+
+    def test_list_refreshed_when_comparison_changes(self):
+        """Test that a new diff appears once its write commits."""
+        self.assertEqual(self.get_list().data['count'], 4)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            DiffItem.objects.create(
+                work=self.work, screen_work=self.screen, category=DiffCategory.ENDING,
+                claim="Listed late diff", created_by=self.user
+            )
+
+        self.assertEqual(self.get_list().data['count'], 5)
+
+    def test_comments_filter_by_spoiler_level(self):
+        """Test max_spoiler_scope on the comment list."""
+        diff = self.diffs[SpoilerScope.NONE]
+        for scope in (SpoilerScope.NONE, SpoilerScope.FULL):
+            DiffComment.objects.create(diff_item=diff, user=self.user, body=f"{scope} comment", spoiler_scope=scope)
+
+        response = self.client.get(
+            '/api/diffs/comments/', {'diff_item': diff.id, 'max_spoiler_scope': SpoilerScope.SCREEN_ONLY}
+        )
+        self.assertEqual([comment['spoiler_scope'] for comment in response.data['results']], [SpoilerScope.NONE])
+
+
+class CommentThreadTestCase(APITestCase):
+    """Test cases for materialized comment paths and thread listings."""
+
+    def setUp(self):
+        """Set up a diff with two threads: root -> reply -> nested reply, and a lone comment."""
+        self.user = User.objects.create_user(username='threader', password='pass')
+        self.work = Work.objects.create(title="Thread Book", slug="thread-book")
+        self.screen = ScreenWork.objects.create(type=ScreenWorkType.MOVIE, title="Thread Movie", slug="thread-movie")
+        self.diff = DiffItem.objects.create(
+            work=self.work, screen_work=self.screen, category=DiffCategory.PLOT,
+            claim="Threaded diff", created_by=self.user
+        )
+        self.root = self.comment("Root comment")
+        self.reply = self.comment("Reply", parent=self.root)
+        self.nested = self.comment("Nested reply", parent=self.reply)
+        self.lone = self.comment("Lone comment")
+
+    def comment(self, body, parent=None, **kwargs):
+        """Create a comment on the diff."""
+        return DiffComment.objects.create(diff_item=self.diff, user=self.user, body=body, parent=parent, **kwargs)
+
+    def get_threads(self, **params):
+        """Response for the diff's threads."""
+        return self.client.get('/api/diffs/comments/threads/', {'diff_item': self.diff.id, **params})
+
+    def test_path_and_depth_set_on_insert(self):
+        """Test that a reply's path extends its parent's."""
+        from .constants import COMMENT_PATH_WIDTH
+
+        self.assertEqual(self.root.path, f"{self.root.pk:0{COMMENT_PATH_WIDTH}d}")
+        self.assertEqual(self.nested.path, self.reply.path + f"{self.nested.pk:0{COMMENT_PATH_WIDTH}d}")
+        self.assertEqual([self.root.depth, self.reply.depth, self.nested.depth], [0, 1, 2])
+        self.assertEqual(DiffComment.objects.get(pk=self.nested.pk).path, self.nested.path)
+
+    def test_reply_counts_follow_status(self):
+        """Test that hiding a comment removes it and its replies from its ancestors' counts."""
+        self.root.refresh_from_db()
+        self.assertEqual((self.root.reply_count, self.root.descendant_count), (1, 2))
+
+        self.reply.status = CommentStatus.HIDDEN
+        self.reply.save()
+        self.root.refresh_from_db()
+        self.assertEqual((self.root.reply_count, self.root.descendant_count), (0, 0))
+
+    def test_threads_in_display_order(self):
+        """Test that threads list oldest first, with replies after their parent."""
+        later = self.comment("Later reply", parent=self.root)
+
+        response = self.get_threads()
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 2)
+        thread, lone = response.data['results']
+        self.assertEqual(thread['id'], self.root.id)
+        self.assertEqual(thread['descendant_count'], 3)
+        self.assertEqual([reply['id'] for reply in thread['replies']], [self.reply.id, self.nested.id, later.id])
+        self.assertEqual([reply['depth'] for reply in thread['replies']], [1, 2, 1])
+        self.assertEqual((lone['id'], lone['replies']), (self.lone.id, []))
+
+    def test_threads_collapse_below_max_depth(self):
+        """Test that replies below max_depth are counted instead of loaded."""
+        thread = self.get_threads(max_depth=1).data['results'][0]
+
+        self.assertEqual([reply['id'] for reply in thread['replies']], [self.reply.id])
+        self.assertEqual(thread['replies'][0]['collapsed_reply_count'], 1)
+
+        expanded = self.client.get(f'/api/diffs/comments/{self.reply.id}/thread/', {'max_depth': 1}).data
+        self.assertEqual([reply['id'] for reply in expanded['replies']], [self.nested.id])
+
+    def test_threads_query_count_independent_of_depth(self):
+        """Test that a page of threads loads its replies with one query however deep they go."""
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        def thread_queries():
+            with CaptureQueriesContext(connection) as queries:
+                self.get_threads()
+            return len(queries)
+
+        shallow = thread_queries()
+        parent = self.nested
+        for i in range(5):
+            parent = self.comment(f"Deeper reply {i}", parent=parent)
+        self.assertEqual(thread_queries(), shallow)
+
+    def test_reply_to_other_diff_rejected(self):
+        """Test that a reply must be on its parent's diff."""
+        other = DiffItem.objects.create(
+            work=self.work, screen_work=self.screen, category=DiffCategory.ENDING,
+            claim="Other threaded diff", created_by=self.user
+        )
+        self.client.force_authenticate(user=self.user)
+
+        response = self.client.post(
+            '/api/diffs/comments/', {'diff_item': other.id, 'parent': self.root.id, 'body': 'Misplaced reply'}
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class ComparisonPageTestCase(APITestCase):
+    """Test cases for the aggregate comparison page endpoint."""
+
+    def setUp(self):
+        """Set up a comparison with a spoiler-free and a fully spoilery diff, a thread and a voter."""
+        from django.core.cache import cache
+        from adaptapedia.cache import local_cache
+
+        # Pages are cached across requests; start from a cold cache
+        cache.clear()
+        local_cache.clear()
+
+        self.user = User.objects.create_user(username='pagereader', password='pass')
+        self.work = Work.objects.create(title="Page Book", slug="page-book", author="Page Author")
+        self.screen = ScreenWork.objects.create(type=ScreenWorkType.MOVIE, title="Page Movie", slug="page-movie")
+        self.safe = DiffItem.objects.create(
+            work=self.work, screen_work=self.screen, category=DiffCategory.PLOT,
+            claim="Spoiler-free page diff", spoiler_scope=SpoilerScope.NONE, created_by=self.user
+        )
+        self.spoiler = DiffItem.objects.create(
+            work=self.work, screen_work=self.screen, category=DiffCategory.ENDING,
+            claim="Spoilery page diff", spoiler_scope=SpoilerScope.FULL, created_by=self.user
+        )
+        self.root = DiffComment.objects.create(diff_item=self.safe, user=self.user, body="Page thread")
+        self.reply = DiffComment.objects.create(diff_item=self.safe, user=self.user, body="Reply", parent=self.root)
+        self.url = '/api/diffs/comparisons/page-book/page-movie/'
+
+    def test_page_payload(self):
+        """Test that the page holds the works, stats and diffs with their first threads."""
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['work']['slug'], 'page-book')
+        self.assertEqual(response.data['screen_work']['slug'], 'page-movie')
+        self.assertEqual(response.data['vote_stats']['total_votes'], 0)
+        self.assertIsNone(response.data['vote_stats']['user_vote'])
+        self.assertEqual(response.data['bookmark'], {'is_bookmarked': False, 'bookmark_id': None})
+        self.assertEqual({diff['id'] for diff in response.data['diffs']}, {self.safe.id, self.spoiler.id})
+
+        safe = next(diff for diff in response.data['diffs'] if diff['id'] == self.safe.id)
+        self.assertEqual(safe['comments']['thread_count'], 1)
+        thread = safe['comments']['threads'][0]
+        self.assertEqual(thread['id'], self.root.id)
+        self.assertEqual([reply['id'] for reply in thread['replies']], [self.reply.id])
+
+    def test_page_filters_by_spoiler_level(self):
+        """Test that diffs above the requested scope are left out."""
+        response = self.client.get(self.url, {'max_spoiler_scope': SpoilerScope.NONE})
+
+        self.assertEqual([diff['id'] for diff in response.data['diffs']], [self.safe.id])
+
+    def test_unknown_slug_not_found(self):
+        """Test that an unknown work or screen work slug returns 404."""
+        self.assertEqual(
+            self.client.get('/api/diffs/comparisons/page-book/missing/').status_code, status.HTTP_404_NOT_FOUND
+        )
+        self.assertEqual(
+            self.client.get('/api/diffs/comparisons/missing/page-movie/').status_code, status.HTTP_404_NOT_FOUND
+        )
+
+    def test_user_overlay_in_one_query(self):
+        """Test that a cached page costs the slug lookup plus one query for the user's votes and bookmark."""
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        from users.models import Bookmark
+        from .models import ComparisonVote
+        from .serializers import ComparisonVoteSerializer
+
+        self.client.get(self.url)
+        DiffVote.objects.create(diff_item=self.safe, user=self.user, vote=VoteType.ACCURATE)
+        bookmark = Bookmark.objects.create(user=self.user, work=self.work, screen_work=self.screen)
+        comparison_vote = ComparisonVote.objects.create(
+            work=self.work, screen_work=self.screen, user=self.user, has_read_book=True,
+            has_watched_adaptation=True, preference='BOOK', faithfulness_rating=4
+        )
+        self.client.get(self.url)  # Cache the page again; on-commit invalidation does not run in tests
+
+        with CaptureQueriesContext(connection) as anonymous:
+            self.client.get(self.url)
+        self.assertEqual(len(anonymous), 1)
+
+        self.client.force_authenticate(user=self.user)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url)
+        self.assertEqual(len(queries), 2)
+
+        self.assertEqual(response.data['bookmark'], {'is_bookmarked': True, 'bookmark_id': bookmark.id})
+        self.assertEqual(
+            response.data['vote_stats']['user_vote'], dict(ComparisonVoteSerializer(comparison_vote).data)
+        )
+        votes = {diff['id']: diff['user_vote'] for diff in response.data['diffs']}
+        self.assertEqual(votes, {self.safe.id: VoteType.ACCURATE, self.spoiler.id: None})
+
+    def test_page_refreshed_when_comparison_changes(self):
+        """Test that a new comment appears once its write commits."""
+        self.client.get(self.url)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            DiffComment.objects.create(diff_item=self.spoiler, user=self.user, body="New page thread")
+
+        spoiler = next(diff for diff in self.client.get(self.url).data['diffs'] if diff['id'] == self.spoiler.id)
+        self.assertEqual(spoiler['comments']['thread_count'], 1)
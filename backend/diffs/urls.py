@@ -1,7 +1,7 @@
 """URL configuration for diffs app."""
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import DiffItemViewSet, DiffCommentViewSet, ComparisonVoteViewSet
+from .views import DiffItemViewSet, DiffCommentViewSet, ComparisonVoteViewSet, ComparisonPageView
 
 router = DefaultRouter()
 router.register(r'items', DiffItemViewSet, basename='diffitem')
@@ -9,5 +9,10 @@ router.register(r'comments', DiffCommentViewSet, basename='diffcomment')
 router.register(r'comparison-votes', ComparisonVoteViewSet, basename='comparison-vote')
 
 urlpatterns = [
+    path(
+        'comparisons/<slug:work_slug>/<slug:screen_slug>/',
+        ComparisonPageView.as_view(),
+        name='comparison-page',
+    ),
     path('', include(router.urls)),
 ]
@@ -1,15 +1,93 @@
 """Views for diffs app."""
+import re
 from rest_framework import viewsets, permissions, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
+from rest_framework.views import APIView
 from django_filters.rest_framework import DjangoFilterBackend
-from django.db.models import Count, Avg, Q, F, ExpressionWrapper, IntegerField, Case, When
-from django.core.cache import cache
+from django.db import transaction
 from .models import DiffItem, DiffVote, DiffComment, SpoilerScope, ComparisonVote
-from .serializers import DiffItemSerializer, DiffVoteSerializer, DiffCommentSerializer, ComparisonVoteSerializer
+from .serializers import (
+    DiffItemSerializer,
+    DiffVoteSerializer,
+    DiffCommentSerializer,
+    ComparisonVoteSerializer,
+    serialize_threads,
+)
 from .services import DiffService
 from .permissions import CanEditDiff, CanMergeDiff
-from .constants import SPOILER_SCOPE_ORDER
+from .constants import (
+    SPOILER_SCOPE_ORDER,
+    BROWSE_SORTS,
+    DEFAULT_BROWSE_LIMIT,
+    DEFAULT_DIFF_ORDERING,
+    DEFAULT_THREAD_DEPTH,
+    DIFF_ORDERINGS,
+    MAX_SPOILER_LEVEL,
+    MAX_BROWSE_LIMIT,
+    MAX_NEEDS_HELP_LIMIT,
+    MAX_STATS_BATCH_PAIRS,
+    MAX_THREAD_DEPTH,
+    MAX_TRENDING_DAYS,
+    MAX_TRENDING_LIMIT,
+    RANDOM_RECENT_EXCLUDE,
+    RANDOM_WEIGHTINGS,
+    TRENDING_LOOKBACK_DAYS,
+    VOTE_COUNT_FIELDS,
+)
+from . import comparison_page, sampling, vote_buffer
+from .sections import (
+    get_section,
+    get_trending,
+    get_comparison_diff_ids,
+    get_comparison_vote_stats,
+    section_version_tags,
+)
+from adaptapedia.cache import (
+    CACHE_SWR_TIMEOUTS,
+    TRENDING_TAG,
+    comparison_tag,
+    conditional_on_versions,
+)
+
+# Sections drift with time as well as writes (e.g. the trending window moving on)
+SECTION_ETAG_BUCKET = CACHE_SWR_TIMEOUTS['browse_section'][0]
+
+
+def _comparison_version_tags(request):
+    """Version tags for a diff list scoped to one comparison, None for other lists."""
+    work_id = request.query_params.get('work', '')
+    screen_work_id = request.query_params.get('screen_work', '')
+    if not (work_id.isdigit() and screen_work_id.isdigit()):
+        return None
+    tags = [comparison_tag(int(work_id), int(screen_work_id))]
+    if request.user.is_authenticated:
+        # The voter's buffered votes show as user_vote before they are flushed
+        tags.append(vote_buffer.pending_votes_tag(request.user.pk))
+    return tags
+
+
+# Query parameters a cached comparison diff list can serve (see DiffItemViewSet.list)
+COMPARISON_LIST_PARAMS = {'work', 'screen_work', 'max_spoiler_scope', 'ordering', 'page'}
+
+
+def _max_spoiler_level(request):
+    """Spoiler level requested with max_spoiler_scope, None when not filtering."""
+    spoiler_scope = request.query_params.get('max_spoiler_scope', None)
+    if not spoiler_scope:
+        return None
+    # Unknown scopes show only spoiler-free items
+    return SPOILER_SCOPE_ORDER.get(spoiler_scope, 0)
+
+
+def _browse_version_tags(request):
+    """Version tags for the browse sections served for the requested sort."""
+    sort = request.query_params.get('sort', 'popularity')
+    if sort not in BROWSE_SORTS:
+        sort = 'popularity'
+    return section_version_tags(
+        'featured', 'recently_updated', 'most_documented', 'trending', f'all_comparisons:{sort}'
+    )
 
 
 class DiffItemViewSet(viewsets.ModelViewSet):
@@ -17,7 +95,7 @@ class DiffItemViewSet(viewsets.ModelViewSet):
 
     queryset = DiffItem.objects.filter(status='LIVE').select_related(
         'work', 'screen_work', 'created_by'
-    ).prefetch_related('votes')
+    )
     serializer_class = DiffItemSerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
     filter_backends = [DjangoFilterBackend]
@@ -32,72 +110,72 @@ class DiffItemViewSet(viewsets.ModelViewSet):
     def get_queryset(self):
         """Filter queryset based on spoiler scope and apply ordering."""
         queryset = super().get_queryset()
-        spoiler_scope = self.request.query_params.get('max_spoiler_scope', None)
-        ordering = self.request.query_params.get('ordering', 'best')
-
-        # Filter by spoiler scope
-        if spoiler_scope:
-            # Order by spoiler severity: NONE < BOOK_ONLY/SCREEN_ONLY < FULL
-            max_level = SPOILER_SCOPE_ORDER.get(spoiler_scope, 0)
-            allowed_scopes = [k for k, v in SPOILER_SCOPE_ORDER.items() if v <= max_level]
-            queryset = queryset.filter(spoiler_scope__in=allowed_scopes)
-
-        # Annotate with vote metrics
-        queryset = queryset.annotate(
-            accurate_count=Count(
-                Case(When(votes__vote='ACCURATE', then=1)),
-                distinct=True
-            ),
-            disagree_count=Count(
-                Case(When(votes__vote='DISAGREE', then=1)),
-                distinct=True
-            ),
-            nuance_count=Count(
-                Case(When(votes__vote='NEEDS_NUANCE', then=1)),
-                distinct=True
-            ),
-            total_votes=F('accurate_count') + F('disagree_count') + F('nuance_count'),
-            net_score=F('accurate_count') - F('disagree_count'),
-            # Controversial score: high total votes with divisive split
-            controversy_score=ExpressionWrapper(
-                F('total_votes') * Case(
-                    # If votes are split close to 50/50, controversy is high
-                    When(total_votes__gt=0, then=(
-                        1.0 - (F('accurate_count') - F('disagree_count')) *
-                        (F('accurate_count') - F('disagree_count')) /
-                        (F('total_votes') * F('total_votes'))
-                    )),
-                    default=0.0,
-                    output_field=IntegerField()
-                ),
-                output_field=IntegerField()
-            )
-        )
+        ordering = self.request.query_params.get('ordering', DEFAULT_DIFF_ORDERING)
 
-        # Apply ordering
-        if ordering == 'new':
-            queryset = queryset.order_by('-created_at')
-        elif ordering == 'controversial':
-            queryset = queryset.order_by('-controversy_score', '-total_votes', '-created_at')
-        else:  # 'best' is default
-            queryset = queryset.order_by('-net_score', '-accurate_count', '-created_at')
+        # Spoiler severity: NONE < BOOK_ONLY/SCREEN_ONLY < FULL, stored as spoiler_level
+        max_level = _max_spoiler_level(self.request)
+        if max_level is not None:
+            queryset = queryset.filter(spoiler_level__lte=max_level)
 
-        return queryset
+        # Ranking scores are stored on each diff and indexed per comparison
+        return queryset.order_by(*DIFF_ORDERINGS.get(ordering, DIFF_ORDERINGS[DEFAULT_DIFF_ORDERING]))
+
+    @conditional_on_versions(_comparison_version_tags)
+    def list(self, request, *args, **kwargs):
+        """
+        List diffs; lists for one comparison support conditional GET (ETag).
+
+        A comparison page's list (work, screen_work and optionally
+        max_spoiler_scope, ordering and page) is read from the comparison's
+        cached diff IDs for that spoiler level and ordering, so only the page's
+        rows are queried, by primary key.
+        """
+        params = request.query_params
+        if not (
+            set(params) <= COMPARISON_LIST_PARAMS
+            and params.get('work', '').isdigit()
+            and params.get('screen_work', '').isdigit()
+        ):
+            return super().list(request, *args, **kwargs)
+
+        max_level = _max_spoiler_level(request)
+        ordering = params.get('ordering', DEFAULT_DIFF_ORDERING)
+        diff_ids = get_comparison_diff_ids(
+            int(params['work']),
+            int(params['screen_work']),
+            MAX_SPOILER_LEVEL if max_level is None else max_level,
+            ordering if ordering in DIFF_ORDERINGS else DEFAULT_DIFF_ORDERING,
+        )
+
+        page_ids = self.paginate_queryset(diff_ids)
+        ids = diff_ids if page_ids is None else page_ids
+        diffs = super().get_queryset().in_bulk(ids)
+        serializer = self.get_serializer([diffs[pk] for pk in ids if pk in diffs], many=True)
+        if page_ids is None:
+            return Response(serializer.data)
+        return self.get_paginated_response(serializer.data)
 
+    @transaction.atomic
     def perform_create(self, serializer):
         """Set the created_by field to the current user and status to LIVE."""
-        from users.services import BadgeService
+        from users.models import OutboxEventType
+        from users.services import OutboxService
 
         diff_item = serializer.save(created_by=self.request.user, status='LIVE')
 
-        # Award milestone badges for diff creation
-        BadgeService.check_milestone_badges(self.request.user)
+        # Milestone badges are awarded asynchronously
+        OutboxService.record(OutboxEventType.DIFF_CREATED, self.request.user, diff_item=diff_item)
 
     @action(detail=True, methods=['post'], permission_classes=[permissions.IsAuthenticated])
     def vote(self, request, pk=None):
-        """Vote on a diff item. If voting the same value, remove the vote (toggle)."""
-        from users.services import BadgeService, ReputationService, NotificationService
-        from users.models import ReputationEventType
+        """
+        Vote on a diff item. If voting the same value, remove the vote (toggle).
+
+        Badges, consensus reputation and notifications are applied
+        asynchronously from the outbox (see users.services.OutboxService).
+        """
+        from users.models import OutboxEventType
+        from users.services import OutboxService
 
         diff_item = self.get_object()
         vote_value = request.data.get('vote')
@@ -108,6 +186,11 @@ class DiffItemViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
+        # High-throughput mode: accept the vote into Redis, written by diffs.tasks.flush_vote_buffer
+        buffered = vote_buffer.submit(diff_item.pk, request.user.pk, vote_value)
+        if buffered is not None:
+            return self._buffered_vote_response(diff_item, request.user, buffered)
+
         # Check if user already has a vote
         existing_vote = DiffVote.objects.filter(
             diff_item=diff_item,
@@ -122,53 +205,19 @@ class DiffItemViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_200_OK
             )
 
-        # Otherwise, create or update the vote
-        vote, created = DiffVote.objects.update_or_create(
-            diff_item=diff_item,
-            user=request.user,
-            defaults={'vote': vote_value}
-        )
+        # Otherwise, create or update the vote, with its outbox event
+        with transaction.atomic():
+            vote, created = DiffVote.objects.update_or_create(
+                diff_item=diff_item,
+                user=request.user,
+                defaults={'vote': vote_value}
+            )
+            OutboxService.record(
+                OutboxEventType.DIFF_VOTED, request.user, diff_item=diff_item, payload={'created': created}
+            )
 
-        # Award milestone badges for first vote
-        if created:
-            BadgeService.check_milestone_badges(request.user)
-
-        # Refresh diff_item to get updated vote counts
-        diff_item.refresh_from_db()
-        diff_item = DiffItem.objects.annotate(
-            accurate_count=Count(
-                Case(When(votes__vote='ACCURATE', then=1)),
-                distinct=True
-            ),
-            disagree_count=Count(
-                Case(When(votes__vote='DISAGREE', then=1)),
-                distinct=True
-            ),
-            nuance_count=Count(
-                Case(When(votes__vote='NEEDS_NUANCE', then=1)),
-                distinct=True
-            ),
-            total_votes=F('accurate_count') + F('disagree_count') + F('nuance_count'),
-        ).get(pk=diff_item.pk)
-
-        # Check if diff reached consensus threshold (10+ votes)
-        if diff_item.total_votes >= 10:
-            # Calculate consensus and award reputation to diff creator
-            consensus_event_type = ReputationService.calculate_diff_consensus_rep(diff_item)
-            if consensus_event_type:
-                # Award reputation to the diff creator
-                ReputationService.award_reputation(
-                    user=diff_item.created_by,
-                    event_type=consensus_event_type,
-                    description=f"Diff reached consensus: {diff_item.claim}",
-                    diff_item=diff_item
-                )
-
-                # Notify diff creator about consensus
-                NotificationService.notify_diff_consensus(diff_item, diff_item.created_by)
-
-                # Check for quality badges
-                BadgeService.check_quality_badges(diff_item.created_by)
+        # Vote counters are updated by the vote's signal handlers
+        diff_item.refresh_from_db(fields=['accurate_count', 'nuance_count', 'disagree_count', 'total_votes'])
 
         serializer = DiffVoteSerializer(vote)
 
@@ -184,70 +233,117 @@ class DiffItemViewSet(viewsets.ModelViewSet):
             }
         }, status=status.HTTP_200_OK)
 
+    @staticmethod
+    def _buffered_vote_response(diff_item, user, buffered):
+        """Vote response for a buffered vote, with counters as the voter will see them after the flush."""
+        if buffered['vote'] is None:
+            return Response(
+                {'message': 'Vote removed', 'removed': True, 'pending': True},
+                status=status.HTTP_200_OK
+            )
+
+        # Flushed counters, moved by the voter's own pending change
+        counts = {vote: getattr(diff_item, field) for vote, field in VOTE_COUNT_FIELDS.items()}
+        total_votes = diff_item.total_votes
+        db_vote = DiffVote.objects.filter(diff_item=diff_item, user=user).values_list('vote', flat=True).first()
+        if db_vote != buffered['vote']:
+            if db_vote in counts:
+                counts[db_vote] -= 1
+                total_votes -= 1
+            if buffered['vote'] in counts:
+                counts[buffered['vote']] += 1
+                total_votes += 1
+
+        accurate_ratio = counts['ACCURATE'] / total_votes if total_votes > 0 else 0
+        return Response({
+            'diff_item': diff_item.pk,
+            'user': user.pk,
+            'vote': buffered['vote'],
+            'pending': True,
+            'consensus': {
+                'total_votes': total_votes,
+                'accurate_percentage': round(accurate_ratio * 100)
+            }
+        }, status=status.HTTP_200_OK)
+
     @action(detail=False, methods=['get'], url_path='random-comparison')
     def random_comparison(self, request):
-        """Get a random comparison that has at least one diff."""
-        from works.models import Work
-        from screen.models import ScreenWork
-        from django.db.models import Count
-        import random
-
-        # Get all work-screen pairs that have at least one diff
-        comparisons = DiffItem.objects.filter(
-            status='LIVE'
-        ).values('work', 'screen_work').annotate(
-            diff_count=Count('id')
-        ).filter(diff_count__gt=0)
-
-        if not comparisons:
+        """
+        Get a random comparison that has at least one diff.
+
+        Query parameters:
+        - genre (str): Only comparisons of books in this genre
+        - weight (str): 'uniform' (default) or 'activity' to favour comparisons
+          with more diffs and votes
+        - exclude (str): Comma-separated 'comparison' values of recently served
+          comparisons (the client keeps the last RANDOM_RECENT_EXCLUDE), skipped
+          while others are left
+
+        Returns work_slug, screen_work_slug, diff_count and comparison, the
+        value to send back in exclude.
+        """
+        weighting = request.query_params.get('weight', 'uniform')
+        if weighting not in RANDOM_WEIGHTINGS:
+            weighting = 'uniform'
+
+        recent = [member for member in request.query_params.get('exclude', '').split(',') if member]
+        if not all(re.fullmatch(r'\d+:\d+', member) for member in recent):
+            return Response(
+                {'error': 'exclude must be comma-separated work_id:screen_work_id pairs'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        comparison = sampling.get_random_comparison(
+            genre=request.query_params.get('genre') or None,
+            weighting=weighting,
+            exclude=recent[:RANDOM_RECENT_EXCLUDE],
+        )
+
+        if comparison is None:
             return Response(
                 {'error': 'No comparisons available'},
                 status=status.HTTP_404_NOT_FOUND
             )
 
-        # Pick a random comparison
-        random_comparison = random.choice(list(comparisons))
-        work = Work.objects.get(id=random_comparison['work'])
-        screen_work = ScreenWork.objects.get(id=random_comparison['screen_work'])
-
         return Response({
-            'work_slug': work.slug,
-            'screen_work_slug': screen_work.slug,
-            'diff_count': random_comparison['diff_count']
+            'work_slug': comparison.work.slug,
+            'screen_work_slug': comparison.screen_work.slug,
+            'diff_count': comparison.diff_count,
+            'comparison': sampling.member_key(comparison.work_id, comparison.screen_work_id),
         })
 
     @action(detail=False, methods=['get'], url_path='trending')
+    @conditional_on_versions(
+        lambda request: section_version_tags('trending') + [TRENDING_TAG], bucket=SECTION_ETAG_BUCKET
+    )
     def trending(self, request):
         """
         Get trending comparisons based on recent activity.
 
         Query parameters:
         - limit (int): Number of trending comparisons to return (default 8, max 20)
-        - days (int): Number of days to look back for activity (default 7)
+        - days (int): Number of days to look back for activity (default 7, 1 to 90)
 
-        Returns cached data (30-minute cache) for performance.
+        The default window is served from the cached trending section, which is
+        refreshed when diffs or votes change. The other common windows are cached
+        for 30 minutes (see get_trending).
         """
         # Get query parameters with defaults
-        limit = min(int(request.query_params.get('limit', 8)), 20)  # Cap at 20
-        days = int(request.query_params.get('days', 7))
-
-        # Create cache key based on parameters
-        cache_key = f'trending_comparisons_limit_{limit}_days_{days}'
-
-        # Try to get from cache
-        cached_data = cache.get(cache_key)
-        if cached_data is not None:
-            return Response(cached_data)
-
-        # Calculate trending comparisons using service
-        trending_comparisons = DiffService.get_trending_comparisons(limit=limit, days=days)
-
-        # Cache for 30 minutes (1800 seconds)
-        cache.set(cache_key, trending_comparisons, 1800)
+        try:
+            limit = min(int(request.query_params.get('limit', 8)), MAX_TRENDING_LIMIT)
+            days = int(request.query_params.get('days', TRENDING_LOOKBACK_DAYS))
+        except ValueError:
+            return Response(
+                {'error': 'limit and days must be integers'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        days = min(max(days, 1), MAX_TRENDING_DAYS)
 
-        return Response(trending_comparisons)
+        # Cached at the maximum limit; smaller limits are prefixes
+        return Response(get_trending(days)[:limit])
 
     @action(detail=False, methods=['get'], url_path='browse')
+    @conditional_on_versions(_browse_version_tags, bucket=SECTION_ETAG_BUCKET)
     def browse(self, request):
         """
         Get curated browse sections: featured, recently updated, most documented, trending.
@@ -255,41 +351,61 @@ class DiffItemViewSet(viewsets.ModelViewSet):
         Query parameters:
         - sort (str): Sort order for 'all_comparisons' section. Options: 'popularity' (default), 'trending', 'most_documented', 'recently_updated', 'newest'
 
-        Returns all sections in one response for the browse page.
+        Returns all sections in one response for the browse page; all_comparisons
+        holds the first 50 comparisons (page through all of them with browse/comparisons).
         Comparisons can appear in multiple sections (e.g., both Featured and Trending).
-        Cached for performance (cache key includes sort parameter).
+        Each section is cached separately and refreshed when diffs or votes change.
         """
         # Get sort parameter from query string
         sort = request.query_params.get('sort', 'popularity')
 
         # Validate sort parameter
-        valid_sorts = ['popularity', 'trending', 'most_documented', 'recently_updated', 'newest']
-        if sort not in valid_sorts:
+        if sort not in BROWSE_SORTS:
             sort = 'popularity'
 
-        # Cache key includes sort parameter so different sorts are cached separately
-        cache_key = f'browse_page_sections_sort_{sort}'
-
-        # Try to get from cache
-        cached_data = cache.get(cache_key)
-        if cached_data is not None:
-            return Response(cached_data)
-
-        # Get all sections (queries already deduplicate within each section via GROUP BY)
         data = {
-            'featured': DiffService.get_featured_comparisons(limit=12),
-            'recently_updated': DiffService.get_recently_updated(limit=12),
-            'most_documented': DiffService.get_most_documented(limit=12),
-            'trending': DiffService.get_trending_comparisons(limit=12, days=7),
-            'all_comparisons': DiffService.get_all_comparisons(limit=50, sort=sort),
+            'featured': get_section('featured'),
+            'recently_updated': get_section('recently_updated'),
+            'most_documented': get_section('most_documented'),
+            'trending': get_section('trending')[:DEFAULT_BROWSE_LIMIT],
+            'all_comparisons': get_section(f'all_comparisons:{sort}'),
         }
 
-        # Cache for 5 minutes (300 seconds)
-        cache.set(cache_key, data, 300)
-
         return Response(data)
 
+    @action(detail=False, methods=['get'], url_path='browse/comparisons')
+    def browse_comparisons(self, request):
+        """
+        Page through all comparisons in a browse sort order.
+
+        Query parameters:
+        - sort (str): Same options as browse (default 'popularity')
+        - limit (int): Comparisons per page (default 50, max 50)
+        - cursor (str): next_cursor from the previous page
+
+        Returns {'results': [...], 'next_cursor': str or null}. Pages are read
+        live with keyset pagination, so paging stays consistent while
+        comparisons are added.
+        """
+        sort = request.query_params.get('sort', 'popularity')
+        if sort not in BROWSE_SORTS:
+            sort = 'popularity'
+
+        try:
+            limit = min(max(int(request.query_params.get('limit', MAX_BROWSE_LIMIT)), 1), MAX_BROWSE_LIMIT)
+            page = DiffService.get_comparisons_page(
+                sort=sort, limit=limit, cursor=request.query_params.get('cursor') or None
+            )
+        except ValueError:
+            return Response(
+                {'error': 'Invalid limit or cursor'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        return Response(page)
+
     @action(detail=False, methods=['get'], url_path='needs-help')
+    @conditional_on_versions(lambda request: section_version_tags('needs_help'), bucket=SECTION_ETAG_BUCKET)
     def needs_help(self, request):
         """
         Get comparisons and diffs that need community help.
@@ -302,47 +418,116 @@ class DiffItemViewSet(viewsets.ModelViewSet):
         Query parameters:
         - limit (int): Number of items per section (default 20, max 50)
 
-        Cached for performance (15-minute cache).
+        Served from the cached needs-help section, refreshed when diffs, votes or comments change.
         """
-        limit = min(int(request.query_params.get('limit', 20)), 50)
-
-        cache_key = f'needs_help_limit_{limit}'
+        limit = min(int(request.query_params.get('limit', 20)), MAX_NEEDS_HELP_LIMIT)
 
-        # Try to get from cache
-        cached_data = cache.get(cache_key)
-        if cached_data is not None:
-            return Response(cached_data)
+        # Section is cached at the maximum limit; smaller limits are prefixes
+        data = get_section('needs_help')
 
-        # Get needs help data
-        data = DiffService.get_needs_help(limit=limit)
-
-        # Cache for 5 minutes (300 seconds)
-        cache.set(cache_key, data, 300)
-
-        return Response(data)
+        return Response({section: items[:limit] for section, items in data.items()})
 
 
 class DiffCommentViewSet(viewsets.ModelViewSet):
     """ViewSet for DiffComment model."""
 
-    queryset = DiffComment.objects.filter(status='LIVE').select_related('user', 'diff_item', 'parent')
+    queryset = DiffComment.objects.filter(status='LIVE').select_related(
+        'user', 'diff_item__work', 'diff_item__screen_work', 'parent'
+    )
     serializer_class = DiffCommentSerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
     filter_backends = [DjangoFilterBackend]
     filterset_fields = ['diff_item']
 
+    def get_queryset(self):
+        """Filter comments by spoiler scope (max_spoiler_scope), as for diffs."""
+        queryset = super().get_queryset()
+        max_level = _max_spoiler_level(self.request)
+        if max_level is not None:
+            queryset = queryset.filter(spoiler_level__lte=max_level)
+        return queryset
+
+    def _thread_data(self, roots, max_depth):
+        """Serialize comments with their loaded replies, each as {...comment, 'replies': [...]}."""
+        comments = DiffService.get_comment_threads(roots, max_depth, _max_spoiler_level(self.request))
+        return serialize_threads(comments, roots, max_depth, self.get_serializer_context())
+
+    def _max_depth(self):
+        """Requested reply levels per thread, raising ValueError if invalid."""
+        max_depth = int(self.request.query_params.get('max_depth', DEFAULT_THREAD_DEPTH))
+        if max_depth < 0:
+            raise ValueError(max_depth)
+        return min(max_depth, MAX_THREAD_DEPTH)
+
+    @action(detail=False, methods=['get'])
+    def threads(self, request):
+        """
+        Get a diff's comment threads in display order, paginated by thread.
+
+        A page's replies load with one indexed path range query (see
+        DiffService.get_comment_threads); reply counts are stored on each
+        comment, so nothing is counted recursively.
+
+        Query parameters:
+        - diff_item (int): Diff ID (required)
+        - max_depth (int): Reply levels to include below each top-level comment
+          (default 5, max 20); replies below are counted in collapsed_reply_count
+        - max_spoiler_scope (str): Leave out comments above this scope, with their replies
+
+        Returns:
+            Paginated top-level comments, each with depth, reply_count,
+            descendant_count (the thread's reply total), collapsed_reply_count
+            and 'replies': the loaded replies in display order, with the same fields
+        """
+        diff_id = request.query_params.get('diff_item', '')
+        try:
+            if not diff_id.isdigit():
+                raise ValueError(diff_id)
+            max_depth = self._max_depth()
+        except ValueError:
+            return Response(
+                {'error': 'diff_item must be a diff ID and max_depth a non-negative integer'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        roots = self.get_queryset().filter(diff_item_id=diff_id, depth=0).order_by('path')
+        page = self.paginate_queryset(roots)
+        if page is None:
+            return Response(self._thread_data(list(roots), max_depth))
+        return self.get_paginated_response(self._thread_data(page, max_depth))
+
+    @action(detail=True, methods=['get'])
+    def thread(self, request, pk=None):
+        """
+        Get a comment with its replies in display order, e.g. to expand collapsed replies.
+
+        Query parameters:
+        - max_depth (int): Reply levels to include below the comment (default 5, max 20)
+        - max_spoiler_scope (str): Leave out replies above this scope, with their replies
+        """
+        comment = self.get_object()
+        try:
+            max_depth = self._max_depth()
+        except ValueError:
+            return Response(
+                {'error': 'max_depth must be a non-negative integer'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        return Response(self._thread_data([comment], max_depth)[0])
+
+    @transaction.atomic
     def perform_create(self, serializer):
-        """Set the user field to the current user and handle notifications."""
-        from users.services import BadgeService, NotificationService
+        """Set the user field to the current user and queue badges and reply notifications."""
+        from users.models import OutboxEventType
+        from users.services import OutboxService
 
         comment = serializer.save(user=self.request.user)
 
-        # Award milestone badges for first comment
-        BadgeService.check_milestone_badges(self.request.user)
-
-        # Notify parent comment author if this is a reply
-        if comment.parent:
-            NotificationService.notify_comment_reply(comment, comment.parent)
+        # Milestone badges and the reply notification are handled asynchronously
+        OutboxService.record(
+            OutboxEventType.COMMENT_CREATED, self.request.user, diff_item=comment.diff_item, comment=comment
+        )
 
 
 class ComparisonVoteViewSet(viewsets.ModelViewSet):
@@ -399,51 +584,115 @@ class ComparisonVoteViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        # Get all votes for this comparison (only from users who confirmed consumption)
-        votes = ComparisonVote.objects.filter(
-            work_id=work_id,
-            screen_work_id=screen_work_id,
-            has_read_book=True,
-            has_watched_adaptation=True
-        )
-
-        total_votes = votes.count()
-
-        # Preference distribution
-        preference_stats = votes.values('preference').annotate(
-            count=Count('id')
-        )
-
-        preference_breakdown = {
-            'BOOK': 0,
-            'SCREEN': 0,
-            'TIE': 0,
-            'DIDNT_FINISH': 0
-        }
-
-        for stat in preference_stats:
-            preference_breakdown[stat['preference']] = stat['count']
+        try:
+            work_id, screen_work_id = int(work_id), int(screen_work_id)
+        except ValueError:
+            return Response(
+                {'error': 'work and screen_work must be integers'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
 
-        # Faithfulness rating stats (exclude DIDNT_FINISH votes)
-        completed_votes = votes.exclude(preference='DIDNT_FINISH')
-        faithfulness_stats = completed_votes.aggregate(
-            avg_rating=Avg('faithfulness_rating'),
-            count=Count('faithfulness_rating')
-        )
+        # Aggregates are shared by every visitor and cached per comparison
+        stats = get_comparison_vote_stats(work_id, screen_work_id)
 
         # Get user's vote if authenticated
         user_vote = None
         if request.user.is_authenticated:
-            user_vote_obj = votes.filter(user=request.user).first()
+            user_vote_obj = ComparisonVote.objects.filter(
+                work_id=work_id,
+                screen_work_id=screen_work_id,
+                user=request.user,
+                has_read_book=True,
+                has_watched_adaptation=True
+            ).first()
             if user_vote_obj:
                 user_vote = ComparisonVoteSerializer(user_vote_obj).data
 
+        return Response({**stats, 'user_vote': user_vote})
+
+    @action(detail=False, methods=['get'], url_path='stats/batch')
+    def get_stats_batch(self, request):
+        """
+        Get aggregated voting statistics for many comparisons, e.g. a browse grid.
+
+        Query parameters:
+        - pairs (str): Comma-separated work_id:screen_work_id pairs, at most MAX_STATS_BATCH_PAIRS
+
+        Returns the stats of each pair, in request order, with the current
+        user's vote on it (one query for all pairs).
+        """
+        try:
+            pairs = [
+                tuple(int(part) for part in pair.split(':'))
+                for pair in request.query_params.get('pairs', '').split(',') if pair
+            ]
+        except ValueError:
+            pairs = None
+        if not pairs or any(len(pair) != 2 for pair in pairs):
+            return Response(
+                {'error': 'pairs parameter is required, as comma-separated work_id:screen_work_id pairs'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if len(pairs) > MAX_STATS_BATCH_PAIRS:
+            return Response(
+                {'error': f'At most {MAX_STATS_BATCH_PAIRS} pairs are allowed'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        stats = DiffService.get_comparison_vote_stats_batch(pairs)
+
+        user_votes = {}
+        if request.user.is_authenticated:
+            votes = ComparisonVote.objects.filter(
+                work_id__in={work_id for work_id, _ in pairs},
+                screen_work_id__in={screen_work_id for _, screen_work_id in pairs},
+                user=request.user,
+                has_read_book=True,
+                has_watched_adaptation=True
+            ).select_related('work', 'screen_work')
+            user_votes = {
+                (vote.work_id, vote.screen_work_id): ComparisonVoteSerializer(vote).data
+                for vote in votes
+            }
+
         return Response({
-            'total_votes': total_votes,
-            'preference_breakdown': preference_breakdown,
-            'faithfulness': {
-                'average': round(faithfulness_stats['avg_rating'], 2) if faithfulness_stats['avg_rating'] else None,
-                'count': faithfulness_stats['count']
-            },
-            'user_vote': user_vote
+            'results': [
+                {
+                    'work': work_id,
+                    'screen_work': screen_work_id,
+                    **stats[(work_id, screen_work_id)],
+                    'user_vote': user_votes.get((work_id, screen_work_id)),
+                }
+                for work_id, screen_work_id in dict.fromkeys(pairs)
+            ]
         })
+
+
+class ComparisonPageView(APIView):
+    """Everything a comparison page shows, in one response (see diffs.comparison_page)."""
+
+    permission_classes = [permissions.AllowAny]
+
+    def get(self, request, work_slug, screen_slug):
+        """
+        Get a comparison page.
+
+        The shared part is cached per spoiler level until the comparison
+        changes; the current user's votes and bookmark take one more query.
+
+        Query parameters:
+        - max_spoiler_scope (str): Leave out diffs and comments above this scope
+
+        Returns:
+            work, screen_work, vote_stats (with the user's vote), bookmark
+            ({is_bookmarked, bookmark_id}) and diffs in default order, each with
+            the user's vote and 'comments': thread_count and the first threads
+        """
+        ids = comparison_page.resolve_comparison(work_slug, screen_slug)
+        if ids is None:
+            return Response({'error': 'Comparison not found'}, status=status.HTTP_404_NOT_FOUND)
+
+        max_level = _max_spoiler_level(request)
+        if max_level is None:
+            max_level = MAX_SPOILER_LEVEL
+        return Response(comparison_page.get_page_for_request(request, *ids, max_level))
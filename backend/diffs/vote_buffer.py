@@ -0,0 +1,261 @@
+"""Write-behind buffering of diff votes in Redis.
+
+With settings.DIFF_VOTE_BUFFERING on, the vote endpoint does not touch
+DiffVote. Each vote or toggle is written to a Redis hash per diff, keyed by
+user ID, holding the user's latest vote ('' for a removed vote), so the last
+write wins. The diff is added to a dirty set. The
+diffs.tasks.flush_vote_buffer task then applies each dirty diff's pending
+votes in one transaction:
+- one INSERT ... ON CONFLICT (diff_item, user) DO UPDATE for new and changed
+  votes, so the unique constraint holds whatever order flushes run in
+- one DELETE for removed votes
+- one UPDATE of the diff's counters
+
+Entries are cleared only once committed, and only if no newer vote replaced
+them meanwhile, so a failed flush loses nothing. Until then the user's own
+pending vote overlays reads (get_pending_votes), and each buffered vote
+bumps the user's pending_votes_tag so their conditional GETs see it; other
+users see the counters catch up at the next flush.
+
+Bulk writes bypass the DiffVote signals, so the flush applies their side
+effects itself, once per diff.
+"""
+import logging
+from typing import Any, Dict, Iterable, List, Optional
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, transaction
+from redis.exceptions import RedisError
+from adaptapedia.cache import _get_redis_client, bump_versions
+from .constants import VOTE_BUFFER_FLUSH_BATCH
+from .models import DiffItem, DiffVote
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = 'vote_buffer'
+REMOVED = ''  # Pending value of a removed vote
+
+# Delete the flushed entries still holding the flushed value
+CLEAR_FLUSHED_SCRIPT = """
+for i = 1, #ARGV, 2 do
+    if redis.call('HGET', KEYS[1], ARGV[i]) == ARGV[i + 1] then
+        redis.call('HDEL', KEYS[1], ARGV[i])
+    end
+end
+"""
+
+
+def _key(*parts: Any) -> str:
+    """Redis key for buffered votes, namespaced like cache keys."""
+    return cache.make_key(':'.join([KEY_PREFIX, *map(str, parts)]))
+
+
+def _decode(value: Any) -> Any:
+    """Decode a Redis reply value."""
+    return value.decode() if isinstance(value, bytes) else value
+
+
+def pending_votes_tag(user_id: int) -> str:
+    """Version tag bumped whenever a user's buffered votes change."""
+    return f"pending_votes:{user_id}"
+
+
+def _client() -> Any:
+    """Redis client if buffering is on, else None."""
+    if not settings.DIFF_VOTE_BUFFERING:
+        return None
+    return _get_redis_client()
+
+
+def is_enabled() -> bool:
+    """Whether votes are buffered."""
+    return _client() is not None
+
+
+def submit(diff_id: int, user_id: int, vote: str) -> Optional[Dict[str, Optional[str]]]:
+    """
+    Buffer a vote, toggling it off if it repeats the user's current vote.
+
+    Args:
+        diff_id: DiffItem ID
+        user_id: Voter's user ID
+        vote: Vote type
+
+    Returns:
+        Dict with the user's 'previous' and new 'vote' (None when removed), or
+        None if the vote was not buffered and must be written directly
+    """
+    client = _client()
+    if client is None:
+        return None
+
+    try:
+        pending = client.hget(_key('pending', diff_id), user_id)
+        if pending is not None:
+            previous = _decode(pending) or None
+        else:
+            previous = DiffVote.objects.filter(diff_item_id=diff_id, user_id=user_id).values_list(
+                'vote', flat=True
+            ).first()
+        new_vote = None if previous == vote else vote
+
+        pipe = client.pipeline(transaction=True)
+        pipe.hset(_key('pending', diff_id), user_id, new_vote or REMOVED)
+        pipe.sadd(_key('dirty'), diff_id)
+        pipe.execute()
+    except RedisError as e:
+        logger.warning(f"Failed to buffer vote on diff {diff_id}, writing it directly: {e}")
+        return None
+
+    try:
+        # The vote is already buffered; a failed bump only delays the voter's ETag until the flush
+        bump_versions(pending_votes_tag(user_id))
+    except Exception as e:
+        logger.warning(f"Failed to bump pending votes version of user {user_id}: {e}")
+
+    return {'previous': previous, 'vote': new_vote}
+
+
+def get_pending_votes(user_id: int, diff_ids: Iterable[int]) -> Dict[int, Optional[str]]:
+    """
+    Get a user's votes not yet flushed.
+
+    Args:
+        user_id: User ID
+        diff_ids: DiffItem IDs to look up
+
+    Returns:
+        Dict mapping diff ID to the pending vote (None for a removed vote),
+        only for diffs with a pending vote
+    """
+    client = _client()
+    diff_ids = list(diff_ids)
+    if client is None or not diff_ids:
+        return {}
+
+    try:
+        pipe = client.pipeline(transaction=False)
+        for diff_id in diff_ids:
+            pipe.hget(_key('pending', diff_id), user_id)
+        values = pipe.execute()
+    except RedisError as e:
+        logger.warning(f"Failed to read pending votes: {e}")
+        return {}
+
+    return {
+        diff_id: _decode(value) or None
+        for diff_id, value in zip(diff_ids, values)
+        if value is not None
+    }
+
+
+def _apply(diff_id: int, pending: Dict[int, Optional[str]]) -> int:
+    """
+    Write a diff's pending votes to Postgres and apply their side effects.
+
+    Returns:
+        Number of votes created, changed or removed
+    """
+    from users.models import User, OutboxEvent, OutboxEventType
+    from users.services import OutboxService
+    from .services import DiffService, ComparisonStatsService
+    from .sections import invalidate_comparison_on_commit, mark_sections_dirty, DIFF_VOTE_SECTIONS
+    from . import sampling
+
+    diff = DiffItem.objects.filter(pk=diff_id).values('work_id', 'screen_work_id', 'status').first()
+    if diff is None:
+        return 0  # Diff deleted since; its votes go with it
+
+    user_ids = set(User.objects.filter(id__in=pending).values_list('id', flat=True))
+    old_votes = dict(
+        DiffVote.objects.select_for_update().filter(diff_item_id=diff_id, user_id__in=user_ids).values_list(
+            'user_id', 'vote'
+        )
+    )
+    changes = {
+        user_id: (old_votes.get(user_id), vote)
+        for user_id, vote in pending.items()
+        if user_id in user_ids and old_votes.get(user_id) != vote
+    }
+    if not changes:
+        return 0
+
+    upserts = [
+        DiffVote(diff_item_id=diff_id, user_id=user_id, vote=new)
+        for user_id, (old, new) in changes.items() if new is not None
+    ]
+    DiffVote.objects.bulk_create(
+        upserts, update_conflicts=True, unique_fields=['diff_item', 'user'], update_fields=['vote']
+    )
+    removed = [user_id for user_id, (old, new) in changes.items() if new is None]
+    if removed:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"DELETE FROM {DiffVote._meta.db_table} WHERE diff_item_id = %s AND user_id = ANY(%s)",
+                [diff_id, removed],
+            )
+
+    DiffService.apply_vote_changes(diff_id, changes.values())
+
+    # What the DiffVote signal handlers and the vote view do for single votes
+    created = sum(1 for old, new in changes.values() if old is None)
+    net_votes = created - len(removed)
+    if diff['status'] == 'LIVE' and (created or removed):
+        if net_votes:
+            ComparisonStatsService.add_diff_votes(diff['work_id'], diff['screen_work_id'], net_votes)
+        sampling.mark_dirty(diff['work_id'], diff['screen_work_id'])
+        if created:
+            ComparisonStatsService.bump_trending(diff['work_id'], diff['screen_work_id'], votes=created)
+    mark_sections_dirty(DIFF_VOTE_SECTIONS)
+    invalidate_comparison_on_commit(diff['work_id'], diff['screen_work_id'])
+
+    OutboxService.record_many([
+        OutboxEvent(
+            event_type=OutboxEventType.DIFF_VOTED, user_id=user_id, diff_item_id=diff_id,
+            payload={'created': old is None},
+        )
+        for user_id, (old, new) in changes.items() if new is not None
+    ])
+    return len(changes)
+
+
+def flush(max_diffs: int = VOTE_BUFFER_FLUSH_BATCH) -> Dict[str, int]:
+    """
+    Write pending votes of up to max_diffs dirty diffs to Postgres.
+
+    Runs even with buffering turned off, so votes buffered before the switch
+    are still written.
+
+    Args:
+        max_diffs: Maximum number of diffs to flush
+
+    Returns:
+        Dict with the number of diffs flushed, votes written and diffs left dirty
+    """
+    client = _get_redis_client()
+    if client is None:
+        return {'diffs': 0, 'votes': 0, 'remaining': 0}
+
+    flushed = written = 0
+    for diff_id in map(int, map(_decode, client.spop(_key('dirty'), max_diffs) or [])):
+        key = _key('pending', diff_id)
+        entries = {int(_decode(user_id)): _decode(vote) for user_id, vote in client.hgetall(key).items()}
+        if not entries:
+            continue
+
+        try:
+            with transaction.atomic():
+                written += _apply(diff_id, {user_id: vote or None for user_id, vote in entries.items()})
+        except Exception as e:
+            logger.warning(f"Failed to flush buffered votes of diff {diff_id}, will retry: {e}", exc_info=True)
+            client.sadd(_key('dirty'), diff_id)
+            continue
+
+        args: List[Any] = []
+        for user_id, vote in entries.items():
+            args += [user_id, vote]
+        # Votes cast during the flush stay, and their writes marked the diff dirty again
+        client.eval(CLEAR_FLUSHED_SCRIPT, 1, key, *args)
+        flushed += 1
+
+    return {'diffs': flushed, 'votes': written, 'remaining': client.scard(_key('dirty'))}
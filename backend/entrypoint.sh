@@ -9,5 +9,8 @@ python manage.py migrate --noinput
 echo "Collecting static files..."
 python manage.py collectstatic --noinput
 
+echo "Warming caches..."
+python manage.py warm_cache || echo "Cache warming failed (non-fatal)"
+
 echo "Starting Gunicorn..."
 exec gunicorn adaptapedia.wsgi:application --bind 0.0.0.0:8000 --workers 4 --timeout 60
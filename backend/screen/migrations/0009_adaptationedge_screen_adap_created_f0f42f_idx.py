@@ -0,0 +1,19 @@
+# Generated by Django 4.2.10 on 2026-10-17 00:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("screen", "0008_screenwork_average_rating_screenwork_ratings_count"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="adaptationedge",
+            index=models.Index(
+                fields=["-created_at", "-id"], name="screen_adap_created_f0f42f_idx"
+            ),
+        ),
+    ]
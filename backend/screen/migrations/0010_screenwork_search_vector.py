@@ -0,0 +1,23 @@
+"""Add a generated, GIN-indexed full-text search column to screen works."""
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    """Add screen_screenwork.search_vector (see works.constants)."""
+
+    dependencies = [
+        ('screen', '0009_adaptationedge_screen_adap_created_f0f42f_idx'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql="""
+                ALTER TABLE screen_screenwork ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (
+                    setweight(to_tsvector('simple', coalesce(title, '')), 'A') ||
+                    setweight(to_tsvector('simple', coalesce(summary, '')), 'C')
+                ) STORED;
+                CREATE INDEX screen_work_search_idx ON screen_screenwork USING GIN (search_vector);
+            """,
+            reverse_sql="ALTER TABLE screen_screenwork DROP COLUMN search_vector;",
+        ),
+    ]
@@ -95,6 +95,7 @@ class AdaptationEdge(models.Model):
         unique_together = [['work', 'screen_work']]
         indexes = [
             models.Index(fields=['work', 'screen_work']),
+            models.Index(fields=['-created_at', '-id']),  # For the newest browse sort
         ]
 
     def __str__(self) -> str:
@@ -9,7 +9,6 @@ django.setup()
 from users.models import User, UserBadge, ReputationEvent, Notification
 from diffs.models import DiffItem, DiffVote
 from users.services import BadgeService, ReputationService, NotificationService
-from django.db.models import Count, Case, When, F
 
 def main():
     print("=" * 60)
@@ -62,21 +61,7 @@ def main():
 
     # 5. Test diff consensus (simulate reaching consensus)
     print(f"\n5️⃣  Testing consensus calculation for diff...")
-    diff_with_votes = DiffItem.objects.filter(pk=diff.pk).annotate(
-        accurate_count=Count(
-            Case(When(votes__vote='ACCURATE', then=1)),
-            distinct=True
-        ),
-        disagree_count=Count(
-            Case(When(votes__vote='DISAGREE', then=1)),
-            distinct=True
-        ),
-        nuance_count=Count(
-            Case(When(votes__vote='NEEDS_NUANCE', then=1)),
-            distinct=True
-        ),
-        total_votes=F('accurate_count') + F('disagree_count') + F('nuance_count'),
-    ).first()
+    diff_with_votes = DiffItem.objects.get(pk=diff.pk)
 
     print(f"   Accurate: {diff_with_votes.accurate_count}")
     print(f"   Disagree: {diff_with_votes.disagree_count}")
@@ -1,7 +1,7 @@
 """Admin configuration for users app."""
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
-from .models import User, Bookmark, UserPreferences
+from .models import User, Bookmark, UserPreferences, OutboxEvent
 
 
 @admin.register(User)
@@ -34,3 +34,14 @@ class UserPreferencesAdmin(admin.ModelAdmin):
     list_display = ['user', 'contribution_interest', 'completed_at']
     list_filter = ['contribution_interest', 'book_vs_screen']
     search_fields = ['user__username']
+
+
+@admin.register(OutboxEvent)
+class OutboxEventAdmin(admin.ModelAdmin):
+    """Admin interface for OutboxEvent model."""
+
+    list_display = ['id', 'event_type', 'user', 'created_at', 'processed_at', 'attempts']
+    list_filter = ['event_type', 'processed_at']
+    search_fields = ['user__username', 'last_error']
+    readonly_fields = ['created_at']
+    raw_id_fields = ['user', 'diff_item', 'comment']
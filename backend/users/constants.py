@@ -1,4 +1,4 @@
-"""Constants for user validation and moderation."""
+"""Constants for user validation, moderation, display and outbox processing."""
 
 # Reserved usernames that cannot be claimed by regular users
 RESERVED_USERNAMES = {
@@ -43,3 +43,18 @@ PROFANITY_BLOCKLIST = {
     # Common leetspeak variations
     'fck', 'sht', 'btch', 'dmn', 'a55',
 }
+
+# Reputation tiers shown next to usernames, highest first: (minimum reputation, tier).
+# Thresholds match the permission unlocks in UserSerializer.get_permissions
+REPUTATION_TIERS = [
+    (500, 'EXPERT'),
+    (100, 'TRUSTED'),
+    (50, 'CONTRIBUTOR'),
+    (0, 'NEWCOMER'),
+]
+
+# Outbox processing (see users.services.OutboxService)
+OUTBOX_BATCH_SIZE = 200  # Events processed per batch
+OUTBOX_MAX_ATTEMPTS = 5  # Failed events are retried this many times, then left for inspection
+OUTBOX_RETENTION_DAYS = 7  # Processed events are pruned after this long
+OUTBOX_DEBOUNCE = 2  # Seconds to collect writes before processing
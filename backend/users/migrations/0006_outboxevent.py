@@ -0,0 +1,85 @@
+# Generated by Django 4.2.10 on 2026-10-17 00:17
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("diffs", "0009_comparisonstats_browse_indexes"),
+        ("users", "0005_update_site_domain"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="OutboxEvent",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "event_type",
+                    models.CharField(
+                        choices=[
+                            ("DIFF_CREATED", "Difference Created"),
+                            ("DIFF_VOTED", "Difference Voted"),
+                            ("COMMENT_CREATED", "Comment Created"),
+                        ],
+                        max_length=30,
+                    ),
+                ),
+                ("payload", models.JSONField(blank=True, default=dict)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("processed_at", models.DateTimeField(blank=True, null=True)),
+                ("attempts", models.SmallIntegerField(default=0)),
+                ("last_error", models.TextField(blank=True)),
+                (
+                    "comment",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        to="diffs.diffcomment",
+                    ),
+                ),
+                (
+                    "diff_item",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        to="diffs.diffitem",
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="outbox_events",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["id"],
+                "indexes": [
+                    models.Index(
+                        condition=models.Q(("processed_at__isnull", True)),
+                        fields=["id"],
+                        name="users_outbox_pending_idx",
+                    ),
+                    models.Index(
+                        fields=["processed_at"], name="users_outbo_process_d99a78_idx"
+                    ),
+                ],
+            },
+        ),
+    ]
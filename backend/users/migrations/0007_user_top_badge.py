@@ -0,0 +1,84 @@
+# Generated by Django 4.2.10 on 2026-10-17 00:54
+
+from django.db import migrations, models
+
+# Frozen copy of BadgeService.BADGE_PRIORITY at the time of this migration
+BADGE_PRIORITY = {
+    "HIGH_ACCURACY": 100,
+    "WELL_SOURCED": 99,
+    "CONSENSUS_BUILDER": 98,
+    "EARLY_ADOPTER": 80,
+    "VOTER_100": 49,
+    "WEEKLY_CONTRIBUTOR": 35,
+    "VOTER_50": 29,
+    "COMMENTER_50": 28,
+    "DIFF_CREATOR_25": 27,
+    "VOTER_10": 14,
+    "COMMENTER_10": 13,
+    "DIFF_CREATOR_5": 12,
+    "FIRST_DIFF": 5,
+    "FIRST_VOTE": 4,
+    "FIRST_COMMENT": 3,
+}
+
+
+def backfill_top_badges(apps, schema_editor):
+    """Store each user's most prestigious badge."""
+    User = apps.get_model("users", "User")
+    UserBadge = apps.get_model("users", "UserBadge")
+
+    top_badges = {}
+    for user_id, badge_type in UserBadge.objects.values_list("user_id", "badge_type"):
+        current = top_badges.get(user_id)
+        if current is None or BADGE_PRIORITY.get(badge_type, 0) > BADGE_PRIORITY.get(current, 0):
+            top_badges[user_id] = badge_type
+
+    User.objects.bulk_update(
+        [User(id=user_id, top_badge=badge_type) for user_id, badge_type in top_badges.items()],
+        ["top_badge"],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0006_outboxevent"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="user",
+            name="top_badge",
+            field=models.CharField(
+                blank=True,
+                choices=[
+                    ("FIRST_VOTE", "First Vote"),
+                    ("FIRST_COMMENT", "First Comment"),
+                    ("FIRST_DIFF", "First Difference"),
+                    ("VOTER_10", "10 Votes"),
+                    ("VOTER_50", "50 Votes"),
+                    ("VOTER_100", "100 Votes"),
+                    ("COMMENTER_10", "10 Comments"),
+                    ("COMMENTER_50", "50 Comments"),
+                    ("DIFF_CREATOR_5", "5 Differences"),
+                    ("DIFF_CREATOR_25", "25 Differences"),
+                    ("WELL_SOURCED", "Well-Sourced"),
+                    ("HIGH_ACCURACY", "High Accuracy"),
+                    ("CONSENSUS_BUILDER", "Consensus Builder"),
+                    ("EDITOR", "Editor"),
+                    ("HELPFUL_COMMENTER", "Helpful Commenter"),
+                    ("EARLY_ADOPTER", "Early Adopter"),
+                    ("GENRE_SPECIALIST_HORROR", "Horror Specialist"),
+                    ("GENRE_SPECIALIST_SCIFI", "Sci-Fi Specialist"),
+                    ("GENRE_SPECIALIST_FANTASY", "Fantasy Specialist"),
+                    ("SERIES_SPECIALIST", "Series Specialist"),
+                    ("ACTIVE_CONTRIBUTOR", "Active Contributor"),
+                    ("WEEKLY_CONTRIBUTOR", "Weekly Contributor"),
+                ],
+                default="",
+                max_length=50,
+            ),
+        ),
+        migrations.RunPython(backfill_top_badges, migrations.RunPython.noop),
+    ]
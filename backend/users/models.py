@@ -1,9 +1,11 @@
 """User models and profiles."""
+from typing import Dict, Optional
 from django.db import models
 from django.contrib.auth.models import AbstractUser
 from django.db.models.functions import Lower
 from django.contrib.postgres.fields import ArrayField
 from django.contrib.postgres.indexes import GinIndex
+from .constants import REPUTATION_TIERS
 
 
 class UserRole(models.TextChoices):
@@ -83,6 +85,14 @@ class NotificationType(models.TextChoices):
     DIFF_VALIDATED = 'DIFF_VALIDATED', 'Difference Validated'
 
 
+class OutboxEventType(models.TextChoices):
+    """Writes whose side effects (badges, reputation, notifications) run asynchronously."""
+
+    DIFF_CREATED = 'DIFF_CREATED', 'Difference Created'
+    DIFF_VOTED = 'DIFF_VOTED', 'Difference Voted'
+    COMMENT_CREATED = 'COMMENT_CREATED', 'Comment Created'
+
+
 class User(AbstractUser):
     """Extended user model."""
 
@@ -90,6 +100,10 @@ class User(AbstractUser):
     reputation_points = models.IntegerField(default=0)
     spoiler_preference = models.CharField(max_length=15, default='NONE')
 
+    # Most prestigious badge (BadgeService.BADGE_PRIORITY), kept in sync by users.signals,
+    # so listings show author flair from the user row alone
+    top_badge = models.CharField(max_length=50, choices=BadgeType.choices, blank=True, default='')
+
     # Onboarding tracking
     onboarding_completed = models.BooleanField(default=False)
     onboarding_started_at = models.DateTimeField(null=True, blank=True)
@@ -124,6 +138,21 @@ class User(AbstractUser):
         """String representation of User."""
         return self.username
 
+    @property
+    def top_badge_data(self) -> Optional[Dict[str, str]]:
+        """Top badge as {'badge_type', 'badge_display'}, None without badges."""
+        if not self.top_badge:
+            return None
+        return {'badge_type': self.top_badge, 'badge_display': self.get_top_badge_display()}
+
+    @property
+    def reputation_tier(self) -> str:
+        """Reputation tier (see REPUTATION_TIERS)."""
+        return next(
+            (tier for minimum, tier in REPUTATION_TIERS if self.reputation_points >= minimum),
+            REPUTATION_TIERS[-1][1],  # Penalties can take reputation below zero
+        )
+
 
 class Bookmark(models.Model):
     """User bookmarks for work/screen work comparisons."""
@@ -233,6 +262,38 @@ class Notification(models.Model):
         return f"Notification for {self.user.username}: {self.title}"
 
 
+class OutboxEvent(models.Model):
+    """Transactional outbox: written with a diff, vote or comment, processed by users.tasks.process_outbox."""
+
+    event_type = models.CharField(max_length=30, choices=OutboxEventType.choices)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='outbox_events')  # Who wrote
+
+    # Related objects (events whose object is gone are skipped)
+    diff_item = models.ForeignKey('diffs.DiffItem', on_delete=models.SET_NULL, null=True, blank=True)
+    comment = models.ForeignKey('diffs.DiffComment', on_delete=models.SET_NULL, null=True, blank=True)
+
+    payload = models.JSONField(default=dict, blank=True)  # Extra data (e.g. whether a vote was new)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    processed_at = models.DateTimeField(null=True, blank=True)
+    attempts = models.SmallIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+
+    class Meta:
+        """Meta options for OutboxEvent model."""
+
+        ordering = ['id']
+        indexes = [
+            models.Index(fields=['id'], condition=models.Q(processed_at__isnull=True), name='users_outbox_pending_idx'),
+            models.Index(fields=['processed_at']),  # For pruning
+        ]
+
+    def __str__(self) -> str:
+        """String representation of OutboxEvent."""
+        state = 'processed' if self.processed_at else 'pending'
+        return f"{self.get_event_type_display()} by {self.user_id} ({state})"
+
+
 class UserPreferences(models.Model):
     """User preferences from onboarding quiz."""
 
@@ -112,6 +112,8 @@ class UserProfileSerializer(serializers.ModelSerializer):
     votes_count = serializers.SerializerMethodField()
     comments_count = serializers.SerializerMethodField()
     reputation_score = serializers.IntegerField(source='reputation_points', read_only=True)
+    top_badge = serializers.ReadOnlyField(source='top_badge_data')
+    reputation_tier = serializers.ReadOnlyField()
 
     class Meta:
         """Meta options for UserProfileSerializer."""
@@ -124,6 +126,8 @@ class UserProfileSerializer(serializers.ModelSerializer):
             'role',
             'reputation_points',
             'reputation_score',
+            'reputation_tier',
+            'top_badge',
             'diffs_count',
             'votes_count',
             'comments_count',
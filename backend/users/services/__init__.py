@@ -1,5 +1,6 @@
 """Services for users app."""
 from .reputation_service import ReputationService, BadgeService, NotificationService
+from .outbox_service import OutboxService
 from .username_service import (
     validate_username,
     check_username_availability,
@@ -10,6 +11,7 @@ __all__ = [
     'ReputationService',
     'BadgeService',
     'NotificationService',
+    'OutboxService',
     'validate_username',
     'check_username_availability',
     'generate_username_suggestions',
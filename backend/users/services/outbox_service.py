@@ -0,0 +1,180 @@
+"""Transactional outbox for the side effects of diff, vote and comment writes.
+
+Views record an OutboxEvent in the same transaction as the write, and the
+users.tasks.process_outbox Celery task applies badges, reputation and
+notifications in batches, so write latency no longer depends on them.
+"""
+import logging
+from datetime import timedelta
+from typing import Any, Dict, List, Optional, Set
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+from ..constants import OUTBOX_BATCH_SIZE, OUTBOX_DEBOUNCE, OUTBOX_MAX_ATTEMPTS, OUTBOX_RETENTION_DAYS
+from ..models import User, OutboxEvent, OutboxEventType
+from .reputation_service import ReputationService, BadgeService, NotificationService
+
+logger = logging.getLogger(__name__)
+
+PROCESS_SCHEDULED_KEY = 'outbox_process_scheduled'
+
+
+class OutboxService:
+    """Service for recording and processing outbox events."""
+
+    @staticmethod
+    def record(
+        event_type: OutboxEventType,
+        user: User,
+        diff_item=None,
+        comment=None,
+        payload: Optional[Dict[str, Any]] = None,
+    ) -> OutboxEvent:
+        """
+        Record a write's side effects to be processed asynchronously.
+
+        Call within the write's transaction; processing is scheduled once it commits.
+
+        Returns:
+            The OutboxEvent created
+        """
+        event = OutboxEvent.objects.create(
+            event_type=event_type,
+            user=user,
+            diff_item=diff_item,
+            comment=comment,
+            payload=payload or {},
+        )
+        transaction.on_commit(OutboxService._schedule_processing)
+        return event
+
+    @staticmethod
+    def record_many(events: List[OutboxEvent]) -> List[OutboxEvent]:
+        """
+        Record several unsaved events with one INSERT (see record).
+
+        Args:
+            events: Unsaved OutboxEvent instances
+
+        Returns:
+            The OutboxEvents created
+        """
+        if not events:
+            return []
+        created = OutboxEvent.objects.bulk_create(events)
+        transaction.on_commit(OutboxService._schedule_processing)
+        return created
+
+    @staticmethod
+    def _schedule_processing() -> None:
+        """Schedule a processing run unless one is already pending."""
+        from ..tasks import process_outbox
+
+        try:
+            if cache.add(PROCESS_SCHEDULED_KEY, 1, OUTBOX_DEBOUNCE * 10):
+                try:
+                    process_outbox.apply_async(countdown=OUTBOX_DEBOUNCE)
+                except Exception:
+                    # Let the next write try again
+                    cache.delete(PROCESS_SCHEDULED_KEY)
+                    raise
+        except Exception as e:
+            # Never fail the write; the periodic run picks the event up
+            logger.warning(f"Failed to schedule outbox processing: {e}")
+
+    @staticmethod
+    def process_pending(batch_size: int = OUTBOX_BATCH_SIZE) -> Dict[str, int]:
+        """
+        Process one batch of pending events, oldest first.
+
+        Rows are locked with SKIP LOCKED, so concurrent workers take disjoint
+        batches. Work shared by several events in the batch (milestone badges
+        per user, consensus per diff) runs once. Each event runs in its own
+        savepoint; a failing event is retried by later batches up to
+        OUTBOX_MAX_ATTEMPTS times.
+
+        Returns:
+            Dict with processed and failed event counts
+        """
+        processed = failed = 0
+        done_users: Set[int] = set()
+        done_diffs: Set[int] = set()
+
+        with transaction.atomic():
+            events = list(
+                OutboxEvent.objects.select_for_update(skip_locked=True, of=('self',)).filter(
+                    processed_at__isnull=True, attempts__lt=OUTBOX_MAX_ATTEMPTS
+                ).select_related(
+                    'user', 'diff_item__created_by', 'diff_item__work', 'diff_item__screen_work',
+                    'comment__user', 'comment__parent__user',
+                ).order_by('id')[:batch_size]
+            )
+
+            for event in events:
+                try:
+                    with transaction.atomic():
+                        OutboxService._process(event, done_users, done_diffs)
+                    event.processed_at = timezone.now()
+                    event.last_error = ''
+                    processed += 1
+                except Exception as e:
+                    logger.warning(f"Outbox event {event.id} failed: {e}", exc_info=True)
+                    event.last_error = str(e)
+                    failed += 1
+                event.attempts += 1
+
+            OutboxEvent.objects.bulk_update(events, ['processed_at', 'attempts', 'last_error'])
+
+        return {'processed': processed, 'failed': failed}
+
+    @staticmethod
+    def _process(event: OutboxEvent, done_users: Set[int], done_diffs: Set[int]) -> None:
+        """Apply one event's side effects, skipping work already done in this batch."""
+        if event.event_type == OutboxEventType.DIFF_VOTED:
+            if event.diff_item is not None and event.diff_item_id not in done_diffs:
+                OutboxService._check_consensus(event.diff_item)
+                done_diffs.add(event.diff_item_id)
+            if not event.payload.get('created'):
+                return  # Changed votes do not count towards milestones
+
+        if event.event_type == OutboxEventType.COMMENT_CREATED:
+            comment = event.comment
+            if comment is not None and comment.parent is not None:
+                NotificationService.notify_comment_reply(comment, comment.parent)
+
+        if event.user_id not in done_users:
+            BadgeService.check_milestone_badges(event.user)
+            done_users.add(event.user_id)
+
+    @staticmethod
+    def _check_consensus(diff_item) -> None:
+        """Award consensus reputation, notification and quality badges for a diff with 10+ votes."""
+        # Counters as of now, which may include votes cast after the event
+        diff_item.refresh_from_db(fields=['accurate_count', 'nuance_count', 'disagree_count', 'total_votes'])
+        if diff_item.total_votes < 10:
+            return
+
+        consensus_event_type = ReputationService.calculate_diff_consensus_rep(diff_item)
+        if not consensus_event_type:
+            return
+
+        ReputationService.award_reputation(
+            user=diff_item.created_by,
+            event_type=consensus_event_type,
+            description=f"Diff reached consensus: {diff_item.claim}",
+            diff_item=diff_item
+        )
+        NotificationService.notify_diff_consensus(diff_item, diff_item.created_by)
+        BadgeService.check_quality_badges(diff_item.created_by)
+
+    @staticmethod
+    def prune(days: int = OUTBOX_RETENTION_DAYS) -> int:
+        """
+        Delete events processed more than the given number of days ago.
+
+        Returns:
+            Number of events deleted
+        """
+        cutoff = timezone.now() - timedelta(days=days)
+        deleted, _ = OutboxEvent.objects.filter(processed_at__lt=cutoff).delete()
+        return deleted
@@ -1,6 +1,7 @@
 """Service for generating personalized comparison recommendations."""
 from typing import List, Dict, Any, Optional
-from django.db.models import Count, Q, F
+from django.db.models import Q, F
+from django.db.models.functions import Coalesce
 from ..models import User, UserPreferences
 
 
@@ -34,9 +35,9 @@ class RecommendationService:
         # Get adaptation edges with related work/screen data
         base_edges = AdaptationEdge.objects.select_related('work', 'screen_work').all()
 
-        # Annotate with diff count for this specific pairing
+        # Annotate with diff count for this specific pairing (materialized in ComparisonStats)
         base_edges = base_edges.annotate(
-            diff_count=Count('work__diffs', filter=Q(work__diffs__screen_work=F('screen_work')))
+            diff_count=Coalesce(F('stats__diff_count'), 0)
         )
 
         # Filter by user's preferred genres if they exist
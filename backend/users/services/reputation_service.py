@@ -231,6 +231,84 @@ class BadgeService:
         ],
     }
 
+    # Badge priority for display next to usernames (higher = more prestigious)
+    BADGE_PRIORITY = {
+        # Quality badges (highest priority)
+        BadgeType.HIGH_ACCURACY: 100,
+        BadgeType.WELL_SOURCED: 99,
+        BadgeType.CONSENSUS_BUILDER: 98,
+        # High milestone badges
+        BadgeType.VOTER_100: 49,
+        # Medium milestone badges
+        BadgeType.VOTER_50: 29,
+        BadgeType.COMMENTER_50: 28,
+        BadgeType.DIFF_CREATOR_25: 27,
+        # Low milestone badges
+        BadgeType.VOTER_10: 14,
+        BadgeType.COMMENTER_10: 13,
+        BadgeType.DIFF_CREATOR_5: 12,
+        # Special badges
+        BadgeType.EARLY_ADOPTER: 80,
+        BadgeType.WEEKLY_CONTRIBUTOR: 35,
+        # First badges (lowest priority)
+        BadgeType.FIRST_DIFF: 5,
+        BadgeType.FIRST_VOTE: 4,
+        BadgeType.FIRST_COMMENT: 3,
+    }
+
+    @staticmethod
+    def get_top_badges(user_ids: List[int]) -> Dict[int, str]:
+        """
+        Compute each user's most prestigious badge from their badges, in a single query.
+
+        Listings read the stored User.top_badge instead.
+
+        Args:
+            user_ids: User IDs
+
+        Returns:
+            Dict mapping user ID to badge type; users without badges are left out
+        """
+        top_badges = {}
+        for user_id, badge_type in UserBadge.objects.filter(user_id__in=user_ids).values_list('user_id', 'badge_type'):
+            current = top_badges.get(user_id)
+            priority = BadgeService.BADGE_PRIORITY.get(badge_type, 0)
+            if current is None or priority > BadgeService.BADGE_PRIORITY.get(current, 0):
+                top_badges[user_id] = badge_type
+        return top_badges
+
+    @staticmethod
+    def raise_top_badge(user_id: int, badge_type: str) -> bool:
+        """
+        Make a newly earned badge the user's top badge if it outranks the current one.
+
+        One conditional UPDATE, so concurrent awards keep the highest badge.
+
+        Args:
+            user_id: User ID
+            badge_type: Badge just earned
+
+        Returns:
+            Whether the top badge changed
+        """
+        priority = BadgeService.BADGE_PRIORITY.get(badge_type, 0)
+        outranked = [other for other, rank in BadgeService.BADGE_PRIORITY.items() if rank < priority]
+        return bool(
+            User.objects.filter(Q(top_badge='') | Q(top_badge__in=outranked), pk=user_id).update(top_badge=badge_type)
+        )
+
+    @staticmethod
+    def refresh_top_badges(user_ids: List[int]) -> None:
+        """
+        Recompute users' stored top badges, e.g. after a badge is revoked.
+
+        Args:
+            user_ids: User IDs
+        """
+        top_badges = BadgeService.get_top_badges(user_ids)
+        for user_id in user_ids:
+            User.objects.filter(pk=user_id).update(top_badge=top_badges.get(user_id, ''))
+
     @staticmethod
     @transaction.atomic
     def award_badge(
@@ -241,6 +319,8 @@ class BadgeService:
         """
         Award a badge to a user.
 
+        The user's stored top badge is raised by the UserBadge signal (see raise_top_badge).
+
         Returns the UserBadge if created (new badge), or None if already earned.
         """
         # Check if user already has this badge
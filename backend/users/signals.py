@@ -1,7 +1,9 @@
 """Signal handlers for user-related events."""
+from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
 from allauth.socialaccount.signals import pre_social_login
 from django.utils import timezone
+from users.models import UserBadge
 from users.username_service import generate_temp_username
 
 
@@ -37,3 +39,22 @@ def populate_temp_username(sender, request, sociallogin, **kwargs):
     user.onboarding_completed = False
     user.onboarding_step = 1  # Username selection required
     user.onboarding_started_at = timezone.now()
+
+
+@receiver(post_save, sender=UserBadge)
+def badge_awarded(sender, instance, created, **kwargs):
+    """Raise the user's stored top badge if the new badge outranks it."""
+    from users.services import BadgeService
+
+    if created and BadgeService.raise_top_badge(instance.user_id, instance.badge_type):
+        # Keep an already-loaded user (e.g. the one the badge was awarded to) in step
+        if UserBadge.user.is_cached(instance):
+            instance.user.top_badge = instance.badge_type
+
+
+@receiver(post_delete, sender=UserBadge)
+def badge_revoked(sender, instance, **kwargs):
+    """Recompute the user's stored top badge."""
+    from users.services import BadgeService
+
+    BadgeService.refresh_top_badges([instance.user_id])
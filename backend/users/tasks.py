@@ -0,0 +1,54 @@
+"""Celery tasks for the users app."""
+import logging
+import time
+from typing import Dict, Any
+from celery import shared_task
+from django.core.cache import cache
+from .constants import OUTBOX_BATCH_SIZE
+from .services.outbox_service import OutboxService, PROCESS_SCHEDULED_KEY
+
+logger = logging.getLogger(__name__)
+
+MAX_BATCHES_PER_RUN = 50  # Leave the rest to the next run so one run cannot hog a worker
+
+
+@shared_task(ignore_result=True)
+def process_outbox() -> Dict[str, Any]:
+    """
+    Apply badges, reputation and notifications for pending outbox events.
+
+    Scheduled shortly after writes (debounced) and every minute as a safety net.
+
+    Returns:
+        dict: Processed and failed event counts and time taken
+    """
+    # Clear the debounce flag first so writes from now on schedule another run
+    cache.delete(PROCESS_SCHEDULED_KEY)
+
+    start = time.monotonic()
+    processed = failed = 0
+    for _ in range(MAX_BATCHES_PER_RUN):
+        result = OutboxService.process_pending(OUTBOX_BATCH_SIZE)
+        processed += result['processed']
+        failed += result['failed']
+        if result['processed'] + result['failed'] < OUTBOX_BATCH_SIZE:
+            break
+
+    elapsed = round(time.monotonic() - start, 3)
+    if processed or failed:
+        logger.info(f"Processed {processed} outbox events in {elapsed}s ({failed} failed)")
+
+    return {'processed': processed, 'failed': failed, 'seconds': elapsed}
+
+
+@shared_task(ignore_result=True)
+def prune_outbox() -> Dict[str, Any]:
+    """
+    Delete old processed outbox events.
+
+    Returns:
+        dict: Number of events deleted
+    """
+    deleted = OutboxService.prune()
+    logger.info(f"Pruned {deleted} processed outbox events")
+    return {'deleted': deleted}
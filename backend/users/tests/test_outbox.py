@@ -0,0 +1,130 @@
+"""Tests for the side-effect outbox."""
+from rest_framework.test import APITestCase
+from users.models import User
+from works.models import Work
+from screen.models import ScreenWork
+
+
+class OutboxTestCase(APITestCase):
+    """Test cases for the side-effect outbox."""
+
+    def setUp(self):
+        """Set up test data."""
+        from diffs.models import DiffItem, DiffCategory, DiffStatus
+        from screen.models import ScreenWorkType
+
+        self.user = User.objects.create_user(username='outboxuser', password='pass')
+        self.work = Work.objects.create(title='Book', slug='book')
+        self.screen = ScreenWork.objects.create(type=ScreenWorkType.MOVIE, title='Movie', slug='movie')
+        self.diff = DiffItem.objects.create(
+            work=self.work,
+            screen_work=self.screen,
+            category=DiffCategory.PLOT,
+            claim='Test diff',
+            status=DiffStatus.LIVE,
+            created_by=self.user
+        )
+
+    def test_writes_record_events_without_inline_side_effects(self):
+        """Test that diff, vote and comment writes record events and defer badges."""
+        from users.models import OutboxEvent, OutboxEventType, UserBadge
+
+        self.client.force_authenticate(user=self.user)
+        with self.captureOnCommitCallbacks(execute=False):
+            self.client.post(f'/api/diffs/items/{self.diff.id}/vote/', {'vote': 'ACCURATE'})
+            self.client.post('/api/diffs/comments/', {'diff_item': self.diff.id, 'body': 'Nice'})
+
+        self.assertEqual(
+            list(OutboxEvent.objects.values_list('event_type', flat=True)),
+            [OutboxEventType.DIFF_VOTED, OutboxEventType.COMMENT_CREATED]
+        )
+        self.assertEqual(OutboxEvent.objects.first().payload, {'created': True})
+        self.assertFalse(UserBadge.objects.filter(user=self.user).exists())
+
+    def test_process_pending_awards_badges(self):
+        """Test that processing the outbox awards milestone badges."""
+        from users.models import OutboxEvent, UserBadge, BadgeType
+        from users.services import OutboxService
+
+        self.client.force_authenticate(user=self.user)
+        with self.captureOnCommitCallbacks(execute=False):
+            self.client.post(f'/api/diffs/items/{self.diff.id}/vote/', {'vote': 'ACCURATE'})
+            self.client.post('/api/diffs/comments/', {'diff_item': self.diff.id, 'body': 'Nice'})
+
+        result = OutboxService.process_pending()
+
+        self.assertEqual(result, {'processed': 2, 'failed': 0})
+        self.assertFalse(OutboxEvent.objects.filter(processed_at__isnull=True).exists())
+        badges = set(UserBadge.objects.filter(user=self.user).values_list('badge_type', flat=True))
+        self.assertIn(BadgeType.FIRST_VOTE, badges)
+        self.assertIn(BadgeType.FIRST_COMMENT, badges)
+
+    def test_reply_notification(self):
+        """Test that processing a reply notifies the parent comment's author."""
+        from diffs.models import DiffComment
+        from users.models import Notification, NotificationType
+        from users.services import OutboxService
+
+        parent = DiffComment.objects.create(diff_item=self.diff, user=self.user, body='Parent')
+        replier = User.objects.create_user(username='replier', password='pass')
+        self.client.force_authenticate(user=replier)
+        with self.captureOnCommitCallbacks(execute=False):
+            self.client.post('/api/diffs/comments/', {'diff_item': self.diff.id, 'parent': parent.id, 'body': 'Reply'})
+
+        OutboxService.process_pending()
+
+        self.assertTrue(Notification.objects.filter(
+            user=self.user, notification_type=NotificationType.COMMENT_REPLY
+        ).exists())
+
+    def test_consensus_checked_once_per_batch(self):
+        """Test that a diff's consensus is awarded once however many votes a batch holds."""
+        from diffs.models import DiffVote
+        from users.models import OutboxEvent, OutboxEventType, ReputationEvent
+        from users.services import OutboxService
+
+        with self.captureOnCommitCallbacks(execute=False):
+            for i in range(12):
+                voter = User.objects.create_user(username=f'voter{i}', password='pass')
+                DiffVote.objects.create(diff_item=self.diff, user=voter, vote='ACCURATE')
+                OutboxService.record(OutboxEventType.DIFF_VOTED, voter, diff_item=self.diff, payload={'created': True})
+
+        OutboxService.process_pending()
+
+        self.assertEqual(ReputationEvent.objects.filter(user=self.user, diff_item=self.diff).count(), 1)
+        self.assertEqual(OutboxEvent.objects.filter(processed_at__isnull=False).count(), 12)
+
+    def test_failed_event_is_retried(self):
+        """Test that a failing event stays pending with its error recorded."""
+        from unittest.mock import patch
+        from users.models import OutboxEvent, OutboxEventType
+        from users.services import OutboxService, BadgeService
+
+        with self.captureOnCommitCallbacks(execute=False):
+            OutboxService.record(OutboxEventType.DIFF_CREATED, self.user, diff_item=self.diff)
+
+        with patch.object(BadgeService, 'check_milestone_badges', side_effect=RuntimeError('boom')):
+            result = OutboxService.process_pending()
+
+        self.assertEqual(result, {'processed': 0, 'failed': 1})
+        event = OutboxEvent.objects.get()
+        self.assertIsNone(event.processed_at)
+        self.assertEqual(event.attempts, 1)
+        self.assertEqual(event.last_error, 'boom')
+
+        self.assertEqual(OutboxService.process_pending(), {'processed': 1, 'failed': 0})
+
+    def test_prune(self):
+        """Test that pruning deletes only old processed events."""
+        from datetime import timedelta
+        from django.utils import timezone
+        from users.models import OutboxEvent, OutboxEventType
+        from users.services import OutboxService
+
+        with self.captureOnCommitCallbacks(execute=False):
+            old = OutboxService.record(OutboxEventType.DIFF_CREATED, self.user, diff_item=self.diff)
+            OutboxService.record(OutboxEventType.DIFF_CREATED, self.user, diff_item=self.diff)
+        OutboxEvent.objects.filter(id=old.id).update(processed_at=timezone.now() - timedelta(days=30))
+
+        self.assertEqual(OutboxService.prune(), 1)
+        self.assertEqual(OutboxEvent.objects.count(), 1)
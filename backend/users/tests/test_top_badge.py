@@ -0,0 +1,80 @@
+"""Tests for the stored top badge and reputation tier."""
+from rest_framework.test import APITestCase
+from users.models import User, UserBadge, BadgeType
+from users.services import BadgeService
+from works.models import Work
+from screen.models import ScreenWork
+
+
+class TopBadgeTestCase(APITestCase):
+    """Test cases for the top badge and reputation tier stored for author flair."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.user = User.objects.create_user(username='flairuser', password='pass')
+
+    def top_badge(self):
+        """The user's stored top badge."""
+        self.user.refresh_from_db(fields=['top_badge'])
+        return self.user.top_badge
+
+    def test_award_raises_top_badge(self):
+        """Test that only a badge outranking the current one becomes the top badge."""
+        self.assertEqual(self.user.top_badge_data, None)
+
+        BadgeService.award_badge(self.user, BadgeType.VOTER_10)
+        self.assertEqual(self.user.top_badge, BadgeType.VOTER_10)
+        self.assertEqual(self.top_badge(), BadgeType.VOTER_10)
+
+        BadgeService.award_badge(self.user, BadgeType.FIRST_VOTE)
+        self.assertEqual(self.top_badge(), BadgeType.VOTER_10)
+
+        BadgeService.award_badge(self.user, BadgeType.HIGH_ACCURACY)
+        self.assertEqual(
+            self.user.top_badge_data,
+            {'badge_type': BadgeType.HIGH_ACCURACY, 'badge_display': 'High Accuracy'},
+        )
+
+    def test_revoked_badge_recomputes_top_badge(self):
+        """Test that deleting the top badge falls back to the next best one."""
+        BadgeService.award_badge(self.user, BadgeType.FIRST_VOTE)
+        BadgeService.award_badge(self.user, BadgeType.VOTER_50)
+
+        UserBadge.objects.get(user=self.user, badge_type=BadgeType.VOTER_50).delete()
+        self.assertEqual(self.top_badge(), BadgeType.FIRST_VOTE)
+
+        UserBadge.objects.filter(user=self.user).delete()
+        self.assertEqual(self.top_badge(), '')
+
+    def test_reputation_tier(self):
+        """Test that tiers follow the permission unlock thresholds."""
+        for points, tier in [(-5, 'NEWCOMER'), (0, 'NEWCOMER'), (50, 'CONTRIBUTOR'), (100, 'TRUSTED'), (999, 'EXPERT')]:
+            self.user.reputation_points = points
+            self.assertEqual(self.user.reputation_tier, tier)
+
+    def test_listings_render_flair_without_badge_queries(self):
+        """Test that comment and diff listings read author flair from the user row."""
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        from diffs.models import DiffItem, DiffComment, DiffCategory
+        from screen.models import ScreenWorkType
+
+        work = Work.objects.create(title='Flair Book', slug='flair-book')
+        screen = ScreenWork.objects.create(type=ScreenWorkType.MOVIE, title='Flair Movie', slug='flair-movie')
+        diff = DiffItem.objects.create(
+            work=work, screen_work=screen, category=DiffCategory.PLOT, claim='Flair diff', created_by=self.user
+        )
+        DiffComment.objects.create(diff_item=diff, user=self.user, body='Flair comment')
+        BadgeService.award_badge(self.user, BadgeType.EARLY_ADOPTER)
+        User.objects.filter(pk=self.user.pk).update(reputation_points=120)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/diffs/comments/', {'diff_item': diff.id})
+        comment = response.data['results'][0]
+        self.assertEqual(comment['top_badge']['badge_type'], BadgeType.EARLY_ADOPTER)
+        self.assertEqual(comment['reputation_tier'], 'TRUSTED')
+        self.assertFalse(any('users_userbadge' in query['sql'] for query in queries))
+
+        response = self.client.get('/api/diffs/items/', {'category': DiffCategory.PLOT})
+        self.assertEqual(response.data['results'][0]['created_by_top_badge']['badge_type'], BadgeType.EARLY_ADOPTER)
+        self.assertEqual(response.data['results'][0]['created_by_reputation_tier'], 'TRUSTED')
@@ -5,7 +5,7 @@ from rest_framework.pagination import PageNumberPagination
 from rest_framework.throttling import UserRateThrottle
 from rest_framework_simplejwt.tokens import RefreshToken, TokenError
 from django.contrib.auth import authenticate
-from django.db import models, IntegrityError
+from django.db import IntegrityError
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
 from .models import User, Bookmark, Notification, UserPreferences
@@ -68,9 +68,7 @@ class UserViewSet(viewsets.ReadOnlyModelViewSet):
         ordering = request.query_params.get('ordering', 'newest')
         if ordering == 'most_votes':
             # Order by total accurate votes (primary indicator of quality)
-            queryset = queryset.annotate(
-                total_votes=models.Count('votes', filter=models.Q(votes__vote='ACCURATE'))
-            ).order_by('-total_votes', '-created_at')
+            queryset = queryset.order_by('-accurate_count', '-created_at')
         else:  # newest
             queryset = queryset.order_by('-created_at')
 
@@ -7,3 +7,7 @@ class WorksConfig(AppConfig):
 
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'works'
+
+    def ready(self):
+        """Import signal handlers when app is ready."""
+        import works.signals  # noqa: F401
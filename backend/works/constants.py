@@ -0,0 +1,9 @@
+"""Constants for book and screen work search."""
+
+# Full-text search (see SearchService). works_work.search_vector and
+# screen_screenwork.search_vector are generated, GIN-indexed tsvector columns
+# added by migrations, not model fields: title weighted A, author B, summary C.
+SEARCH_CONFIG = 'simple'  # No stemming or stop words, so titles like "It" stay searchable
+SEARCH_CANDIDATES = 200  # Best ts_rank_cd matches re-ranked by the title/author cascade
+SEARCH_MIN_RESULTS = 3  # With fewer full-text matches, fall back to trigram similarity
+SEARCH_TEXT_RANK_WEIGHT = 20  # Points for a ts_rank_cd of 1 (normalized to 0-1)
@@ -0,0 +1,24 @@
+"""Add a generated, GIN-indexed full-text search column to works."""
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    """Add works_work.search_vector (see works.constants)."""
+
+    dependencies = [
+        ('works', '0005_work_genres_populate_from_tmdb'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql="""
+                ALTER TABLE works_work ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (
+                    setweight(to_tsvector('simple', coalesce(title, '')), 'A') ||
+                    setweight(to_tsvector('simple', coalesce(author, '')), 'B') ||
+                    setweight(to_tsvector('simple', coalesce(summary, '')), 'C')
+                ) STORED;
+                CREATE INDEX works_work_search_idx ON works_work USING GIN (search_vector);
+            """,
+            reverse_sql="ALTER TABLE works_work DROP COLUMN search_vector;",
+        ),
+    ]
@@ -1,7 +1,11 @@
 """Business logic services for works app."""
 import re
 from typing import Optional, List, Dict, Any
-from django.db.models import QuerySet, Count, Q, F, FloatField, ExpressionWrapper, Prefetch
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVectorField
+from django.db.models import QuerySet, Count, Q, F, FloatField, ExpressionWrapper, Prefetch, Value
+from django.db.models.expressions import RawSQL
+from adaptapedia.cache import stale_while_revalidate, CATALOG_TAG
+from .constants import SEARCH_CANDIDATES, SEARCH_CONFIG, SEARCH_MIN_RESULTS, SEARCH_TEXT_RANK_WEIGHT
 from .models import Work
 from screen.models import ScreenWork, AdaptationEdge
 
@@ -28,6 +32,7 @@ class WorkService:
         return work, created
 
     @staticmethod
+    @stale_while_revalidate('works_catalog', tags=[CATALOG_TAG])
     def get_catalog(
         sort_by: str = 'title',
         order: str = 'asc',
@@ -39,6 +44,9 @@ class WorkService:
         """
         Get books with their adaptations for catalog page with letter-based pagination.
 
+        Results are cached with stale-while-revalidate (see CACHE_SWR_TIMEOUTS)
+        and invalidated when works, screen works or adaptations change.
+
         Args:
             sort_by: 'title' (default), 'year', or 'adaptations'
             order: 'asc' (default) or 'desc'
@@ -355,13 +363,66 @@ class SearchService:
 
         return screen_works
 
+    @staticmethod
+    def _text_query(query: str) -> Optional[SearchQuery]:
+        """
+        Full-text query matching every word of a search, the last one as a prefix.
+
+        Args:
+            query: Search query string
+
+        Returns:
+            SearchQuery, or None if the query has no words
+        """
+        words = re.findall(r'[^\W_]+', query.lower())
+        if not words:
+            return None
+        return SearchQuery(' & '.join(words[:-1] + [f'{words[-1]}:*']), search_type='raw', config=SEARCH_CONFIG)
+
+    @staticmethod
+    def _search_vector(model) -> RawSQL:
+        """A model's generated search_vector column (not a model field, see works.constants)."""
+        return RawSQL(f'"{model._meta.db_table}"."search_vector"', [], output_field=SearchVectorField())
+
+    @staticmethod
+    def _text_rank(model, text_query: SearchQuery) -> SearchRank:
+        """ts_rank_cd of a row's search_vector, normalized to 0-1."""
+        return SearchRank(
+            SearchService._search_vector(model), text_query, cover_density=True, normalization=Value(32)
+        )
+
+    @staticmethod
+    def _candidate_ids(queryset: QuerySet, text_query: Optional[SearchQuery]) -> List[int]:
+        """
+        IDs of the best full-text matches, using the GIN index on search_vector.
+
+        Args:
+            queryset: Works or screen works to search
+            text_query: See _text_query
+
+        Returns:
+            Up to SEARCH_CANDIDATES IDs, best ts_rank_cd first
+        """
+        if text_query is None:
+            return []
+        model = queryset.model
+        return list(
+            queryset.annotate(
+                search=SearchService._search_vector(model),
+                text_rank=SearchService._text_rank(model, text_query),
+            ).filter(search=text_query).order_by('-text_rank', 'pk').values_list('pk', flat=True)[:SEARCH_CANDIDATES]
+        )
+
     @staticmethod
     def search_works_with_adaptations(query: str, limit: int = 20) -> tuple[QuerySet, int]:
         """
         Search for works with their ranked adaptations.
 
         Returns tuple of (Work queryset with ranked_adaptations, total_count).
-        Uses intelligent ranking with exact match, starts-with, whole-word, and fuzzy matching.
+        Full-text matches on title, author and summary are found through the
+        search_vector GIN index; the best SEARCH_CANDIDATES of them are ranked
+        with exact match, starts-with and whole-word checks, text rank and
+        popularity. Falls back to fuzzy matching for typos.
 
         Ranking priority:
         1. Exact title match (100 pts)
@@ -370,50 +431,56 @@ class SearchService:
         4. Title contains query (30 pts)
         5. Author matches (60% of title scores: 60, 42, 30, 18 pts)
         6. Summary contains (10 pts)
-        7. Popularity boost from adaptation count (+2 pts per adaptation)
+        7. ts_rank_cd (up to SEARCH_TEXT_RANK_WEIGHT pts)
+        8. Popularity boost from adaptation count (+2 pts per adaptation)
         """
         from django.contrib.postgres.search import TrigramSimilarity
-        from django.db.models import Case, When, IntegerField, Value, Max
+        from django.db.models import Case, When, IntegerField, Max
 
         # Escape special regex characters in query
         escaped_query = re.escape(query)
 
-        # Search with improved ranking
-        search_results = Work.objects.filter(
-            Q(title__icontains=query) | Q(author__icontains=query) | Q(summary__icontains=query)
-        ).annotate(
-            # Count adaptations for popularity boost
-            adaptation_count=Count('adaptations', distinct=True),
-            # Hierarchical relevance ranking
-            relevance_rank=Case(
-                # Title matches (highest priority)
-                When(title__iexact=query, then=Value(100)),  # Exact: "It" = "It"
-                When(title__istartswith=query + ' ', then=Value(70)),  # Starts: "It Ends with Us"
-                When(title__iregex=rf'\b{escaped_query}\b', then=Value(50)),  # Whole word: "The It Crowd"
-                When(title__icontains=query, then=Value(30)),  # Contains: "Spitfire Grill"
-
-                # Author matches (60% of title scores)
-                When(author__iexact=query, then=Value(60)),
-                When(author__istartswith=query + ' ', then=Value(42)),
-                When(author__iregex=rf'\b{escaped_query}\b', then=Value(30)),
-                When(author__icontains=query, then=Value(18)),
-
-                # Summary match (lowest priority)
-                When(summary__icontains=query, then=Value(10)),
-
-                default=Value(0),
-                output_field=IntegerField()
-            ),
-            # Final score = relevance + popularity boost
-            final_score=ExpressionWrapper(
-                F('relevance_rank') + (F('adaptation_count') * 2),
-                output_field=IntegerField()
-            )
-        )
+        text_query = SearchService._text_query(query)
+        candidate_ids = SearchService._candidate_ids(Work.objects.all(), text_query)
+
+        # If we have good matches, rank those
+        if len(candidate_ids) >= SEARCH_MIN_RESULTS:
+            total_count = len(candidate_ids)
+            if total_count == SEARCH_CANDIDATES:
+                total_count = Work.objects.annotate(
+                    search=SearchService._search_vector(Work)
+                ).filter(search=text_query).count()
 
-        # If we have good matches, return those
-        if search_results.count() >= 3:
-            total_count = search_results.count()
+            search_results = Work.objects.filter(pk__in=candidate_ids).annotate(
+                # Count adaptations for popularity boost
+                adaptation_count=Count('adaptations', distinct=True),
+                text_rank=SearchService._text_rank(Work, text_query),
+                # Hierarchical relevance ranking, only over the candidates
+                relevance_rank=Case(
+                    # Title matches (highest priority)
+                    When(title__iexact=query, then=Value(100)),  # Exact: "It" = "It"
+                    When(title__istartswith=query + ' ', then=Value(70)),  # Starts: "It Ends with Us"
+                    When(title__iregex=rf'\b{escaped_query}\b', then=Value(50)),  # Whole word: "The It Crowd"
+                    When(title__icontains=query, then=Value(30)),  # Contains: "Spitfire Grill"
+
+                    # Author matches (60% of title scores)
+                    When(author__iexact=query, then=Value(60)),
+                    When(author__istartswith=query + ' ', then=Value(42)),
+                    When(author__iregex=rf'\b{escaped_query}\b', then=Value(30)),
+                    When(author__icontains=query, then=Value(18)),
+
+                    # Summary match (lowest priority)
+                    When(summary__icontains=query, then=Value(10)),
+
+                    default=Value(0),
+                    output_field=IntegerField()
+                ),
+                # Final score = relevance + text rank + popularity boost
+                final_score=ExpressionWrapper(
+                    F('relevance_rank') + (F('text_rank') * SEARCH_TEXT_RANK_WEIGHT) + (F('adaptation_count') * 2),
+                    output_field=FloatField()
+                )
+            )
             works = search_results.order_by('-final_score', '-created_at')[:limit]
         else:
             # Use fuzzy matching with trigrams for typo tolerance
@@ -453,7 +520,10 @@ class SearchService:
         Search for screen works directly (for screen-first searches).
 
         If year is provided, filter by year.
-        Uses intelligent ranking with exact match, starts-with, whole-word, and fuzzy matching.
+        Full-text matches on title and summary are found through the
+        search_vector GIN index; the best SEARCH_CANDIDATES of them are ranked
+        with exact match, starts-with and whole-word checks, text rank and
+        popularity. Falls back to fuzzy matching for typos.
 
         Ranking priority:
         1. Exact title match (100 pts)
@@ -461,44 +531,46 @@ class SearchService:
         3. Whole word in title (50 pts)
         4. Title contains query (30 pts)
         5. Summary contains (10 pts)
-        6. TMDb popularity boost
+        6. ts_rank_cd (up to SEARCH_TEXT_RANK_WEIGHT pts)
+        7. TMDb popularity boost
         """
         from django.contrib.postgres.search import TrigramSimilarity
-        from django.db.models import Case, When, IntegerField, Value
+        from django.db.models import Case, When, IntegerField
 
         # Escape special regex characters in query
         escaped_query = re.escape(query)
 
-        # Build filters
-        filters = Q(title__icontains=query) | Q(summary__icontains=query)
-
+        screen_works = ScreenWork.objects.all()
         if year:
-            filters &= Q(year=year)
-
-        # Search with improved ranking
-        search_results = ScreenWork.objects.filter(filters).annotate(
-            relevance_rank=Case(
-                # Title matches (highest priority)
-                When(title__iexact=query, then=Value(100)),
-                When(title__istartswith=query + ' ', then=Value(70)),
-                When(title__iregex=rf'\b{escaped_query}\b', then=Value(50)),
-                When(title__icontains=query, then=Value(30)),
-
-                # Summary match
-                When(summary__icontains=query, then=Value(10)),
-
-                default=Value(0),
-                output_field=IntegerField()
-            ),
-            # Final score = relevance + (tmdb_popularity / 10) for slight boost
-            final_score=ExpressionWrapper(
-                F('relevance_rank') + (F('tmdb_popularity') / 10.0),
-                output_field=FloatField()
-            )
-        )
+            screen_works = screen_works.filter(year=year)
+
+        text_query = SearchService._text_query(query)
+        candidate_ids = SearchService._candidate_ids(screen_works, text_query)
+
+        # If we have good matches, rank those
+        if len(candidate_ids) >= SEARCH_MIN_RESULTS:
+            search_results = ScreenWork.objects.filter(pk__in=candidate_ids).annotate(
+                text_rank=SearchService._text_rank(ScreenWork, text_query),
+                # Hierarchical relevance ranking, only over the candidates
+                relevance_rank=Case(
+                    # Title matches (highest priority)
+                    When(title__iexact=query, then=Value(100)),
+                    When(title__istartswith=query + ' ', then=Value(70)),
+                    When(title__iregex=rf'\b{escaped_query}\b', then=Value(50)),
+                    When(title__icontains=query, then=Value(30)),
+
+                    # Summary match
+                    When(summary__icontains=query, then=Value(10)),
 
-        # If we have good matches, return those
-        if search_results.count() >= 3:
+                    default=Value(0),
+                    output_field=IntegerField()
+                ),
+                # Final score = relevance + text rank + (tmdb_popularity / 10) for slight boost
+                final_score=ExpressionWrapper(
+                    F('relevance_rank') + (F('text_rank') * SEARCH_TEXT_RANK_WEIGHT) + (F('tmdb_popularity') / 10.0),
+                    output_field=FloatField()
+                )
+            )
             works = search_results.order_by('-final_score', '-year')[:limit]
         else:
             # Use fuzzy matching with trigrams
@@ -0,0 +1,30 @@
+"""Signal handlers keeping the cached works catalog in sync with writes."""
+import logging
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from adaptapedia.cache import invalidate_tags, CATALOG_TAG
+from screen.models import ScreenWork, AdaptationEdge
+from .models import Work
+
+logger = logging.getLogger(__name__)
+
+
+def _invalidate_catalog() -> None:
+    """Invalidate every cached catalog page."""
+    try:
+        invalidate_tags(CATALOG_TAG)
+    except Exception as e:
+        # Never fail the write; the catalog TTL bounds staleness
+        logger.warning(f"Failed to invalidate works catalog: {e}")
+
+
+@receiver(post_save, sender=Work)
+@receiver(post_delete, sender=Work)
+@receiver(post_save, sender=ScreenWork)
+@receiver(post_delete, sender=ScreenWork)
+@receiver(post_save, sender=AdaptationEdge)
+@receiver(post_delete, sender=AdaptationEdge)
+def catalog_changed(sender, instance, **kwargs):
+    """Invalidate catalog pages once the write commits."""
+    transaction.on_commit(_invalidate_catalog)
@@ -4,7 +4,7 @@ from django.utils.text import slugify
 from rest_framework.test import APITestCase
 from rest_framework import status
 from .models import Work
-from .services import SimilarBooksService
+from .services import SimilarBooksService, SearchService
 from screen.models import ScreenWork, AdaptationEdge
 
 
@@ -433,3 +433,61 @@ class SimilarBooksAPITestCase(APITestCase):
         """Test similar books for non-existent work."""
         response = self.client.get('/api/works/nonexistent/similar/')
         self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class SearchServiceTestCase(TestCase):
+    """Test cases for full-text search over works and screen works."""
+
+    def setUp(self):
+        """Set up works matching 'it' by title, author and summary, and their adaptations."""
+        from screen.models import ScreenWorkType
+
+        self.it = Work.objects.create(title="It", slug="it", author="Stephen King", summary="A killer clown.")
+        self.ends = Work.objects.create(
+            title="It Ends with Us", slug="it-ends-with-us", author="Colleen Hoover", summary="A romance."
+        )
+        self.summary_only = Work.objects.create(
+            title="Carrie", slug="carrie", author="Stephen King", summary="Nobody saw it coming."
+        )
+        self.other = Work.objects.create(title="Dune", slug="dune", author="Frank Herbert", summary="Spice.")
+        self.movie = ScreenWork.objects.create(
+            type=ScreenWorkType.MOVIE, title="It", slug="it-2017", year=2017, summary="Losers face a clown."
+        )
+        self.remake = ScreenWork.objects.create(
+            type=ScreenWorkType.TV, title="It", slug="it-1990", year=1990, summary="Miniseries of the novel."
+        )
+        ScreenWork.objects.create(
+            type=ScreenWorkType.MOVIE, title="It Follows", slug="it-follows", year=2014, summary="A curse."
+        )
+        AdaptationEdge.objects.create(work=self.it, screen_work=self.movie)
+
+    def test_title_author_and_summary_matches_ranked(self):
+        """Test that stop words match and an exact title outranks title and summary matches."""
+        works, total_count = SearchService.search_works_with_adaptations('it')
+
+        self.assertEqual(total_count, 3)
+        self.assertEqual([work.id for work in works], [self.it.id, self.ends.id, self.summary_only.id])
+        self.assertEqual([screen.id for screen in works[0].ranked_adaptations], [self.movie.id])
+
+    def test_last_word_matches_as_prefix(self):
+        """Test that a partly typed last word matches titles and authors."""
+        works, total_count = SearchService.search_works_with_adaptations('stephen ki')
+
+        self.assertEqual(total_count, 2)
+        self.assertEqual({work.id for work in works}, {self.it.id, self.summary_only.id})
+
+    def test_few_matches_fall_back_to_fuzzy(self):
+        """Test that a misspelt query still finds works by trigram similarity."""
+        works, total_count = SearchService.search_works_with_adaptations('Dunne')
+
+        self.assertEqual([work.id for work in works], [self.other.id])
+        self.assertEqual(total_count, 1)
+
+    def test_screen_search_by_year(self):
+        """Test that screen-first search matches the title within the requested year."""
+        self.assertEqual(
+            [screen.id for screen in SearchService.search_screen_works('it', year=1990)], [self.remake.id]
+        )
+        screens = SearchService.search_screen_works('it')
+        self.assertEqual(len(screens), 3)
+        self.assertEqual(screens[2].title, "It Follows")
@@ -9,6 +9,7 @@ from .models import Work
 from .serializers import WorkSerializer, WorkWithAdaptationsSerializer, GenreSerializer, SimilarBookSerializer
 from .services import SearchService, SimilarBooksService
 from screen.serializers import ScreenWorkSerializer
+from adaptapedia.cache import CACHE_SWR_TIMEOUTS, CATALOG_TAG, conditional_on_versions
 
 
 class WorkPagination(PageNumberPagination):
@@ -166,6 +167,7 @@ class WorkViewSet(viewsets.ReadOnlyModelViewSet):
         })
 
     @action(detail=False, methods=['get'], url_path='catalog')
+    @conditional_on_versions(lambda request: [CATALOG_TAG], bucket=CACHE_SWR_TIMEOUTS['works_catalog'][0])
     def catalog(self, request):
         """
         Get books with their adaptations for catalog page with letter-based pagination.
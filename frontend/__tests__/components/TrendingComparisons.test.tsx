@@ -36,8 +36,8 @@ const mockTrendingData: TrendingComparison[] = [
     screen_work_type: 'Movie',
     screen_work_year: 2012,
     total_diffs: 15,
-    recent_diffs: 3,
-    recent_votes: 8,
+    decayed_diffs: 3,
+    decayed_votes: 8,
     activity_score: 17.0,
   },
   {
@@ -50,8 +50,8 @@ const mockTrendingData: TrendingComparison[] = [
     screen_work_type: 'Movie',
     screen_work_year: 1993,
     total_diffs: 12,
-    recent_diffs: 2,
-    recent_votes: 5,
+    decayed_diffs: 2,
+    decayed_votes: 5,
     activity_score: 11.0,
   },
   {
@@ -64,8 +64,8 @@ const mockTrendingData: TrendingComparison[] = [
     screen_work_type: 'Movie',
     screen_work_year: 2001,
     total_diffs: 20,
-    recent_diffs: 1,
-    recent_votes: 3,
+    decayed_diffs: 1,
+    decayed_votes: 3,
     activity_score: 6.0,
   },
 ];
@@ -143,8 +143,8 @@ describe('TrendingComparisons', () => {
     const singleDiffData: TrendingComparison[] = [
       {
         ...mockTrendingData[0],
-        recent_diffs: 1,
-        recent_votes: 0,
+        decayed_diffs: 1,
+        decayed_votes: 0,
       },
     ];
 
@@ -161,8 +161,8 @@ describe('TrendingComparisons', () => {
     const onlyVotesData: TrendingComparison[] = [
       {
         ...mockTrendingData[0],
-        recent_diffs: 0,
-        recent_votes: 5,
+        decayed_diffs: 0,
+        decayed_votes: 5,
       },
     ];
 
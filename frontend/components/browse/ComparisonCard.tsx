@@ -30,8 +30,8 @@ export default function ComparisonCard({ comparison, showTrendingBadge = false }
   const vote_count = 'vote_count' in comparison ? comparison.vote_count : 0;
   const comparison_vote_count = comparison.comparison_vote_count || 0;
   const last_updated = 'last_updated' in comparison ? comparison.last_updated : undefined;
-  const recent_diffs = 'recent_diffs' in comparison ? comparison.recent_diffs : 0;
-  const recent_votes = 'recent_votes' in comparison ? comparison.recent_votes : 0;
+  const decayed_diffs = 'decayed_diffs' in comparison ? comparison.decayed_diffs : 0;
+  const decayed_votes = 'decayed_votes' in comparison ? comparison.decayed_votes : 0;
 
   const comparisonUrl = `/compare/${work_slug}/${screen_work_slug}`;
 
@@ -156,7 +156,7 @@ export default function ComparisonCard({ comparison, showTrendingBadge = false }
           </span>
 
           {/* Activity indicator for trending */}
-          {showTrendingBadge && (recent_diffs && recent_diffs > 0 || recent_votes && recent_votes > 0) && (
+          {showTrendingBadge && (decayed_diffs && decayed_diffs > 0 || decayed_votes && decayed_votes > 0) && (
             <span className={`inline-flex items-center gap-1 px-1.5 py-1 ${TEXT.metadata} font-bold bg-black dark:bg-white text-white dark:text-black ${monoUppercase}`} style={{ fontFamily: FONTS.mono, letterSpacing: LETTER_SPACING.tight }}>
               <svg className="w-3 h-3" fill="none" viewBox="0 0 24 24" stroke="currentColor">
                 <path strokeLinecap="round" strokeLinejoin="round" strokeWidth={2} d="M13 7h8m0 0v8m0-8l-8 8-4-4-6 6" />
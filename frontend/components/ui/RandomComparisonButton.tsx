@@ -7,6 +7,10 @@ import { Button } from '@/components/ui/Button';
 import { BoltIcon, SpinnerIcon } from '@/components/ui/Icons';
 import { analytics } from '@/lib/analytics';
 
+// Comparisons served recently in this tab, sent back so the API skips them
+const RECENT_RANDOM_KEY = 'recentRandomComparisons';
+const RECENT_RANDOM_LIMIT = 10;
+
 interface RandomComparisonButtonProps {
   className?: string;
 }
@@ -18,7 +22,17 @@ export default function RandomComparisonButton({ className }: RandomComparisonBu
   const handleClick = async (): Promise<void> => {
     setLoading(true);
     try {
-      const randomComparison = await api.diffs.getRandomComparison();
+      const recent: string[] = JSON.parse(sessionStorage.getItem(RECENT_RANDOM_KEY) || '[]');
+      const randomComparison = await api.diffs.getRandomComparison(recent);
+      sessionStorage.setItem(
+        RECENT_RANDOM_KEY,
+        JSON.stringify(
+          [randomComparison.comparison, ...recent.filter((c) => c !== randomComparison.comparison)].slice(
+            0,
+            RECENT_RANDOM_LIMIT
+          )
+        )
+      );
 
       // Track random comparison click
       analytics.trackRandomComparison();
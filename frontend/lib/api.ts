@@ -13,15 +13,19 @@ import type {
   CreateComparisonVoteData,
   ComparisonVote,
   ComparisonVoteStats,
+  ComparisonVoteStatsBatchItem,
   SearchWithAdaptationsResponse,
   GenreListResponse,
   ApiResponse,
   WorkWithAdaptations,
   SimilarBooksResponse,
   TrendingComparison,
+  BrowseComparison,
   Vote,
   VoteType,
   Comment,
+  CommentThread,
+  ComparisonPage,
   Bookmark,
   BookmarkCheckResponse,
   Notification,
@@ -376,13 +380,29 @@ export const api = {
       const params = limit ? `?limit=${limit}` : '';
       return fetchApi<NeedsHelpResponse>(`/diffs/items/needs-help/${params}`);
     },
-    getRandomComparison: async (): Promise<{ work_slug: string; screen_work_slug: string; diff_count: number }> => {
-      return fetchApi('/diffs/items/random-comparison/');
+    getRandomComparison: async (
+      exclude?: string[]
+    ): Promise<{ work_slug: string; screen_work_slug: string; diff_count: number; comparison: string }> => {
+      // exclude: 'comparison' values of recently served comparisons, skipped while others are left
+      const query = exclude?.length ? `?${new URLSearchParams({ exclude: exclude.join(',') })}` : '';
+      return fetchApi(`/diffs/items/random-comparison/${query}`);
     },
     browse: async (sort?: string) => {
       const query = sort && sort !== 'popularity' ? `?sort=${sort}` : '';
       return fetchApi(`/diffs/items/browse/${query}`);
     },
+    browseComparisons: async (
+      sort?: string,
+      cursor?: string | null,
+      limit?: number
+    ): Promise<{ results: BrowseComparison[]; next_cursor: string | null }> => {
+      const params: Record<string, string> = {};
+      if (sort) params.sort = sort;
+      if (cursor) params.cursor = cursor;
+      if (limit) params.limit = limit.toString();
+      const query = Object.keys(params).length ? `?${new URLSearchParams(params)}` : '';
+      return fetchApi(`/diffs/items/browse/comparisons/${query}`);
+    },
     getTrending: async (limit?: number, days?: number): Promise<TrendingComparison[]> => {
       const params: Record<string, string> = {};
       if (limit) params.limit = limit.toString();
@@ -407,12 +427,30 @@ export const api = {
       const query = `?${new URLSearchParams(params)}`;
       return fetchApi(`/diffs/items/${query}`);
     },
+    page: async (workSlug: string, screenSlug: string, spoilerScope?: string): Promise<ComparisonPage> => {
+      const query = spoilerScope ? `?${new URLSearchParams({ max_spoiler_scope: spoilerScope })}` : '';
+      return fetchApi<ComparisonPage>(`/diffs/comparisons/${workSlug}/${screenSlug}/${query}`);
+    },
   },
 
   comments: {
     list: async (diffItemId: number) => {
       return fetchApi(`/diffs/comments/?diff_item=${diffItemId}`);
     },
+    threads: async (diffItemId: number, page?: number, maxDepth?: number): Promise<ApiResponse<CommentThread>> => {
+      const params: Record<string, string> = { diff_item: diffItemId.toString() };
+      if (page) {
+        params.page = page.toString();
+      }
+      if (maxDepth !== undefined) {
+        params.max_depth = maxDepth.toString();
+      }
+      return fetchApi<ApiResponse<CommentThread>>(`/diffs/comments/threads/?${new URLSearchParams(params)}`);
+    },
+    thread: async (commentId: number, maxDepth?: number): Promise<CommentThread> => {
+      const query = maxDepth !== undefined ? `?max_depth=${maxDepth}` : '';
+      return fetchApi<CommentThread>(`/diffs/comments/${commentId}/thread/${query}`);
+    },
     create: async (diffItemId: number, body: string, spoilerScope: string, parentId?: number) => {
       const payload: Record<string, unknown> = {
         diff_item: diffItemId,
@@ -481,6 +519,15 @@ export const api = {
       );
     },
 
+    getStatsBatch: async (
+      pairs: Array<{ workId: number; screenWorkId: number }>
+    ): Promise<{ results: ComparisonVoteStatsBatchItem[] }> => {
+      const query = pairs.map(({ workId, screenWorkId }) => `${workId}:${screenWorkId}`).join(',');
+      return fetchApi<{ results: ComparisonVoteStatsBatchItem[] }>(
+        `/diffs/comparison-votes/stats/batch/?pairs=${query}`
+      );
+    },
+
     submit: async (data: CreateComparisonVoteData) => {
       return fetchApi('/diffs/comparison-votes/', {
         method: 'POST',
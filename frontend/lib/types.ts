@@ -109,6 +109,8 @@ export interface DiffItem {
   image?: string | null;
   created_by: number;
   created_by_username: string;
+  created_by_top_badge?: TopBadge | null;
+  created_by_reputation_tier?: ReputationTier | null;
   vote_counts: {
     accurate: number;
     needs_nuance: number;
@@ -131,15 +133,21 @@ export interface AdaptationEdge {
   created_at: string;
 }
 
+// Author flair stored on the user (see User.top_badge, REPUTATION_TIERS)
+export interface TopBadge {
+  badge_type: BadgeType;
+  badge_display: string;
+}
+
+export type ReputationTier = 'NEWCOMER' | 'CONTRIBUTOR' | 'TRUSTED' | 'EXPERT';
+
 export interface Comment {
   id: number;
   diff_item: number;
   user: number;
   username: string;
-  top_badge?: {
-    badge_type: BadgeType;
-    badge_display: string;
-  } | null;
+  top_badge?: TopBadge | null;
+  reputation_tier?: ReputationTier;
   body: string;
   spoiler_scope: SpoilerScope;
   status: string;
@@ -152,6 +160,18 @@ export interface Comment {
   screen_work_slug?: string;
 }
 
+// Comment in a thread listing (/diffs/comments/threads/, /diffs/comments/{id}/thread/)
+export interface ThreadComment extends Comment {
+  depth: number;
+  reply_count: number;
+  descendant_count: number;
+  collapsed_reply_count: number;
+}
+
+export interface CommentThread extends ThreadComment {
+  replies: ThreadComment[];
+}
+
 export interface User {
   id: number;
   username: string;
@@ -184,6 +204,8 @@ export interface UserProfile {
   votes_count: number;
   comments_count: number;
   reputation_score: number;
+  reputation_tier?: ReputationTier;
+  top_badge?: TopBadge | null;
   badges?: UserBadge[];
   stats?: {
     total_votes: number;
@@ -278,10 +300,16 @@ export interface ComparisonVoteStats {
   faithfulness: {
     average: number | null;
     count: number;
+    histogram: Record<'1' | '2' | '3' | '4' | '5', number>; // Votes per rating
   };
   user_vote: ComparisonVote | null;
 }
 
+export interface ComparisonVoteStatsBatchItem extends ComparisonVoteStats {
+  work: number;
+  screen_work: number;
+}
+
 export interface CreateComparisonVoteData {
   work: number;
   screen_work: number;
@@ -330,8 +358,8 @@ export interface BrowseComparison {
   comparison_vote_count?: number;
   last_updated?: string;
   activity_score?: number;
-  recent_diffs?: number;
-  recent_votes?: number;
+  decayed_diffs?: number;
+  decayed_votes?: number;
 }
 
 export interface BrowseSections {
@@ -391,8 +419,9 @@ export interface TrendingComparison {
   screen_work_year: number | null;
   poster_url?: string;
   total_diffs: number;
-  recent_diffs: number;
-  recent_votes: number;
+  // Recent diffs and votes, each weighted down with age (48-hour half-life), so fractional
+  decayed_diffs: number;
+  decayed_votes: number;
   activity_score: number;
   comparison_vote_count?: number;
 }
@@ -418,6 +447,21 @@ export interface BookmarkCheckResponse {
   bookmark_id: number | null;
 }
 
+export interface ComparisonPageDiff extends DiffItem {
+  comments: {
+    thread_count: number; // Visible top-level comments
+    threads: CommentThread[]; // The first few, with their first reply levels
+  };
+}
+
+export interface ComparisonPage {
+  work: Work;
+  screen_work: ScreenWork;
+  vote_stats: ComparisonVoteStats;
+  bookmark: BookmarkCheckResponse;
+  diffs: ComparisonPageDiff[];
+}
+
 // Reputation & Badge System
 
 export type BadgeType =
@@ -527,6 +571,7 @@ export interface VoteResponse {
   user: number;
   vote: VoteType;
   created_at: string;
+  pending?: boolean; // Buffered vote, not yet written (no id or created_at)
   consensus?: {
     total_votes: number;
     accurate_percentage: number;